@@ -0,0 +1,281 @@
+# app/core/cache.py
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Caché en memoria con expiración (TTL) y límite de entradas (LRU).
+
+    - Las claves son tuplas cuyo primer elemento es el "espacio"
+      (ej: ("abc", "2024-01-01", "2024-03-31")), así se puede invalidar
+      todo un grupo con invalidate("abc").
+    - Es segura para hilos: Streamlit atiende cada sesión en su propio hilo.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_items: int = 256) -> None:
+        self.ttl = float(ttl)
+        self.max_items = int(max_items)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expira, valor = item
+            if expira < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return valor
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expira = time.monotonic() + (self.ttl if ttl is None else float(ttl))
+        with self._lock:
+            self._data[key] = (expira, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def get_or_set(
+        self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Devuelve el valor cacheado o lo calcula con factory() y lo guarda.
+        El cálculo se hace fuera del lock para no bloquear otras sesiones.
+        """
+        centinela = object()
+        valor = self.get(key, centinela)
+        if valor is not centinela:
+            return valor
+
+        valor = factory()
+        self.set(key, valor, ttl)
+        return valor
+
+    def invalidate(self, espacio: Optional[str] = None) -> None:
+        """
+        Sin argumentos vacía la caché; con espacio borra solo las claves
+        cuyo primer elemento coincide.
+        """
+        with self._lock:
+            if espacio is None:
+                self._data.clear()
+                return
+
+            for key in [
+                k for k in self._data
+                if isinstance(k, tuple) and k and k[0] == espacio
+            ]:
+                del self._data[key]
+
+
+# ==========================================================
+#   BACKENDS COMPARTIDOS ENTRE PROCESOS
+# ==========================================================
+# Misma interfaz que TTLCache (get / set / get_or_set / invalidate). Con
+# varios procesos de Streamlit detrás de un proxy, cada uno tendría su
+# propia TTLCache; con estos backends el catálogo, los KPIs o los fiados
+# pendientes se calculan una vez y los ven todos. Los valores se guardan
+# con pickle: el almacén debe ser local/privado de la app.
+
+
+def _espacio(key: Hashable) -> str:
+    return str(key[0]) if isinstance(key, tuple) and key else ""
+
+
+class SQLiteCache:
+    """
+    Caché en un archivo SQLite (modo WAL) compartido por los procesos de
+    la misma máquina. Una conexión por hilo; el TTL usa el reloj de pared
+    porque lo comparten procesos distintos.
+    """
+
+    # Cada cuántos set() se purgan vencidos y se recorta a max_items
+    PURGA_CADA = 200
+
+    def __init__(self, ruta: str, ttl: float = 300.0, max_items: int = 5000) -> None:
+        self.ruta = ruta
+        self.ttl = float(ttl)
+        self.max_items = int(max_items)
+        self._local = threading.local()
+        self._sets = 0
+
+        carpeta = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(carpeta, exist_ok=True)
+        self._cn().execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                clave   TEXT PRIMARY KEY,
+                espacio TEXT NOT NULL,
+                expira  REAL NOT NULL,
+                valor   BLOB NOT NULL
+            )
+            """
+        )
+        self._cn().execute("CREATE INDEX IF NOT EXISTS ix_cache_espacio ON cache (espacio)")
+
+    def _cn(self) -> sqlite3.Connection:
+        cn = getattr(self._local, "cn", None)
+        if cn is None:
+            cn = sqlite3.connect(self.ruta, timeout=5.0, isolation_level=None)
+            cn.execute("PRAGMA journal_mode=WAL")
+            cn.execute("PRAGMA synchronous=NORMAL")
+            self._local.cn = cn
+        return cn
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        row = self._cn().execute(
+            "SELECT expira, valor FROM cache WHERE clave = ?", (repr(key),)
+        ).fetchone()
+        if row is None:
+            return default
+
+        expira, valor = row
+        if expira < time.time():
+            self._cn().execute("DELETE FROM cache WHERE clave = ?", (repr(key),))
+            return default
+        return pickle.loads(valor)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expira = time.time() + (self.ttl if ttl is None else float(ttl))
+        self._cn().execute(
+            "INSERT OR REPLACE INTO cache (clave, espacio, expira, valor) VALUES (?, ?, ?, ?)",
+            (repr(key), _espacio(key), expira, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)),
+        )
+
+        self._sets += 1
+        if self._sets % self.PURGA_CADA == 0:
+            self._purgar()
+
+    def _purgar(self) -> None:
+        cn = self._cn()
+        cn.execute("DELETE FROM cache WHERE expira < ?", (time.time(),))
+        cn.execute(
+            """
+            DELETE FROM cache WHERE clave IN (
+                SELECT clave FROM cache ORDER BY expira DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_items,),
+        )
+
+    def get_or_set(
+        self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        centinela = object()
+        valor = self.get(key, centinela)
+        if valor is not centinela:
+            return valor
+
+        valor = factory()
+        self.set(key, valor, ttl)
+        return valor
+
+    def invalidate(self, espacio: Optional[str] = None) -> None:
+        if espacio is None:
+            self._cn().execute("DELETE FROM cache")
+        else:
+            self._cn().execute("DELETE FROM cache WHERE espacio = ?", (espacio,))
+
+
+class RedisCache:
+    """
+    Caché en un servidor compatible con Redis (Redis, Valkey, KeyDB o un
+    sustituto local que hable el mismo protocolo). Requiere el paquete
+    `redis`; el vencimiento lo maneja el servidor.
+    """
+
+    def __init__(
+        self, url: str, ttl: float = 300.0, prefijo: str = "farmacia"
+    ) -> None:
+        import redis  # opcional: solo si CACHE_BACKEND=redis
+
+        self.ttl = float(ttl)
+        self.prefijo = prefijo
+        self._r = redis.Redis.from_url(url)
+        self._r.ping()
+
+    def _clave(self, key: Hashable) -> str:
+        return f"{self.prefijo}:{_espacio(key)}:{key!r}"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        valor = self._r.get(self._clave(key))
+        return default if valor is None else pickle.loads(valor)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ms = int((self.ttl if ttl is None else float(ttl)) * 1000)
+        self._r.set(
+            self._clave(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=max(1, ms)
+        )
+
+    def get_or_set(
+        self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        centinela = object()
+        valor = self.get(key, centinela)
+        if valor is not centinela:
+            return valor
+
+        valor = factory()
+        self.set(key, valor, ttl)
+        return valor
+
+    def invalidate(self, espacio: Optional[str] = None) -> None:
+        patron = f"{self.prefijo}:*" if espacio is None else f"{self.prefijo}:{espacio}:*"
+        claves = list(self._r.scan_iter(match=patron, count=500))
+        if claves:
+            self._r.delete(*claves)
+
+
+class SinCache:
+    """No guarda nada: get_or_set siempre calcula (services sin caché inyectada)."""
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    def get_or_set(
+        self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        return factory()
+
+    def invalidate(self, espacio: Optional[str] = None) -> None:
+        pass
+
+
+def crear_cache(ttl: float = 300.0, max_items: int = 256):
+    """
+    Backend según CACHE_BACKEND:
+    - memoria (por defecto): TTLCache del proceso
+    - sqlite: SQLiteCache en CACHE_SQLITE_RUTA (cache/farmacia.sqlite3)
+    - redis:  RedisCache en CACHE_REDIS_URL (redis://localhost:6379/0)
+
+    Si el backend compartido no está disponible se usa memoria.
+    """
+    backend = os.getenv("CACHE_BACKEND", "memoria").lower()
+
+    try:
+        if backend == "sqlite":
+            ruta = os.getenv("CACHE_SQLITE_RUTA", os.path.join("cache", "farmacia.sqlite3"))
+            return SQLiteCache(ruta, ttl=ttl, max_items=max(max_items, 5000))
+        if backend == "redis":
+            url = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+            return RedisCache(url, ttl=ttl)
+    except Exception as e:
+        print(f"[CACHE] Backend '{backend}' no disponible ({e}); se usa memoria.")
+
+    return TTLCache(ttl=ttl, max_items=max_items)
@@ -1,6 +1,106 @@
 # app/core/database.py
+import atexit
 import os
+import threading
+
 import psycopg2
+from psycopg2 import pool as pg_pool
+
+
+# ==========================================================
+#   POOL DE CONEXIONES
+# ==========================================================
+# Un pool por proceso, compartido por la app web y el cliente de
+# escritorio. conectar_bd() presta una conexión y cn.close() la devuelve.
+_pool = None
+_pool_lock = threading.Lock()
+
+# Contadores para estado_pool(): conexiones prestadas por el pool y
+# abiertas fuera de él porque estaba agotado. psycopg2 no expone su
+# ocupación, así que se cuentan aquí (con su propio lock).
+_contadores_lock = threading.Lock()
+_prestadas = 0
+_directas = 0
+
+
+def _contar(prestadas=0, directas=0):
+    global _prestadas, _directas
+    with _contadores_lock:
+        _prestadas += prestadas
+        _directas += directas
+
+
+def _parametros():
+    host = os.getenv("DB_HOST")
+    if not host:
+        raise RuntimeError("DB_HOST no está definido en las variables de entorno.")
+
+    return {
+        "host": host,      # 👈 dejamos que psycopg2 resuelva (IPv4/IPv6)
+        "port": int(os.getenv("DB_PORT", "5432")),
+        "dbname": os.getenv("DB_NAME", "postgres"),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASS", ""),
+        # Supabase exige SSL; un Postgres local (pruebas de carga) puede usar
+        # DB_SSLMODE=disable o prefer
+        "sslmode": os.getenv("DB_SSLMODE", "require"),
+    }
+
+
+def _get_pool():
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None:
+            params = _parametros()
+            minimo = int(os.getenv("DB_POOL_MIN", "1"))
+            maximo = int(os.getenv("DB_POOL_MAX", "10"))
+            print(
+                f"[DB DEBUG] Creando pool PostgreSQL ({minimo}-{maximo}): "
+                f"host={params['host']}, port={params['port']}, "
+                f"db={params['dbname']}, user={params['user']}"
+            )
+            _pool = pg_pool.ThreadedConnectionPool(minimo, maximo, **params)
+            print("✅ Pool de conexiones listo (Supabase)")
+    return _pool
+
+
+class ConexionPool:
+    """
+    Conexión prestada por el pool. Se usa igual que una conexión de
+    psycopg2; la única diferencia es que close() la devuelve al pool
+    (con rollback de lo que haya quedado abierto) en vez de cerrarla.
+    """
+
+    __slots__ = ("_cn", "_pool", "_devuelta")
+
+    def __init__(self, cn, pool):
+        self._cn = cn
+        self._pool = pool
+        self._devuelta = False
+
+    def __getattr__(self, nombre):
+        return getattr(self._cn, nombre)
+
+    def close(self):
+        if self._devuelta:
+            return
+        self._devuelta = True
+        _contar(prestadas=-1)
+
+        rota = bool(self._cn.closed)
+        if not rota:
+            try:
+                self._cn.rollback()
+            except Exception:
+                rota = True
+        try:
+            self._pool.putconn(self._cn, close=rota)
+        except pg_pool.PoolError:
+            # El pool ya se cerró (fin del proceso)
+            self._cn.close()
 
 
 def conectar_bd():
@@ -9,40 +109,66 @@ def conectar_bd():
 
     - En local: puedes usar .env o os.environ.
     - En Streamlit Cloud: se leen desde Secrets.
-    """
-
-    host = os.getenv("DB_HOST")
-    port = int(os.getenv("DB_PORT", "5432"))
-    dbname = os.getenv("DB_NAME", "postgres")
-    user = os.getenv("DB_USER", "postgres")
-    password = os.getenv("DB_PASS", "")
-
-    if not host:
-        raise RuntimeError("DB_HOST no está definido en las variables de entorno.")
+    - DB_POOL_MIN / DB_POOL_MAX: tamaño del pool (1 / 10 por defecto).
 
+    La conexión sale de un pool; llamar cn.close() la devuelve. Si el
+    pool está agotado se abre una conexión directa como antes.
+    """
     try:
-        print(
-            f"[DB DEBUG] Conectando a PostgreSQL: "
-            f"host={host}, port={port}, db={dbname}, user={user}"
-        )
+        pool = _get_pool()
+        try:
+            cn = pool.getconn()
+        except pg_pool.PoolError:
+            _contar(directas=1)
+            print("[DB DEBUG] Pool agotado: conexión directa")
+            return psycopg2.connect(**_parametros())
 
-        conexion = psycopg2.connect(
-            host=host,      # 👈 dejamos que psycopg2 resuelva (IPv4/IPv6)
-            port=port,
-            dbname=dbname,
-            user=user,
-            password=password,
-            sslmode="require",   # Supabase exige SSL
-        )
+        # Las conexiones cortadas por el servidor se descartan
+        while cn.closed:
+            pool.putconn(cn, close=True)
+            cn = pool.getconn()
 
-        print("✅ Conexión exitosa a PostgreSQL (Supabase)")
-        return conexion
+        _contar(prestadas=1)
+        return ConexionPool(cn, pool)
 
+    except RuntimeError:
+        raise
     except Exception as e:
         print("❌ Error al conectar a PostgreSQL:", e)
         raise RuntimeError(f"No se pudo conectar con la BD: {e}") from e
 
 
+def estado_pool():
+    """
+    Ocupación del pool de este proceso:
+    {"en_uso", "libres", "maximo", "directas"}. "libres" son las que el
+    pool todavía puede prestar; "directas" cuenta las conexiones abiertas
+    fuera del pool por estar agotado.
+    """
+    pool = _pool
+    maximo = pool.maxconn if pool is not None else 0
+    with _contadores_lock:
+        en_uso, directas = _prestadas, _directas
+    return {
+        "en_uso": en_uso,
+        "libres": max(0, maximo - en_uso),
+        "maximo": maximo,
+        "directas": directas,
+    }
+
+
+def cerrar_pool():
+    """Cierra todas las conexiones del pool (fin del proceso)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+atexit.register(cerrar_pool)
+
+
 # Test rápido local (opcional)
 if __name__ == "__main__":
     cn = conectar_bd()
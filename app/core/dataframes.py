@@ -0,0 +1,85 @@
+# app/core/dataframes.py
+from __future__ import annotations
+
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ==========================================================
+#   FORMATOS DE FECHA
+# ==========================================================
+# Las consultas que devuelven fechas como texto usan to_char con estos
+# formatos; al parsear se indica el formato exacto (sin adivinar por fila).
+FORMATO_FECHA = "%Y-%m-%d"               # to_char(x, 'YYYY-MM-DD')
+FORMATO_FECHA_HORA = "%Y-%m-%d %H:%M"    # to_char(x, 'YYYY-MM-DD HH24:MI')
+
+
+# ==========================================================
+#   FILAS DEL CURSOR → DATAFRAME TIPADO
+# ==========================================================
+# Tipos de columna:
+# - "int"    enteros (con NULL pasa a Int64, que admite nulos)
+# - "float"  decimales; Decimal de NUMERIC y NULL (→ NaN) se convierten en bloque
+# - "str"    texto u objetos tal cual
+# - "fecha"  date/datetime de psycopg2 → datetime64 sin zona (en UTC)
+# - "%Y-..." texto de fecha con ese formato exacto → datetime64
+Esquema = Dict[str, str]
+
+
+def _columna(valores: Tuple[Any, ...], tipo: str):
+    if tipo == "int":
+        try:
+            return np.array(valores, dtype=np.int64)
+        except TypeError:
+            return pd.array(valores, dtype="Int64")
+    if tipo == "float":
+        return np.array(valores, dtype=np.float64)
+    if tipo == "str":
+        arr = np.empty(len(valores), dtype=object)
+        arr[:] = valores
+        return arr
+    if tipo == "fecha":
+        fechas = pd.to_datetime(pd.Series(valores, dtype=object), errors="coerce", utc=True)
+        return fechas.dt.tz_convert(None).to_numpy()
+    if "%" in tipo:
+        return pd.to_datetime(
+            pd.Series(valores, dtype=object), format=tipo, errors="coerce"
+        ).to_numpy()
+    raise ValueError(f"Tipo de columna desconocido: {tipo!r}")
+
+
+def _vacia(tipo: str):
+    if tipo == "int":
+        return np.empty(0, dtype=np.int64)
+    if tipo == "float":
+        return np.empty(0, dtype=np.float64)
+    if tipo == "fecha" or "%" in tipo:
+        return np.empty(0, dtype="datetime64[ns]")
+    return np.empty(0, dtype=object)
+
+
+def df_desde_filas(filas: Sequence[Tuple], esquema: Esquema) -> pd.DataFrame:
+    """
+    DataFrame con tipos fijos a partir de fetchall().
+
+        df_desde_filas(rows, {"Id": "int", "Producto": "str", "Monto": "float"})
+
+    esquema: {columna: tipo} en el mismo orden que el SELECT. Las filas se
+    trasponen una vez y cada columna se convierte en bloque; no hay trabajo
+    por fila en Python ni inferencia de tipos de pandas.
+    """
+    if not filas:
+        return pd.DataFrame({c: _vacia(t) for c, t in esquema.items()})
+
+    columnas = list(zip(*filas))
+    if len(columnas) != len(esquema):
+        raise ValueError(
+            f"El esquema tiene {len(esquema)} columnas y las filas {len(columnas)}."
+        )
+
+    return pd.DataFrame(
+        {c: _columna(v, t) for (c, t), v in zip(esquema.items(), columnas)},
+        copy=False,
+    )
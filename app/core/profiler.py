@@ -0,0 +1,215 @@
+# app/core/profiler.py
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import json
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class Perfil:
+    """
+    Línea de tiempo de una corrida (un rerun de Streamlit, una pantalla).
+
+    Cada span es un dict:
+        {nombre, categoria, inicio_ms, dur_ms, propio_ms, nivel}
+    - inicio_ms: desde el inicio del perfil
+    - propio_ms: dur_ms menos lo que tardaron los spans hijos; con esto
+      "service" mide solo el trabajo en pandas y "sql" el tiempo en la BD.
+    """
+
+    def __init__(self, nombre: str) -> None:
+        self.nombre = nombre
+        self.creado = datetime.now()
+        self.spans: List[Dict[str, Any]] = []
+        self.perfil_texto: Optional[str] = None   # salida de cProfile/pyinstrument
+        self._t0 = time.perf_counter()
+        self._pila: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, nombre: str, categoria: str = "app"):
+        inicio = time.perf_counter()
+        s = {
+            "nombre": nombre,
+            "categoria": categoria,
+            "inicio_ms": (inicio - self._t0) * 1000,
+            "dur_ms": 0.0,
+            "propio_ms": 0.0,
+            "nivel": len(self._pila),
+            "_hijos_ms": 0.0,
+        }
+        self.spans.append(s)
+        self._pila.append(s)
+        try:
+            yield s
+        finally:
+            self._pila.pop()
+            s["dur_ms"] = (time.perf_counter() - inicio) * 1000
+            s["propio_ms"] = s["dur_ms"] - s.pop("_hijos_ms")
+            if self._pila:
+                self._pila[-1]["_hijos_ms"] += s["dur_ms"]
+
+    @property
+    def total_ms(self) -> float:
+        return sum(s["dur_ms"] for s in self.spans if s["nivel"] == 0)
+
+    def por_categoria(self) -> Dict[str, float]:
+        """Tiempo propio sumado por categoría (sin contar dos veces lo anidado)."""
+        totales: Dict[str, float] = {}
+        for s in self.spans:
+            totales[s["categoria"]] = totales.get(s["categoria"], 0.0) + s["propio_ms"]
+        return dict(sorted(totales.items(), key=lambda kv: -kv[1]))
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "pagina": self.nombre,
+            "inicio": self.creado.isoformat(timespec="seconds"),
+            "total_ms": round(self.total_ms, 2),
+            "por_categoria": {k: round(v, 2) for k, v in self.por_categoria().items()},
+            "spans": [
+                {k: (round(v, 2) if isinstance(v, float) else v) for k, v in s.items()}
+                for s in self.spans
+            ],
+        }
+
+    def guardar(self, carpeta: Optional[str] = None) -> str:
+        """Agrega el perfil como una línea JSON a <carpeta>/perfiles.jsonl."""
+        carpeta = carpeta or directorio_perfiles()
+        os.makedirs(carpeta, exist_ok=True)
+        ruta = os.path.join(carpeta, "perfiles.jsonl")
+        with open(ruta, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.a_dict(), ensure_ascii=False) + "\n")
+        return ruta
+
+
+# ==========================================================
+#   PERFIL ACTIVO (uno por hilo / sesión de Streamlit)
+# ==========================================================
+_activo: contextvars.ContextVar[Optional[Perfil]] = contextvars.ContextVar(
+    "perfil_activo", default=None
+)
+
+
+def directorio_perfiles() -> str:
+    return os.getenv("PERFIL_DIR", "perfiles")
+
+
+def perfil_actual() -> Optional[Perfil]:
+    return _activo.get()
+
+
+@contextmanager
+def perfilar(nombre: str, captura: Optional[str] = None):
+    """
+    Activa un Perfil mientras dura el bloque y lo entrega.
+
+    captura: None | "cprofile" | "pyinstrument" -> además del timeline se
+    guarda el perfil de funciones del bloque en perfil.perfil_texto (y el
+    .prof de cProfile en directorio_perfiles()).
+    """
+    perfil = Perfil(nombre)
+    token = _activo.set(perfil)
+    try:
+        if captura == "pyinstrument":
+            with _captura_pyinstrument(perfil):
+                yield perfil
+        elif captura == "cprofile":
+            with _captura_cprofile(perfil):
+                yield perfil
+        else:
+            yield perfil
+    finally:
+        _activo.reset(token)
+
+
+@contextmanager
+def span(nombre: str, categoria: str = "app"):
+    """Span en el perfil activo; sin perfil activo no hace nada."""
+    perfil = _activo.get()
+    if perfil is None:
+        yield None
+        return
+    with perfil.span(nombre, categoria) as s:
+        yield s
+
+
+def perfilado(categoria: str):
+    """
+    Decorador de clase: cada método público queda medido como un span
+    "<Clase>.<método>" de la categoría dada (p. ej. "service" o "sql").
+    Sin perfil activo el costo es una lectura de ContextVar.
+    """
+
+    def decorador(cls):
+        for nombre, valor in list(vars(cls).items()):
+            if nombre.startswith("_") or not inspect.isfunction(valor):
+                continue
+            setattr(cls, nombre, _medir(valor, f"{cls.__name__}.{nombre}", categoria))
+        return cls
+
+    return decorador
+
+
+def _medir(fn, nombre: str, categoria: str):
+    @functools.wraps(fn)
+    def medido(*args, **kwargs):
+        perfil = _activo.get()
+        if perfil is None:
+            return fn(*args, **kwargs)
+        with perfil.span(nombre, categoria):
+            return fn(*args, **kwargs)
+
+    return medido
+
+
+# ==========================================================
+#   CAPTURA DE FUNCIONES (UNA SOLA CORRIDA)
+# ==========================================================
+@contextmanager
+def _captura_cprofile(perfil: Perfil):
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+
+        carpeta = directorio_perfiles()
+        os.makedirs(carpeta, exist_ok=True)
+        nombre = f"{perfil.creado:%Y%m%d-%H%M%S}-{_slug(perfil.nombre)}.prof"
+        prof.dump_stats(os.path.join(carpeta, nombre))
+
+        salida = io.StringIO()
+        pstats.Stats(prof, stream=salida).sort_stats("cumulative").print_stats(40)
+        perfil.perfil_texto = salida.getvalue()
+
+
+@contextmanager
+def _captura_pyinstrument(perfil: Perfil):
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        # Opcional: sin pyinstrument se usa cProfile
+        with _captura_cprofile(perfil):
+            yield
+        return
+
+    prof = Profiler()
+    prof.start()
+    try:
+        yield
+    finally:
+        prof.stop()
+        perfil.perfil_texto = prof.output_text(unicode=True, color=False)
+
+
+def _slug(texto: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in texto).strip("_") or "pagina"
@@ -0,0 +1,127 @@
+# app/interfaz/cargador.py
+import queue
+import threading
+from tkinter import messagebox
+
+
+class CargadorFondo:
+    """
+    Ejecuta consultas de lectura fuera del hilo de Tk y entrega el resultado
+    en el hilo principal con after(), para que la ventana no se congele
+    mientras la BD responde.
+
+    - Un solo hilo de trabajo; las consultas son llamadas a los services,
+      que toman su conexión del pool (app/core/database.py).
+    - Cada carga lleva una clave ("movimientos", "productos", ...). Si se pide
+      otra carga con la misma clave antes de que termine la anterior, la
+      anterior queda obsoleta: si aún no empezó no se ejecuta y, si ya estaba
+      corriendo, su resultado se descarta.
+
+    Uso:
+        self.cargador = CargadorFondo(self)
+        self.cargador.cargar("movimientos",
+                             lambda: self.inv_service.get_libro(d1, d2),
+                             self._pintar)
+    """
+
+    SONDEO_MS = 40
+
+    def __init__(self, widget):
+        self.widget = widget
+
+        self._tareas = queue.Queue()
+        self._resultados = queue.Queue()
+        self._generacion = {}           # clave -> última generación pedida
+        self._lock = threading.Lock()
+        self._en_vuelo = 0              # tareas sin respuesta (solo hilo Tk)
+        self._sondeo = None
+        self._cerrado = False
+
+        self._hilo = threading.Thread(target=self._trabajar, name="cargador-bd", daemon=True)
+        self._hilo.start()
+
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    # -------- API (hilo de Tk) --------
+    def cargar(self, clave, consulta, al_terminar, al_fallar=None):
+        """
+        consulta() corre en el hilo de trabajo y devuelve los datos;
+        al_terminar(datos) / al_fallar(error) corren en el hilo de Tk.
+        """
+        if self._cerrado:
+            return
+        with self._lock:
+            gen = self._generacion.get(clave, 0) + 1
+            self._generacion[clave] = gen
+        self._en_vuelo += 1
+        self._tareas.put((clave, gen, consulta, al_terminar, al_fallar))
+        self._programar()
+
+    def cancelar(self, clave):
+        """Descarta cualquier carga pendiente o en curso de esa clave."""
+        with self._lock:
+            self._generacion[clave] = self._generacion.get(clave, 0) + 1
+
+    def cerrar(self):
+        if self._cerrado:
+            return
+        self._cerrado = True
+        if self._sondeo is not None:
+            try:
+                self.widget.after_cancel(self._sondeo)
+            except Exception:
+                pass
+            self._sondeo = None
+        self._tareas.put(None)
+
+    # -------- internos --------
+    def _vigente(self, clave, gen) -> bool:
+        with self._lock:
+            return self._generacion.get(clave) == gen
+
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.cerrar()
+
+    def _programar(self):
+        if self._sondeo is None and not self._cerrado:
+            self._sondeo = self.widget.after(self.SONDEO_MS, self._sondear)
+
+    def _sondear(self):
+        self._sondeo = None
+        while True:
+            try:
+                clave, gen, datos, error, al_terminar, al_fallar = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._en_vuelo -= 1
+            if not self._vigente(clave, gen):
+                continue
+            if error is None:
+                al_terminar(datos)
+            elif al_fallar is not None:
+                al_fallar(error)
+            else:
+                messagebox.showerror("BD", f"No se pudieron cargar los datos:\n{error}")
+
+        if self._en_vuelo > 0:
+            self._programar()
+
+    def _trabajar(self):
+        while True:
+            tarea = self._tareas.get()
+            if tarea is None:
+                break
+            clave, gen, consulta, al_terminar, al_fallar = tarea
+
+            # Ya hay una carga más nueva con la misma clave: ni se consulta
+            if not self._vigente(clave, gen):
+                self._resultados.put((clave, gen, None, None, al_terminar, al_fallar))
+                continue
+
+            datos, error = None, None
+            try:
+                datos = consulta()
+            except Exception as e:
+                error = e
+            self._resultados.put((clave, gen, datos, error, al_terminar, al_fallar))
@@ -4,7 +4,11 @@ from tkinter import ttk, messagebox
 from datetime import datetime, date
 
 from tkcalendar import DateEntry
-from app.core.database import conectar_bd
+from app.interfaz.cargador import CargadorFondo
+from app.interfaz.libro_treeview import LlenadoPorLotes, formatear_libro, id_fiado
+from app.services.fiados_service import FiadosService
+from app.services.gastos_service import GastosService
+from app.services.inventario_service import InventarioService
 
 PRIMARY = "#1E63FF"
 SURFACE = "#F5F7FB"
@@ -21,16 +25,17 @@ class InventarioApp(tk.Tk):
 
         self._styles()
 
-        self.cn = conectar_bd()
-        if not self.cn:
-            messagebox.showerror("BD", "No hay conexión a SQL Server.")
-            self.destroy(); return
+        # Misma capa de services (y pool de conexiones) que la app web
+        self.inv_service = InventarioService()
+        self.fiados_service = FiadosService()
+        self.gastos_service = GastosService()
 
         hoy = date.today()
         self.var_desde = tk.StringVar(value=hoy.strftime("%Y-%m-%d"))
         self.var_hasta = tk.StringVar(value=hoy.strftime("%Y-%m-%d"))
 
         self._ui()
+        self.cargador = CargadorFondo(self)
         self._cargar_todo()
 
     # ---------- estilos ----------
@@ -133,7 +138,7 @@ class InventarioApp(tk.Tk):
         ttk.Button(top_f, text="Marcar pagado", style="Primary.TButton",
                    command=self._marcar_fiado_pagado).pack(side="right", padx=(8,0))
 
-        cols_f = ("ID", "Fecha", "Estado", "Cliente", "Producto", "Cantidad", "Monto (Q)", "Fecha pago", "id_venta")
+        cols_f = ("ID", "Fecha", "Estado", "Cliente", "Producto", "Cantidad", "Monto (Q)")
         self.tv_fiados = ttk.Treeview(tab_fiado, columns=cols_f, show="headings", style="m.Treeview", height=20)
         for c in cols_f:
             self.tv_fiados.heading(c, text=c)
@@ -144,14 +149,16 @@ class InventarioApp(tk.Tk):
         self.tv_fiados.column("Producto", width=230, anchor="w")
         self.tv_fiados.column("Cantidad", width=90, anchor="e")
         self.tv_fiados.column("Monto (Q)", width=120, anchor="e")
-        self.tv_fiados.column("Fecha pago", width=130, anchor="center")
-        self.tv_fiados.column("id_venta", width=90, anchor="center")
         self.tv_fiados.pack(fill="both", expand=True, padx=12, pady=(0,12))
 
         vs2 = ttk.Scrollbar(tab_fiado, orient="vertical", command=self.tv_fiados.yview)
         self.tv_fiados.configure(yscrollcommand=vs2.set)
         vs2.place(in_=self.tv_fiados, relx=1.0, rely=0, relheight=1.0, x=-1)
 
+        # Ambas tablas se llenan por tandas para que la primera pantalla salga ya
+        self.llenado_mov = LlenadoPorLotes(self.tv_mov)
+        self.llenado_fiados = LlenadoPorLotes(self.tv_fiados)
+
         # --- Panel derecho: Totales y acciones rápidas
         right = tk.Frame(body, bg=CARD_BG, bd=1, relief="solid")
         right.grid(row=0, column=1, sticky="nsew")
@@ -194,87 +201,40 @@ class InventarioApp(tk.Tk):
 
     # ---------- cargar datos (totales + grillas) ----------
     def _cargar_todo(self):
-        d1 = self.var_desde.get()
-        d2 = self.var_hasta.get()
-
-        # Limpiar tablas
-        self.tv_mov.delete(*self.tv_mov.get_children())
-        self.tv_fiados.delete(*self.tv_fiados.get_children())
-
-        # 1) MOVIMIENTOS: Ventas (incluye fiados pagados) y Gastos
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT CONVERT(varchar(16), v.fecha, 120) AS fecha,
-                       'Venta' AS tipo,
-                       '' AS persona,
-                       STRING_AGG(p.nombre + ' x' + CAST(d.cantidad AS varchar(10)), ', ') WITHIN GROUP (ORDER BY d.id) AS detalle,
-                       SUM(d.cantidad) AS cantidad,
-                       CAST(SUM(d.cantidad * d.precio_unitario) AS float) AS monto
-                FROM dbo.ventas v
-                JOIN dbo.detalle_ventas d ON d.id_venta = v.id
-                JOIN dbo.productos p ON p.id = d.id_producto
-                WHERE v.fecha >= ? AND v.fecha < DATEADD(DAY,1,?)
-                GROUP BY v.fecha
-                ORDER BY v.fecha
-            """, (d1, d2))
-            ventas = cur.fetchall()
-
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT CONVERT(varchar(16), g.fecha, 120) AS fecha,
-                       'Egreso' AS tipo,
-                       '' AS persona,
-                       g.descripcion AS detalle,
-                       NULL AS cantidad,
-                       CAST(g.monto AS float) AS monto
-                FROM dbo.gastos g
-                WHERE g.fecha >= ? AND g.fecha < DATEADD(DAY,1,?)
-                ORDER BY g.fecha
-            """, (d1, d2))
-            gastos = cur.fetchall()
-
-        # poblar tabla movimientos
-        for (fecha, tipo, persona, detalle, cantidad, monto) in ventas:
-            self.tv_mov.insert("", "end", values=(fecha, tipo, persona, detalle or "", int(cantidad or 0), f"{float(monto or 0):.2f}"))
-        for (fecha, tipo, persona, detalle, cantidad, monto) in gastos:
-            self.tv_mov.insert("", "end", values=(fecha, tipo, persona, detalle or "", "-", f"{float(monto or 0):.2f}"))
+        # Consulta en segundo plano vía InventarioService; un rango nuevo descarta la anterior
+        desde = date.fromisoformat(self.var_desde.get())
+        hasta = date.fromisoformat(self.var_hasta.get())
+        self.cargador.cargar("movimientos",
+                             lambda: self._consultar(desde, hasta),
+                             self._pintar)
+
+    def _consultar(self, desde, hasta):
+        # Hilo del cargador: una sola consulta; se reparte en las dos pestañas
+        libro, totales = self.inv_service.get_libro(desde, hasta)
+        es_fiado = libro["tipo"] == "Fiado"
+
+        # 1) MOVIMIENTOS: Ventas y Gastos (sin la columna Estado)
+        movs = [(iid, vals[:6], tags)
+                for iid, vals, tags in formatear_libro(libro[~es_fiado].reset_index(drop=True))]
 
         # 2) FIADOS (pendientes y pagados) del rango por fecha del fiado
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT f.id, CONVERT(varchar(16), f.fecha, 120) AS fecha, f.estado,
-                       f.nombre_cliente, f.producto, f.cantidad,
-                       CAST(f.monto AS float) AS monto,
-                       CONVERT(varchar(16), f.fecha_pago, 120) AS fecha_pago,
-                       f.id_venta
-                FROM dbo.fiados f
-                WHERE f.fecha >= ? AND f.fecha < DATEADD(DAY,1,?)
-                ORDER BY f.fecha
-            """, (d1, d2))
-            fiados = cur.fetchall()
-
-        for (fid, fecha, estado, cliente, producto, cantidad, monto, fecha_pago, idv) in fiados:
-            self.tv_fiados.insert("", "end", values=(fid, fecha, estado or "Pendiente", cliente or "", producto or "",
-                                                     int(cantidad or 0), f"{float(monto or 0):.2f}", fecha_pago or "-", idv or "-"))
+        fiados = [(iid, (id_fiado(iid), fecha, estado, cliente, producto, cant, monto), tags)
+                  for iid, (fecha, _tipo, cliente, producto, cant, monto, estado), tags
+                  in formatear_libro(libro[es_fiado].reset_index(drop=True))]
+
+        return movs, fiados, totales
+
+    def _pintar(self, datos):
+        movs, fiados, totales = datos
+
+        self.llenado_mov.llenar(movs)
+        self.llenado_fiados.llenar(fiados)
 
         # 3) Totales y balance
-        total_vendido = sum((float(r[5] or 0) for r in ventas), 0.0)
-        total_gastos  = sum((float(r[5] or 0) for r in gastos), 0.0)
-        # Fiado pendiente del rango (no pagado)
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT CAST(ISNULL(SUM(monto),0) AS float)
-                FROM dbo.fiados
-                WHERE (estado IS NULL OR estado <> 'Pagado')
-                  AND fecha >= ? AND fecha < DATEADD(DAY,1,?)
-            """, (d1, d2))
-            total_fiado_pend = float(cur.fetchone()[0] or 0)
-        balance = total_vendido - total_gastos - total_fiado_pend
-
-        self.lbl_total_vendido.config(text=f"Vendido: Q {total_vendido:,.2f}")
-        self.lbl_total_gastos.config(text=f"Gastos: Q {total_gastos:,.2f}")
-        self.lbl_total_fiado.config(text=f"Fiado (pend.): Q {total_fiado_pend:,.2f}")
-        self.lbl_balance.config(text=f"Balance: Q {balance:,.2f}")
+        self.lbl_total_vendido.config(text=f"Vendido: Q {totales['vendido']:,.2f}")
+        self.lbl_total_gastos.config(text=f"Gastos: Q {totales['gastos']:,.2f}")
+        self.lbl_total_fiado.config(text=f"Fiado (pend.): Q {totales['fiado_pendiente']:,.2f}")
+        self.lbl_balance.config(text=f"Balance: Q {totales['balance']:,.2f}")
 
     # ---------- acciones ----------
     def _marcar_fiado_pagado(self):
@@ -287,80 +247,16 @@ class InventarioApp(tk.Tk):
         if estado_actual == "Pagado":
             messagebox.showinfo("Fiado", "Ese fiado ya está marcado como pagado."); return
 
-        # traemos el fiado completo
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT id, nombre_cliente, producto, cantidad, CAST(monto AS float) AS monto, fecha, id_venta
-                FROM dbo.fiados WHERE id = ?
-            """, (fid,))
-            row = cur.fetchone()
-        if not row:
-            messagebox.showerror("Fiado", "No se encontró el fiado seleccionado."); return
-
-        _id, cliente, producto, cantidad, monto, fecha_fiado, idv_exist = row
-        if idv_exist:
-            messagebox.showinfo("Fiado", f"Ya tiene venta asociada #{idv_exist}."); return
-
-        # Necesitamos el id_producto por nombre (si hay duplicados, escogemos el primero)
-        with self.cn.cursor() as cur:
-            cur.execute("SELECT TOP 1 id FROM dbo.productos WHERE nombre = ?", (producto,))
-            r = cur.fetchone()
-        if not r:
-            messagebox.showerror("Fiado", f"No existe producto '{producto}' en productos."); return
-        id_producto = int(r[0])
-
         # Confirmar
         if not messagebox.askyesno("Confirmar pago",
-                                   f"Marcar como pagado Q {monto:.2f} de {cliente}.\n"
-                                   f"Se registrará una VENTA con fecha {fecha_fiado.strftime('%Y-%m-%d')}.\n¿Continuar?"):
+                                   f"Marcar como pagado Q {item[6]} de {item[3]}.\n¿Continuar?"):
             return
 
         try:
-            with self.cn.cursor() as cur:
-                # 1) Insertar venta con la FECHA ORIGINAL del fiado
-                cur.execute("""
-                    DECLARE @idv INT;
-                    INSERT INTO dbo.ventas (fecha, total, tipo_pago, observacion)
-                    OUTPUT INSERTED.id INTO #tmp(id)
-                    SELECT ?, ?, 'efectivo', 'Pago de fiado';
-
-                    -- si no existe #tmp, créala
-                """)  # noqa
-        except Exception:
-            pass  # pyodbc no maneja temp table así; usamos OUTPUT... SELECT truco abajo
-
-        try:
-            with self.cn.cursor() as cur:
-                # Usamos OUTPUT INSERTED.id para capturar el id
-                cur.execute("""
-                    INSERT INTO dbo.ventas (fecha, total, tipo_pago, observacion)
-                    OUTPUT INSERTED.id
-                    VALUES (?, ?, ?, ?);
-                """, (fecha_fiado, float(monto), 'efectivo', f'Pago fiado {cliente}'))
-                idv = int(cur.fetchone()[0])
-
-                # 2) detalle_ventas
-                precio_unit = float(monto) / max(int(cantidad), 1)
-                cur.execute("""
-                    INSERT INTO dbo.detalle_ventas (id_venta, id_producto, tipo, cantidad, precio_unitario)
-                    VALUES (?, ?, 'unidad', ?, ?)
-                """, (idv, id_producto, int(cantidad), float(precio_unit)))
-
-                # 3) actualizar fiado a Pagado (fecha_pago=ahora, id_venta)
-                cur.execute("""
-                    UPDATE dbo.fiados
-                       SET estado='Pagado',
-                           fecha_pago=GETDATE(),
-                           id_venta=?
-                     WHERE id=?
-                """, (idv, fid))
-
-                self.cn.commit()
-
-            messagebox.showinfo("Fiado", f"Fiado pagado. Venta #{idv} creada con fecha {fecha_fiado.strftime('%Y-%m-%d')}.")
+            self.fiados_service.marcar_fiado_pagado(fid)
+            messagebox.showinfo("Fiado", "Fiado marcado como pagado.")
             self._cargar_todo()
         except Exception as e:
-            self.cn.rollback()
             messagebox.showerror("Fiado", f"Ocurrió un error:\n{e}")
 
     # ---------- modales ----------
@@ -393,18 +289,13 @@ class InventarioApp(tk.Tk):
             except:
                 messagebox.showwarning("Gasto", "Monto inválido."); return
             try:
-                with self.cn.cursor() as cur:
-                    cur.execute("""
-                        INSERT INTO dbo.gastos(descripcion, monto, fecha, categoria)
-                        VALUES (?, ?, ?, ?)
-                    """, (e_desc.get().strip(), monto,
-                          de_fecha.get_date().strftime("%Y-%m-%d"),
-                          e_cat.get().strip() or None))
-                    self.cn.commit()
+                self.gastos_service.crear_gasto(e_desc.get(), monto, de_fecha.get_date(), e_cat.get())
                 messagebox.showinfo("Gasto", "Gasto registrado.")
                 win.destroy(); self._cargar_todo()
+            except ValueError as e:
+                messagebox.showwarning("Gasto", str(e))
             except Exception as e:
-                self.cn.rollback(); messagebox.showerror("Gasto", f"Ocurrió un error:\n{e}")
+                messagebox.showerror("Gasto", f"Ocurrió un error:\n{e}")
 
         ttk.Button(btns, text="Guardar", style="Primary.TButton", command=guardar).pack(side="right")
 
@@ -422,9 +313,7 @@ class InventarioApp(tk.Tk):
 
         ttk.Label(frm, text="Producto:", style="Card.TLabel").grid(row=2, column=0, sticky="w", pady=4)
         cb_prod = ttk.Combobox(frm, width=34, state="readonly")
-        with self.cn.cursor() as cur:
-            cur.execute("SELECT id, nombre FROM dbo.productos WHERE activo=1 ORDER BY nombre")
-            prods = cur.fetchall()
+        prods = self.fiados_service.listar_productos_para_combo()
         opciones = [f"{pid} - {nom}" for pid, nom in prods]
         cb_prod["values"] = opciones
         if opciones: cb_prod.current(0)
@@ -456,28 +345,20 @@ class InventarioApp(tk.Tk):
                 messagebox.showwarning("Fiado", "Verifica producto, cantidad y monto."); return
 
             try:
-                with self.cn.cursor() as cur:
-                    # Insertar fiado (pendiente)
-                    cur.execute("""
-                        INSERT INTO dbo.fiados(nombre_cliente, telefono, producto, cantidad, monto, fecha, estado)
-                        SELECT ?, ?, p.nombre, ?, ?, ?, 'Pendiente'
-                        FROM dbo.productos p WHERE p.id = ?
-                    """, (e_cli.get().strip(), e_tel.get().strip() or None,
-                          cantidad, monto, de_fecha.get_date().strftime("%Y-%m-%d"), pid))
-
-                    # ↓↓↓ Al generar fiado, el producto ya salió: descontamos STOCK
-                    cur.execute("""
-                        UPDATE dbo.productos
-                           SET stock = stock - ?
-                         WHERE id = ?
-                    """, (cantidad, pid))
-
-                    self.cn.commit()
-
+                self.fiados_service.crear_fiado(
+                    id_producto=pid,
+                    cliente=e_cli.get(),
+                    telefono=e_tel.get(),
+                    cantidad=cantidad,
+                    monto=monto,
+                    fecha=de_fecha.get_date(),
+                )
                 messagebox.showinfo("Fiado", "Fiado registrado y stock actualizado.")
                 win.destroy(); self._cargar_todo()
+            except ValueError as e:
+                messagebox.showwarning("Fiado", str(e))
             except Exception as e:
-                self.cn.rollback(); messagebox.showerror("Fiado", f"Ocurrió un error:\n{e}")
+                messagebox.showerror("Fiado", f"Ocurrió un error:\n{e}")
 
         ttk.Button(btns, text="Guardar", style="Primary.TButton", command=guardar).pack(side="right")
 
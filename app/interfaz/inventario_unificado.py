@@ -4,7 +4,11 @@ from tkinter import ttk, messagebox
 from datetime import datetime, date
 from tkcalendar import DateEntry
 
-from app.core.database import conectar_bd
+from app.interfaz.cargador import CargadorFondo
+from app.interfaz.libro_treeview import LlenadoPorLotes, formatear_libro, id_fiado
+from app.services.fiados_service import FiadosService
+from app.services.gastos_service import GastosService
+from app.services.inventario_service import InventarioService
 
 # ======== Paleta / Tokens de diseño ========
 PRIMARY = "#2563EB"   # azul moderno
@@ -31,13 +35,14 @@ class InventarioUnificadoApp(tk.Tk):
         self.geometry("1200x760")
         self.configure(bg=SURFACE)
 
-        self.cn = conectar_bd()
-        if not self.cn:
-            messagebox.showerror("BD", "No hay conexión a SQL Server.")
-            self.destroy(); return
+        # Misma capa de services (y pool de conexiones) que la app web
+        self.inv_service = InventarioService()
+        self.fiados_service = FiadosService()
+        self.gastos_service = GastosService()
 
         self._styles()
         self._ui()
+        self.cargador = CargadorFondo(self)
 
         hoy = date.today()
         self.var_desde.set(hoy.strftime("%Y-%m-%d"))
@@ -111,6 +116,8 @@ class InventarioUnificadoApp(tk.Tk):
                    command=self._set_hoy).pack(side="left", padx=(8, 0))
         ttk.Button(filtros, text="Este mes", style="Secondary.TButton",
                    command=self._set_mes).pack(side="left", padx=(8, 0))
+        self.lbl_cargando = ttk.Label(filtros, text="", style="Muted.TLabel")
+        self.lbl_cargando.pack(side="left", padx=(12, 0))
 
         # Layout principal
         body = tk.Frame(self, bg=SURFACE)
@@ -153,8 +160,8 @@ class InventarioUnificadoApp(tk.Tk):
         self.tv.tag_configure("badge-pagado", foreground="#0EA5E9")
         self.tv.tag_configure("badge-pendiente", foreground="#D97706")
 
-        # meta por fila
-        self.row_meta = {}
+        # La tabla se llena por tandas para que la primera pantalla salga ya
+        self.llenador = LlenadoPorLotes(self.tv)
 
         # Card derecha
         right = tk.Frame(body, bg=CARD, bd=1, relief="solid", highlightthickness=1, highlightbackground=BORDER)
@@ -203,8 +210,8 @@ class InventarioUnificadoApp(tk.Tk):
         if not sel:
             messagebox.showinfo("Fiado", "Selecciona un fiado para marcar pagado."); return
         iid = sel[0]
-        meta = self.row_meta.get(iid, {})
-        if meta.get("tipo") != "fiado":
+        fid = id_fiado(iid)
+        if fid is None:
             messagebox.showinfo("Fiado", "La fila seleccionada no es un fiado."); return
 
         # ya pagado?
@@ -212,62 +219,16 @@ class InventarioUnificadoApp(tk.Tk):
         if estado == "pagado":
             messagebox.showinfo("Fiado", "Ese fiado ya está pagado."); return
 
-        fid = meta.get("id_fiado")
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT id, nombre_cliente, producto, cantidad, CAST(monto AS float) AS monto, fecha, id_venta
-                FROM dbo.fiados WHERE id=?
-            """, (fid,))
-            row = cur.fetchone()
-        if not row:
-            messagebox.showerror("Fiado", "No se encontró el fiado."); return
-        _id, cliente, producto, cantidad, monto, fecha_fiado, idv_ex = row
-        if idv_ex:
-            messagebox.showinfo("Fiado", f"Ya tiene venta asociada #{idv_ex}."); return
-
-        # obtener id_producto por nombre
-        with self.cn.cursor() as cur:
-            cur.execute("SELECT TOP 1 id FROM dbo.productos WHERE nombre = ?", (producto,))
-            r = cur.fetchone()
-        if not r:
-            messagebox.showerror("Fiado", f"No existe producto '{producto}' en productos."); return
-        id_producto = int(r[0])
-
+        vals = self.tv.item(iid, "values")
         if not messagebox.askyesno("Confirmar pago",
-                                   f"Marcar pagado Q {monto:.2f} de {cliente}.\n"
-                                   f"Se creará una venta con fecha {fecha_fiado.strftime('%Y-%m-%d')}.\n¿Continuar?"):
+                                   f"Marcar pagado Q {vals[5]} de {vals[2]}.\n¿Continuar?"):
             return
 
         try:
-            with self.cn.cursor() as cur:
-                # Crear venta con fecha original del fiado
-                cur.execute("""
-                    INSERT INTO dbo.ventas (fecha, total, tipo_pago, observacion)
-                    OUTPUT INSERTED.id
-                    VALUES (?, ?, 'efectivo', ?)
-                """, (fecha_fiado, float(monto), f"Pago fiado {cliente}"))
-                idv = int(cur.fetchone()[0])
-
-                precio_unit = float(monto) / max(int(cantidad), 1)
-                cur.execute("""
-                    INSERT INTO dbo.detalle_ventas (id_venta, id_producto, tipo, cantidad, precio_unitario)
-                    VALUES (?, ?, 'unidad', ?, ?)
-                """, (idv, id_producto, int(cantidad), float(precio_unit)))
-
-                cur.execute("""
-                    UPDATE dbo.fiados
-                       SET estado='Pagado',
-                           fecha_pago=GETDATE(),
-                           id_venta=?
-                     WHERE id=?
-                """, (idv, fid))
-
-                self.cn.commit()
-
-            messagebox.showinfo("Fiado", f"Fiado pagado. Venta #{idv} creada.")
+            self.fiados_service.marcar_fiado_pagado(fid)
+            messagebox.showinfo("Fiado", "Fiado marcado como pagado.")
             self._cargar()
         except Exception as e:
-            self.cn.rollback()
             messagebox.showerror("Fiado", f"Ocurrió un error:\n{e}")
 
     # ---------- Acciones ----------
@@ -295,134 +256,54 @@ class InventarioUnificadoApp(tk.Tk):
             try: monto = float((e_monto.get() or "0").replace(",", "."))
             except: messagebox.showwarning("Gasto", "Monto inválido."); return
             try:
-                with self.cn.cursor() as cur:
-                    cur.execute("""
-                        INSERT INTO dbo.gastos(descripcion, monto, fecha, categoria)
-                        VALUES (?, ?, ?, ?)
-                    """, (e_desc.get().strip(), monto, de_fecha.get_date().strftime("%Y-%m-%d"), e_cat.get().strip() or None))
-                    self.cn.commit()
+                self.gastos_service.crear_gasto(e_desc.get(), monto, de_fecha.get_date(), e_cat.get())
                 messagebox.showinfo("Gasto", "Gasto registrado.")
                 win.destroy(); self._cargar()
+            except ValueError as e:
+                messagebox.showwarning("Gasto", str(e))
             except Exception as e:
-                self.cn.rollback(); messagebox.showerror("Gasto", f"Ocurrió un error:\n{e}")
+                messagebox.showerror("Gasto", f"Ocurrió un error:\n{e}")
 
         ttk.Button(btns, text="Guardar", style="Primary.TButton", command=guardar).pack(side="right")
 
     def _cargar(self):
-        d1, d2 = self.var_desde.get(), self.var_hasta.get()
-        # limpiar tabla y meta
-        for iid in self.tv.get_children():
-            self.tv.delete(iid)
-        self.row_meta.clear()
-
-        # 1) Ventas (agregadas por documento)
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT CONVERT(varchar(16), v.fecha, 120) AS fecha,
-                       STRING_AGG(p.nombre + ' x' + CAST(d.cantidad AS varchar(10)), ', ')
-                            WITHIN GROUP (ORDER BY d.id) AS detalle,
-                       SUM(d.cantidad) AS cantidad,
-                       CAST(SUM(d.cantidad * d.precio_unitario) AS float) AS monto
-                FROM dbo.ventas v
-                JOIN dbo.detalle_ventas d ON d.id_venta = v.id
-                JOIN dbo.productos p ON p.id = d.id_producto
-                WHERE v.fecha >= ? AND v.fecha < DATEADD(DAY,1,?)
-                GROUP BY v.fecha
-                ORDER BY v.fecha
-            """, (d1, d2))
-            ventas = cur.fetchall()
-
-        # 2) Gastos (egresos)
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT CONVERT(varchar(16), g.fecha, 120) AS fecha,
-                       g.descripcion,
-                       CAST(g.monto AS float) AS monto
-                FROM dbo.gastos g
-                WHERE g.fecha >= ? AND g.fecha < DATEADD(DAY,1,?)
-                ORDER BY g.fecha
-            """, (d1, d2))
-            gastos = cur.fetchall()
-
-        # 3) Fiados del rango (para mostrar y para total de fiado pendiente)
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT f.id,
-                       CONVERT(varchar(16), f.fecha, 120) AS fecha,
-                       ISNULL(f.estado,'Pendiente') AS estado,
-                       f.nombre_cliente,
-                       f.producto,
-                       f.cantidad,
-                       CAST(f.monto AS float) AS monto
-                FROM dbo.fiados f
-                WHERE f.fecha >= ? AND f.fecha < DATEADD(DAY,1,?)
-                ORDER BY f.fecha
-            """, (d1, d2))
-            fiados = cur.fetchall()
-
-        # Poblar grilla con zebra + tags
-        rownum = 0
-        for (fecha, detalle, cant, monto) in ventas:
-            tags = ("venta", "even" if rownum % 2 == 0 else "odd")
-            iid = self.tv.insert("", "end",
-                                 values=(fecha, "Venta", "", detalle or "", int(cant or 0), f"{float(monto or 0):.2f}",
-                                         ""),
-                                 tags=tags)
-            self.row_meta[iid] = {"tipo": "venta"}
-            rownum += 1
-
-        for (fecha, desc, monto) in gastos:
-            tags = ("egreso", "even" if rownum % 2 == 0 else "odd")
-            iid = self.tv.insert("", "end",
-                                 values=(fecha, "Egreso", "", desc or "", "-", f"{float(monto or 0):.2f}", ""),
-                                 tags=tags)
-            self.row_meta[iid] = {"tipo": "egreso"}
-            rownum += 1
-
-        for (fid, fecha, estado, cliente, producto, cant, monto) in fiados:
-            tags = ("fiado", "even" if rownum % 2 == 0 else "odd",
-                    "badge-pagado" if (estado or "").lower() == "pagado" else "badge-pendiente")
-            iid = self.tv.insert("", "end",
-                                 values=(fecha, "Fiado", cliente or "", producto or "",
-                                         int(cant or 0), f"{float(monto or 0):.2f}", estado or "Pendiente"),
-                                 tags=tags)
-            self.row_meta[iid] = {"tipo": "fiado", "id_fiado": int(fid)}
-            rownum += 1
-
-        # -------- Totales --------
-        total_vendido = sum((float(r[3] or 0) for r in ventas), 0.0)
-        # en gastos r = (fecha, desc, monto) -> índice 2 = monto
-        total_gastos = sum((float(r[2] or 0) for r in gastos), 0.0)
-
-        # Fiado pendiente del rango
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT CAST(ISNULL(SUM(monto),0) AS float)
-                FROM dbo.fiados
-                WHERE (estado IS NULL OR estado <> 'Pagado')
-                  AND fecha >= ? AND fecha < DATEADD(DAY,1,?)
-            """, (d1, d2))
-            fiado_pend = float(cur.fetchone()[0] or 0)
-
-        # Caja (efectivo): ventas en efectivo del rango - gastos
-        with self.cn.cursor() as cur:
-            cur.execute("""
-                SELECT CAST(ISNULL(SUM(total),0) AS float)
-                FROM dbo.ventas
-                WHERE fecha >= ? AND fecha < DATEADD(DAY,1,?)
-                  AND (LOWER(ISNULL(tipo_pago,'efectivo')) = 'efectivo')
-            """, (d1, d2))
-            ventas_efectivo = float(cur.fetchone()[0] or 0)
-
-        caja_efectivo = ventas_efectivo - total_gastos
-        balance = total_vendido - total_gastos - fiado_pend
-
-        # Pintar totales
-        self.lbl_vendido.config(text=f"Vendido: Q {total_vendido:,.2f}")
-        self.lbl_gastos.config(text=f"Gastos: Q {total_gastos:,.2f}")
-        self.lbl_fiado.config(text=f"Fiado (pend.): Q {fiado_pend:,.2f}")
-        self.lbl_balance.config(text=f"Balance: Q {balance:,.2f}")
-        self.lbl_caja.config(text=f"Caja (efectivo): Q {caja_efectivo:,.2f}")
+        """
+        Lanza la carga del rango en segundo plano; la ventana sigue
+        respondiendo y, si el rango cambia antes de terminar, la carga
+        anterior se descarta.
+        """
+        desde = date.fromisoformat(self.var_desde.get())
+        hasta = date.fromisoformat(self.var_hasta.get())
+        self.lbl_cargando.config(text="Cargando…")
+        self.cargador.cargar(
+            "movimientos",
+            lambda: self._consultar(desde, hasta),
+            self._pintar,
+            self._fallo_carga,
+        )
+
+    def _consultar(self, desde, hasta):
+        # Hilo del cargador: una consulta y el formateo de todas las filas
+        libro, totales = self.inv_service.get_libro(desde, hasta)
+        return formatear_libro(libro), totales
+
+    def _fallo_carga(self, error):
+        self.lbl_cargando.config(text="")
+        messagebox.showerror("BD", f"No se pudieron cargar los movimientos:\n{error}")
+
+    def _pintar(self, datos):
+        filas, totales = datos
+        self.lbl_cargando.config(text="")
+
+        # Primera tanda ya; el resto entra con after() sin congelar la ventana
+        self.llenador.llenar(filas)
+
+        # -------- Totales (calculados por InventarioService) --------
+        self.lbl_vendido.config(text=f"Vendido: Q {totales['vendido']:,.2f}")
+        self.lbl_gastos.config(text=f"Gastos: Q {totales['gastos']:,.2f}")
+        self.lbl_fiado.config(text=f"Fiado (pend.): Q {totales['fiado_pendiente']:,.2f}")
+        self.lbl_balance.config(text=f"Balance: Q {totales['balance']:,.2f}")
+        self.lbl_caja.config(text=f"Caja (efectivo): Q {totales['caja_efectivo']:,.2f}")
 
     # --------- Modales ---------
 
@@ -438,9 +319,7 @@ class InventarioUnificadoApp(tk.Tk):
 
         ttk.Label(frm, text="Producto:", style="Card.TLabel").grid(row=2, column=0, sticky="w", pady=4)
         cb_prod = ttk.Combobox(frm, width=34, state="readonly")
-        with self.cn.cursor() as cur:
-            cur.execute("SELECT id, nombre FROM dbo.productos WHERE activo=1 ORDER BY nombre")
-            prods = cur.fetchall()
+        prods = self.fiados_service.listar_productos_para_combo()
         options = [f"{pid} - {nom}" for pid, nom in prods]
         cb_prod["values"] = options
         if options: cb_prod.current(0)
@@ -470,20 +349,20 @@ class InventarioUnificadoApp(tk.Tk):
                 messagebox.showwarning("Fiado", "Verifica producto, cantidad y monto."); return
 
             try:
-                with self.cn.cursor() as cur:
-                    cur.execute("""
-                        INSERT INTO dbo.fiados(nombre_cliente, telefono, producto, cantidad, monto, fecha, estado)
-                        SELECT ?, ?, p.nombre, ?, ?, ?, 'Pendiente'
-                        FROM dbo.productos p WHERE p.id=?
-                    """, (e_cli.get().strip(), e_tel.get().strip() or None, cantidad, monto,
-                          de_fecha.get_date().strftime("%Y-%m-%d"), pid))
-                    # descontar stock: la mercadería sale
-                    cur.execute("UPDATE dbo.productos SET stock = stock - ? WHERE id=?", (cantidad, pid))
-                    self.cn.commit()
+                self.fiados_service.crear_fiado(
+                    id_producto=pid,
+                    cliente=e_cli.get(),
+                    telefono=e_tel.get(),
+                    cantidad=cantidad,
+                    monto=monto,
+                    fecha=de_fecha.get_date(),
+                )
                 messagebox.showinfo("Fiado", "Fiado registrado y stock actualizado.")
                 win.destroy(); self._cargar()
+            except ValueError as e:
+                messagebox.showwarning("Fiado", str(e))
             except Exception as e:
-                self.cn.rollback(); messagebox.showerror("Fiado", f"Ocurrió un error:\n{e}")
+                messagebox.showerror("Fiado", f"Ocurrió un error:\n{e}")
 
         ttk.Button(btns, text="Guardar", style="Primary.TButton", command=guardar).pack(side="right")
 
@@ -0,0 +1,109 @@
+# app/interfaz/libro_treeview.py
+import numpy as np
+import pandas as pd
+
+
+# Tipo en el libro -> (texto en la tabla, tag de color)
+ETIQUETAS = {"Venta": "Venta", "Gasto": "Egreso", "Fiado": "Fiado"}
+TAGS = {"Venta": "venta", "Gasto": "egreso", "Fiado": "fiado"}
+
+
+def formatear_libro(libro):
+    """
+    Convierte el DataFrame de InventarioService.get_libro en filas listas
+    para el Treeview: [(iid, values, tags)].
+
+    Se formatea por columnas (sin bucle fila a fila con lógica), así que
+    puede correr en el hilo del cargador y el hilo de Tk solo inserta.
+
+    - iid 'F<id>' en fiados (para marcarlos pagados), 'L<n>' en el resto
+    - values: (Fecha, Tipo, Persona, Detalle, Cantidad, Monto, Estado)
+    - tags: tipo + zebra (+ badge en fiados)
+    """
+    n = len(libro)
+    if n == 0:
+        return []
+
+    tipo = libro["tipo"]
+    es_fiado = (tipo == "Fiado").to_numpy()
+
+    estado = libro["estado"].fillna("")
+    estado = estado.where(~es_fiado | (estado != ""), "Pendiente")
+    pagado = (estado.str.lower() == "pagado").to_numpy()
+
+    cantidad = libro["cantidad"]
+    cantidad = np.where(
+        cantidad.isna(), "-", cantidad.fillna(0).astype(int).astype(str)
+    ).tolist()
+    monto = libro["monto"].fillna(0.0).map("{:.2f}".format)
+
+    # Concatenación con strings de pandas: "x" + arreglo de str de NumPy
+    # solo funciona desde NumPy 2
+    ids = "F" + libro["id_fiado"].fillna(0).astype(int).astype(str)
+    lineas = "L" + pd.RangeIndex(n).astype(str)
+    iids = np.where(es_fiado, ids.to_numpy(), lineas.to_numpy())
+
+    zebra = np.where(np.arange(n) % 2 == 0, "even", "odd").tolist()
+    badge = np.where(pagado, "badge-pagado", "badge-pendiente").tolist()
+    tag_tipo = tipo.map(TAGS).tolist()
+
+    values = zip(
+        libro["fecha"],
+        tipo.map(ETIQUETAS),
+        libro["persona"].fillna(""),
+        libro["detalle"].fillna(""),
+        cantidad,
+        monto,
+        estado,
+    )
+    tags = [
+        (t, z, b) if f else (t, z)
+        for t, z, b, f in zip(tag_tipo, zebra, badge, es_fiado)
+    ]
+    return list(zip(iids.tolist(), values, tags))
+
+
+def id_fiado(iid):
+    """id del fiado de una fila del libro, o None si la fila no es un fiado."""
+    return int(iid[1:]) if iid and iid.startswith("F") else None
+
+
+class LlenadoPorLotes:
+    """
+    Inserta muchas filas en un ttk.Treeview por tandas programadas con
+    after(): la primera pantalla aparece de inmediato y el resto entra sin
+    bloquear la ventana. Un llenado nuevo cancela el que siga en curso.
+    """
+
+    PRIMER_LOTE = 200
+    LOTE = 500
+
+    def __init__(self, tv):
+        self.tv = tv
+        self._job = None
+
+    def cancelar(self):
+        if self._job is not None:
+            try:
+                self.tv.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def llenar(self, filas, al_terminar=None):
+        """filas: [(iid, values, tags)] como las de formatear_libro."""
+        self.cancelar()
+        self.tv.delete(*self.tv.get_children())
+        self._lote(filas, 0, self.PRIMER_LOTE, al_terminar)
+
+    def _lote(self, filas, inicio, tam, al_terminar):
+        self._job = None
+        fin = min(inicio + tam, len(filas))
+        insertar = self.tv.insert
+        for iid, values, tags in filas[inicio:fin]:
+            insertar("", "end", iid=iid, values=values, tags=tags)
+
+        if fin < len(filas):
+            self._job = self.tv.after(1, self._lote, filas, fin, self.LOTE, al_terminar)
+        elif al_terminar is not None:
+            al_terminar()
@@ -0,0 +1,86 @@
+# app/interfaz/overlay_acciones.py
+import tkinter as tk
+from tkinter import ttk
+
+
+class AccionesOverlay:
+    """
+    Columna de botones "Editar / Añadir" sobre un ttk.Treeview, virtualizada:
+    solo existen widgets para las filas visibles (un pool pequeño que se
+    recicla al hacer scroll o cambiar de tamaño), sin importar cuántas
+    filas tenga el Treeview.
+
+    acciones: lista de (texto, estilo, callback(iid)).
+    yscroll:  el .set de la Scrollbar vertical (el overlay se engancha al
+              yscrollcommand del Treeview para enterarse del scroll).
+    """
+
+    def __init__(self, tv: ttk.Treeview, columna: str, acciones, yscroll=None, bg="#FFFFFF"):
+        self.tv = tv
+        self.columna = columna
+        self.acciones = acciones
+        self.yscroll = yscroll
+        self.bg = bg
+        self.pool = []          # [(frame, [iid asignado])]
+        self._pendiente = None
+
+        tv.configure(yscrollcommand=self._on_yscroll)
+        tv.bind("<Configure>", lambda _e: self.programar(), add="+")
+
+    # -------- eventos --------
+    def _on_yscroll(self, primero, ultimo):
+        if self.yscroll is not None:
+            self.yscroll(primero, ultimo)
+        self.programar()
+
+    def programar(self):
+        """Agrupa varios eventos seguidos en un solo refresco (idle)."""
+        if self._pendiente is None:
+            self._pendiente = self.tv.after_idle(self.refrescar)
+
+    # -------- pool --------
+    def _slot(self, i):
+        while len(self.pool) <= i:
+            asignado = [None]
+            fr = tk.Frame(self.tv, bg=self.bg)
+            for j, (texto, estilo, callback) in enumerate(self.acciones):
+                ttk.Button(
+                    fr, text=texto, style=estilo,
+                    command=lambda cb=callback, a=asignado: a[0] and cb(a[0]),
+                ).pack(side="left", padx=(0, 6) if j < len(self.acciones) - 1 else 0)
+            self.pool.append((fr, asignado))
+        return self.pool[i]
+
+    def filas_visibles(self):
+        """iids visibles de arriba a abajo con su bbox en la columna."""
+        filas = []
+        alto = self.tv.winfo_height()
+
+        # y=0 cae en el encabezado: bajamos hasta dar con la primera fila
+        iid, y = None, 0
+        while not iid and y < alto:
+            iid = self.tv.identify_row(y) or None
+            y += 4
+
+        while iid:
+            bbox = self.tv.bbox(iid, column=self.columna)
+            if not bbox:
+                break
+            filas.append((iid, bbox))
+            if bbox[1] + bbox[3] >= alto:
+                break
+            iid = self.tv.next(iid) or None
+        return filas
+
+    def refrescar(self):
+        self._pendiente = None
+        filas = self.filas_visibles()
+
+        for i, (iid, (x, y, w, h)) in enumerate(filas):
+            fr, asignado = self._slot(i)
+            asignado[0] = iid
+            fr.place(x=x + 8, y=y + 2, width=w - 16, height=h - 4)
+
+        for fr, asignado in self.pool[len(filas):]:
+            asignado[0] = None
+            fr.place_forget()
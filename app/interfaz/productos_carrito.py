@@ -1,9 +1,13 @@
 # app/interfaz/productos_carrito_view.py
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
-from app.core.database import conectar_bd
+from app.interfaz.cargador import CargadorFondo
+from app.interfaz.overlay_acciones import AccionesOverlay
+from app.services.productos_service import ProductosService
+from app.services.ventas_service import VentasService
 
 PRIMARY = "#1E63FF"
 SURFACE = "#F5F7FB"
@@ -11,6 +15,9 @@ CARD_BG = "#FFFFFF"
 TEXT = "#0F172A"
 MUTED = "#64748B"
 
+# El escritorio no tiene login: las ventas quedan a nombre de este usuario
+ID_USUARIO_ESCRITORIO = int(os.getenv("DESKTOP_ID_USUARIO", "1"))
+
 class ProductosCarritoView(tk.Frame):
     """
     Vista embebible para Productos / Carrito.
@@ -20,14 +27,22 @@ class ProductosCarritoView(tk.Frame):
         super().__init__(parent, bg=SURFACE)
         self._styles()
 
-        self.cn = conectar_bd()
-        if not self.cn:
-            messagebox.showerror("BD", "No hay conexión a SQL Server.")
-            return
+        # Misma capa de services (y pool de conexiones) que la app web
+        self.productos_service = ProductosService()
+        self.ventas_service = VentasService()
 
         self.carrito = []
-        self.botones_overlay = {}
+
+        # Catálogo en memoria: iid -> (pid, nombre, pc, pu, pb, pcaja, texto_busqueda)
+        # El buscador filtra sobre esto; no hay consulta por tecla.
+        self.catalogo = {}
+        self.orden_catalogo = []      # iids en orden de nombre
+        self.visibles = []            # iids adjuntos al Treeview, en orden
+        self._filtro_after = None
+        self._filtro_actual = ""
+
         self._ui()
+        self.cargador = CargadorFondo(self)
         self._cargar_productos()
 
     # -------- estilos --------
@@ -97,13 +112,19 @@ class ProductosCarritoView(tk.Frame):
         self.tv.grid(row=1, column=0, sticky="nsew", padx=12, pady=(0, 12))
 
         vs = ttk.Scrollbar(left_card, orient="vertical", command=self.tv.yview)
-        self.tv.configure(yscrollcommand=vs.set)
         vs.grid(row=1, column=0, sticky="nse", padx=(0, 12))
 
-        # overlay botones en la columna "Acciones"
-        self.tv.bind("<Expose>", self._refrescar_botones_overlay)
-        self.tv.bind("<Configure>", self._refrescar_botones_overlay)
-        self.tv.bind("<Motion>", self._refrescar_botones_overlay)
+        # overlay botones en la columna "Acciones": solo filas visibles
+        self.overlay = AccionesOverlay(
+            self.tv,
+            "Acciones",
+            [
+                ("Editar", "Secondary.TButton", self._abrir_modal_editar),
+                ("Añadir", "Primary.TButton", self._abrir_modal_add),
+            ],
+            yscroll=vs.set,
+            bg=CARD_BG,
+        )
         self.tv.bind("<Double-1>", self._editar_inline_precio)
 
         # RIGHT: carrito + cambio
@@ -152,56 +173,90 @@ class ProductosCarritoView(tk.Frame):
         self.lbl_cambio.grid(row=0, column=3, sticky="w", padx=(8, 0), pady=4)
 
     # -------- datos --------
-    def _cargar_productos(self, where_text=""):
-        for fr in self.botones_overlay.values():
-            fr.destroy()
-        self.botones_overlay.clear()
+    FILTRO_DEBOUNCE_MS = 200
 
+    def _cargar_productos(self):
+        """
+        Toma una foto del catálogo activo (una sola consulta, en el hilo del
+        cargador) y reconstruye el Treeview al llegar. El buscador trabaja
+        sobre la foto.
+        """
+        self.cargador.cargar("productos", self.productos_service.listar_activos, self._pintar_catalogo)
+
+    def _pintar_catalogo(self, productos):
         self.tv.delete(*self.tv.get_children())
-        cur = self.cn.cursor()
-        if where_text:
-            q = f"%{where_text.lower()}%"
-            cur.execute("""
-                SELECT id, nombre, precio_compra, precio_venta_unidad, ISNULL(precio_venta_blister,0)
-                FROM dbo.productos
-                WHERE LOWER(nombre) LIKE ? OR LOWER(categoria) LIKE ?
-                ORDER BY nombre
-            """, (q, q))
-        else:
-            cur.execute("""
-                SELECT id, nombre, precio_compra, precio_venta_unidad, ISNULL(precio_venta_blister,0)
-                FROM dbo.productos
-                WHERE activo=1
-                ORDER BY nombre
-            """)
-        for (pid, nombre, pc, pu, pb) in cur.fetchall():
-            self.tv.insert("", "end",
-                           values=(nombre, f"{pc:.2f}", f"{pu:.2f}", f"{pb:.2f}", ""),
-                           tags=(str(pid),))
-        cur.close()
-        self.after(50, self._refrescar_botones_overlay)
+        self.catalogo.clear()
+        self.orden_catalogo = []
+        for p in productos:
+            iid = str(p.id)
+            pc, pu, pb = p.precio_compra, p.precio_venta_unidad, p.precio_venta_blister or 0.0
+            self.catalogo[iid] = (p.id, p.nombre, pc, pu, pb, p.precio_venta_caja,
+                                  f"{p.nombre} {p.categoria or ''}".lower())
+            self.orden_catalogo.append(iid)
+            self.tv.insert("", "end", iid=iid,
+                           values=(p.nombre, f"{pc:.2f}", f"{pu:.2f}", f"{pb:.2f}", ""),
+                           tags=(iid,))
+        self.visibles = list(self.orden_catalogo)
+
+        # Si había texto en el buscador se vuelve a aplicar sobre la foto nueva
+        self._filtro_actual = ""
+        self._aplicar_filtro()
+        self.overlay.programar()
 
     def _filtrar_en_linea(self, _):
-        self._cargar_productos(self.entry_buscar.get().strip())
-
-    # -------- overlay de botones --------
-    def _refrescar_botones_overlay(self, _=None):
-        col_index = 4  # Acciones
-        for iid in self.tv.get_children():
-            bbox = self.tv.bbox(iid, column=col_index)
-            if not bbox:
-                if iid in self.botones_overlay:
-                    self.botones_overlay[iid].place_forget()
-                continue
-            x, y, w, h = bbox
-            if iid not in self.botones_overlay:
-                fr = tk.Frame(self.tv, bg="#FFFFFF")
-                ttk.Button(fr, text="Editar", style="Secondary.TButton",
-                           command=lambda a=iid: self._abrir_modal_editar(a)).pack(side="left", padx=(0, 6))
-                ttk.Button(fr, text="Añadir", style="Primary.TButton",
-                           command=lambda a=iid: self._abrir_modal_add(a)).pack(side="left")
-                self.botones_overlay[iid] = fr
-            self.botones_overlay[iid].place(x=x + 8, y=y + 2, width=w - 16, height=h - 4)
+        # Debounce: solo se filtra cuando el usuario deja de escribir
+        if self._filtro_after is not None:
+            self.after_cancel(self._filtro_after)
+        self._filtro_after = self.after(self.FILTRO_DEBOUNCE_MS, self._aplicar_filtro)
+
+    def _aplicar_filtro(self):
+        self._filtro_after = None
+        texto = self.entry_buscar.get().strip().lower()
+        if texto == self._filtro_actual:
+            return
+
+        # Si el texto nuevo extiende al anterior basta con filtrar lo visible
+        if self._filtro_actual and texto.startswith(self._filtro_actual):
+            base = self.visibles
+        else:
+            base = self.orden_catalogo
+        self._filtro_actual = texto
+
+        nuevos = [iid for iid in base if texto in self.catalogo[iid][-1]] if texto else list(self.orden_catalogo)
+
+        # Diff contra lo visible: detach de lo que sobra, reattach de lo que falta
+        conjunto_nuevo = set(nuevos)
+        ocultar = [iid for iid in self.visibles if iid not in conjunto_nuevo]
+        if ocultar:
+            self.tv.detach(*ocultar)
+
+        conjunto_actual = set(self.visibles)
+        for idx, iid in enumerate(nuevos):
+            if iid not in conjunto_actual:
+                self.tv.move(iid, "", idx)
+
+        self.visibles = nuevos
+        self.overlay.programar()
+
+    def _actualizar_fila(self, iid, pc, pu, pb):
+        """Refleja precios editados en la foto y en el Treeview sin recargar."""
+        pid, nombre, _pc, _pu, _pb, pcaja, texto = self.catalogo[iid]
+        self.catalogo[iid] = (pid, nombre, pc, pu, pb, pcaja, texto)
+        self.tv.item(iid, values=(nombre, f"{pc:.2f}", f"{pu:.2f}", f"{pb:.2f}", ""))
+
+    def _guardar_precios(self, iid, pc, pu, pb) -> bool:
+        """Guarda vía ProductosService (mismas validaciones que la web)."""
+        pid, _nombre, _pc, _pu, _pb, pcaja, _texto = self.catalogo[iid]
+        try:
+            self.productos_service.actualizar_precios(pid, pc, pu, pb, pcaja)
+        except ValueError as e:
+            messagebox.showwarning("Validación", str(e))
+            return False
+        except Exception as e:
+            messagebox.showerror("BD", f"Ocurrió un error:\n{e}")
+            return False
+        self._actualizar_fila(iid, pc, pu, pb)
+        return True
 
     def _get_producto_by_iid(self, iid):
         vals = self.tv.item(iid, "values")
@@ -243,13 +298,8 @@ class ProductosCarritoView(tk.Frame):
                 pc = float(v_pc.get()); pu = float(v_pu.get()); pb = float(v_pb.get())
             except:
                 messagebox.showwarning("Validación", "Valores numéricos inválidos."); return
-            cur = self.cn.cursor()
-            cur.execute("""
-                UPDATE dbo.productos
-                   SET precio_compra=?, precio_venta_unidad=?, precio_venta_blister=?
-                 WHERE id=?""", (pc, pu, pb, p["id"]))
-            self.cn.commit(); cur.close()
-            self._cargar_productos(self.entry_buscar.get().strip())
+            if not self._guardar_precios(iid, pc, pu, pb):
+                return
             messagebox.showinfo("OK", "Producto actualizado.")
             win.destroy()
 
@@ -341,31 +391,32 @@ class ProductosCarritoView(tk.Frame):
             messagebox.showwarning("Pago", f"El pagado (Q {pagado:.2f}) es menor al total (Q {total:.2f}).")
             return
 
+        carrito_raw = [
+            {
+                "producto_id": it["id_producto"],
+                "tipo": it["tipo"],
+                "cantidad": it["cantidad"],
+                "monto": it["monto"],
+                "fecha": it["fecha"],
+            }
+            for it in self.carrito
+        ]
         try:
-            cur = self.cn.cursor()
-            cur.execute("INSERT INTO dbo.ventas(total, tipo_pago, observacion) VALUES (?, ?, ?);",
-                        (total, "efectivo", "Venta desde Tkinter"))
-            cur.execute("SELECT SCOPE_IDENTITY();")
-            idv = int(cur.fetchone()[0])
-
-            for it in self.carrito:
-                punit = round(it["monto"] / it["cantidad"], 2)
-                cur.execute("""
-                    INSERT INTO dbo.detalle_ventas(id_venta, id_producto, tipo, cantidad, precio_unitario)
-                    VALUES (?, ?, ?, ?, ?)""",
-                    (idv, it["id_producto"], it["tipo"], it["cantidad"], punit))
-            self.cn.commit()
-
-            # limpiar UI
-            self.carrito.clear()
-            for i in self.tv_carrito.get_children(): self.tv_carrito.delete(i)
-            self._recalcular_total()
-            self.var_pagado.set("")
-            self.lbl_cambio.config(text="Cambio: Q 0.00")
-            messagebox.showinfo("Venta", f"Venta #{idv} registrada.")
+            self.ventas_service.registrar_ventas_desde_carrito(carrito_raw, ID_USUARIO_ESCRITORIO)
+        except ValueError as e:
+            messagebox.showwarning("Venta", str(e))
+            return
         except Exception as e:
-            self.cn.rollback()
             messagebox.showerror("Venta", f"Ocurrió un error:\n{e}")
+            return
+
+        # limpiar UI
+        self.carrito.clear()
+        for i in self.tv_carrito.get_children(): self.tv_carrito.delete(i)
+        self._recalcular_total()
+        self.var_pagado.set("")
+        self.lbl_cambio.config(text="Cambio: Q 0.00")
+        messagebox.showinfo("Venta", "Venta registrada.")
 
     # -------- edición inline de precios --------
     def _editar_inline_precio(self, event):
@@ -390,16 +441,13 @@ class ProductosCarritoView(tk.Frame):
                 e.destroy(); return
             self.tv.set(iid, col, f"{nuevo:.2f}")
             e.destroy()
-            p = self._get_producto_by_iid(iid)
             pc = float(self.tv.set(iid, "#2"))
             pu = float(self.tv.set(iid, "#3"))
             pb = float(self.tv.set(iid, "#4"))
-            cur = self.cn.cursor()
-            cur.execute("""
-                UPDATE dbo.productos
-                   SET precio_compra=?, precio_venta_unidad=?, precio_venta_blister=?
-                 WHERE id=?""", (pc, pu, pb, p["id"]))
-            self.cn.commit(); cur.close()
+            if not self._guardar_precios(iid, pc, pu, pb):
+                # Rechazado: se vuelve a mostrar lo que hay en la foto
+                _pid, _nom, pc0, pu0, pb0, _pcaja, _t = self.catalogo[iid]
+                self._actualizar_fila(iid, pc0, pu0, pb0)
 
         e.bind("<Return>", guardar)
         e.bind("<FocusOut>", lambda _=None: e.destroy())
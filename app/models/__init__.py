@@ -1,20 +1,30 @@
 # app/models/__init__.py
 
 from .producto import Producto
+from .catalogo import CatalogoProductos, FilaProducto
 from .usuario import Usuario
 from .venta import Venta, CarritoItem
 from .detalle_venta import DetalleVenta
 from .fiado import Fiado
+from .cliente import Cliente
 from .gasto import Gasto
 from .movimiento_inventario import MovimientoInventario
+from .corte_caja import CorteCaja
+from .pago import MetodoPago, PagoVenta
 
 __all__ = [
     "Producto",
+    "CatalogoProductos",
+    "FilaProducto",
     "Usuario",
     "Venta",
     "CarritoItem",
     "DetalleVenta",
     "Fiado",
+    "Cliente",
     "Gasto",
     "MovimientoInventario",
+    "CorteCaja",
+    "MetodoPago",
+    "PagoVenta",
 ]
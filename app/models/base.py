@@ -1,19 +1,56 @@
 # app/models/base.py
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import Any, Dict
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Type, TypeVar
 
+T = TypeVar("T", bound="BaseModel")
 
-@dataclass
+# Por clase: (nombres de los campos, attrgetter de todos)
+_LECTORES: Dict[type, Tuple[Tuple[str, ...], Callable]] = {}
+
+
+@dataclass(slots=True)
 class BaseModel:
     """
     Clase base para los modelos de dominio.
 
-    - Permite convertir cualquier dataclass hijo a dict con .to_dict(),
-      útil para debug, logs o serializar a JSON.
+    Los modelos son dataclasses con __slots__: sin __dict__ por instancia
+    (menos memoria por fila) y el mismo __init__ rápido de siempre.
+
+    - .to_dict(): dict plano de los campos, útil para debug, logs o JSON.
+    - .from_row(fila): crea la entidad desde una tupla con los campos en
+      orden de declaración (las que faltan al final toman su default).
+    - .from_rows(filas): lo mismo para un listado completo.
     """
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convierte el dataclass en dict (útil para debug o JSON)."""
-        return asdict(self)
+        """
+        Convierte la entidad en dict. No es recursivo (a diferencia de
+        dataclasses.asdict): los valores se devuelven tal cual.
+        """
+        nombres, leer = _lector(type(self))
+        valores = leer(self)
+        if len(nombres) == 1:
+            valores = (valores,)
+        return dict(zip(nombres, valores))
+
+    @classmethod
+    def from_row(cls: Type[T], row: Sequence[Any]) -> T:
+        """Entidad desde una fila (id, nombre, ...) en orden de los campos."""
+        return cls(*row)
+
+    @classmethod
+    def from_rows(cls: Type[T], rows: Iterable[Sequence[Any]]) -> List[T]:
+        """Lista de entidades desde filas (una por entidad)."""
+        return [cls(*row) for row in rows]
+
+
+def _lector(cls: type) -> Tuple[Tuple[str, ...], Callable]:
+    """Nombres de los campos y un attrgetter de todos, armados una vez por clase."""
+    lector = _LECTORES.get(cls)
+    if lector is None:
+        nombres = tuple(f.name for f in fields(cls))
+        lector = _LECTORES[cls] = (nombres, attrgetter(*nombres))
+    return lector
@@ -0,0 +1,203 @@
+# app/models/catalogo.py
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .producto import Producto
+
+
+# Orden de las columnas que devuelve ProductosRepo.listar_catalogo():
+# (id, nombre, detalle, presentacion, compra, unidad, blister,
+#  unidades_por_blister, stock_unidades, stock_actual, caja, categoria)
+_ENTEROS = {"id": 0, "unidades_por_blister": 7, "stock_unidades": 8, "stock_actual": 9}
+_DECIMALES = {"precio_compra": 4, "precio_venta_unidad": 5, "precio_venta_blister": 6,
+              "precio_venta_caja": 10}
+_TEXTOS = {"nombre": 1, "detalle": 2, "presentacion": 3, "categoria": 11}
+
+# Atributo de Producto → columna del DataFrame (mismos nombres que la grilla)
+COLUMNAS_DF = {
+    "id": "id",
+    "nombre": "Nombre",
+    "presentacion": "Presentacion",
+    "detalle": "Detalle",
+    "precio_compra": "Compra",
+    "precio_venta_unidad": "Unidad",
+    "precio_venta_blister": "Blister",
+    "precio_venta_caja": "Caja",
+    "unidades_por_blister": "UnidadesBlister",
+    "stock_unidades": "StockUnidades",
+    "categoria": "Categoria",
+}
+
+
+class FilaProducto:
+    """
+    Vista de una fila del catálogo con los mismos atributos que Producto.
+    No copia datos: lee del arreglo correspondiente al pedir el atributo.
+    """
+
+    __slots__ = ("_cat", "_i")
+
+    def __init__(self, catalogo: "CatalogoProductos", i: int) -> None:
+        self._cat = catalogo
+        self._i = i
+
+    def __getattr__(self, nombre: str) -> Any:
+        if nombre.startswith("_"):
+            raise AttributeError(nombre)
+        return self._cat.valor(nombre, self._i)
+
+    def __eq__(self, otro: object) -> bool:
+        return isinstance(otro, FilaProducto) and otro.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"FilaProducto(id={self.id}, nombre={self.nombre!r})"
+
+    def a_producto(self) -> Producto:
+        return Producto.from_row(
+            tuple(self._cat.valor(c, self._i) for c in Producto.__dataclass_fields__)
+        )
+
+
+class CatalogoProductos:
+    """
+    Catálogo de productos activos en columnas (un arreglo NumPy por campo),
+    armado una sola vez desde las filas del cursor.
+
+    - Iterar devuelve FilaProducto (se usan igual que Producto).
+    - .df es un DataFrame sobre los mismos arreglos (sin copiar).
+    - buscar() / obtener() no recorren objetos Python.
+    """
+
+    def __init__(self, columnas: Dict[str, np.ndarray]) -> None:
+        self._col = columnas
+        self._df: Optional[pd.DataFrame] = None
+        self._indice: Optional[Dict[int, int]] = None
+        self._texto: Optional[np.ndarray] = None
+
+    @classmethod
+    def desde_filas(cls, rows: Sequence[Tuple]) -> "CatalogoProductos":
+        n = len(rows)
+        if n == 0:
+            columnas = {c: np.empty(0, dtype=np.int64) for c in _ENTEROS}
+            columnas.update({c: np.empty(0, dtype=np.float64) for c in _DECIMALES})
+            columnas.update({c: np.empty(0, dtype=object) for c in _TEXTOS})
+            return cls(columnas)
+
+        transpuesta = list(zip(*rows))
+        columnas: Dict[str, np.ndarray] = {}
+
+        for campo, pos in _ENTEROS.items():
+            columnas[campo] = np.fromiter(
+                (v or 0 for v in transpuesta[pos]), dtype=np.int64, count=n
+            )
+        # unidades_por_blister vacío cuenta como 1 (igual que el COALESCE del repo)
+        upb = columnas["unidades_por_blister"]
+        upb[upb == 0] = 1
+
+        for campo, pos in _DECIMALES.items():
+            # None → NaN (solo blister puede venir nulo)
+            columnas[campo] = np.array(transpuesta[pos], dtype=np.float64)
+
+        for campo, pos in _TEXTOS.items():
+            arr = np.empty(n, dtype=object)
+            arr[:] = transpuesta[pos]
+            columnas[campo] = arr
+
+        return cls(columnas)
+
+    # ==========================================================
+    #   ACCESO
+    # ==========================================================
+    def __len__(self) -> int:
+        return len(self._col["id"])
+
+    def __iter__(self) -> Iterator[FilaProducto]:
+        return (FilaProducto(self, i) for i in range(len(self)))
+
+    def __getitem__(self, i: int) -> FilaProducto:
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return FilaProducto(self, i % len(self))
+
+    def columna(self, campo: str) -> np.ndarray:
+        return self._col[campo]
+
+    def valor(self, campo: str, i: int) -> Any:
+        try:
+            arr = self._col[campo]
+        except KeyError:
+            raise AttributeError(campo) from None
+
+        v = arr[i]
+        if campo in _TEXTOS:
+            return v
+        if campo in _ENTEROS:
+            return int(v)
+        v = float(v)
+        if campo == "precio_venta_blister" and v != v:  # NaN → None
+            return None
+        return v
+
+    def obtener(self, pid: int) -> Optional[FilaProducto]:
+        if self._indice is None:
+            self._indice = {int(v): i for i, v in enumerate(self._col["id"])}
+        i = self._indice.get(int(pid))
+        return None if i is None else FilaProducto(self, i)
+
+    def buscar(self, q: str) -> List[FilaProducto]:
+        """Filas cuyo nombre, detalle, categoría o presentación contienen q."""
+        q = (q or "").strip().lower()
+        if not q:
+            return list(self)
+
+        if self._texto is None:
+            partes = [
+                pd.Series(self._col[c]).fillna("").astype(str)
+                for c in ("nombre", "detalle", "categoria", "presentacion")
+            ]
+            self._texto = (
+                partes[0].str.cat(partes[1:], sep=" ").str.lower().to_numpy(dtype=object)
+            )
+
+        mascara = pd.Series(self._texto).str.contains(q, regex=False).to_numpy()
+        return [FilaProducto(self, int(i)) for i in np.flatnonzero(mascara)]
+
+    def a_productos(self) -> List[Producto]:
+        """Lista de Producto (para código que necesita las entidades)."""
+        columnas = []
+        for campo in Producto.__dataclass_fields__:
+            valores = self._col[campo].tolist()
+            if campo == "precio_venta_blister":
+                valores = [None if v != v else v for v in valores]
+            columnas.append(valores)
+        return Producto.from_rows(zip(*columnas))
+
+    # ==========================================================
+    #   DATAFRAME
+    # ==========================================================
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        DataFrame con las columnas de la grilla (id, Nombre, ... Categoria).
+        Comparte memoria con el catálogo: no modificarlo en sitio.
+        """
+        if self._df is None:
+            self._df = pd.DataFrame(
+                {col: self._col[campo] for campo, col in COLUMNAS_DF.items()},
+                copy=False,
+            )
+        return self._df
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Para la caché compartida: solo los arreglos, lo derivado se rehace
+        return {"_col": self._col}
+
+    def __setstate__(self, estado: Dict[str, Any]) -> None:
+        self.__init__(estado["_col"])
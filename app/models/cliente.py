@@ -0,0 +1,27 @@
+# app/models/cliente.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from .base import BaseModel
+
+
+@dataclass(slots=True)
+class Cliente(BaseModel):
+    """
+    Cliente con cuenta de fiados (public.clientes). saldo es lo que debe
+    hoy; se actualiza junto con cada fiado y cada abono.
+    """
+
+    id: int
+    nombre: str
+    telefono: Optional[str]
+    saldo: float
+    fiados_pendientes: int
+    ultimo_movimiento: Optional[datetime]
+
+    @property
+    def debe(self) -> bool:
+        return self.saldo > 0
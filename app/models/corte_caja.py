@@ -0,0 +1,35 @@
+# app/models/corte_caja.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from .base import BaseModel
+
+
+@dataclass(slots=True)
+class CorteCaja(BaseModel):
+    """
+    Cierre de un día (public.cortes_caja). Una vez guardado no cambia:
+    los totales de ese día se leen de aquí y no de las tablas de movimientos.
+    """
+
+    fecha: date
+    num_ventas: int
+    ventas_total: float
+    ventas_efectivo: float
+    ventas_por_pago: Dict[str, float]
+    ganancia: float
+    gastos: float
+    fiados_nuevos: float
+    fiados_pendientes: float
+    fiados_cobrados: float
+    efectivo_esperado: float
+    id_usuario: Optional[int]
+    cerrado_en: Optional[datetime]
+
+    @property
+    def balance(self) -> float:
+        """Misma fórmula que el balance de InventarioService.get_libro."""
+        return self.ventas_total + self.fiados_cobrados - self.gastos - self.fiados_pendientes
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class DetalleVenta(BaseModel):
     """
     Representa una fila de detalle de venta (dbo.detalle_ventas).
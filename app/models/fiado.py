@@ -8,7 +8,7 @@ from typing import Optional
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Fiado(BaseModel):
     id: int
     nombre_cliente: str
@@ -20,6 +20,8 @@ class Fiado(BaseModel):
     estado: Optional[str]
     fecha_pago: Optional[datetime]
     id_venta: Optional[int]
+    # Lo que falta pagar (abonos parciales); None = no se consultó
+    saldo: Optional[float] = None
 
     @property
     def esta_pagado(self) -> bool:
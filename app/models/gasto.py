@@ -8,7 +8,7 @@ from typing import Optional
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Gasto(BaseModel):
     """
     Representa un gasto registrado en el sistema.
@@ -8,7 +8,7 @@ from typing import Optional
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class MovimientoInventario(BaseModel):
     """
     Representa un movimiento en el inventario.
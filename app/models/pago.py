@@ -0,0 +1,30 @@
+# app/models/pago.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .base import BaseModel
+
+# ventas.tipo_pago cuando la venta se cobró con más de un método
+TIPO_PAGO_MIXTO = "mixto"
+
+
+@dataclass(slots=True)
+class MetodoPago(BaseModel):
+    """Fila de public.metodos_pago (efectivo, tarjeta, transferencia...)."""
+
+    codigo: str
+    nombre: str
+    es_efectivo: bool = False
+    activo: bool = True
+
+
+@dataclass(slots=True)
+class PagoVenta(BaseModel):
+    """
+    Parte del cobro de una venta con un método. Una venta con pago
+    dividido tiene varios; la suma de sus montos es el total de la venta.
+    """
+
+    metodo: str       # metodos_pago.codigo
+    monto: float
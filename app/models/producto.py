@@ -4,7 +4,7 @@ from typing import Optional
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Producto(BaseModel):
     """
     Entidad de dominio para un producto de la farmacia.
@@ -8,7 +8,7 @@ from typing import Optional
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Usuario(BaseModel):
     """
     Modelo de usuario del sistema Farmacia 2.0.
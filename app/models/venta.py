@@ -8,7 +8,7 @@ from typing import Optional
 from .base import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class CarritoItem(BaseModel):
     """
     Item que viene desde la UI del carrito.
@@ -26,7 +26,7 @@ class CarritoItem(BaseModel):
     fecha: date               # Fecha de la venta (yyyy-mm-dd)
 
 
-@dataclass
+@dataclass(slots=True)
 class Venta(BaseModel):
     """
     Representa la cabecera de una venta (tabla ventas en la BD).
@@ -34,5 +34,5 @@ class Venta(BaseModel):
     id: Optional[int]
     fecha: datetime
     total: float
-    tipo_pago: str = "efectivo"
+    tipo_pago: str = "efectivo"      # metodos_pago.codigo o "mixto"
     observacion: Optional[str] = None
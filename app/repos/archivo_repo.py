@@ -0,0 +1,416 @@
+# app/repos/archivo_repo.py
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from psycopg2 import sql
+
+from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+
+# Carpeta raíz del archivo histórico (un subdirectorio por tabla)
+ARCHIVO_DIR = os.getenv("ARCHIVO_DIR", "archivo_historico")
+
+# Filas por lote al leer de PostgreSQL y escribir el Parquet
+TAMANO_LOTE = 50_000
+
+_TS = pa.timestamp("us", tz="UTC")
+
+# Columnas archivadas por tabla: (nombre, expresión SQL, tipo Arrow)
+ESQUEMAS: Dict[str, List[Tuple[str, str, pa.DataType]]] = {
+    "ventas": [
+        ("id", "id", pa.int64()),
+        ("fecha", "fecha", _TS),
+        ("total", "total::double precision", pa.float64()),
+        ("tipo_pago", "tipo_pago", pa.string()),
+        ("observacion", "observacion", pa.string()),
+        ("id_usuario", "id_usuario", pa.int64()),
+        ("estado", "estado", pa.string()),
+    ],
+    "detalle_ventas": [
+        ("id", "id", pa.int64()),
+        ("id_venta", "id_venta", pa.int64()),
+        ("fecha", "fecha", _TS),
+        ("id_producto", "id_producto", pa.int64()),
+        ("tipo", "tipo", pa.string()),
+        ("cantidad", "cantidad", pa.int64()),
+        ("precio_unitario", "precio_unitario::double precision", pa.float64()),
+        ("unidades_descuento", "unidades_descuento", pa.int64()),
+        ("costo_unitario_compra", "costo_unitario_compra::double precision", pa.float64()),
+    ],
+    "pagos_venta": [
+        ("id", "id", pa.int64()),
+        ("id_venta", "id_venta", pa.int64()),
+        ("fecha", "fecha", _TS),
+        ("metodo", "metodo", pa.string()),
+        ("monto", "monto::double precision", pa.float64()),
+    ],
+    "movimientos_inventario": [
+        ("id", "id", pa.int64()),
+        ("id_producto", "id_producto", pa.int64()),
+        ("tipo", "tipo", pa.string()),
+        ("cantidad", "cantidad", pa.int64()),
+        ("referencia", "referencia", pa.string()),
+        ("motivo", "motivo", pa.string()),
+        ("fecha", "fecha", _TS),
+        ("stock_resultante", "stock_resultante", pa.int64()),
+    ],
+}
+
+
+def _inicio_mes(anio: int, mes: int) -> datetime:
+    return datetime(anio, mes, 1, tzinfo=timezone.utc)
+
+
+def _mes_siguiente(anio: int, mes: int) -> Tuple[int, int]:
+    return (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+
+
+@perfilado("sql")
+class ArchivoRepo:
+    """
+    Archivo histórico en Parquet (zstd) sobre disco local:
+
+        <ARCHIVO_DIR>/<tabla>/<AAAA>-<MM>.parquet
+
+    - Lado BD: exporta un mes de PostgreSQL con cursor de servidor y lo
+      borra (o retira su partición mensual) una vez escrito.
+    - Lado archivo: lee meses con memory-map y solo las columnas pedidas.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None) -> None:
+        self.base_dir = base_dir or ARCHIVO_DIR
+
+    # ==========================================================
+    #   RUTAS
+    # ==========================================================
+    def ruta(self, tabla: str, anio: int, mes: int) -> str:
+        return os.path.join(self.base_dir, tabla, f"{anio:04d}-{mes:02d}.parquet")
+
+    def meses_archivados(self, tabla: str) -> Set[Tuple[int, int]]:
+        """Meses (anio, mes) que tienen archivo Parquet para la tabla."""
+        carpeta = os.path.join(self.base_dir, tabla)
+        if not os.path.isdir(carpeta):
+            return set()
+
+        meses: Set[Tuple[int, int]] = set()
+        for nombre in os.listdir(carpeta):
+            base, ext = os.path.splitext(nombre)
+            if ext != ".parquet" or len(base) != 7 or base[4] != "-":
+                continue
+            try:
+                meses.add((int(base[:4]), int(base[5:])))
+            except ValueError:
+                continue
+        return meses
+
+    # ==========================================================
+    #   LECTURA (MEMORY-MAP + PROYECCIÓN + FILTRO)
+    # ==========================================================
+    def leer(
+        self,
+        tabla: str,
+        desde: date,
+        hasta: date,
+        columnas: Optional[Sequence[str]] = None,
+    ) -> pa.Table:
+        """
+        Filas archivadas de `tabla` con fecha en [desde, hasta + 1 día),
+        solo de los meses que tocan el rango. Devuelve una tabla Arrow
+        (vacía con el esquema correcto si no hay nada).
+        """
+        esquema = pa.schema([(n, t) for n, _e, t in ESQUEMAS[tabla]])
+        if columnas is not None:
+            esquema = pa.schema([esquema.field(c) for c in columnas])
+
+        t1 = datetime(desde.year, desde.month, desde.day, tzinfo=timezone.utc)
+        t2 = datetime(hasta.year, hasta.month, hasta.day, tzinfo=timezone.utc) + timedelta(days=1)
+        filtro = [
+            ("fecha", ">=", pa.scalar(t1, type=_TS)),
+            ("fecha", "<", pa.scalar(t2, type=_TS)),
+        ]
+
+        partes: List[pa.Table] = []
+        for anio, mes in sorted(self.meses_archivados(tabla)):
+            if (anio, mes) < (desde.year, desde.month) or (anio, mes) > (hasta.year, hasta.month):
+                continue
+            partes.append(
+                pq.read_table(
+                    self.ruta(tabla, anio, mes),
+                    columns=list(esquema.names),
+                    filters=filtro,
+                    memory_map=True,
+                )
+            )
+
+        if not partes:
+            return esquema.empty_table()
+        return pa.concat_tables(partes)
+
+    # ==========================================================
+    #   EXPORTAR UN MES DESDE POSTGRESQL
+    # ==========================================================
+    def _origen_mes(self, cur, tabla: str, anio: int, mes: int) -> Tuple[sql.Composable, str]:
+        """
+        Devuelve (origen, tipo):
+        - "archivo":   partición desprendida al esquema 'archivo'
+                       (mantener_particiones)
+        - "particion": partición mensual todavía en public
+        - "rango":     tabla sin partición para ese mes (se filtra por fecha)
+
+        Las particiones se leen completas, sin filtro de fecha: sus límites
+        siguen la zona horaria de la BD (particionar_tablas.sql), no UTC, y
+        todo lo que contienen se va con el DROP.
+        """
+        particion = f"{tabla}_p{anio:04d}{mes:02d}"
+        for esquema, tipo in (("archivo", "archivo"), ("public", "particion")):
+            cur.execute("SELECT to_regclass(%s);", (f"{esquema}.{particion}",))
+            if cur.fetchone()[0] is not None:
+                return sql.SQL("{}.{}").format(
+                    sql.Identifier(esquema), sql.Identifier(particion)
+                ), tipo
+        return sql.SQL("public.{}").format(sql.Identifier(tabla)), "rango"
+
+    @staticmethod
+    def _filtro_mes(tipo: str, anio: int, mes: int) -> Tuple[sql.Composable, tuple]:
+        """WHERE del mes (solo para tipo "rango") y sus parámetros."""
+        if tipo != "rango":
+            return sql.SQL(""), ()
+        return (
+            sql.SQL(" WHERE fecha >= %s AND fecha < %s"),
+            (_inicio_mes(anio, mes), _inicio_mes(*_mes_siguiente(anio, mes))),
+        )
+
+    def exportar_mes(self, tabla: str, anio: int, mes: int) -> int:
+        """
+        Escribe el Parquet del mes leyendo en lotes con un cursor de servidor.
+        Si el archivo ya existía (filas tardías de un mes ya archivado) las
+        filas nuevas se agregan a las existentes.
+
+        Devuelve cuántas filas se exportaron desde la BD.
+        """
+        columnas = ESQUEMAS[tabla]
+        esquema = pa.schema([(n, t) for n, _e, t in columnas])
+        destino = self.ruta(tabla, anio, mes)
+        temporal = destino + ".tmp"
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        exportadas = 0
+        try:
+            with cn.cursor() as cur:
+                origen, tipo = self._origen_mes(cur, tabla, anio, mes)
+            filtro, params = self._filtro_mes(tipo, anio, mes)
+
+            consulta = sql.SQL("SELECT {cols} FROM {origen}{filtro} ORDER BY fecha, id;").format(
+                cols=sql.SQL(", ").join(sql.SQL(e) for _n, e, _t in columnas),
+                origen=origen,
+                filtro=filtro,
+            )
+
+            with cn.cursor(name=f"archivo_{tabla}") as cur, pq.ParquetWriter(
+                temporal, esquema, compression="zstd"
+            ) as writer:
+                cur.itersize = TAMANO_LOTE
+                cur.execute(consulta, params)
+                while True:
+                    filas = cur.fetchmany(TAMANO_LOTE)
+                    if not filas:
+                        break
+                    writer.write_batch(
+                        pa.RecordBatch.from_arrays(
+                            [pa.array(col, type=t) for col, (_n, _e, t) in zip(zip(*filas), columnas)],
+                            schema=esquema,
+                        )
+                    )
+                    exportadas += len(filas)
+        except Exception:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        finally:
+            cn.close()
+
+        if exportadas == 0:
+            os.remove(temporal)
+            return 0
+
+        nuevo = pq.read_table(temporal, memory_map=True)
+        if nuevo.num_rows != exportadas:
+            os.remove(temporal)
+            raise RuntimeError(
+                f"El archivo de {tabla} {anio}-{mes:02d} quedó incompleto "
+                f"({nuevo.num_rows} de {exportadas} filas)."
+            )
+
+        if os.path.exists(destino):
+            previo = pq.read_table(destino)
+            ids_nuevos = nuevo.column("id").combine_chunks()
+            mascara = pc.invert(pc.is_in(previo.column("id"), value_set=ids_nuevos))
+            combinado = pa.concat_tables([previo.filter(mascara), nuevo])
+            pq.write_table(combinado, temporal, compression="zstd")
+
+        os.replace(temporal, destino)
+        return exportadas
+
+    # ==========================================================
+    #   BORRAR UN MES DE POSTGRESQL
+    # ==========================================================
+    def borrar_mes(self, tablas: Iterable[str], anio: int, mes: int) -> None:
+        """
+        Quita de la BD el mes ya exportado de cada tabla, en una sola
+        transacción y en el orden recibido (hijos antes que padres):
+        - partición desprendida en 'archivo'  → DROP TABLE
+        - partición mensual en public         → DETACH + DROP
+        - tabla sin particionar               → DELETE del rango
+
+        Antes de borrar cada tabla se bloquea lo que se va a borrar y se
+        comprueba que todas sus filas estén en el Parquet del mes; si falta
+        alguna no se borra nada.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                for tabla in tablas:
+                    origen, tipo = self._origen_mes(cur, tabla, anio, mes)
+
+                    # Nada entra ni cambia entre la verificación y el borrado
+                    modo = "SHARE ROW EXCLUSIVE" if tipo == "rango" else "ACCESS EXCLUSIVE"
+                    cur.execute(
+                        sql.SQL("LOCK TABLE {} IN {} MODE;").format(origen, sql.SQL(modo))
+                    )
+                    self._verificar_archivado(cur, tabla, anio, mes, origen, tipo)
+
+                    if tipo == "archivo":
+                        cur.execute(sql.SQL("DROP TABLE {};").format(origen))
+                    elif tipo == "particion":
+                        cur.execute(
+                            sql.SQL("ALTER TABLE public.{} DETACH PARTITION {};").format(
+                                sql.Identifier(tabla), origen
+                            )
+                        )
+                        cur.execute(sql.SQL("DROP TABLE {};").format(origen))
+                    else:
+                        filtro, params = self._filtro_mes(tipo, anio, mes)
+                        cur.execute(
+                            sql.SQL("DELETE FROM {}{};").format(origen, filtro), params
+                        )
+            cn.commit()
+        except Exception:
+            cn.rollback()
+            raise
+        finally:
+            cn.close()
+
+    def _verificar_archivado(
+        self, cur, tabla: str, anio: int, mes: int, origen: sql.Composable, tipo: str
+    ) -> None:
+        """
+        Falla si alguna fila de `origen` (la partición entera o el rango del
+        mes) no está en el Parquet del mes. Se compara por id: el archivo
+        puede tener además filas de exportaciones anteriores.
+        """
+        filtro, params = self._filtro_mes(tipo, anio, mes)
+        cur.execute(sql.SQL("SELECT id FROM {}{};").format(origen, filtro), params)
+        ids_bd = pa.array([r[0] for r in cur.fetchall()], type=pa.int64())
+        if len(ids_bd) == 0:
+            return
+
+        ruta = self.ruta(tabla, anio, mes)
+        archivados = (
+            pq.read_table(ruta, columns=["id"], memory_map=True).column("id")
+            if os.path.exists(ruta)
+            else pa.chunked_array([], type=pa.int64())
+        )
+        presentes = pc.sum(pc.is_in(ids_bd, value_set=archivados)).as_py() or 0
+        if presentes != len(ids_bd):
+            raise RuntimeError(
+                f"{tabla} {anio}-{mes:02d}: {len(ids_bd) - presentes} de {len(ids_bd)} "
+                "filas no están en el archivo; no se borra el mes."
+            )
+
+    # ==========================================================
+    #   MESES PENDIENTES DE ARCHIVAR
+    # ==========================================================
+    def meses_en_bd(self, tabla: str, antes_de: date) -> Set[Tuple[int, int]]:
+        """
+        Meses (anio, mes, en UTC) con filas de `tabla` anteriores a `antes_de`,
+        incluyendo particiones ya desprendidas al esquema 'archivo'.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    sql.SQL(
+                        """
+                        SELECT DISTINCT
+                            EXTRACT(YEAR  FROM fecha AT TIME ZONE 'UTC')::int,
+                            EXTRACT(MONTH FROM fecha AT TIME ZONE 'UTC')::int
+                        FROM public.{}
+                        WHERE fecha < %s;
+                        """
+                    ).format(sql.Identifier(tabla)),
+                    (datetime(antes_de.year, antes_de.month, antes_de.day, tzinfo=timezone.utc),),
+                )
+                meses = {(int(a), int(m)) for a, m in cur.fetchall()}
+
+                cur.execute(
+                    """
+                    SELECT c.relname
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'archivo'
+                      AND c.relkind = 'r'
+                      AND c.relname ~ %s;
+                    """,
+                    (f"^{tabla}_p[0-9]{{6}}$",),
+                )
+                for (nombre,) in cur.fetchall():
+                    sufijo = nombre[-6:]
+                    meses.add((int(sufijo[:4]), int(sufijo[4:])))
+
+                return meses
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   NOMBRES DE PRODUCTOS (PARA REPORTES SOBRE EL ARCHIVO)
+    # ==========================================================
+    def nombres_productos(self, ids: Sequence[int]) -> Dict[int, Tuple[str, str]]:
+        """
+        {id: (codigo, nombre)} incluyendo productos inactivos.
+        """
+        if not ids:
+            return {}
+
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, codigo, nombre
+                    FROM public.productos
+                    WHERE id = ANY(%s);
+                    """,
+                    ([int(i) for i in ids],),
+                )
+                return {int(i): (c, n) for i, c, n in cur.fetchall()}
+        finally:
+            cn.close()
@@ -0,0 +1,216 @@
+# app/repos/conciliacion_repo.py
+from typing import List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+
+from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+
+
+@perfilado("sql")
+class ConciliacionRepo:
+    """
+    Conciliación de stock contra el libro de movimientos (PostgreSQL).
+
+    El libro (public.movimientos_inventario) se reproduce por producto con
+    funciones de ventana:
+
+        stock_esperado = stock inicial + Σ delta (ordenado por fecha, id)
+
+    donde el stock inicial es stock_resultante - delta del primer movimiento.
+    Los movimientos 'ajuste' y 'conciliacion' fijan el stock a un valor
+    absoluto: abren un tramo nuevo del libro cuyo inicio es su
+    stock_resultante.
+    """
+
+    # ==========================================================
+    #   RANGO DE IDS (PARA PARTIR EL TRABAJO EN BLOQUES)
+    # ==========================================================
+    def rango_ids_productos(self) -> Optional[Tuple[int, int]]:
+        """
+        Devuelve (id_min, id_max) de public.productos, o None si no hay productos.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute("SELECT MIN(id), MAX(id) FROM public.productos;")
+                id_min, id_max = cur.fetchone()
+                if id_min is None:
+                    return None
+                return int(id_min), int(id_max)
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   DESCUADRES EN UN BLOQUE DE PRODUCTOS
+    # ==========================================================
+    def listar_descuadres(self, id_desde: int, id_hasta: int) -> List[Tuple]:
+        """
+        Reproduce el libro de los productos con id en [id_desde, id_hasta]
+        en una sola pasada y devuelve solo los que tienen diferencias.
+
+        Tuplas:
+            (id, nombre, stock_actual, stock_esperado, diferencia,
+             movimientos, movimientos_descuadrados)
+
+        - diferencia = stock_actual - stock_esperado
+        - movimientos_descuadrados: filas cuyo stock_resultante no coincide
+          con el stock reproducido (error del código que lo escribió).
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    WITH mov AS (
+                        SELECT
+                            m.id,
+                            m.id_producto,
+                            m.fecha,
+                            m.stock_resultante,
+                            CASE
+                                WHEN m.tipo IN ('entrada', 'devolucion')
+                                    THEN m.cantidad
+                                WHEN m.tipo IN ('salida', 'venta', 'fiado')
+                                    THEN -m.cantidad
+                                ELSE 0
+                            END AS delta,
+                            COUNT(*) FILTER (
+                                WHERE m.tipo IN ('ajuste', 'conciliacion')
+                            ) OVER (
+                                PARTITION BY m.id_producto
+                                ORDER BY m.fecha, m.id
+                                ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                            ) AS tramo
+                        FROM public.movimientos_inventario m
+                        WHERE m.id_producto BETWEEN %s AND %s
+                    ),
+                    replay AS (
+                        SELECT
+                            mov.id_producto,
+                            mov.stock_resultante,
+                            FIRST_VALUE(mov.stock_resultante - mov.delta) OVER w
+                                + SUM(mov.delta) OVER w          AS stock_esperado,
+                            ROW_NUMBER() OVER (
+                                PARTITION BY mov.id_producto
+                                ORDER BY mov.fecha DESC, mov.id DESC
+                            )                                    AS orden_desc
+                        FROM mov
+                        WINDOW w AS (
+                            PARTITION BY mov.id_producto, mov.tramo
+                            ORDER BY mov.fecha, mov.id
+                            ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                        )
+                    ),
+                    resumen AS (
+                        SELECT
+                            id_producto,
+                            COUNT(*) AS movimientos,
+                            COUNT(*) FILTER (
+                                WHERE stock_resultante <> stock_esperado
+                            ) AS movimientos_descuadrados,
+                            MAX(stock_esperado) FILTER (
+                                WHERE orden_desc = 1
+                            ) AS stock_esperado
+                        FROM replay
+                        GROUP BY id_producto
+                    )
+                    SELECT
+                        p.id,
+                        p.nombre,
+                        COALESCE(p.stock_unidades, 0)                     AS stock_actual,
+                        r.stock_esperado,
+                        COALESCE(p.stock_unidades, 0) - r.stock_esperado  AS diferencia,
+                        r.movimientos,
+                        r.movimientos_descuadrados
+                    FROM resumen r
+                    JOIN public.productos p ON p.id = r.id_producto
+                    WHERE r.movimientos_descuadrados > 0
+                       OR COALESCE(p.stock_unidades, 0) <> r.stock_esperado
+                    ORDER BY p.id;
+                    """,
+                    (int(id_desde), int(id_hasta)),
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   REPARAR STOCK
+    # ==========================================================
+    def reparar_stock(self, ajustes: Sequence[Tuple[int, int, int]]) -> int:
+        """
+        Lleva stock_unidades al valor del libro y registra un movimiento
+        'conciliacion' por cada producto corregido.
+
+        ajustes: (id_producto, stock_observado, stock_esperado)
+
+        Solo se corrige si stock_unidades sigue valiendo stock_observado:
+        si hubo una venta entre la detección y la reparación, ese producto
+        se deja para la siguiente corrida.
+
+        Devuelve cuántos productos se corrigieron.
+        """
+        if not ajustes:
+            return 0
+
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                corregidos = execute_values(
+                    cur,
+                    """
+                    UPDATE public.productos p
+                    SET stock_unidades = a.esperado
+                    FROM (VALUES %s) AS a(id, observado, esperado)
+                    WHERE p.id = a.id
+                      AND COALESCE(p.stock_unidades, 0) = a.observado
+                    RETURNING p.id, a.observado, a.esperado;
+                    """,
+                    [(int(i), int(o), int(e)) for i, o, e in ajustes],
+                    fetch=True,
+                )
+
+                if corregidos:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO public.movimientos_inventario(
+                            id_producto,
+                            tipo,
+                            cantidad,
+                            referencia,
+                            motivo,
+                            stock_resultante
+                        )
+                        VALUES %s;
+                        """,
+                        [
+                            (
+                                pid,
+                                "conciliacion",
+                                abs(observado - esperado),
+                                "CONC",
+                                f"Conciliación: stock {observado} → {esperado}",
+                                esperado,
+                            )
+                            for pid, observado, esperado in corregidos
+                        ],
+                    )
+
+            cn.commit()
+            return len(corregidos)
+        except Exception:
+            cn.rollback()
+            raise
+        finally:
+            cn.close()
@@ -0,0 +1,188 @@
+# app/repos/cortes_caja_repo.py
+from datetime import date
+from typing import List, Optional, Tuple
+
+from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+
+# Orden de columnas = campos de app.models.CorteCaja
+_COLUMNAS = """
+    fecha,
+    num_ventas,
+    ventas_total::double precision,
+    ventas_efectivo::double precision,
+    ventas_por_pago,
+    ganancia::double precision,
+    gastos::double precision,
+    fiados_nuevos::double precision,
+    fiados_pendientes::double precision,
+    fiados_cobrados::double precision,
+    efectivo_esperado::double precision,
+    id_usuario,
+    cerrado_en
+"""
+
+
+@perfilado("sql")
+class CortesCajaRepo:
+    """
+    Acceso a public.cortes_caja (cierre diario de caja) en PostgreSQL.
+    """
+
+    # ==========================================================
+    #   CERRAR DÍA
+    # ==========================================================
+    def cerrar_dia(self, fecha: date, id_usuario: Optional[int]) -> Optional[Tuple]:
+        """
+        Calcula los totales del día y los guarda como corte, en una sola
+        transacción. Devuelve la fila del corte (orden de CorteCaja) o
+        None si ese día ya estaba cerrado.
+
+        Mientras se calcula, ventas/gastos/fiados/abonos quedan bloqueadas para
+        escritura (LOCK ... IN SHARE MODE): nada entra al día a medias. Lo
+        que espere al lock y sea de ese día lo rechaza después el trigger
+        bloquear_dia_cerrado.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    "LOCK TABLE public.ventas, public.gastos, public.fiados, "
+                    "public.abonos_fiado IN SHARE MODE;"
+                )
+                cur.execute(
+                    f"""
+                    WITH
+                    v AS (
+                        SELECT
+                            COUNT(*)                AS n,
+                            COALESCE(SUM(total), 0) AS total
+                        FROM public.ventas
+                        WHERE estado = 'Activa'
+                          AND fecha >= %(d)s
+                          AND fecha < %(d)s::date + INTERVAL '1 day'
+                    ),
+                    pagos AS (
+                        SELECT pv.metodo, SUM(pv.monto) AS monto, m.es_efectivo
+                        FROM public.pagos_venta pv
+                        JOIN public.metodos_pago m ON m.codigo = pv.metodo
+                        WHERE pv.fecha >= %(d)s
+                          AND pv.fecha < %(d)s::date + INTERVAL '1 day'
+                        GROUP BY pv.metodo, m.es_efectivo
+                    ),
+                    gan AS (
+                        SELECT COALESCE(SUM(
+                            (d.precio_unitario - d.costo_unitario_compra) * d.unidades_descuento
+                        ), 0) AS ganancia
+                        FROM public.ventas vv
+                        JOIN public.detalle_ventas d
+                          ON d.id_venta = vv.id AND d.fecha = vv.fecha
+                        WHERE vv.estado = 'Activa'
+                          AND vv.fecha >= %(d)s
+                          AND vv.fecha < %(d)s::date + INTERVAL '1 day'
+                          AND d.fecha >= %(d)s
+                          AND d.fecha < %(d)s::date + INTERVAL '1 day'
+                    ),
+                    g AS (
+                        SELECT COALESCE(SUM(monto), 0) AS gastos
+                        FROM public.gastos
+                        WHERE fecha >= %(d)s
+                          AND fecha < %(d)s::date + INTERVAL '1 day'
+                    ),
+                    -- Pendiente = fiado del día menos lo abonado ese mismo
+                    -- día (lo abonado después cuenta como cobrado en su día;
+                    -- así el corte no depende de cuándo se cierra)
+                    fn AS (
+                        SELECT
+                            COALESCE(SUM(ff.monto), 0) AS nuevos,
+                            COALESCE(SUM(ff.monto), 0) - COALESCE((
+                                SELECT SUM(a.monto)
+                                FROM public.abonos_fiado a
+                                JOIN public.fiados fa ON fa.id = a.id_fiado
+                                WHERE a.fecha >= %(d)s
+                                  AND a.fecha < %(d)s::date + INTERVAL '1 day'
+                                  AND fa.fecha >= %(d)s
+                                  AND fa.fecha < %(d)s::date + INTERVAL '1 day'
+                            ), 0) AS pendientes
+                        FROM public.fiados ff
+                        WHERE ff.fecha >= %(d)s
+                          AND ff.fecha < %(d)s::date + INTERVAL '1 day'
+                    ),
+                    -- Abonos del día a fiados de días anteriores
+                    fc AS (
+                        SELECT COALESCE(SUM(a.monto), 0) AS cobrados
+                        FROM public.abonos_fiado a
+                        JOIN public.fiados ff ON ff.id = a.id_fiado
+                        WHERE a.fecha >= %(d)s
+                          AND a.fecha < %(d)s::date + INTERVAL '1 day'
+                          AND ff.fecha < %(d)s
+                    ),
+                    f AS (
+                        SELECT fn.nuevos, fn.pendientes, fc.cobrados
+                        FROM fn, fc
+                    ),
+                    t AS (
+                        SELECT
+                            v.n,
+                            v.total,
+                            (SELECT COALESCE(SUM(monto) FILTER (WHERE es_efectivo), 0)
+                             FROM pagos)                                  AS efectivo,
+                            (SELECT COALESCE(jsonb_object_agg(metodo, monto), '{{}}')
+                             FROM pagos)                                  AS por_pago
+                        FROM v
+                    )
+                    INSERT INTO public.cortes_caja (
+                        fecha, num_ventas, ventas_total, ventas_efectivo, ventas_por_pago,
+                        ganancia, gastos, fiados_nuevos, fiados_pendientes,
+                        fiados_cobrados, efectivo_esperado, id_usuario
+                    )
+                    SELECT
+                        %(d)s, t.n, t.total, t.efectivo, t.por_pago,
+                        gan.ganancia, g.gastos, f.nuevos, f.pendientes, f.cobrados,
+                        t.efectivo + f.cobrados - g.gastos - f.pendientes,
+                        %(u)s
+                    FROM t, gan, g, f
+                    ON CONFLICT (fecha) DO NOTHING
+                    RETURNING {_COLUMNAS};
+                    """,
+                    {"d": fecha, "u": id_usuario},
+                )
+                fila = cur.fetchone()
+            cn.commit()
+            return fila
+
+        except Exception:
+            cn.rollback()
+            raise
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   LISTAR CORTES
+    # ==========================================================
+    def listar_rango(self, d1: date, d2: date) -> List[Tuple]:
+        """
+        Cortes con fecha en [d1, d2] (ambos inclusive), en orden de fecha.
+        Tuplas en el orden de los campos de CorteCaja.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    SELECT {_COLUMNAS}
+                    FROM public.cortes_caja
+                    WHERE fecha BETWEEN %s AND %s
+                    ORDER BY fecha;
+                    """,
+                    (d1, d2),
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
@@ -1,9 +1,11 @@
 # app/repos/dashboard_repo.py
 from datetime import date
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from app.core.database import conectar_bd
+from app.core.profiler import perfilado
 
 
+@perfilado("sql")
 class DashboardRepo:
     """
     Consultas agregadas para el dashboard de inicio.
@@ -12,14 +14,22 @@ class DashboardRepo:
     # ==========================================================
     #   RESUMEN GENERAL (KPIs)
     # ==========================================================
-    def get_resumen(self, desde: date, hasta: date) -> Dict[str, float]:
+    def get_resumen(
+        self,
+        desde: date,
+        hasta: date,
+        tramos: Optional[Sequence[Tuple[date, date]]] = None,
+    ) -> Dict[str, float]:
+        """
+        tramos: sub-rangos de [desde, hasta] sobre los que se suman ventas y
+        ganancia (los días sin corte de caja). None = el rango completo.
+        """
         cn = conectar_bd()
         if not cn:
             raise RuntimeError("No se pudo conectar a la base de datos.")
 
-        # Convertir fechas → string aceptado por PostgreSQL
-        d1 = desde.strftime("%Y-%m-%d")
-        d2 = hasta.strftime("%Y-%m-%d")
+        if tramos is None:
+            tramos = [(desde, hasta)]
 
         try:
             resumen: Dict[str, float] = {}
@@ -40,42 +50,27 @@ class DashboardRepo:
                 resumen["stock_total_unidades"] = int(stock_total or 0)
 
             # ------------------------------------------------------
-            #   Total vendido (suma de ventas activas en rango)
+            #   Total vendido + ganancia (ventas activas de cada tramo)
             # ------------------------------------------------------
-            with cn.cursor() as cur:
-                cur.execute("""
-                    SELECT COALESCE(SUM(total), 0)
-                    FROM public.ventas
-                    WHERE estado = 'Activa'
-                      AND fecha >= %s
-                      AND fecha < (%s::date + INTERVAL '1 day');
-                """, (d1, d2))
-                resumen["total_vendido"] = float(cur.fetchone()[0] or 0.0)
-
-            # ------------------------------------------------------
-            #   Ganancia = Σ (precio_unitario – costo_unitario_compra) × unidades_descuento
-            # ------------------------------------------------------
-            with cn.cursor() as cur:
-                cur.execute("""
-                    SELECT COALESCE(SUM(
-                       (d.precio_unitario - d.costo_unitario_compra) * d.unidades_descuento
-                    ), 0)
-                    FROM public.ventas v
-                    JOIN public.detalle_ventas d ON d.id_venta = v.id
-                    WHERE v.estado = 'Activa'
-                      AND v.fecha >= %s
-                      AND v.fecha < (%s::date + INTERVAL '1 day');
-                """, (d1, d2))
-                resumen["ganancia"] = float(cur.fetchone()[0] or 0.0)
+            resumen["total_vendido"] = 0.0
+            resumen["ganancia"] = 0.0
+            for t1, t2 in tramos:
+                # Convertir fechas → string aceptado por PostgreSQL
+                vendido, ganancia = self._ventas_y_ganancia(
+                    cn, t1.strftime("%Y-%m-%d"), t2.strftime("%Y-%m-%d")
+                )
+                resumen["total_vendido"] += vendido
+                resumen["ganancia"] += ganancia
 
             # ------------------------------------------------------
-            #   Fiado pendiente total
+            #   Fiado pendiente total (saldos de clientes; índice
+            #   parcial idx_clientes_deudores, solo los que deben)
             # ------------------------------------------------------
             with cn.cursor() as cur:
                 cur.execute("""
-                    SELECT COALESCE(SUM(monto), 0)
-                    FROM public.fiados
-                    WHERE estado IS DISTINCT FROM 'Pagado';
+                    SELECT COALESCE(SUM(saldo), 0)
+                    FROM public.clientes
+                    WHERE saldo > 0;
                 """)
                 resumen["fiado_pendiente"] = float(cur.fetchone()[0] or 0.0)
 
@@ -84,6 +79,43 @@ class DashboardRepo:
         finally:
             cn.close()
 
+    @staticmethod
+    def _ventas_y_ganancia(cn, d1: str, d2: str) -> Tuple[float, float]:
+        """(total vendido, ganancia) de ventas activas en [d1, d2]."""
+        # ------------------------------------------------------
+        #   Total vendido (suma de ventas activas en rango)
+        # ------------------------------------------------------
+        with cn.cursor() as cur:
+            cur.execute("""
+                SELECT COALESCE(SUM(total), 0)
+                FROM public.ventas
+                WHERE estado = 'Activa'
+                  AND fecha >= %s
+                  AND fecha < (%s::date + INTERVAL '1 day');
+            """, (d1, d2))
+            vendido = float(cur.fetchone()[0] or 0.0)
+
+        # ------------------------------------------------------
+        #   Ganancia = Σ (precio_unitario – costo_unitario_compra) × unidades_descuento
+        # ------------------------------------------------------
+        with cn.cursor() as cur:
+            cur.execute("""
+                SELECT COALESCE(SUM(
+                   (d.precio_unitario - d.costo_unitario_compra) * d.unidades_descuento
+                ), 0)
+                FROM public.ventas v
+                JOIN public.detalle_ventas d
+                  ON d.id_venta = v.id AND d.fecha = v.fecha
+                WHERE v.estado = 'Activa'
+                  AND v.fecha >= %s
+                  AND v.fecha < (%s::date + INTERVAL '1 day')
+                  AND d.fecha >= %s
+                  AND d.fecha < (%s::date + INTERVAL '1 day');
+            """, (d1, d2, d1, d2))
+            ganancia = float(cur.fetchone()[0] or 0.0)
+
+        return vendido, ganancia
+
     # ==========================================================
     #   INVENTARIO COMPLETO PARA TABLA
     # ==========================================================
@@ -116,8 +148,11 @@ class DashboardRepo:
     #   TOP PRODUCTOS MÁS VENDIDOS
     # ==========================================================
     def get_top_productos_vendidos(
-        self, desde: date, hasta: date, top_n: int = 5
+        self, desde: date, hasta: date, top_n: Optional[int] = 5
     ) -> List[Tuple]:
+        """
+        top_n=None devuelve todos los productos vendidos en el rango.
+        """
 
         cn = conectar_bd()
         if not cn:
@@ -125,6 +160,7 @@ class DashboardRepo:
 
         d1 = desde.strftime("%Y-%m-%d")
         d2 = hasta.strftime("%Y-%m-%d")
+        limite = "" if top_n is None else f"LIMIT {int(top_n)}"
 
         sql = f"""
             SELECT
@@ -133,19 +169,21 @@ class DashboardRepo:
                 p.nombre,
                 COALESCE(SUM(d.unidades_descuento), 0) AS unidades_vendidas
             FROM public.detalle_ventas d
-            JOIN public.ventas v ON v.id = d.id_venta
+            JOIN public.ventas v ON v.id = d.id_venta AND v.fecha = d.fecha
             JOIN public.productos p ON p.id = d.id_producto
             WHERE v.estado = 'Activa'
               AND v.fecha >= %s
               AND v.fecha < (%s::date + INTERVAL '1 day')
+              AND d.fecha >= %s
+              AND d.fecha < (%s::date + INTERVAL '1 day')
             GROUP BY p.id, p.codigo, p.nombre
             ORDER BY unidades_vendidas DESC, p.nombre
-            LIMIT {int(top_n)};
+            {limite};
         """
 
         try:
             with cn.cursor() as cur:
-                cur.execute(sql, (d1, d2))
+                cur.execute(sql, (d1, d2, d1, d2))
                 return cur.fetchall()
 
         finally:
@@ -179,3 +217,108 @@ class DashboardRepo:
 
         finally:
             cn.close()
+
+    # ==========================================================
+    #   CLASIFICACIÓN ABC / PARETO
+    # ==========================================================
+    def get_clasificacion_abc(
+        self,
+        desde: date,
+        hasta: date,
+        corte_a: float = 0.80,
+        corte_b: float = 0.95,
+    ) -> List[Tuple]:
+        """
+        Clasificación ABC de todos los productos activos en UNA consulta.
+
+        - ingreso: Σ cantidad × precio_unitario en el rango
+        - margen:  Σ (precio_unitario – costo_unitario_compra) × unidades_descuento
+        - acumulado: SUM(ingreso) OVER (ORDER BY ingreso DESC) / total
+
+        Un producto es 'A' si el acumulado ANTES de él es < corte_a
+        (el que cruza el 80 % también es A), 'B' si es < corte_b y 'C'
+        en otro caso. Los productos sin ventas quedan en 'C'.
+
+        Tuplas:
+            (id, codigo, nombre, ingreso, margen,
+             participacion, participacion_margen, acumulado, clase)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        d1 = desde.strftime("%Y-%m-%d")
+        d2 = hasta.strftime("%Y-%m-%d")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute("""
+                    WITH ventas_producto AS (
+                        SELECT
+                            d.id_producto,
+                            SUM(d.cantidad * d.precio_unitario) AS ingreso,
+                            SUM(
+                                (d.precio_unitario - d.costo_unitario_compra)
+                                * d.unidades_descuento
+                            ) AS margen
+                        FROM public.detalle_ventas d
+                        JOIN public.ventas v
+                          ON v.id = d.id_venta AND v.fecha = d.fecha
+                        WHERE v.estado = 'Activa'
+                          AND v.fecha >= %s
+                          AND v.fecha < (%s::date + INTERVAL '1 day')
+                          AND d.fecha >= %s
+                          AND d.fecha < (%s::date + INTERVAL '1 day')
+                        GROUP BY d.id_producto
+                    ),
+                    base AS (
+                        SELECT
+                            p.id,
+                            p.codigo,
+                            p.nombre,
+                            COALESCE(vp.ingreso, 0)::double precision AS ingreso,
+                            COALESCE(vp.margen, 0)::double precision  AS margen
+                        FROM public.productos p
+                        LEFT JOIN ventas_producto vp ON vp.id_producto = p.id
+                        WHERE p.activo = TRUE
+                    ),
+                    acumulado AS (
+                        SELECT
+                            b.*,
+                            COALESCE(
+                                b.ingreso / NULLIF(SUM(b.ingreso) OVER (), 0), 0
+                            ) AS participacion,
+                            COALESCE(
+                                b.margen / NULLIF(SUM(b.margen) OVER (), 0), 0
+                            ) AS participacion_margen,
+                            COALESCE(
+                                SUM(b.ingreso) OVER (
+                                    ORDER BY b.ingreso DESC, b.id
+                                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                                ) / NULLIF(SUM(b.ingreso) OVER (), 0),
+                                0
+                            ) AS acumulado
+                        FROM base b
+                    )
+                    SELECT
+                        id,
+                        codigo,
+                        nombre,
+                        ingreso,
+                        margen,
+                        participacion,
+                        participacion_margen,
+                        acumulado,
+                        CASE
+                            WHEN ingreso <= 0 THEN 'C'
+                            WHEN acumulado - participacion < %s THEN 'A'
+                            WHEN acumulado - participacion < %s THEN 'B'
+                            ELSE 'C'
+                        END AS clase
+                    FROM acumulado
+                    ORDER BY ingreso DESC, id;
+                """, (d1, d2, d1, d2, float(corte_a), float(corte_b)))
+                return cur.fetchall()
+
+        finally:
+            cn.close()
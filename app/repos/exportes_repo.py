@@ -0,0 +1,81 @@
+# app/repos/exportes_repo.py
+from typing import BinaryIO
+
+from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+from app.repos.inventario_repo import SQL_LIBRO
+
+
+# Consultas exportables. Parámetros %(d1)s y %(d2)s ('YYYY-MM-DD', ambos
+# inclusive). Sin ';' final: van dentro de COPY ( ... ).
+CONSULTAS = {
+    # fecha, tipo, persona, detalle, cantidad, monto, estado, id_fiado,
+    # efectivo, saldo
+    "libro": SQL_LIBRO,
+    "gastos": """
+        SELECT
+            to_char(g.fecha, 'YYYY-MM-DD HH24:MI') AS fecha,
+            g.descripcion,
+            g.categoria,
+            g.monto::double precision AS monto
+        FROM public.gastos g
+        WHERE g.fecha >= %(d1)s
+          AND g.fecha < %(d2)s::date + INTERVAL '1 day'
+        ORDER BY g.fecha
+    """,
+    "fiados": """
+        SELECT
+            f.id,
+            to_char(f.fecha, 'YYYY-MM-DD HH24:MI') AS fecha,
+            f.nombre_cliente,
+            f.producto,
+            f.cantidad,
+            f.monto::double precision            AS monto,
+            COALESCE(f.estado, 'Pendiente')      AS estado,
+            f.saldo::double precision            AS saldo
+        FROM public.fiados f
+        WHERE f.fecha >= %(d1)s
+          AND f.fecha < %(d2)s::date + INTERVAL '1 day'
+        ORDER BY f.fecha
+    """,
+}
+
+
+@perfilado("sql")
+class ExportesRepo:
+    """
+    Exportación de reportes con COPY ... TO STDOUT.
+
+    PostgreSQL arma el CSV y psycopg2 lo va escribiendo en el archivo a
+    medida que llega: las filas nunca pasan por Python ni se juntan en
+    memoria, sin importar cuántas sean.
+    """
+
+    # ==========================================================
+    #   COPY A CSV
+    # ==========================================================
+    def copiar_csv(self, reporte: str, d1: str, d2: str, destino: BinaryIO) -> None:
+        """
+        Escribe en destino (abierto en binario) las filas del reporte como
+        CSV sin encabezado. NULL queda como campo vacío sin comillas y el
+        texto vacío como "" (así lo distingue quien lo lea después).
+
+        d1 y d2 vienen como 'YYYY-MM-DD'
+        """
+        if reporte not in CONSULTAS:
+            raise ValueError(f"Reporte desconocido: {reporte!r}")
+
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                # COPY no acepta parámetros: se incrustan ya escapados
+                consulta = cur.mogrify(CONSULTAS[reporte], {"d1": d1, "d2": d2})
+                cur.copy_expert(
+                    f"COPY ({consulta.decode()}) TO STDOUT WITH (FORMAT csv)",
+                    destino,
+                )
+        finally:
+            cn.close()
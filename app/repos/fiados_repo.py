@@ -3,8 +3,10 @@ from datetime import date
 from typing import List, Tuple, Optional
 
 from app.core.database import conectar_bd
+from app.core.profiler import perfilado
 
 
+@perfilado("sql")
 class FiadosRepo:
     """
     Acceso a datos de fiados en PostgreSQL.
@@ -25,7 +27,7 @@ class FiadosRepo:
             d2: fecha final  en formato 'YYYY-MM-DD'
 
         Retorna una lista de tuplas:
-            (id, fecha_str, cliente, producto, cantidad, monto, estado)
+            (id, fecha_str, cliente, producto, cantidad, monto, estado, saldo)
         """
         cn = conectar_bd()
         if not cn:
@@ -42,7 +44,8 @@ class FiadosRepo:
                         f.producto,
                         f.cantidad,
                         f.monto::double precision            AS monto,
-                        COALESCE(f.estado, 'Pendiente')      AS estado
+                        COALESCE(f.estado, 'Pendiente')      AS estado,
+                        f.saldo::double precision            AS saldo
                     FROM public.fiados f
                     WHERE f.fecha >= %s
                       AND f.fecha < %s::date + INTERVAL '1 day'
@@ -69,10 +72,13 @@ class FiadosRepo:
     # ==========================================================
     def listar_pendientes(self) -> List[Tuple]:
         """
-        Devuelve fiados que aún no están pagados.
+        Devuelve fiados que aún no están pagados, con lo que falta pagar.
 
         Tuplas:
-            (id, cliente, producto, monto, fecha)
+            (id, cliente, producto, saldo, fecha)
+
+        Solo recorre el índice parcial idx_fiados_pendientes: los fiados ya
+        pagados no entran, por muchos que haya.
         """
         cn = conectar_bd()
         if not cn:
@@ -86,7 +92,7 @@ class FiadosRepo:
                         f.id,
                         f.nombre_cliente,
                         f.producto,
-                        f.monto::double precision AS monto,
+                        f.saldo::double precision AS saldo,
                         f.fecha
                     FROM public.fiados f
                     WHERE f.estado IS DISTINCT FROM 'Pagado'
@@ -97,6 +103,43 @@ class FiadosRepo:
         finally:
             cn.close()
 
+    # ==========================================================
+    #  DEUDORES (QUIÉN DEBE CUÁNTO)
+    # ==========================================================
+    def listar_deudores(self) -> List[Tuple]:
+        """
+        Clientes con saldo pendiente, del que más debe al que menos.
+
+        Tuplas (orden de app.models.Cliente):
+            (id, nombre, telefono, saldo, fiados_pendientes, ultimo_movimiento)
+
+        Lee el índice parcial idx_clientes_deudores: cuesta lo que haya
+        clientes que deben, no lo que haya fiados.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        c.id,
+                        c.nombre,
+                        c.telefono,
+                        c.saldo::double precision AS saldo,
+                        c.fiados_pendientes,
+                        c.ultimo_movimiento
+                    FROM public.clientes c
+                    WHERE c.saldo > 0
+                    ORDER BY c.saldo DESC;
+                    """
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
+
     # ==========================================================
     #  CREAR FIADO
     # ==========================================================
@@ -110,7 +153,9 @@ class FiadosRepo:
         fecha: date,
     ) -> int:
         """
-        Inserta un nuevo fiado, descuenta stock y registra movimiento.
+        Inserta un nuevo fiado, descuenta stock, registra movimiento y suma
+        el monto al saldo del cliente (lo crea si es nuevo), todo en una
+        sola transacción.
 
         Devuelve:
             id_fiado (int) generado por la BD.
@@ -145,35 +190,58 @@ class FiadosRepo:
                         f"Stock={stock_actual}, requerido={cantidad}"
                     )
 
-                # 2) Insertar fiado
+                # 2) Cliente: alta o suma al saldo (la fila queda bloqueada
+                #    hasta el commit, igual que en los abonos)
+                cur.execute(
+                    """
+                    INSERT INTO public.clientes AS c (
+                        nombre, telefono, saldo, fiados_pendientes, ultimo_movimiento
+                    )
+                    VALUES (%(nombre)s, %(tel)s, %(monto)s, 1, NOW())
+                    ON CONFLICT (nombre_clave) DO UPDATE
+                    SET telefono = COALESCE(EXCLUDED.telefono, c.telefono),
+                        saldo = c.saldo + EXCLUDED.saldo,
+                        fiados_pendientes = c.fiados_pendientes + 1,
+                        ultimo_movimiento = NOW()
+                    RETURNING c.id, c.nombre;
+                    """,
+                    {"nombre": nombre_cliente, "tel": telefono, "monto": float(monto)},
+                )
+                id_cliente, nombre_cliente = cur.fetchone()
+
+                # 3) Insertar fiado
                 cur.execute(
                     """
                     INSERT INTO public.fiados(
                         id_producto,
+                        id_cliente,
                         nombre_cliente,
                         telefono,
                         producto,
                         cantidad,
                         monto,
+                        saldo,
                         fecha,
                         estado
                     )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, 'Pendiente')
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'Pendiente')
                     RETURNING id;
                     """,
                     (
                         id_producto,
+                        id_cliente,
                         nombre_cliente,
                         telefono,
                         nombre_producto,
                         cantidad,
                         float(monto),
+                        float(monto),
                         fecha,
                     ),
                 )
                 id_fiado = int(cur.fetchone()[0])
 
-                # 3) Descontar stock del producto
+                # 4) Descontar stock del producto
                 cur.execute(
                     """
                     UPDATE public.productos
@@ -183,7 +251,7 @@ class FiadosRepo:
                     (cantidad, id_producto),
                 )
 
-                # 4) Registrar movimiento en inventario
+                # 5) Registrar movimiento en inventario
                 cur.execute(
                     """
                     INSERT INTO public.movimientos_inventario(
@@ -221,11 +289,23 @@ class FiadosRepo:
             cn.close()
 
     # ==========================================================
-    #  PAGAR FIADO
+    #  PAGAR / ABONAR FIADO
     # ==========================================================
     def pagar_fiado(self, fiado_id: int) -> None:
         """
-        Marca un fiado como pagado y registra la fecha de pago.
+        Marca un fiado como pagado (abona todo su saldo) y registra la
+        fecha de pago.
+        """
+        self.abonar_fiado(fiado_id, None)
+
+    def abonar_fiado(self, fiado_id: int, monto: Optional[float]) -> float:
+        """
+        Registra un pago (parcial o total) de un fiado. monto=None paga
+        todo lo que falta. Devuelve el saldo que le queda al fiado.
+
+        El abono, el saldo del fiado y el del cliente cambian en la misma
+        transacción. Se bloquea primero el cliente y luego el fiado, en el
+        mismo orden que abonar_cliente (sin deadlocks entre ambos).
         """
         cn = conectar_bd()
         if not cn:
@@ -235,16 +315,163 @@ class FiadosRepo:
             with cn.cursor() as cur:
                 cur.execute(
                     """
-                    UPDATE public.fiados
-                    SET estado = 'Pagado',
-                        fecha_pago = NOW()
-                    WHERE id = %s;
+                    SELECT c.id
+                    FROM public.fiados f
+                    JOIN public.clientes c ON c.id = f.id_cliente
+                    WHERE f.id = %s
+                    FOR UPDATE OF c;
                     """,
                     (fiado_id,),
                 )
+                row = cur.fetchone()
+                if not row:
+                    raise RuntimeError(f"Fiado id={fiado_id} no encontrado.")
+                id_cliente = row[0]
+
+                cur.execute(
+                    """
+                    SELECT saldo::double precision
+                    FROM public.fiados
+                    WHERE id = %s
+                      AND estado IS DISTINCT FROM 'Pagado'
+                    FOR UPDATE;
+                    """,
+                    (fiado_id,),
+                )
+                row = cur.fetchone()
+                if not row:
+                    raise RuntimeError(f"El fiado id={fiado_id} ya está pagado.")
+                saldo = float(row[0])
+
+                abono = saldo if monto is None else round(float(monto), 2)
+                if abono > saldo:
+                    raise RuntimeError(
+                        f"El abono (Q {abono:,.2f}) supera el saldo del fiado "
+                        f"(Q {saldo:,.2f})."
+                    )
+
+                restante, liquidado = self._aplicar_abono(
+                    cur, fiado_id, id_cliente, saldo, abono
+                )
+                self._descontar_cliente(cur, id_cliente, abono, liquidado)
+
             cn.commit()
+            return restante
+
         except Exception:
             cn.rollback()
             raise
         finally:
             cn.close()
+
+    def abonar_cliente(self, id_cliente: int, monto: float) -> float:
+        """
+        Abono a la cuenta de un cliente: se reparte entre sus fiados
+        abiertos, del más viejo al más nuevo. Devuelve el saldo que le
+        queda al cliente.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT saldo::double precision
+                    FROM public.clientes
+                    WHERE id = %s
+                    FOR UPDATE;
+                    """,
+                    (id_cliente,),
+                )
+                row = cur.fetchone()
+                if not row:
+                    raise RuntimeError(f"Cliente id={id_cliente} no encontrado.")
+                saldo_cliente = float(row[0])
+
+                monto = round(float(monto), 2)
+                if monto > saldo_cliente:
+                    raise RuntimeError(
+                        f"El abono (Q {monto:,.2f}) supera lo que debe el cliente "
+                        f"(Q {saldo_cliente:,.2f})."
+                    )
+
+                # idx_fiados_cliente_pendientes: solo los fiados abiertos
+                cur.execute(
+                    """
+                    SELECT id, saldo::double precision
+                    FROM public.fiados
+                    WHERE id_cliente = %s
+                      AND estado IS DISTINCT FROM 'Pagado'
+                    ORDER BY fecha, id
+                    FOR UPDATE;
+                    """,
+                    (id_cliente,),
+                )
+                abiertos = cur.fetchall()
+
+                falta = monto
+                liquidados = 0
+                for id_fiado, saldo in abiertos:
+                    if falta <= 0:
+                        break
+                    abono = min(falta, float(saldo))
+                    _, liquidado = self._aplicar_abono(
+                        cur, id_fiado, id_cliente, float(saldo), abono
+                    )
+                    liquidados += int(liquidado)
+                    falta = round(falta - abono, 2)
+
+                self._descontar_cliente(cur, id_cliente, monto - falta, liquidados)
+
+            cn.commit()
+            return round(saldo_cliente - (monto - falta), 2)
+
+        except Exception:
+            cn.rollback()
+            raise
+        finally:
+            cn.close()
+
+    @staticmethod
+    def _aplicar_abono(cur, id_fiado: int, id_cliente: int, saldo: float, abono: float):
+        """
+        Guarda el abono y baja el saldo del fiado (lo marca pagado si llega
+        a cero). Devuelve (saldo restante, quedó liquidado).
+        """
+        restante = round(saldo - abono, 2)
+        liquidado = restante <= 0
+        if abono > 0:
+            cur.execute(
+                """
+                INSERT INTO public.abonos_fiado (id_fiado, id_cliente, monto)
+                VALUES (%s, %s, %s);
+                """,
+                (id_fiado, id_cliente, abono),
+            )
+        cur.execute(
+            """
+            UPDATE public.fiados
+            SET saldo = %s,
+                estado = CASE WHEN %s THEN 'Pagado' ELSE estado END,
+                fecha_pago = CASE WHEN %s THEN NOW() ELSE fecha_pago END
+            WHERE id = %s;
+            """,
+            (max(restante, 0.0), liquidado, liquidado, id_fiado),
+        )
+        return max(restante, 0.0), liquidado
+
+    @staticmethod
+    def _descontar_cliente(cur, id_cliente: int, monto: float, liquidados: int) -> None:
+        """Baja el saldo del cliente y cuenta los fiados que quedaron pagados."""
+        cur.execute(
+            """
+            UPDATE public.clientes
+            SET saldo = GREATEST(saldo - %s, 0),
+                fiados_pendientes = GREATEST(fiados_pendientes - %s, 0),
+                ultimo_movimiento = NOW()
+            WHERE id = %s;
+            """,
+            (round(monto, 2), int(liquidados), id_cliente),
+        )
@@ -3,8 +3,10 @@ from datetime import date
 from typing import List, Tuple
 
 from app.core.database import conectar_bd
+from app.core.profiler import perfilado
 
 
+@perfilado("sql")
 class GastosRepo:
     """
     Acceso a datos para gastos (PostgreSQL).
@@ -2,14 +2,94 @@
 from typing import List, Tuple
 
 from app.core.database import conectar_bd
+from app.core.profiler import perfilado
 
+# Libro unificado del rango (ventas + gastos + fiados). Parámetros %(d1)s y
+# %(d2)s ('YYYY-MM-DD'). Lo usan listar_libro y la exportación (COPY).
+SQL_LIBRO = """
+    WITH ventas_doc AS (
+        SELECT
+            v.fecha,
+            MIN(d.id) AS primer_detalle,
+            string_agg(
+                p.nombre || ' x' || d.cantidad::text,
+                ', ' ORDER BY d.id
+            ) AS detalle,
+            SUM(d.cantidad) AS cantidad,
+            SUM(d.cantidad * d.precio_unitario) AS monto
+        FROM public.ventas v
+        JOIN public.detalle_ventas d
+          ON d.id_venta = v.id AND d.fecha = v.fecha
+        JOIN public.productos      p ON p.id = d.id_producto
+        WHERE v.fecha >= %(d1)s
+          AND v.fecha < %(d2)s::date + INTERVAL '1 day'
+          AND d.fecha >= %(d1)s
+          AND d.fecha < %(d2)s::date + INTERVAL '1 day'
+        GROUP BY v.id, v.fecha
+    ),
+    -- Parte cobrada en efectivo, por fecha de venta: solo lee el índice
+    -- idx_pagos_venta_fecha_metodo (fecha, metodo) INCLUDE (monto)
+    efectivo_doc AS (
+        SELECT pv.fecha, SUM(pv.monto) AS efectivo
+        FROM public.pagos_venta pv
+        WHERE pv.fecha >= %(d1)s
+          AND pv.fecha < %(d2)s::date + INTERVAL '1 day'
+          AND pv.metodo IN (SELECT codigo FROM public.metodos_pago WHERE es_efectivo)
+        GROUP BY pv.fecha
+    ),
+    libro AS (
+        SELECT
+            vd.fecha,
+            1 AS bloque,
+            'Venta' AS tipo,
+            '' AS persona,
+            string_agg(vd.detalle, ', ' ORDER BY vd.primer_detalle) AS detalle,
+            SUM(vd.cantidad)::int AS cantidad,
+            SUM(vd.monto)::double precision AS monto,
+            '' AS estado,
+            NULL::int AS id_fiado,
+            COALESCE(MAX(e.efectivo), 0)::double precision AS efectivo,
+            NULL::double precision AS saldo
+        FROM ventas_doc vd
+        LEFT JOIN efectivo_doc e ON e.fecha = vd.fecha
+        GROUP BY vd.fecha
 
+        UNION ALL
+
+        SELECT
+            g.fecha, 2, 'Gasto', '', g.descripcion,
+            NULL, g.monto::double precision, '', NULL, 0, NULL
+        FROM public.gastos g
+        WHERE g.fecha >= %(d1)s
+          AND g.fecha < %(d2)s::date + INTERVAL '1 day'
+
+        UNION ALL
+
+        SELECT
+            f.fecha, 3, 'Fiado', f.nombre_cliente, f.producto,
+            f.cantidad, f.monto::double precision,
+            COALESCE(f.estado, 'Pendiente'), f.id, 0, f.saldo::double precision
+        FROM public.fiados f
+        WHERE f.fecha >= %(d1)s
+          AND f.fecha < %(d2)s::date + INTERVAL '1 day'
+    )
+    SELECT
+        to_char(fecha, 'YYYY-MM-DD HH24:MI') AS fecha,
+        tipo, persona, detalle, cantidad,
+        monto, estado, id_fiado, efectivo, saldo
+    FROM libro
+    ORDER BY libro.fecha, bloque
+"""
+
+
+@perfilado("sql")
 class InventarioRepo:
     """
     Acceso a datos para el panel de Inventario en PostgreSQL:
     - Ventas resumidas
     - Gastos
-    - Totales de ventas en efectivo
+    - Totales de ventas en efectivo y por método de pago
+    - Libro unificado (todo lo anterior en una consulta)
     """
 
     # ==========================================================
@@ -39,14 +119,17 @@ class InventarioRepo:
                         SUM(d.cantidad) AS cantidad,
                         SUM(d.cantidad * d.precio_unitario)::double precision AS monto
                     FROM public.ventas v
-                    JOIN public.detalle_ventas d ON d.id_venta = v.id
+                    JOIN public.detalle_ventas d
+                      ON d.id_venta = v.id AND d.fecha = v.fecha
                     JOIN public.productos      p ON p.id = d.id_producto
                     WHERE v.fecha >= %s
                       AND v.fecha < %s::date + INTERVAL '1 day'
+                      AND d.fecha >= %s
+                      AND d.fecha < %s::date + INTERVAL '1 day'
                     GROUP BY v.fecha
                     ORDER BY v.fecha;
                     """,
-                    (d1, d2),
+                    (d1, d2, d1, d2),
                 )
                 return cur.fetchall()
         finally:
@@ -88,7 +171,8 @@ class InventarioRepo:
     # ==========================================================
     def get_total_ventas_efectivo(self, d1: str, d2: str) -> float:
         """
-        Total de ventas en efectivo dentro del rango indicado.
+        Total cobrado en efectivo dentro del rango indicado (incluye la
+        parte en efectivo de los pagos divididos).
         """
         cn = conectar_bd()
         if not cn:
@@ -99,11 +183,13 @@ class InventarioRepo:
                 cur.execute(
                     """
                     SELECT
-                        COALESCE(SUM(total), 0)::double precision
-                    FROM public.ventas
-                    WHERE fecha >= %s
-                      AND fecha < %s::date + INTERVAL '1 day'
-                      AND lower(COALESCE(tipo_pago, 'efectivo')) = 'efectivo';
+                        COALESCE(SUM(pv.monto), 0)::double precision
+                    FROM public.pagos_venta pv
+                    WHERE pv.fecha >= %s
+                      AND pv.fecha < %s::date + INTERVAL '1 day'
+                      AND pv.metodo IN (
+                          SELECT codigo FROM public.metodos_pago WHERE es_efectivo
+                      );
                     """,
                     (d1, d2),
                 )
@@ -111,3 +197,103 @@ class InventarioRepo:
                 return float(row[0]) if row else 0.0
         finally:
             cn.close()
+
+    # ==========================================================
+    #  VENTAS POR MÉTODO DE PAGO
+    # ==========================================================
+    def listar_ventas_por_metodo(self, d1: str, d2: str) -> List[Tuple]:
+        """
+        Total cobrado por método de pago en el rango:
+        (codigo, monto)
+
+        Solo recorre el índice idx_pagos_venta_fecha_metodo.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la BD.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        pv.metodo,
+                        SUM(pv.monto)::double precision
+                    FROM public.pagos_venta pv
+                    WHERE pv.fecha >= %s
+                      AND pv.fecha < %s::date + INTERVAL '1 day'
+                    GROUP BY pv.metodo;
+                    """,
+                    (d1, d2),
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
+
+    def get_fiados_pendiente_y_cobrado(self, d1: str, d2: str) -> Tuple[float, float]:
+        """
+        (pendiente, cobrado) de fiados en [d1, d2], con el mismo criterio
+        que el corte de caja de cada día:
+        - pendiente: fiados del rango menos lo abonado el mismo día del fiado
+        - cobrado: abonos del rango a fiados de días anteriores al abono
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la BD.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    WITH f AS (
+                        SELECT id, monto, fecha
+                        FROM public.fiados
+                        WHERE fecha >= %(d1)s
+                          AND fecha < %(d2)s::date + INTERVAL '1 day'
+                    )
+                    SELECT
+                        (SELECT COALESCE(SUM(monto), 0) FROM f)
+                        - (SELECT COALESCE(SUM(a.monto), 0)
+                           FROM public.abonos_fiado a
+                           JOIN f ON f.id = a.id_fiado
+                           WHERE a.fecha::date = f.fecha::date),
+                        (SELECT COALESCE(SUM(a.monto), 0)
+                         FROM public.abonos_fiado a
+                         JOIN public.fiados ff ON ff.id = a.id_fiado
+                         WHERE a.fecha >= %(d1)s
+                           AND a.fecha < %(d2)s::date + INTERVAL '1 day'
+                           AND ff.fecha < a.fecha::date);
+                    """,
+                    {"d1": d1, "d2": d2},
+                )
+                pendiente, cobrado = cur.fetchone()
+                return float(pendiente or 0.0), float(cobrado or 0.0)
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #  LIBRO UNIFICADO (VENTAS + GASTOS + FIADOS)
+    # ==========================================================
+    def listar_libro(self, d1: str, d2: str) -> List[Tuple]:
+        """
+        Ventas, gastos y fiados del rango en UNA sola consulta, en orden
+        cronológico. Cada fila:
+            (fecha 'YYYY-MM-DD HH:MM', tipo, persona, detalle, cantidad,
+             monto, estado, id_fiado, efectivo, saldo)
+
+        - tipo: 'Venta' | 'Gasto' | 'Fiado'
+        - ventas agrupadas por fecha como listar_ventas_resumen
+        - efectivo: parte de ventas.total cobrada en efectivo (0 en gastos
+          y fiados); con esto la caja sale del mismo resultado.
+        - saldo: lo que falta pagar del fiado (NULL en ventas y gastos)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la BD.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(SQL_LIBRO, {"d1": d1, "d2": d2})
+                return cur.fetchall()
+        finally:
+            cn.close()
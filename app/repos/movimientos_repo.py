@@ -3,8 +3,10 @@ from datetime import date
 from typing import List, Tuple, Union
 
 from app.core.database import conectar_bd
+from app.core.profiler import perfilado
 
 
+@perfilado("sql")
 class MovimientosRepo:
     """
     Acceso unificado a movimientos en PostgreSQL:
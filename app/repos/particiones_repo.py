@@ -0,0 +1,162 @@
+# app/repos/particiones_repo.py
+from datetime import date
+from typing import List, Tuple
+
+from psycopg2 import sql
+
+from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+
+
+@perfilado("sql")
+class ParticionesRepo:
+    """
+    Mantenimiento de particiones mensuales (PostgreSQL).
+
+    Las tablas particionadas y la función public.crear_particiones_mensuales
+    se crean con scripts/particionar_tablas.sql.
+    """
+
+    # ==========================================================
+    #   ¿LA TABLA ESTÁ PARTICIONADA?
+    # ==========================================================
+    def es_particionada(self, tabla: str) -> bool:
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT EXISTS (
+                        SELECT 1
+                        FROM pg_partitioned_table pt
+                        JOIN pg_class c     ON c.oid = pt.partrelid
+                        JOIN pg_namespace n ON n.oid = c.relnamespace
+                        WHERE n.nspname = 'public'
+                          AND c.relname = %s
+                    );
+                    """,
+                    (tabla,),
+                )
+                return bool(cur.fetchone()[0])
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   LISTAR PARTICIONES
+    # ==========================================================
+    def listar_particiones(self, tabla: str) -> List[Tuple]:
+        """
+        Tuplas:
+            (nombre, es_default, filas_estimadas)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        c.relname,
+                        pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT' AS es_default,
+                        GREATEST(c.reltuples, 0)::bigint               AS filas
+                    FROM pg_inherits i
+                    JOIN pg_class c     ON c.oid = i.inhrelid
+                    JOIN pg_class p     ON p.oid = i.inhparent
+                    JOIN pg_namespace n ON n.oid = p.relnamespace
+                    WHERE n.nspname = 'public'
+                      AND p.relname = %s
+                    ORDER BY c.relname;
+                    """,
+                    (tabla,),
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   CREAR PARTICIONES FUTURAS
+    # ==========================================================
+    def crear_particiones(self, tabla: str, desde: date, meses: int) -> int:
+        """
+        Crea las particiones mensuales que falten en [desde, desde + meses).
+        Devuelve cuántas se crearon.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    "SELECT public.crear_particiones_mensuales(%s, %s, %s);",
+                    (tabla, desde.strftime("%Y-%m-%d"), int(meses)),
+                )
+                creadas = int(cur.fetchone()[0] or 0)
+            cn.commit()
+            return creadas
+        except Exception:
+            cn.rollback()
+            raise
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   ¿LA PARTICIÓN DEFAULT TIENE FILAS?
+    # ==========================================================
+    def default_tiene_filas(self, nombre: str) -> bool:
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    sql.SQL("SELECT EXISTS (SELECT 1 FROM public.{});").format(
+                        sql.Identifier(nombre)
+                    )
+                )
+                return bool(cur.fetchone()[0])
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   DESPRENDER (ARCHIVAR) UNA PARTICIÓN
+    # ==========================================================
+    def desprender_particion(self, tabla: str, nombre: str, esquema: str) -> None:
+        """
+        Saca la partición de la tabla y la mueve al esquema indicado.
+        Los datos quedan intactos en <esquema>.<nombre>, fuera de los
+        reportes y del vacuum de la tabla principal.
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    sql.SQL("CREATE SCHEMA IF NOT EXISTS {};").format(
+                        sql.Identifier(esquema)
+                    )
+                )
+                cur.execute(
+                    sql.SQL("ALTER TABLE public.{} DETACH PARTITION public.{};").format(
+                        sql.Identifier(tabla), sql.Identifier(nombre)
+                    )
+                )
+                cur.execute(
+                    sql.SQL("ALTER TABLE public.{} SET SCHEMA {};").format(
+                        sql.Identifier(nombre), sql.Identifier(esquema)
+                    )
+                )
+            cn.commit()
+        except Exception:
+            cn.rollback()
+            raise
+        finally:
+            cn.close()
@@ -1,10 +1,13 @@
 # app/repos/productos_repo.py
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+from app.models.catalogo import CatalogoProductos
 from app.models.producto import Producto
 
 
+@perfilado("sql")
 class ProductosRepo:
     """
     Acceso a datos de productos (PostgreSQL).
@@ -14,9 +17,10 @@ class ProductosRepo:
     # ==========================================================
     #   LISTAR ACTIVOS
     # ==========================================================
-    def listar_activos(self) -> List[Producto]:
+    def listar_catalogo(self) -> CatalogoProductos:
         """
-        Devuelve todos los productos activos como una lista de entidades Producto.
+        Productos activos en forma columnar: los arreglos se arman
+        directamente de las filas del cursor, sin objetos por producto.
         """
         cn = conectar_bd()
         if not cn:
@@ -49,25 +53,102 @@ class ProductosRepo:
         finally:
             cn.close()
 
-        productos: List[Producto] = []
-        for r in rows:
-            productos.append(
-                Producto(
-                    id=int(r[0]),
-                    nombre=r[1],
-                    precio_compra=float(r[4]),
-                    precio_venta_unidad=float(r[5]),
-                    precio_venta_blister=float(r[6]) if r[6] is not None else None,
-                    unidades_por_blister=int(r[7] or 1),
-                    stock_unidades=int(r[8] or 0),
-                    stock_actual=int(r[9] or 0),
-                    precio_venta_caja=float(r[10]),
-                    detalle=r[2],
-                    categoria=r[11],
-                    presentacion=r[3],
-                )
+        return CatalogoProductos.desde_filas(rows)
+
+    def listar_activos(self) -> List[Producto]:
+        """
+        Devuelve todos los productos activos como una lista de entidades Producto.
+        """
+        return self.listar_catalogo().a_productos()
+
+    # ==========================================================
+    #   LISTAR ACTIVOS POR PÁGINAS (GRID DE PRODUCTOS)
+    # ==========================================================
+    # Columnas de la grilla → expresión SQL permitida en ORDER BY
+    ORDEN_PAGINA = {
+        "Nombre": "nombre",
+        "Presentacion": "presentacion",
+        "Compra": "precio_compra",
+        "Unidad": "precio_venta_unidad",
+        "Blister": "precio_venta_blister",
+        "Caja": "precio_venta_caja",
+        "StockUnidades": "stock_unidades",
+    }
+
+    def listar_activos_pagina(
+        self,
+        terminos: Sequence[str],
+        ids_incluir: Optional[Sequence[int]],
+        ids_excluir: Optional[Sequence[int]],
+        orden: str,
+        descendente: bool,
+        offset: int,
+        limite: int,
+    ) -> Tuple[List[Tuple], int]:
+        """
+        Una página de productos activos con búsqueda, filtro por ids
+        y orden resueltos en PostgreSQL.
+
+        - terminos: basta que UNO aparezca en nombre, detalle, categoría
+          o presentación (mismo criterio que el buscador de la grilla).
+        - ids_incluir / ids_excluir: filtro por clase ABC (None = sin filtro).
+
+        Devuelve (filas, total_filtrado). Cada fila:
+            (id, nombre, presentacion, detalle, compra, unidad, blister, caja,
+             unidades_por_blister, stock_unidades, categoria)
+        """
+        columna = self.ORDEN_PAGINA.get(orden, "nombre")
+        sentido = "DESC" if descendente else "ASC"
+
+        filtros = ["activo = TRUE"]
+        params: list = []
+        if terminos:
+            filtros.append(
+                "concat_ws(' ', nombre, detalle, categoria, presentacion) ILIKE ANY(%s)"
             )
-        return productos
+            params.append([f"%{t}%" for t in terminos])
+        if ids_incluir is not None:
+            filtros.append("id = ANY(%s)")
+            params.append([int(i) for i in ids_incluir])
+        if ids_excluir:
+            filtros.append("NOT (id = ANY(%s))")
+            params.append([int(i) for i in ids_excluir])
+
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    SELECT
+                        id,
+                        nombre,
+                        presentacion,
+                        detalle,
+                        precio_compra::double precision,
+                        precio_venta_unidad::double precision,
+                        precio_venta_blister::double precision,
+                        precio_venta_caja::double precision,
+                        COALESCE(unidades_por_blister, 1),
+                        COALESCE(stock_unidades, 0),
+                        categoria,
+                        COUNT(*) OVER () AS total
+                    FROM public.productos
+                    WHERE {" AND ".join(filtros)}
+                    ORDER BY {columna} {sentido} NULLS LAST, id
+                    OFFSET %s
+                    LIMIT %s;
+                    """,
+                    (*params, int(offset), int(limite)),
+                )
+                rows = cur.fetchall()
+        finally:
+            cn.close()
+
+        total = int(rows[0][-1]) if rows else 0
+        return [r[:-1] for r in rows], total
 
     # ==========================================================
     #   CREAR PRODUCTO
@@ -0,0 +1,165 @@
+# app/repos/reposicion_repo.py
+from datetime import date
+from typing import List, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+
+from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+
+
+@perfilado("sql")
+class ReposicionRepo:
+    """
+    Acceso a datos para el motor de reposición (PostgreSQL):
+    - Salidas diarias por producto (ventas + fiados) desde movimientos_inventario
+    - Stock actual de productos activos
+    - Tabla public.sugerencias_reposicion (resultado del cálculo batch)
+    """
+
+    # ==========================================================
+    #   SALIDAS DIARIAS POR PRODUCTO
+    # ==========================================================
+    def listar_salidas_diarias(self, desde: date) -> List[Tuple]:
+        """
+        Unidades que salieron por venta o fiado, agrupadas por producto y día,
+        desde la fecha indicada (inclusive).
+
+        Tuplas:
+            (id_producto, dia: date, unidades: int)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        m.id_producto,
+                        m.fecha::date      AS dia,
+                        SUM(m.cantidad)    AS unidades
+                    FROM public.movimientos_inventario m
+                    WHERE m.tipo IN ('venta', 'fiado')
+                      AND m.fecha >= %s
+                    GROUP BY m.id_producto, m.fecha::date;
+                    """,
+                    (desde.strftime("%Y-%m-%d"),),
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   STOCK DE PRODUCTOS ACTIVOS
+    # ==========================================================
+    def listar_stock_activos(self) -> List[Tuple]:
+        """
+        Tuplas:
+            (id, stock_unidades)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        id,
+                        COALESCE(stock_unidades, 0)
+                    FROM public.productos
+                    WHERE activo = TRUE
+                    ORDER BY id;
+                    """
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   GUARDAR SUGERENCIAS (REEMPLAZO COMPLETO)
+    # ==========================================================
+    def guardar_sugerencias(self, filas: Sequence[Tuple]) -> None:
+        """
+        Reemplaza el contenido de public.sugerencias_reposicion en una sola
+        transacción, así el dashboard nunca lee un cálculo a medias.
+
+        Cada fila:
+            (id_producto, stock_unidades, venta_diaria_7, venta_diaria_28,
+             venta_diaria, dias_cobertura | None, cantidad_sugerida)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute("DELETE FROM public.sugerencias_reposicion;")
+                if filas:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO public.sugerencias_reposicion(
+                            id_producto,
+                            stock_unidades,
+                            venta_diaria_7,
+                            venta_diaria_28,
+                            venta_diaria,
+                            dias_cobertura,
+                            cantidad_sugerida
+                        )
+                        VALUES %s;
+                        """,
+                        filas,
+                        page_size=1000,
+                    )
+            cn.commit()
+        except Exception:
+            cn.rollback()
+            raise
+        finally:
+            cn.close()
+
+    # ==========================================================
+    #   LEER SUGERENCIAS (PARA EL DASHBOARD)
+    # ==========================================================
+    def listar_sugerencias(self, max_dias_cobertura: float) -> List[Tuple]:
+        """
+        Productos que necesitan compra o cuya cobertura es menor a
+        max_dias_cobertura, ordenados por urgencia.
+
+        Tuplas:
+            (id, codigo, nombre, stock_unidades, venta_diaria,
+             dias_cobertura, cantidad_sugerida, calculado_en)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        p.id,
+                        p.codigo,
+                        p.nombre,
+                        s.stock_unidades,
+                        s.venta_diaria::double precision,
+                        s.dias_cobertura::double precision,
+                        s.cantidad_sugerida,
+                        s.calculado_en
+                    FROM public.sugerencias_reposicion s
+                    JOIN public.productos p ON p.id = s.id_producto
+                    WHERE p.activo = TRUE
+                      AND (s.cantidad_sugerida > 0 OR s.dias_cobertura < %s)
+                    ORDER BY s.dias_cobertura ASC NULLS LAST, s.cantidad_sugerida DESC;
+                    """,
+                    (float(max_dias_cobertura),),
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
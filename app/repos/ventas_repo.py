@@ -3,12 +3,15 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import date
-from typing import List, Sequence, Dict
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.core.database import conectar_bd
+from app.core.profiler import perfilado
+from app.models.pago import TIPO_PAGO_MIXTO, PagoVenta
 from app.models.venta import CarritoItem
 
 
+@perfilado("sql")
 class VentasRepo:
     """
     Acceso a datos para registrar y consultar ventas completas
@@ -49,6 +52,32 @@ class VentasRepo:
         finally:
             cn.close()
 
+    # ============================================================
+    #  MÉTODOS DE PAGO
+    # ============================================================
+    def listar_metodos_pago(self) -> List[Tuple]:
+        """
+        Métodos de pago activos, en el orden en que se ofrecen:
+        (codigo, nombre, es_efectivo, activo)
+        """
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la base de datos.")
+
+        try:
+            with cn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT codigo, nombre, es_efectivo, activo
+                    FROM public.metodos_pago
+                    WHERE activo = TRUE
+                    ORDER BY orden, codigo;
+                    """
+                )
+                return cur.fetchall()
+        finally:
+            cn.close()
+
     # ============================================================
     #  REGISTRAR VENTAS DESDE EL CARRITO
     # ============================================================
@@ -56,10 +85,13 @@ class VentasRepo:
         self,
         items: List[CarritoItem],
         id_usuario: int,
+        pagos: Optional[Dict[date, List[PagoVenta]]] = None,
     ) -> None:
         """
         Crea una venta por cada fecha distinta y registra:
         - Cabecera en public.ventas
+        - Pagos en public.pagos_venta (pagos[fecha]; sin pagos, todo en
+          efectivo)
         - Detalle en public.detalle_ventas
         - Actualización de stock_unidades en public.productos
         - Movimiento en public.movimientos_inventario
@@ -81,6 +113,11 @@ class VentasRepo:
                 for fecha, lista in by_date.items():
                     total = sum(float(i.monto) for i in lista)
 
+                    pagos_venta = (pagos or {}).get(fecha) or [PagoVenta("efectivo", total)]
+                    tipo_pago = (
+                        pagos_venta[0].metodo if len(pagos_venta) == 1 else TIPO_PAGO_MIXTO
+                    )
+
                     # 1) Cabecera de venta
                     cur.execute(
                         """
@@ -92,12 +129,25 @@ class VentasRepo:
                             id_usuario,
                             estado
                         )
-                        VALUES (%s, %s, 'efectivo', 'Venta app web', %s, 'Activa')
-                        RETURNING id;
+                        VALUES (%s, %s, %s, 'Venta app web', %s, 'Activa')
+                        RETURNING id, fecha;
+                        """,
+                        (fecha, float(total), tipo_pago, int(id_usuario)),
+                    )
+                    id_venta, fecha_venta = cur.fetchone()
+                    id_venta = int(id_venta)
+
+                    # 1.1) Pagos (misma fecha que la venta: índice por fecha/método)
+                    cur.executemany(
+                        """
+                        INSERT INTO public.pagos_venta(id_venta, fecha, metodo, monto)
+                        VALUES (%s, %s, %s, %s);
                         """,
-                        (fecha, float(total), int(id_usuario)),
+                        [
+                            (id_venta, fecha_venta, p.metodo, float(p.monto))
+                            for p in pagos_venta
+                        ],
                     )
-                    id_venta = int(cur.fetchone()[0])
 
                     # 2) Detalles + stock + inventario
                     for item in lista:
@@ -146,6 +196,7 @@ class VentasRepo:
                             """
                             INSERT INTO public.detalle_ventas(
                                 id_venta,
+                                fecha,
                                 id_producto,
                                 tipo,
                                 cantidad,
@@ -153,10 +204,11 @@ class VentasRepo:
                                 unidades_descuento,
                                 costo_unitario_compra
                             )
-                            VALUES (%s, %s, %s, %s, %s, %s, %s);
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
                             """,
                             (
                                 id_venta,
+                                fecha_venta,
                                 pid,
                                 tipo,
                                 cantidad,
@@ -5,6 +5,13 @@ from .fiados_service import FiadosService
 from .gastos_service import GastosService
 from .inventario_service import InventarioService
 from .dashboard_service import DashboardService
+from .reposicion_service import ReposicionService
+from .conciliacion_service import ConciliacionService
+from .particiones_service import ParticionesService
+from .archivo_service import ArchivoService
+from .exportes_service import ExportesService
+from .cortes_caja_service import CortesCajaService
+from .contexto import ContextoApp
 
 __all__ = [
     "AuthService",
@@ -14,4 +21,11 @@ __all__ = [
     "GastosService",
     "InventarioService",
     "DashboardService",
+    "ReposicionService",
+    "ConciliacionService",
+    "ParticionesService",
+    "ArchivoService",
+    "ExportesService",
+    "CortesCajaService",
+    "ContextoApp",
 ]
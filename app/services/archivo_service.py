@@ -0,0 +1,217 @@
+# app/services/archivo_service.py
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.compute as pc
+
+from app.core.profiler import perfilado
+from app.models.pago import TIPO_PAGO_MIXTO
+from app.repos.archivo_repo import ArchivoRepo
+
+
+@perfilado("service")
+class ArchivoService:
+    """
+    Archivo histórico de ventas, detalle_ventas, pagos_venta y
+    movimientos_inventario.
+
+    - archivar(): pasa los meses cerrados de PostgreSQL a Parquet.
+    - Lecturas agregadas sobre el archivo para que InventarioService y
+      DashboardService sumen los meses archivados a lo que sigue en la BD.
+      Mientras el rango no toque meses archivados no se abre ningún archivo.
+    """
+
+    # Orden de borrado: hijos antes que padres (FK detalle/pagos → ventas)
+    TABLAS = ("movimientos_inventario", "detalle_ventas", "pagos_venta", "ventas")
+
+    # Reposición usa 56 días de movimientos: nunca archivar menos de 3 meses
+    RETENCION_MINIMA = 3
+
+    def __init__(self) -> None:
+        self.repo = ArchivoRepo()
+
+    # ==========================================================
+    #   ARCHIVAR MESES CERRADOS
+    # ==========================================================
+    def archivar(
+        self, retener_meses: int = 24, hoy: Optional[date] = None
+    ) -> List[Tuple[str, int, int, int]]:
+        """
+        Exporta a Parquet y quita de la BD cada mes anterior a
+        (mes actual - retener_meses). Un mes solo se borra de la BD
+        después de escribir y verificar los archivos de todas las tablas.
+
+        Devuelve [(tabla, anio, mes, filas)].
+        """
+        if retener_meses < self.RETENCION_MINIMA:
+            raise ValueError(
+                f"Se deben retener al menos {self.RETENCION_MINIMA} meses en la BD."
+            )
+
+        hoy = hoy or date.today()
+        total = hoy.year * 12 + (hoy.month - 1) - retener_meses
+        corte = date(total // 12, total % 12 + 1, 1)
+
+        meses = set()
+        for tabla in self.TABLAS:
+            meses |= self.repo.meses_en_bd(tabla, corte)
+
+        resultado: List[Tuple[str, int, int, int]] = []
+        for anio, mes in sorted(meses):
+            for tabla in self.TABLAS:
+                filas = self.repo.exportar_mes(tabla, anio, mes)
+                resultado.append((tabla, anio, mes, filas))
+            self.repo.borrar_mes(self.TABLAS, anio, mes)
+
+        return resultado
+
+    # ==========================================================
+    #   ¿EL RANGO TOCA MESES ARCHIVADOS?
+    # ==========================================================
+    def cubre(self, desde: date, hasta: date, tabla: str = "ventas") -> bool:
+        return any(
+            (desde.year, desde.month) <= m <= (hasta.year, hasta.month)
+            for m in self.repo.meses_archivados(tabla)
+        )
+
+    # ==========================================================
+    #   LECTURAS PARA REPORTES
+    # ==========================================================
+    def _ventas_activas(self, desde: date, hasta: date) -> pd.DataFrame:
+        ventas = self.repo.leer("ventas", desde, hasta, ["id", "estado"])
+        return ventas.filter(pc.equal(ventas.column("estado"), "Activa")).to_pandas()
+
+    def ventas_resumen(self, desde: date, hasta: date) -> List[Tuple]:
+        """
+        Igual que InventarioRepo.listar_ventas_resumen pero sobre el archivo:
+        (fecha 'YYYY-MM-DD HH:MM', detalle, cantidad, monto)
+        """
+        if not self.cubre(desde, hasta):
+            return []
+
+        det = self.repo.leer(
+            "detalle_ventas",
+            desde,
+            hasta,
+            ["id", "fecha", "id_producto", "cantidad", "precio_unitario"],
+        ).to_pandas()
+        if det.empty:
+            return []
+
+        nombres = self.repo.nombres_productos(det["id_producto"].unique().tolist())
+        det = det.sort_values("id")
+        det["nombre"] = det["id_producto"].map(
+            lambda pid: nombres.get(int(pid), ("", f"Producto #{pid}"))[1]
+        )
+        det["linea"] = det["nombre"] + " x" + det["cantidad"].astype(str)
+        det["monto"] = det["cantidad"] * det["precio_unitario"]
+
+        agrupado = det.groupby("fecha", sort=True).agg(
+            detalle=("linea", ", ".join),
+            cantidad=("cantidad", "sum"),
+            monto=("monto", "sum"),
+        )
+        fechas = agrupado.index.strftime("%Y-%m-%d %H:%M")
+        return list(
+            zip(
+                fechas,
+                agrupado["detalle"],
+                agrupado["cantidad"].astype(int),
+                agrupado["monto"].astype(float),
+            )
+        )
+
+    def total_ventas_efectivo(self, desde: date, hasta: date) -> float:
+        if not self.cubre(desde, hasta):
+            return 0.0
+
+        por_metodo = self.ventas_por_metodo(desde, hasta)
+        return float(por_metodo.get("efectivo", 0.0))
+
+    def ventas_por_metodo(self, desde: date, hasta: date) -> Dict[str, float]:
+        """
+        {metodo: monto} de las ventas archivadas. Los meses archivados antes
+        de existir pagos_venta se reparten por ventas.tipo_pago (un solo
+        método por venta); los pagos divididos ('mixto') salen de pagos_venta.
+        """
+        if not self.cubre(desde, hasta):
+            return {}
+
+        ventas = self.repo.leer("ventas", desde, hasta, ["id", "total", "tipo_pago"]).to_pandas()
+        if ventas.empty:
+            return {}
+
+        tipo = ventas["tipo_pago"].fillna("efectivo").str.lower()
+        mixtas = tipo == TIPO_PAGO_MIXTO
+        resultado = ventas.loc[~mixtas, "total"].groupby(tipo[~mixtas]).sum()
+
+        if mixtas.any():
+            pagos = self.repo.leer(
+                "pagos_venta", desde, hasta, ["id_venta", "metodo", "monto"]
+            ).to_pandas()
+            pagos = pagos[pagos["id_venta"].isin(ventas.loc[mixtas, "id"])]
+            resultado = resultado.add(pagos.groupby("metodo")["monto"].sum(), fill_value=0)
+
+        return {str(m): float(v) for m, v in resultado.items()}
+
+    def resumen(self, desde: date, hasta: date) -> Dict[str, float]:
+        """{'total_vendido', 'ganancia'} de ventas activas archivadas."""
+        if not self.cubre(desde, hasta):
+            return {"total_vendido": 0.0, "ganancia": 0.0}
+
+        ventas = self.repo.leer("ventas", desde, hasta, ["id", "total", "estado"]).to_pandas()
+        ventas = ventas[ventas["estado"] == "Activa"]
+
+        por_producto = self.ventas_por_producto(desde, hasta)
+        return {
+            "total_vendido": float(ventas["total"].sum()),
+            "ganancia": float(por_producto["margen"].sum()) if not por_producto.empty else 0.0,
+        }
+
+    def ventas_por_producto(self, desde: date, hasta: date) -> pd.DataFrame:
+        """
+        DataFrame [id_producto, unidades, ingreso, margen] de ventas activas
+        archivadas (mismas fórmulas que DashboardRepo).
+        """
+        cols = ["id_producto", "unidades", "ingreso", "margen"]
+        if not self.cubre(desde, hasta):
+            return pd.DataFrame(columns=cols)
+
+        det = self.repo.leer(
+            "detalle_ventas",
+            desde,
+            hasta,
+            [
+                "id_venta",
+                "id_producto",
+                "cantidad",
+                "precio_unitario",
+                "unidades_descuento",
+                "costo_unitario_compra",
+            ],
+        ).to_pandas()
+        if det.empty:
+            return pd.DataFrame(columns=cols)
+
+        activas = self._ventas_activas(desde, hasta)["id"]
+        det = det[det["id_venta"].isin(activas)].copy()
+
+        det["ingreso"] = det["cantidad"] * det["precio_unitario"]
+        det["margen"] = (
+            det["precio_unitario"] - det["costo_unitario_compra"]
+        ) * det["unidades_descuento"]
+
+        return (
+            det.groupby("id_producto", as_index=False)
+            .agg(
+                unidades=("unidades_descuento", "sum"),
+                ingreso=("ingreso", "sum"),
+                margen=("margen", "sum"),
+            )[cols]
+        )
+
+    def nombres_productos(self, ids) -> Dict[int, Tuple[str, str]]:
+        return self.repo.nombres_productos(list(ids))
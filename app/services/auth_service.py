@@ -1,10 +1,12 @@
 from __future__ import annotations
 from typing import Optional, Dict, Any
 
+from app.core.profiler import perfilado
 from app.repos.users_repo import get_user_by_username
 from app.core.auth import verify_password
 
 
+@perfilado("service")
 class AuthService:
     """
     Servicio de autenticación.
@@ -16,48 +16,54 @@ class BaseService:
     PRICE_BLISTER_CANDIDATES = ["precio_venta_blister", "precio_blister"]
 
     def __init__(self, cn=None):
-        self._close_after = False
-        if cn is None:
-            cn = conectar_bd()
-            self._close_after = True
-        if not cn:
-            raise RuntimeError("No hay conexión a SQL Server.")
-        self.cn = cn
-
-    def close(self):
-        if self._close_after and self.cn:
-            self.cn.close()
-            self.cn = None
-
-    def __del__(self):
-        try:
-            self.close()
-        except Exception:
-            pass
+        # Conexión prestada por quien crea el service (p. ej. dentro de una
+        # transacción más grande). Sin ella, cada operación pide una al pool
+        # y la devuelve al terminar: el service no guarda conexiones abiertas
+        # y se puede compartir entre hilos/sesiones.
+        self._cn_externa = cn
 
     # -------------------------------
     # DB helpers
     # -------------------------------
+    @contextmanager
+    def conexion(self):
+        """
+        with service.conexion() as cn:
+            ...
+        """
+        if self._cn_externa is not None:
+            yield self._cn_externa
+            return
+
+        cn = conectar_bd()
+        if not cn:
+            raise RuntimeError("No se pudo conectar a la BD.")
+        try:
+            yield cn
+        finally:
+            cn.close()
+
     @contextmanager
     def tx(self):
         """
         Contexto de transacción:
-        with service.tx():
+        with service.tx() as cn:
             ...
         """
-        try:
-            yield
-            self.cn.commit()
-        except Exception:
-            self.cn.rollback()
-            raise
+        with self.conexion() as cn:
+            try:
+                yield cn
+                cn.commit()
+            except Exception:
+                cn.rollback()
+                raise
 
     def price_columns(self) -> Tuple[str, Optional[str]]:
         """
         Detecta nombres de columnas de precios en dbo.productos.
         Devuelve: (col_unidad, col_blister|None)
         """
-        with self.cn.cursor() as cur:
+        with self.conexion() as cn, cn.cursor() as cur:
             cur.execute("""
                 SELECT COLUMN_NAME
                 FROM INFORMATION_SCHEMA.COLUMNS
@@ -0,0 +1,109 @@
+# app/services/conciliacion_service.py
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.profiler import perfilado
+from app.repos.conciliacion_repo import ConciliacionRepo
+
+
+@perfilado("service")
+class ConciliacionService:
+    """
+    Conciliación nocturna de productos.stock_unidades contra el libro
+    de movimientos_inventario.
+
+    El catálogo se parte en bloques por rango de id de producto; cada
+    bloque es una sola consulta con funciones de ventana y puede correr
+    en paralelo (un hilo y una conexión por bloque).
+    """
+
+    COLUMNAS = [
+        "Id",
+        "Producto",
+        "Stock actual",
+        "Stock según libro",
+        "Diferencia",
+        "Movimientos",
+        "Movimientos descuadrados",
+    ]
+
+    def __init__(self) -> None:
+        self.repo = ConciliacionRepo()
+
+    # ==========================================================
+    #   BLOQUES
+    # ==========================================================
+    @staticmethod
+    def bloques(id_min: int, id_max: int, tamano: int) -> List[Tuple[int, int]]:
+        """Parte [id_min, id_max] en rangos cerrados de `tamano` ids."""
+        if tamano <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor que cero.")
+        return [
+            (inicio, min(inicio + tamano - 1, id_max))
+            for inicio in range(id_min, id_max + 1, tamano)
+        ]
+
+    # ==========================================================
+    #   CONCILIAR
+    # ==========================================================
+    def conciliar(
+        self,
+        reparar: bool = False,
+        tamano_bloque: int = 5000,
+        hilos: int = 1,
+        id_desde: Optional[int] = None,
+        id_hasta: Optional[int] = None,
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        Detecta (y opcionalmente repara) descuadres de stock.
+
+        - id_desde / id_hasta permiten repartir el catálogo entre varios
+          procesos o máquinas; por defecto se toma todo el catálogo.
+
+        Devuelve:
+        - DataFrame con los productos descuadrados
+        - cantidad de productos reparados (0 si reparar=False)
+        """
+        if hilos <= 0:
+            raise ValueError("La cantidad de hilos debe ser mayor que cero.")
+
+        rango = self.repo.rango_ids_productos()
+        if rango is None:
+            return pd.DataFrame(columns=self.COLUMNAS), 0
+
+        id_min = rango[0] if id_desde is None else max(rango[0], int(id_desde))
+        id_max = rango[1] if id_hasta is None else min(rango[1], int(id_hasta))
+        if id_min > id_max:
+            return pd.DataFrame(columns=self.COLUMNAS), 0
+
+        bloques = self.bloques(id_min, id_max, tamano_bloque)
+
+        def procesar(bloque: Tuple[int, int]) -> Tuple[List[Tuple], int]:
+            filas = self.repo.listar_descuadres(*bloque)
+            reparados = 0
+            if reparar:
+                ajustes = [
+                    (pid, stock_actual, stock_esperado)
+                    for pid, _n, stock_actual, stock_esperado, diferencia, _m, _d in filas
+                    if diferencia != 0
+                ]
+                reparados = self.repo.reparar_stock(ajustes)
+            return filas, reparados
+
+        if hilos == 1:
+            resultados = [procesar(b) for b in bloques]
+        else:
+            with ThreadPoolExecutor(max_workers=hilos) as pool:
+                resultados = list(pool.map(procesar, bloques))
+
+        filas = [f for parcial, _ in resultados for f in parcial]
+        reparados = sum(r for _, r in resultados)
+
+        if not filas:
+            return pd.DataFrame(columns=self.COLUMNAS), reparados
+
+        return pd.DataFrame(filas, columns=self.COLUMNAS), reparados
@@ -0,0 +1,74 @@
+# app/services/contexto.py
+from __future__ import annotations
+
+import threading
+
+from app.core.cache import crear_cache
+from app.core.database import cerrar_pool
+from app.services.archivo_service import ArchivoService
+from app.services.cortes_caja_service import CortesCajaService
+from app.services.dashboard_service import ABC_CACHE_TTL, DashboardService
+from app.services.exportes_service import ExportesService
+from app.services.fiados_service import FiadosService
+from app.services.gastos_service import GastosService
+from app.services.inventario_service import InventarioService
+from app.services.productos_service import ProductosService
+from app.services.reposicion_service import ReposicionService
+from app.services.ventas_service import VentasService
+
+
+class ContextoApp:
+    """
+    Objetos compartidos de la aplicación: caché, archivo histórico y
+    services. Se crea UNA vez por proceso (en la web vía st.cache_resource)
+    y lo usan todas las sesiones/cajeros a la vez.
+
+    Por qué es seguro compartirlo entre hilos:
+    - Los services y repos no guardan estado por llamada: cada método pide
+      su conexión al pool (conectar_bd) y la devuelve al terminar.
+    - El pool (ThreadedConnectionPool) y la caché tienen su propio lock
+      (SQLiteCache usa una conexión por hilo; Redis es seguro entre hilos).
+    - Lo que es de una sesión (usuario, carrito, filtros) vive en
+      st.session_state, nunca aquí.
+
+    Con CACHE_BACKEND=sqlite o redis la caché es la misma para todos los
+    procesos: lo que un proceso invalida (venta, fiado, ajuste) deja de
+    verse en los demás.
+
+    cerrar() vacía la caché y cierra las conexiones del pool; después de
+    cerrarlo el contexto no se debe usar.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cerrado = False
+
+        # Compartidos entre services
+        # CACHE_BACKEND=memoria|sqlite|redis (ver app/core/cache.crear_cache)
+        self.cache = crear_cache(ttl=ABC_CACHE_TTL)
+        self.archivo = ArchivoService()
+
+        # Services
+        self.cortes = CortesCajaService(cache=self.cache, archivo=self.archivo)
+        self.dashboard = DashboardService(
+            cache=self.cache, archivo=self.archivo, cortes=self.cortes
+        )
+        self.inventario = InventarioService(archivo=self.archivo, cortes=self.cortes)
+        self.fiados = FiadosService(cache=self.cache)
+        self.gastos = GastosService()
+        self.productos = ProductosService(cache=self.cache)
+        self.ventas = VentasService(cache=self.cache)
+        self.reposicion = ReposicionService()
+        self.exportes = ExportesService(archivo=self.archivo)
+
+    @property
+    def cerrado(self) -> bool:
+        return self._cerrado
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self._cerrado:
+                return
+            self._cerrado = True
+        self.cache.invalidate()
+        cerrar_pool()
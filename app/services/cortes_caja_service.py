@@ -0,0 +1,145 @@
+# app/services/cortes_caja_service.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from app.core.cache import SinCache
+from app.core.profiler import perfilado
+from app.models.corte_caja import CorteCaja
+from app.repos.cortes_caja_repo import CortesCajaRepo
+from app.services.archivo_service import ArchivoService
+
+Tramo = Tuple[date, date]
+
+
+@perfilado("service")
+class CortesCajaService:
+    """
+    Corte de caja diario.
+
+    Al cerrar un día se guardan sus totales (ventas por tipo de pago,
+    ganancia, gastos, fiados nuevos / pendientes / cobrados y el efectivo
+    esperado en caja). Desde ese momento el día no admite cambios (trigger
+    en la BD) y los reportes de un rango toman los días cerrados de
+    cortes_caja: solo los días abiertos se calculan sobre los movimientos.
+    """
+
+    # Un corte no cambia nunca; solo aparecen cortes nuevos (cerrar_dia
+    # invalida el espacio "cortes")
+    CACHE_TTL = 3600
+
+    def __init__(self, cache=None, archivo: Optional[ArchivoService] = None) -> None:
+        self.repo = CortesCajaRepo()
+        self.cache = cache if cache is not None else SinCache()
+        self.archivo = archivo if archivo is not None else ArchivoService()
+
+    # ==========================================================
+    #   CERRAR DÍA
+    # ==========================================================
+    def cerrar_dia(self, fecha: date, id_usuario: Optional[int] = None) -> CorteCaja:
+        """
+        Guarda el corte del día. Un día solo se cierra una vez.
+        """
+        if not isinstance(fecha, date):
+            raise ValueError("La fecha del corte no es válida.")
+        if fecha > date.today():
+            raise ValueError("No se puede cerrar un día que todavía no termina.")
+        if self.archivo.cubre(fecha, fecha):
+            # Los movimientos ya no están en la BD: el corte saldría en cero
+            raise ValueError(f"El mes de {fecha:%Y-%m-%d} ya está archivado.")
+
+        fila = self.repo.cerrar_dia(fecha, id_usuario)
+        if fila is None:
+            raise ValueError(f"El día {fecha:%Y-%m-%d} ya tiene corte de caja.")
+
+        # Los reportes del rango pasan a leer el corte
+        for espacio in ("cortes", "kpis"):
+            self.cache.invalidate(espacio)
+
+        return CorteCaja.from_row(fila)
+
+    def cerrar_pendientes(
+        self, desde: date, hasta: date, id_usuario: Optional[int] = None
+    ) -> List[CorteCaja]:
+        """Cierra, en orden, los días de [desde, hasta] que aún no tienen corte."""
+        cerrados = {c.fecha for c in self.listar(desde, hasta)}
+        nuevos = []
+        dia = desde
+        while dia <= hasta:
+            if dia not in cerrados:
+                nuevos.append(self.cerrar_dia(dia, id_usuario))
+            dia += timedelta(days=1)
+        return nuevos
+
+    # ==========================================================
+    #   CONSULTAS
+    # ==========================================================
+    def listar(self, desde: date, hasta: date) -> List[CorteCaja]:
+        """Cortes del rango (cacheados: un corte no cambia)."""
+        return self.cache.get_or_set(
+            ("cortes", desde, hasta),
+            lambda: CorteCaja.from_rows(self.repo.listar_rango(desde, hasta)),
+            self.CACHE_TTL,
+        )
+
+    def listar_df(self, desde: date, hasta: date) -> pd.DataFrame:
+        """Cortes del rango para mostrar en tabla."""
+        cortes = self.listar(desde, hasta)
+        return pd.DataFrame(
+            {
+                "Fecha": [c.fecha for c in cortes],
+                "Ventas": [c.num_ventas for c in cortes],
+                "Vendido (Q)": [c.ventas_total for c in cortes],
+                "Efectivo (Q)": [c.ventas_efectivo for c in cortes],
+                "Gastos (Q)": [c.gastos for c in cortes],
+                "Fiado pendiente (Q)": [c.fiados_pendientes for c in cortes],
+                "Fiados cobrados (Q)": [c.fiados_cobrados for c in cortes],
+                "Caja esperada (Q)": [c.efectivo_esperado for c in cortes],
+            }
+        )
+
+    def resumen(self, desde: date, hasta: date) -> Tuple[List[CorteCaja], List[Tramo]]:
+        """
+        Divide el rango en días cerrados y tramos abiertos:
+        - cortes: los CorteCaja del rango
+        - abiertos: [(desde, hasta), ...] de días consecutivos sin corte,
+          los únicos que hay que calcular sobre los movimientos
+        """
+        cortes = self.listar(desde, hasta)
+        return cortes, tramos_abiertos(desde, hasta, {c.fecha for c in cortes})
+
+
+def tramos_abiertos(desde: date, hasta: date, cerrados: Set[date]) -> List[Tramo]:
+    """Sub-rangos de [desde, hasta] sin días cerrados (normalmente 0 o 1)."""
+    tramos: List[Tramo] = []
+    inicio: Optional[date] = None
+    dia = desde
+    while dia <= hasta:
+        if dia in cerrados:
+            if inicio is not None:
+                tramos.append((inicio, dia - timedelta(days=1)))
+                inicio = None
+        elif inicio is None:
+            inicio = dia
+        dia += timedelta(days=1)
+    if inicio is not None:
+        tramos.append((inicio, hasta))
+    return tramos
+
+
+def sumar_cortes(cortes: Sequence[CorteCaja]) -> Dict[str, float]:
+    """Totales de varios cortes con las claves de InventarioService.get_libro."""
+    vendido = sum(c.ventas_total for c in cortes)
+    gastos = sum(c.gastos for c in cortes)
+    pendiente = sum(c.fiados_pendientes for c in cortes)
+    cobrados = sum(c.fiados_cobrados for c in cortes)
+    return {
+        "vendido": vendido,
+        "gastos": gastos,
+        "fiado_pendiente": pendiente,
+        "balance": vendido + cobrados - gastos - pendiente,
+        "caja_efectivo": sum(c.efectivo_esperado for c in cortes),
+    }
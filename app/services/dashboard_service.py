@@ -1,12 +1,53 @@
 # app/services/dashboard_service.py
 from datetime import date
-from typing import Dict
+from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
+from app.core.cache import TTLCache
+from app.core.dataframes import df_desde_filas
+from app.core.profiler import perfilado
 from app.repos.dashboard_repo import DashboardRepo
+from app.services.archivo_service import ArchivoService
+from app.services.cortes_caja_service import CortesCajaService
 
+# La clasificación ABC cambia poco durante el día: 10 minutos de caché
+ABC_CACHE_TTL = 600
 
+# KPIs del inicio: los invalidan las ventas y fiados; el TTL cubre los
+# cambios hechos desde otros clientes
+KPIS_CACHE_TTL = 60
+
+# Esquemas de las tablas del dashboard (mismo orden que el SELECT del repo)
+ESQUEMA_PRODUCTOS_STOCK = {
+    "Id": "int",
+    "Código": "str",
+    "Producto": "str",
+    "Stock (unidades)": "int",
+    "Precio unidad": "float",
+    "Precio blister": "float",
+    "Unidades por blister": "int",
+}
+ESQUEMA_TOP = {"Id": "int", "Código": "str", "Producto": "str", "Unidades vendidas": "int"}
+ESQUEMA_ABC = {
+    "Id": "int",
+    "Código": "str",
+    "Producto": "str",
+    "Ingreso (Q)": "float",
+    "Margen (Q)": "float",
+    "% ingreso": "float",
+    "% margen": "float",
+    "% acumulado": "float",
+    "Clase": "str",
+}
+
+# Cortes de participación acumulada para las clases A y B
+ABC_CORTE_A = 0.80
+ABC_CORTE_B = 0.95
+
+
+@perfilado("service")
 class DashboardService:
     """
     Lógica de negocio para el dashboard de inicio.
@@ -14,8 +55,19 @@ class DashboardService:
     delegar el SQL al DashboardRepo.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache: Optional[TTLCache] = None,
+        archivo: Optional[ArchivoService] = None,
+        cortes: Optional[CortesCajaService] = None,
+    ) -> None:
         self.repo = DashboardRepo()
+        self.cache = cache if cache is not None else TTLCache(ttl=ABC_CACHE_TTL)
+        self.archivo = archivo if archivo is not None else ArchivoService()
+        self.cortes = (
+            cortes if cortes is not None
+            else CortesCajaService(cache=self.cache, archivo=self.archivo)
+        )
 
     # ==========================================================
     #   RESUMEN GENERAL (KPIs)
@@ -28,8 +80,31 @@ class DashboardService:
         - vendido_rango
         - ganancia_rango
         - fiado_pendiente
+
+        Se cachea por rango de fechas (espacio "kpis").
         """
-        return self.repo.get_resumen(desde, hasta)
+        return self.cache.get_or_set(
+            ("kpis", desde, hasta),
+            lambda: self._calcular_resumen(desde, hasta),
+            KPIS_CACHE_TTL,
+        )
+
+    def _calcular_resumen(self, desde: date, hasta: date) -> Dict[str, float]:
+        # Días con corte de caja: vendido y ganancia salen del corte; solo
+        # los tramos abiertos se suman sobre ventas / detalle_ventas
+        cortes, abiertos = self.cortes.resumen(desde, hasta)
+        resumen = self.repo.get_resumen(desde, hasta, tramos=abiertos)
+        resumen["total_vendido"] += sum(c.ventas_total for c in cortes)
+        resumen["ganancia"] += sum(c.ganancia for c in cortes)
+
+        # Meses archivados en Parquet (rangos antiguos)
+        for t1, t2 in abiertos:
+            if self.archivo.cubre(t1, t2):
+                archivado = self.archivo.resumen(t1, t2)
+                resumen["total_vendido"] += archivado["total_vendido"]
+                resumen["ganancia"] += archivado["ganancia"]
+
+        return resumen
 
     # ==========================================================
     #   INVENTARIO COMPLETO (PARA TABLA)
@@ -39,21 +114,7 @@ class DashboardService:
         Devuelve el inventario completo como DataFrame.
         Cada fila representa un producto.
         """
-        rows = self.repo.get_inventario_completo()
-        cols = [
-            "Id",
-            "Código",
-            "Producto",
-            "Stock (unidades)",
-            "Precio unidad",
-            "Precio blister",
-            "Unidades por blister",
-        ]
-
-        if not rows:
-            return pd.DataFrame(columns=cols)
-
-        return pd.DataFrame(rows, columns=cols)
+        return df_desde_filas(self.repo.get_inventario_completo(), ESQUEMA_PRODUCTOS_STOCK)
 
     # ==========================================================
     #   TOP MÁS VENDIDOS
@@ -64,13 +125,47 @@ class DashboardService:
         """
         Devuelve top_n productos más vendidos dentro del rango.
         """
+        if self.archivo.cubre(desde, hasta):
+            return self._top_con_archivo(desde, hasta, top_n)
+
         rows = self.repo.get_top_productos_vendidos(desde, hasta, top_n)
-        cols = ["Id", "Código", "Producto", "Unidades vendidas"]
+        return df_desde_filas(rows, ESQUEMA_TOP)
+
+    def _top_con_archivo(self, desde: date, hasta: date, top_n: int) -> pd.DataFrame:
+        """Top vendidos sumando BD (todos los productos) + meses archivados."""
+        df_bd = df_desde_filas(
+            self.repo.get_top_productos_vendidos(desde, hasta, None), ESQUEMA_TOP
+        )
+        df_arch = self.archivo.ventas_por_producto(desde, hasta)
 
-        if not rows:
-            return pd.DataFrame(columns=cols)
+        unidades = pd.concat(
+            [
+                df_bd.set_index("Id")["Unidades vendidas"],
+                df_arch.set_index("id_producto")["unidades"],
+            ]
+        ).groupby(level=0).sum()
+        if unidades.empty:
+            return df_desde_filas([], ESQUEMA_TOP)
 
-        return pd.DataFrame(rows, columns=cols)
+        nombres = dict(zip(df_bd["Id"], zip(df_bd["Código"], df_bd["Producto"])))
+        faltan = [pid for pid in unidades.index if pid not in nombres]
+        nombres.update(self.archivo.nombres_productos(faltan))
+
+        df = pd.DataFrame(
+            {
+                "Id": unidades.index.astype(int),
+                "Código": [nombres.get(pid, ("", ""))[0] for pid in unidades.index],
+                "Producto": [
+                    nombres.get(pid, ("", f"Producto #{pid}"))[1] for pid in unidades.index
+                ],
+                "Unidades vendidas": unidades.to_numpy().astype(int),
+            }
+        )
+        return (
+            df.sort_values(["Unidades vendidas", "Producto"], ascending=[False, True])
+            .head(int(top_n))
+            .reset_index(drop=True)
+        )
 
     # ==========================================================
     #   PRODUCTOS CON STOCK CRÍTICO
@@ -80,17 +175,75 @@ class DashboardService:
         Devuelve productos cuyo stock es ≤ threshold.
         """
         rows = self.repo.get_productos_stock_critico(threshold)
-        cols = [
-            "Id",
-            "Código",
-            "Producto",
-            "Stock (unidades)",
-            "Precio unidad",
-            "Precio blister",
-            "Unidades por blister",
-        ]
-
-        if not rows:
-            return pd.DataFrame(columns=cols)
-
-        return pd.DataFrame(rows, columns=cols)
+        return df_desde_filas(rows, ESQUEMA_PRODUCTOS_STOCK)
+
+    # ==========================================================
+    #   CLASIFICACIÓN ABC (PARETO)
+    # ==========================================================
+    def get_clasificacion_abc_df(self, desde: date, hasta: date) -> pd.DataFrame:
+        """
+        Devuelve la clasificación ABC de los productos activos en el rango.
+        El resultado se cachea por rango de fechas.
+        """
+        key = ("abc", desde.isoformat(), hasta.isoformat())
+        return self.cache.get_or_set(
+            key, lambda: self._calcular_clasificacion_abc_df(desde, hasta)
+        )
+
+    def get_clase_abc_por_producto(self, desde: date, hasta: date) -> Dict[int, str]:
+        """
+        Devuelve {id_producto: 'A'|'B'|'C'} para filtrar el listado de productos.
+        """
+        df = self.get_clasificacion_abc_df(desde, hasta)
+        if df.empty:
+            return {}
+        return dict(zip(df["Id"].astype(int), df["Clase"]))
+
+    def invalidar_clasificacion_abc(self) -> None:
+        """Descarta la clasificación cacheada (ej. tras registrar ventas)."""
+        self.cache.invalidate("abc")
+
+    def _calcular_clasificacion_abc_df(self, desde: date, hasta: date) -> pd.DataFrame:
+        rows = self.repo.get_clasificacion_abc(
+            desde, hasta, ABC_CORTE_A, ABC_CORTE_B
+        )
+        df = df_desde_filas(rows, ESQUEMA_ABC)
+        if df.empty:
+            return df
+
+        if self.archivo.cubre(desde, hasta):
+            df = self._reclasificar_con_archivo(df, desde, hasta)
+
+        for col in ("% ingreso", "% margen", "% acumulado"):
+            df[col] = (df[col] * 100).round(2)
+        return df
+
+    def _reclasificar_con_archivo(
+        self, df: pd.DataFrame, desde: date, hasta: date
+    ) -> pd.DataFrame:
+        """
+        Suma ingreso/margen de los meses archivados y repite en pandas el
+        mismo cálculo de participación, acumulado y clase que hace el SQL.
+        """
+        arch = self.archivo.ventas_por_producto(desde, hasta).set_index("id_producto")
+        df = df.copy()
+        df["Ingreso (Q)"] = df["Ingreso (Q)"] + df["Id"].map(arch["ingreso"]).fillna(0.0)
+        df["Margen (Q)"] = df["Margen (Q)"] + df["Id"].map(arch["margen"]).fillna(0.0)
+
+        df = df.sort_values(["Ingreso (Q)", "Id"], ascending=[False, True]).reset_index(drop=True)
+        total_ingreso = df["Ingreso (Q)"].sum()
+        total_margen = df["Margen (Q)"].sum()
+
+        df["% ingreso"] = df["Ingreso (Q)"] / total_ingreso if total_ingreso else 0.0
+        df["% margen"] = df["Margen (Q)"] / total_margen if total_margen else 0.0
+        df["% acumulado"] = (
+            df["Ingreso (Q)"].cumsum() / total_ingreso if total_ingreso else 0.0
+        )
+
+        previo = df["% acumulado"] - df["% ingreso"]
+        df["Clase"] = np.select(
+            [df["Ingreso (Q)"] <= 0, previo < ABC_CORTE_A, previo < ABC_CORTE_B],
+            ["C", "A", "B"],
+            default="C",
+        )
+        return df
@@ -0,0 +1,321 @@
+# app/services/exportes_service.py
+from __future__ import annotations
+
+import csv
+import os
+import re
+import time
+import uuid
+import zipfile
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from app.core.profiler import perfilado
+from app.repos.exportes_repo import ExportesRepo
+from app.services.archivo_service import ArchivoService
+
+EXPORTES_DIR = os.getenv("EXPORTES_DIR", "exportes")
+# Los archivos generados se borran pasado este tiempo (segundos)
+EXPORTES_VIGENCIA = 3600
+
+FORMATOS = ("csv", "parquet", "xlsx")
+
+# Columnas de cada reporte (mismo orden que ExportesRepo.CONSULTAS) y tipo:
+# "str" | "int" | "float"
+COLUMNAS: Dict[str, List[Tuple[str, str]]] = {
+    "libro": [
+        ("Fecha", "str"),
+        ("Tipo", "str"),
+        ("Persona", "str"),
+        ("Detalle", "str"),
+        ("Cantidad", "int"),
+        ("Monto (Q)", "float"),
+        ("Estado", "str"),
+        ("Id fiado", "int"),
+        ("Efectivo (Q)", "float"),
+        ("Saldo (Q)", "float"),
+    ],
+    "gastos": [
+        ("Fecha", "str"),
+        ("Descripción", "str"),
+        ("Categoría", "str"),
+        ("Monto (Q)", "float"),
+    ],
+    "fiados": [
+        ("Id", "int"),
+        ("Fecha", "str"),
+        ("Cliente", "str"),
+        ("Producto", "str"),
+        ("Cantidad", "int"),
+        ("Monto (Q)", "float"),
+        ("Estado", "str"),
+        ("Saldo (Q)", "float"),
+    ],
+}
+
+_TIPOS_ARROW = {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}
+
+# Bloque que lee pyarrow del CSV por vez (acota la memoria al convertir)
+TAMANO_BLOQUE = 8 << 20
+
+# Excel: 1.048.576 filas por hoja, contando el encabezado
+FILAS_POR_HOJA = 1_048_575
+
+
+@perfilado("service")
+class ExportesService:
+    """
+    Genera archivos CSV / Parquet / XLSX de los reportes de Inventario
+    (libro), Gastos y Fiados para descargarlos.
+
+    Todo pasa primero por un CSV que escribe COPY en disco; Parquet y XLSX
+    se convierten leyendo ese CSV por partes. La memoria usada no depende
+    de cuántas filas tenga el rango.
+    """
+
+    def __init__(
+        self,
+        archivo: Optional[ArchivoService] = None,
+        base_dir: Optional[str] = None,
+    ) -> None:
+        self.repo = ExportesRepo()
+        self.archivo = archivo if archivo is not None else ArchivoService()
+        self.base_dir = base_dir or EXPORTES_DIR
+
+    # ==========================================================
+    #   EXPORTAR
+    # ==========================================================
+    def exportar(self, reporte: str, desde: date, hasta: date, formato: str) -> str:
+        """
+        Devuelve la ruta del archivo generado:
+            <EXPORTES_DIR>/<reporte>_<desde>_<hasta>_<id>.<formato>
+        """
+        if reporte not in COLUMNAS:
+            raise ValueError(f"Reporte desconocido: {reporte!r}")
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato no soportado: {formato!r}")
+        if desde > hasta:
+            raise ValueError("La fecha inicial no puede ser mayor que la final.")
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        self.limpiar()
+
+        base = os.path.join(
+            self.base_dir,
+            f"{reporte}_{desde:%Y%m%d}_{hasta:%Y%m%d}_{uuid.uuid4().hex[:8]}",
+        )
+        ruta_csv = base + ".csv"
+        destino = base + "." + formato
+
+        try:
+            self._escribir_csv(reporte, desde, hasta, ruta_csv)
+            if formato == "parquet":
+                _csv_a_parquet(ruta_csv, destino, COLUMNAS[reporte])
+            elif formato == "xlsx":
+                _csv_a_xlsx(ruta_csv, destino, COLUMNAS[reporte])
+        finally:
+            if formato != "csv" and os.path.exists(ruta_csv):
+                os.remove(ruta_csv)
+
+        return destino
+
+    def _escribir_csv(self, reporte: str, desde: date, hasta: date, ruta: str) -> None:
+        columnas = COLUMNAS[reporte]
+        try:
+            with open(ruta, "wb") as f:
+                f.write(_linea_csv([nombre for nombre, _ in columnas]))
+
+                # Ventas de meses archivados en Parquet: siempre anteriores
+                # a lo que sigue en la BD (igual que InventarioService.get_libro)
+                if reporte == "libro":
+                    for fecha, detalle, cantidad, monto in self.archivo.ventas_resumen(
+                        desde, hasta
+                    ):
+                        f.write(
+                            _linea_csv(
+                                [fecha, "Venta", "", detalle, cantidad, monto,
+                                 "", None, 0.0, None]
+                            )
+                        )
+
+                self.repo.copiar_csv(
+                    reporte,
+                    desde.strftime("%Y-%m-%d"),
+                    hasta.strftime("%Y-%m-%d"),
+                    f,
+                )
+        except Exception:
+            if os.path.exists(ruta):
+                os.remove(ruta)
+            raise
+
+    # ==========================================================
+    #   LIMPIEZA
+    # ==========================================================
+    def limpiar(self, vigencia: int = EXPORTES_VIGENCIA) -> int:
+        """Borra los archivos generados hace más de `vigencia` segundos."""
+        if not os.path.isdir(self.base_dir):
+            return 0
+
+        limite = time.time() - vigencia
+        borrados = 0
+        for nombre in os.listdir(self.base_dir):
+            ruta = os.path.join(self.base_dir, nombre)
+            try:
+                if os.path.isfile(ruta) and os.path.getmtime(ruta) < limite:
+                    os.remove(ruta)
+                    borrados += 1
+            except OSError:
+                # Otro proceso lo borró o lo está sirviendo
+                pass
+        return borrados
+
+
+# ==========================================================
+#   CSV
+# ==========================================================
+def _linea_csv(valores: Iterable) -> bytes:
+    """
+    Una línea CSV con las mismas reglas que COPY: None → vacío sin comillas,
+    texto siempre entre comillas (así "" sigue siendo texto vacío).
+    """
+    campos = []
+    for v in valores:
+        if v is None:
+            campos.append("")
+        elif isinstance(v, str):
+            campos.append('"' + v.replace('"', '""') + '"')
+        else:
+            campos.append(str(v))
+    return (",".join(campos) + "\n").encode("utf-8")
+
+
+# ==========================================================
+#   PARQUET
+# ==========================================================
+def _csv_a_parquet(origen: str, destino: str, columnas: Sequence[Tuple[str, str]]) -> None:
+    """Convierte por bloques con el lector de CSV en streaming de pyarrow."""
+    tipos = {nombre: _TIPOS_ARROW[tipo] for nombre, tipo in columnas}
+    esquema = pa.schema(list(tipos.items()))
+
+    lector = pacsv.open_csv(
+        origen,
+        read_options=pacsv.ReadOptions(
+            column_names=list(tipos), skip_rows=1, block_size=TAMANO_BLOQUE
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types=tipos,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    with pq.ParquetWriter(destino, esquema, compression="zstd") as writer:
+        for lote in lector:
+            writer.write_batch(lote)
+
+
+# ==========================================================
+#   XLSX
+# ==========================================================
+# Se escribe el XML de cada hoja fila por fila dentro del zip (sin armar
+# el libro en memoria). Es el formato mínimo que abren Excel y LibreOffice.
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Caracteres de control que XML 1.0 no admite
+_NO_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _celda_texto(v: str) -> str:
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_NO_XML.sub("", v))}</t></is></c>'
+
+
+def _fila_xml(valores: Sequence[str], tipos: Sequence[str]) -> str:
+    celdas = []
+    for v, tipo in zip(valores, tipos):
+        if v == "":
+            celdas.append("<c/>")
+        elif tipo == "str":
+            celdas.append(_celda_texto(v))
+        else:
+            celdas.append(f"<c><v>{v}</v></c>")
+    return "<row>" + "".join(celdas) + "</row>"
+
+
+def _csv_a_xlsx(origen: str, destino: str, columnas: Sequence[Tuple[str, str]]) -> None:
+    """
+    Una hoja por cada FILAS_POR_HOJA filas, todas con el encabezado.
+    """
+    encabezado = "<row>" + "".join(_celda_texto(n) for n, _ in columnas) + "</row>"
+    tipos = [t for _, t in columnas]
+
+    with open(origen, newline="", encoding="utf-8") as f, zipfile.ZipFile(
+        destino, "w", compression=zipfile.ZIP_DEFLATED
+    ) as zf:
+        filas = csv.reader(f)
+        next(filas, None)  # encabezado del CSV
+
+        hojas = 0
+        siguiente = next(filas, None)
+        while hojas == 0 or siguiente is not None:
+            hojas += 1
+            with zf.open(f"xl/worksheets/sheet{hojas}.xml", "w", force_zip64=True) as hoja:
+                hoja.write(
+                    f'{_XML}<worksheet xmlns="{_NS_MAIN}"><sheetData>{encabezado}'.encode()
+                )
+                escritas = 0
+                while siguiente is not None and escritas < FILAS_POR_HOJA:
+                    hoja.write(_fila_xml(siguiente, tipos).encode())
+                    escritas += 1
+                    siguiente = next(filas, None)
+                hoja.write(b"</sheetData></worksheet>")
+
+        _escribir_estructura_xlsx(zf, hojas)
+
+
+def _escribir_estructura_xlsx(zf: zipfile.ZipFile, hojas: int) -> None:
+    rango = range(1, hojas + 1)
+    zf.writestr(
+        "[Content_Types].xml",
+        _XML
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        + "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in rango
+        )
+        + "</Types>",
+    )
+    zf.writestr(
+        "_rels/.rels",
+        _XML
+        + f'<Relationships xmlns="{_NS_PKG}">'
+        f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>",
+    )
+    zf.writestr(
+        "xl/workbook.xml",
+        _XML
+        + f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheets>'
+        + "".join(f'<sheet name="Hoja{i}" sheetId="{i}" r:id="rId{i}"/>' for i in rango)
+        + "</sheets></workbook>",
+    )
+    zf.writestr(
+        "xl/_rels/workbook.xml.rels",
+        _XML
+        + f'<Relationships xmlns="{_NS_PKG}">'
+        + "".join(
+            f'<Relationship Id="rId{i}" Type="{_NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in rango
+        )
+        + "</Relationships>",
+    )
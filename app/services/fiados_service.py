@@ -3,11 +3,18 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import List, Tuple, Optional
 
+import pandas as pd
+
+from app.core.cache import SinCache
+from app.core.dataframes import FORMATO_FECHA, FORMATO_FECHA_HORA, df_desde_filas
+from app.core.profiler import perfilado
 from app.repos.fiados_repo import FiadosRepo
 from app.core.database import conectar_bd
+from app.models.cliente import Cliente
 from app.models.fiado import Fiado
 
 
+@perfilado("service")
 class FiadosService:
     """
     Service para la lógica de fiados.
@@ -16,8 +23,17 @@ class FiadosService:
     - app/ui/web/page_inventario.py
     """
 
-    def __init__(self) -> None:
+    # Pendientes y combo de productos: los invalidan crear/pagar fiado
+    CACHE_TTL = 60
+
+    def __init__(self, cache=None) -> None:
         self.repo = FiadosRepo()
+        self.cache = cache if cache is not None else SinCache()
+
+    def _invalidar(self) -> None:
+        """Un fiado mueve stock, ventas y saldo pendiente."""
+        for espacio in ("fiados_pendientes", "catalogo", "kpis", "abc"):
+            self.cache.invalidate(espacio)
 
     # ==========================================================
     #   CONVERSIÓN ROW → OBJETO
@@ -25,39 +41,40 @@ class FiadosService:
     @staticmethod
     def _row_to_fiado(row: Tuple) -> Fiado:
         """
-        Convierte una tupla:
-        (id, fecha, cliente, producto, cantidad, monto, estado)
+        Convierte una tupla de FiadosRepo.listar_en_rango:
+        (id, fecha, cliente, producto, cantidad, monto, estado, saldo)
         en un objeto Fiado.
 
         Si tu FiadosRepo devuelve más columnas, ajusta el desempaquetado.
         """
-        fid, fecha_raw, cliente, producto, cantidad, monto, estado = row
+        fid, fecha_raw, cliente, producto, cantidad, monto, estado, saldo = row
 
-        # Manejo seguro de fecha
+        # La BD devuelve la fecha como 'YYYY-MM-DD HH:MM' (to_char)
         fecha_dt: Optional[datetime] = None
 
-        if isinstance(fecha_raw, (date, datetime)):
-            # Ya viene como tipo fecha/fecha-hora
-            fecha_dt = datetime.combine(fecha_raw, datetime.min.time()) if isinstance(fecha_raw, date) and not isinstance(fecha_raw, datetime) else fecha_raw
-        elif isinstance(fecha_raw, str):
-            for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
-                try:
-                    fecha_dt = datetime.strptime(fecha_raw, fmt)
-                    break
-                except Exception:
-                    continue
-
-        return Fiado(
-            id=int(fid),
-            nombre_cliente=cliente,
-            telefono=None,
-            producto=producto,
-            cantidad=int(cantidad or 0),
-            monto=float(monto or 0.0),
-            fecha=fecha_dt,
-            estado=estado or "Pendiente",
-            fecha_pago=None,
-            id_venta=None,
+        if isinstance(fecha_raw, datetime):
+            fecha_dt = fecha_raw
+        elif isinstance(fecha_raw, date):
+            fecha_dt = datetime.combine(fecha_raw, datetime.min.time())
+        elif fecha_raw:
+            fecha_dt = datetime.strptime(fecha_raw, FORMATO_FECHA_HORA)
+
+        # (id, nombre_cliente, telefono, producto, cantidad, monto, fecha,
+        #  estado, fecha_pago, id_venta, saldo)
+        return Fiado.from_row(
+            (
+                int(fid),
+                cliente,
+                None,
+                producto,
+                int(cantidad or 0),
+                float(monto or 0.0),
+                fecha_dt,
+                estado or "Pendiente",
+                None,
+                None,
+                float(saldo or 0.0),
+            )
         )
 
     # ==========================================================
@@ -88,7 +105,7 @@ class FiadosService:
         if not cliente or not cliente.strip():
             raise ValueError("El nombre del cliente es obligatorio.")
 
-        return self.repo.crear_fiado(
+        fid = self.repo.crear_fiado(
             nombre_cliente=cliente.strip(),
             telefono=(telefono or "").strip() or None,
             id_producto=int(id_producto),
@@ -96,62 +113,175 @@ class FiadosService:
             monto=float(monto),
             fecha=fecha,
         )
+        self._invalidar()
+        return fid
 
     # ==========================================================
     #   LISTAR RANGO (USADA POR VISTA FIADOS)
     # ==========================================================
-    def listar_rango(self, desde: date, hasta: date):
+    # Columnas de FiadosRepo.listar_en_rango y su tipo
+    ESQUEMA_RANGO = {
+        "id": "int",
+        "fecha": FORMATO_FECHA_HORA,
+        "nombre_cliente": "str",
+        "producto": "str",
+        "cantidad": "int",
+        "monto": "float",
+        "estado": "str",
+        "saldo": "float",
+    }
+
+    # Columnas de la tabla de la vista Fiados
+    COLUMNAS_VISTA = [
+        "Id",
+        "Fecha",
+        "Cliente",
+        "Teléfono",
+        "Producto",
+        "Cantidad",
+        "Monto (Q)",
+        "Saldo (Q)",
+        "Estado",
+    ]
+
+    def get_fiados_df(self, desde: date, hasta: date) -> pd.DataFrame:
         """
-        Vista FIADOS usa esta función.
-        Devuelve una lista de diccionarios con keys:
-        id, fecha, nombre_cliente, telefono, producto, cantidad, monto, estado
+        Fiados del rango como DataFrame con COLUMNAS_VISTA
+        (Fecha 'YYYY-MM-DD', Monto y Saldo float), armado en bloque desde el
+        cursor.
         """
         d1 = desde.strftime("%Y-%m-%d")
         d2 = hasta.strftime("%Y-%m-%d")
 
-        rows = self.repo.listar_en_rango(d1, d2)
-        fiados = [self._row_to_fiado(r) for r in rows]
-
-        salida = []
-        for f in fiados:
-            fecha_str = f.fecha.strftime("%Y-%m-%d") if f.fecha else ""
-
-            salida.append(
-                {
-                    "id": f.id,
-                    "fecha": fecha_str,
-                    "nombre_cliente": f.nombre_cliente,
-                    "telefono": f.telefono,
-                    "producto": f.producto,
-                    "cantidad": f.cantidad,
-                    "monto": float(f.monto),
-                    "estado": f.estado,
-                }
-            )
-        return salida
+        df = df_desde_filas(self.repo.listar_en_rango(d1, d2), self.ESQUEMA_RANGO)
+
+        return pd.DataFrame(
+            {
+                "Id": df["id"],
+                "Fecha": df["fecha"].dt.strftime(FORMATO_FECHA).fillna(""),
+                "Cliente": df["nombre_cliente"],
+                "Teléfono": [None] * len(df),
+                "Producto": df["producto"],
+                "Cantidad": df["cantidad"].fillna(0),
+                "Monto (Q)": df["monto"].fillna(0.0),
+                "Saldo (Q)": df["saldo"].fillna(0.0),
+                "Estado": df["estado"].fillna("Pendiente"),
+            },
+            columns=self.COLUMNAS_VISTA,
+        )
+
+    def listar_rango(self, desde: date, hasta: date):
+        """
+        Devuelve una lista de diccionarios con keys:
+        id, fecha, nombre_cliente, telefono, producto, cantidad, monto, saldo,
+        estado
+        (la vista Fiados usa get_fiados_df directamente).
+        """
+        df = self.get_fiados_df(desde, hasta)
+        df.columns = [
+            "id",
+            "fecha",
+            "nombre_cliente",
+            "telefono",
+            "producto",
+            "cantidad",
+            "monto",
+            "saldo",
+            "estado",
+        ]
+        return df.to_dict("records")
 
     # ==========================================================
     #   LISTAR PENDIENTES (USADA POR FIADOS E INVENTARIO)
     # ==========================================================
     def listar_pendientes(self) -> List[Tuple[int, str, str, float, date]]:
         """
-        Devuelve tuplas: (id, cliente, producto, monto, fecha)
+        Devuelve tuplas: (id, cliente, producto, saldo, fecha)
+        (saldo = lo que falta pagar de ese fiado)
         Formato esperado por:
         - page_inventario._form_marcar_fiado_pagado
         (page_fiados también soporta dicts, pero con tuplas basta)
         """
-        return self.repo.listar_pendientes()
+        return self.cache.get_or_set(
+            ("fiados_pendientes",), self.repo.listar_pendientes, self.CACHE_TTL
+        )
+
+    # ==========================================================
+    #   DEUDORES (USADA POR FIADOS)
+    # ==========================================================
+    def listar_deudores(self) -> List[Cliente]:
+        """Clientes que deben algo, del que más debe al que menos."""
+        return self.cache.get_or_set(
+            ("fiados_pendientes", "deudores"),
+            lambda: Cliente.from_rows(self.repo.listar_deudores()),
+            self.CACHE_TTL,
+        )
+
+    def get_deudores_df(self) -> pd.DataFrame:
+        """Deudores para mostrar en tabla ("quién debe cuánto")."""
+        deudores = self.listar_deudores()
+        return pd.DataFrame(
+            {
+                "Cliente": [c.nombre for c in deudores],
+                "Teléfono": [c.telefono for c in deudores],
+                "Debe (Q)": [c.saldo for c in deudores],
+                "Fiados abiertos": [c.fiados_pendientes for c in deudores],
+                "Último movimiento": [
+                    c.ultimo_movimiento.strftime(FORMATO_FECHA) if c.ultimo_movimiento else ""
+                    for c in deudores
+                ],
+            }
+        )
+
+    def total_pendiente(self) -> float:
+        """Lo que deben todos los clientes juntos."""
+        return sum(c.saldo for c in self.listar_deudores())
 
     # ==========================================================
     #   PAGAR FIADO (USADA POR FIADOS)
     # ==========================================================
     def pagar_fiado(self, fiado_id: int) -> Optional[int]:
         """
-        Marca fiado como pagado y, si aplica, genera una venta.
+        Marca fiado como pagado (abona todo lo que falta).
         Retorna id_venta si se creó, o None si solo se actualizó el fiado.
         Usada en page_fiados._form_marcar_fiado_pagado_ui
         """
-        return self.repo.pagar_fiado(fiado_id)
+        id_venta = self.repo.pagar_fiado(fiado_id)
+        self._invalidar()
+        return id_venta
+
+    # ==========================================================
+    #   ABONOS (PAGOS PARCIALES)
+    # ==========================================================
+    def abonar_fiado(self, fiado_id: int, monto: float) -> float:
+        """
+        Pago parcial (o total) de un fiado. Devuelve lo que le falta.
+        Con el saldo en cero el fiado queda 'Pagado'.
+        """
+        monto = self._validar_abono(monto)
+        restante = self.repo.abonar_fiado(int(fiado_id), monto)
+        self._invalidar()
+        return restante
+
+    def abonar_cliente(self, id_cliente: int, monto: float) -> float:
+        """
+        Abono a la cuenta del cliente, repartido del fiado más viejo al más
+        nuevo. Devuelve lo que el cliente sigue debiendo.
+        """
+        monto = self._validar_abono(monto)
+        restante = self.repo.abonar_cliente(int(id_cliente), monto)
+        self._invalidar()
+        return restante
+
+    @staticmethod
+    def _validar_abono(monto) -> float:
+        try:
+            monto = round(float(monto), 2)
+        except (TypeError, ValueError):
+            raise ValueError("El monto del abono no es válido.")
+        if monto <= 0:
+            raise ValueError("El abono debe ser mayor que cero.")
+        return monto
 
     # ==========================================================
     #   MARCAR FIADO PAGADO (USADA POR INVENTARIO)
@@ -171,6 +301,11 @@ class FiadosService:
         Devuelve lista de diccionarios {id, nombre} para el select.
         Usada en page_fiados._form_agregar_fiado_ui
         """
+        return self.cache.get_or_set(
+            ("catalogo", "combo"), self._consultar_productos_activos, self.CACHE_TTL
+        )
+
+    def _consultar_productos_activos(self):
         cn = conectar_bd()
         if not cn:
             raise RuntimeError("No se pudo conectar a la base de datos.")
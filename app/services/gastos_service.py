@@ -6,10 +6,15 @@ from typing import List, Any, Tuple
 
 import pandas as pd
 
+from app.core.dataframes import df_desde_filas
+from app.core.profiler import perfilado
 from app.repos.gastos_repo import GastosRepo
 from app.core.database import conectar_bd
 
+ESQUEMA_GASTOS = {"Fecha": "str", "Descripción": "str", "Monto (Q)": "float"}
 
+
+@perfilado("service")
 class GastosService:
     """
     Lógica de negocio para gastos.
@@ -65,7 +70,7 @@ class GastosService:
     def listar_en_rango(self, d1: str, d2: str) -> List[Tuple[Any, ...]]:
         """
         Devuelve tuplas:
-        (fecha, descripcion, monto)
+        (fecha 'YYYY-MM-DD', descripcion, monto)
         """
         cn = conectar_bd()
         if not cn:
@@ -75,8 +80,8 @@ class GastosService:
             with cn.cursor() as cur:
                 cur.execute(
                     """
-                    SELECT 
-                        fecha,
+                    SELECT
+                        to_char(fecha, 'YYYY-MM-DD') AS fecha,
                         descripcion,
                         monto::double precision
                     FROM public.gastos
@@ -107,27 +112,6 @@ class GastosService:
         d1 = desde.strftime("%Y-%m-%d")
         d2 = hasta.strftime("%Y-%m-%d")
 
-        filas = self.listar_en_rango(d1, d2)
-
-        if not filas:
-            df = pd.DataFrame(columns=["Fecha", "Descripción", "Monto (Q)"])
-            return df, 0.0
-
-        df = pd.DataFrame(filas, columns=["fecha", "descripcion", "monto"])
-
-        # Normalizar fecha (por si vienen datetime)
-        df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce").dt.strftime(
-            "%Y-%m-%d"
-        )
-
-        total = float(df["monto"].sum())
-
-        df_show = df.rename(
-            columns={
-                "fecha": "Fecha",
-                "descripcion": "Descripción",
-                "monto": "Monto (Q)",
-            }
-        )
-
-        return df_show, total
+        # La BD ya devuelve la fecha como 'YYYY-MM-DD'
+        df = df_desde_filas(self.listar_en_rango(d1, d2), ESQUEMA_GASTOS)
+        return df, float(df["Monto (Q)"].sum())
@@ -2,125 +2,110 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Tuple, Dict, List, Any
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 
+from app.core.dataframes import FORMATO_FECHA_HORA, df_desde_filas
+from app.core.profiler import perfilado
 from app.repos.inventario_repo import InventarioRepo
-from app.repos.fiados_repo import FiadosRepo
-from app.repos.gastos_repo import GastosRepo
+from app.services.archivo_service import ArchivoService
+from app.services.cortes_caja_service import CortesCajaService, sumar_cortes
 
 
+@perfilado("service")
 class InventarioService:
     """
     Lógica de negocio para el panel de Inventario.
     Arma el DataFrame de movimientos y calcula totales.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        archivo: Optional[ArchivoService] = None,
+        cortes: Optional[CortesCajaService] = None,
+    ) -> None:
         self.inv_repo = InventarioRepo()
-        self.fiados_repo = FiadosRepo()
-        self.gastos_repo = GastosRepo()
-
-    def get_movimientos_y_totales(
+        self.archivo = archivo if archivo is not None else ArchivoService()
+        self.cortes = cortes if cortes is not None else CortesCajaService(archivo=self.archivo)
+
+    # Columnas de InventarioRepo.listar_libro y su tipo. La fecha queda como
+    # texto 'YYYY-MM-DD HH:MM' (to_char en la BD), que es lo que muestran
+    # las tablas; cantidad e id_fiado admiten nulos (gastos / no fiados).
+    ESQUEMA_LIBRO = {
+        "fecha": "str",
+        "tipo": "str",
+        "persona": "str",
+        "detalle": "str",
+        "cantidad": "int",
+        "monto": "float",
+        "estado": "str",
+        "id_fiado": "int",
+        "efectivo": "float",
+        "saldo": "float",
+    }
+
+    # ==========================================================
+    #   LIBRO DEL RANGO + TOTALES
+    # ==========================================================
+    def get_libro(
         self,
         desde: date,
         hasta: date,
     ) -> Tuple[pd.DataFrame, Dict[str, float]]:
         """
         Devuelve:
-        - df_mov: DataFrame con columnas [fecha, tipo, concepto, entrada, salida]
-        - totales: dict con claves vendido, gastos, fiado_pendiente, balance, caja_efectivo
-        """
+        - libro: DataFrame cronológico con las columnas de ESQUEMA_LIBRO
+          (tipo 'Venta' | 'Gasto' | 'Fiado'; fecha 'YYYY-MM-DD HH:MM')
+        - totales: dict con claves vendido, gastos, fiado_pendiente,
+          balance, caja_efectivo
 
+        Una sola consulta a la BD para el libro. Los totales de los días con
+        corte de caja salen del corte; los de los días abiertos, del libro.
+        """
         d1 = desde.strftime("%Y-%m-%d")
         d2 = hasta.strftime("%Y-%m-%d")
 
-        # --- Datos base desde los repos ---
-        ventas_rows = self.inv_repo.listar_ventas_resumen(d1, d2)
-        gastos_rows = self.inv_repo.listar_gastos(d1, d2)
-        fiados_rows = self.fiados_repo.listar_en_rango(d1, d2)
-
-        movimientos: List[Dict[str, Any]] = []
-
-        # Ventas -> entrada
-        for fecha, detalle, cantidad, monto in ventas_rows:
-            movimientos.append(
-                {
-                    "fecha": fecha,
-                    "tipo": "Venta",
-                    "concepto": detalle,
-                    "entrada": float(monto or 0.0),
-                    "salida": 0.0,
-                }
-            )
-
-        # Gastos -> salida
-        for fecha, desc, monto in gastos_rows:
-            movimientos.append(
-                {
-                    "fecha": fecha,
-                    "tipo": "Gasto",
-                    "concepto": desc,
-                    "entrada": 0.0,
-                    "salida": float(monto or 0.0),
-                }
-            )
-
-        # Fiados -> salida (dinero que no entró)
-        # fiados_repo.listar_en_rango devuelve:
-        # (id, fecha_str, cliente, producto, cantidad, monto, estado)
-        for fid, fecha, cliente, producto, cantidad, monto, estado in fiados_rows:
-            movimientos.append(
-                {
-                    "fecha": fecha,
-                    "tipo": "Fiado",
-                    "concepto": f"{cliente} - {producto}",
-                    "entrada": 0.0,
-                    "salida": float(monto or 0.0),
-                }
-            )
+        filas = self.inv_repo.listar_libro(d1, d2)
 
-        # --- DataFrame de movimientos ---
-        if movimientos:
-            df_mov = pd.DataFrame(
-                movimientos,
-                columns=["fecha", "tipo", "concepto", "entrada", "salida"],
-            )
+        # Meses archivados en Parquet: siempre anteriores a lo que sigue en la BD
+        archivadas = self.archivo.ventas_resumen(desde, hasta)
+        if archivadas:
+            filas = [
+                (fecha, "Venta", "", detalle, cantidad, monto, "", None, 0.0, None)
+                for fecha, detalle, cantidad, monto in archivadas
+            ] + list(filas)
 
-            # 🔑 Normalizar fechas:
-            # 1) Convertir todo a datetime en UTC (evita mezcla tz-aware/naive)
-            # 2) Quitar la zona horaria para que queden tz-naive
-            fechas = pd.to_datetime(df_mov["fecha"], errors="coerce", utc=True)
-            df_mov["fecha"] = fechas.dt.tz_convert(None)
+        libro = df_desde_filas(filas, self.ESQUEMA_LIBRO)
 
+        cortes, abiertos = self.cortes.resumen(desde, hasta)
+        if cortes:
+            # Filas de días cerrados: sus totales ya están en el corte
+            cerrados = [c.fecha.strftime("%Y-%m-%d") for c in cortes]
+            vivo = libro[~libro["fecha"].str[:10].isin(cerrados)]
         else:
-            df_mov = pd.DataFrame(
-                columns=["fecha", "tipo", "concepto", "entrada", "salida"]
+            vivo = libro
+
+        tipo = vivo["tipo"]
+        total_vendido = float(vivo.loc[tipo == "Venta", "monto"].sum())
+        total_gastos = float(vivo.loc[tipo == "Gasto", "monto"].sum())
+
+        # Fiados: mismo criterio que el corte de caja (pendiente = lo no
+        # abonado el mismo día; lo abonado después es cobrado en su día)
+        total_fiado_pend = 0.0
+        total_cobrado = 0.0
+        caja_bruta = float(vivo["efectivo"].sum())
+        for d1_abierto, d2_abierto in abiertos:
+            pendiente, cobrado = self.inv_repo.get_fiados_pendiente_y_cobrado(
+                d1_abierto.strftime("%Y-%m-%d"), d2_abierto.strftime("%Y-%m-%d")
             )
+            total_fiado_pend += pendiente
+            total_cobrado += cobrado
+            caja_bruta += self.archivo.total_ventas_efectivo(d1_abierto, d2_abierto)
 
-        # --- Totales ---
-        total_vendido = float(df_mov["entrada"].sum()) if not df_mov.empty else 0.0
-        total_gastos = (
-            float(sum(float(r[2] or 0.0) for r in gastos_rows)) if gastos_rows else 0.0
-        )
-        total_fiado_pend = (
-            float(
-                sum(
-                    float(r[5] or 0.0)
-                    for r in fiados_rows
-                    if (r[6] or "Pendiente") != "Pagado"
-                )
-            )
-            if fiados_rows
-            else 0.0
-        )
-
-        balance = total_vendido - (total_gastos + total_fiado_pend)
-
-        # Total de ventas en efectivo desde el repo dedicado
-        caja_bruta = self.inv_repo.get_total_ventas_efectivo(d1, d2)
-        caja_efectivo = caja_bruta - total_gastos - total_fiado_pend
+        # Misma fórmula que CorteCaja.balance / efectivo_esperado
+        balance = total_vendido + total_cobrado - total_gastos - total_fiado_pend
+        caja_efectivo = caja_bruta + total_cobrado - total_gastos - total_fiado_pend
 
         totales = {
             "vendido": total_vendido,
@@ -130,4 +115,78 @@ class InventarioService:
             "caja_efectivo": caja_efectivo,
         }
 
+        if cortes:
+            for clave, valor in sumar_cortes(cortes).items():
+                totales[clave] += valor
+
+        return libro, totales
+
+    # ==========================================================
+    #   VENTAS POR MÉTODO DE PAGO
+    # ==========================================================
+    def get_ventas_por_metodo(self, desde: date, hasta: date) -> Dict[str, float]:
+        """
+        {metodo: monto cobrado} del rango, de mayor a menor.
+
+        Días cerrados: ventas_por_pago de su corte. Días abiertos: suma
+        sobre pagos_venta (solo índice) más los meses archivados.
+        """
+        cortes, abiertos = self.cortes.resumen(desde, hasta)
+
+        totales: Dict[str, float] = {}
+        partes = [c.ventas_por_pago for c in cortes]
+        for t1, t2 in abiertos:
+            partes.append(
+                dict(
+                    self.inv_repo.listar_ventas_por_metodo(
+                        t1.strftime("%Y-%m-%d"), t2.strftime("%Y-%m-%d")
+                    )
+                )
+            )
+            partes.append(self.archivo.ventas_por_metodo(t1, t2))
+
+        for parte in partes:
+            for metodo, monto in parte.items():
+                totales[metodo] = totales.get(metodo, 0.0) + float(monto)
+
+        return dict(sorted(totales.items(), key=lambda kv: kv[1], reverse=True))
+
+    # ==========================================================
+    #   MOVIMIENTOS PARA LA VISTA WEB
+    # ==========================================================
+    def get_movimientos_y_totales(
+        self,
+        desde: date,
+        hasta: date,
+    ) -> Tuple[pd.DataFrame, Dict[str, float]]:
+        """
+        Devuelve:
+        - df_mov: DataFrame con columnas [fecha, tipo, concepto, entrada, salida]
+        - totales: dict con claves vendido, gastos, fiado_pendiente, balance, caja_efectivo
+        """
+        libro, totales = self.get_libro(desde, hasta)
+
+        es_venta = libro["tipo"] == "Venta"
+        es_fiado = libro["tipo"] == "Fiado"
+        detalle = libro["detalle"].fillna("")
+
+        # Ventas -> entrada; gastos y fiados (dinero que no entró) -> salida
+        df_mov = pd.DataFrame(
+            {
+                "fecha": libro["fecha"],
+                "tipo": libro["tipo"],
+                "concepto": detalle.where(
+                    ~es_fiado, libro["persona"].fillna("") + " - " + detalle
+                ),
+                "entrada": libro["monto"].where(es_venta, 0.0),
+                "salida": libro["monto"].where(~es_venta, 0.0),
+            },
+            columns=["fecha", "tipo", "concepto", "entrada", "salida"],
+        )
+
+        # El libro trae la fecha con formato fijo: se parsea en bloque
+        df_mov["fecha"] = pd.to_datetime(
+            df_mov["fecha"], format=FORMATO_FECHA_HORA, errors="coerce"
+        )
+
         return df_mov, totales
@@ -0,0 +1,108 @@
+# app/services/particiones_service.py
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+from app.core.profiler import perfilado
+from app.repos.particiones_repo import ParticionesRepo
+
+
+@perfilado("service")
+class ParticionesService:
+    """
+    Mantenimiento de las particiones mensuales de ventas, detalle_ventas
+    y movimientos_inventario:
+    - Crea con anticipación las particiones de los meses siguientes.
+    - Desprende (archiva) las particiones más viejas que la retención.
+    - Avisa si la partición DEFAULT recibió filas (falta un mes).
+    """
+
+    # Orden de creación; al desprender se recorre al revés porque
+    # detalle_ventas tiene FK hacia ventas.
+    TABLAS = ("ventas", "detalle_ventas", "movimientos_inventario")
+    ESQUEMA_ARCHIVO = "archivo"
+
+    _PATRON_MES = re.compile(r"_p(\d{4})(\d{2})$")
+
+    def __init__(self) -> None:
+        self.repo = ParticionesRepo()
+
+    @staticmethod
+    def _sumar_meses(d: date, meses: int) -> date:
+        total = d.year * 12 + (d.month - 1) + meses
+        return date(total // 12, total % 12 + 1, 1)
+
+    def _validar(self, tabla: str) -> None:
+        if not self.repo.es_particionada(tabla):
+            raise RuntimeError(
+                f"La tabla {tabla} no está particionada. "
+                "Ejecute primero scripts/particionar_tablas.sql."
+            )
+
+    # ==========================================================
+    #   CREAR MESES FUTUROS
+    # ==========================================================
+    def asegurar_particiones(
+        self, meses_adelante: int = 3, hoy: Optional[date] = None
+    ) -> Dict[str, int]:
+        """
+        Garantiza particiones desde el mes actual hasta meses_adelante.
+        Devuelve {tabla: particiones creadas}.
+        """
+        if meses_adelante < 0:
+            raise ValueError("Los meses adelante no pueden ser negativos.")
+
+        inicio = (hoy or date.today()).replace(day=1)
+        creadas: Dict[str, int] = {}
+        for tabla in self.TABLAS:
+            self._validar(tabla)
+            creadas[tabla] = self.repo.crear_particiones(
+                tabla, inicio, meses_adelante + 1
+            )
+        return creadas
+
+    # ==========================================================
+    #   DESPRENDER MESES VIEJOS
+    # ==========================================================
+    def desprender_antiguas(
+        self, retener_meses: int, hoy: Optional[date] = None
+    ) -> List[str]:
+        """
+        Desprende las particiones de meses anteriores a
+        (mes actual - retener_meses) y las mueve al esquema 'archivo'.
+        Devuelve los nombres desprendidos.
+        """
+        if retener_meses < 1:
+            raise ValueError("Se debe retener al menos un mes.")
+
+        corte = self._sumar_meses((hoy or date.today()).replace(day=1), -retener_meses)
+        desprendidas: List[str] = []
+
+        for tabla in reversed(self.TABLAS):
+            self._validar(tabla)
+            for nombre, es_default, _filas in self.repo.listar_particiones(tabla):
+                m = self._PATRON_MES.search(nombre)
+                if es_default or not m:
+                    continue
+                if date(int(m.group(1)), int(m.group(2)), 1) < corte:
+                    self.repo.desprender_particion(tabla, nombre, self.ESQUEMA_ARCHIVO)
+                    desprendidas.append(nombre)
+
+        return desprendidas
+
+    # ==========================================================
+    #   REVISAR PARTICIONES DEFAULT
+    # ==========================================================
+    def tablas_con_filas_en_default(self) -> List[str]:
+        """
+        Tablas cuya partición DEFAULT tiene filas: son fechas sin partición
+        mensual y conviene crearla y mover esas filas.
+        """
+        tablas: List[str] = []
+        for tabla in self.TABLAS:
+            for nombre, es_default, _filas in self.repo.listar_particiones(tabla):
+                if es_default and self.repo.default_tiene_filas(nombre):
+                    tablas.append(tabla)
+        return tablas
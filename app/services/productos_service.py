@@ -1,63 +1,136 @@
 # app/services/productos_service.py
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import pandas as pd
+
+from app.core.cache import SinCache
+from app.core.profiler import perfilado
 from app.repos.productos_repo import ProductosRepo
-from app.models.producto import Producto
+from app.models.catalogo import CatalogoProductos, FilaProducto
+
+# El catálogo cambia con cada venta/ajuste, pero las escrituras lo
+# invalidan; el TTL solo acota lo que tarda en verse un cambio hecho
+# desde otro cliente (p. ej. la app de escritorio).
+CATALOGO_CACHE_TTL = 60
 
 
+@perfilado("service")
 class ProductosService:
     """
     Lógica de negocio para productos.
     No ejecuta SQL directo: delega a ProductosRepo.
     """
 
-    def __init__(self):
+    def __init__(self, cache=None):
         self.repo = ProductosRepo()
+        # Sin caché inyectada cada llamada va a la BD (cliente de escritorio)
+        self.cache = cache if cache is not None else SinCache()
+
+    def _invalidar_catalogo(self, abc: bool = False) -> None:
+        """
+        Un cambio de producto mueve el catálogo y los KPIs del inicio (total
+        de productos, stock). abc=True cuando cambia qué productos activos
+        hay o sus nombres (alta, edición completa, baja).
+        """
+        espacios = ("catalogo", "kpis", "abc") if abc else ("catalogo", "kpis")
+        for espacio in espacios:
+            self.cache.invalidate(espacio)
 
     # ==========================================================
     #   LISTAR Y BUSCAR
     # ==========================================================
-    def listar_activos(self) -> List[Producto]:
-        """Devuelve lista de entidades Producto activas."""
-        return self.repo.listar_activos()
+    def listar_activos(self) -> CatalogoProductos:
+        """
+        Catálogo de productos activos (cacheado). Se recorre igual que una
+        lista de Producto: cada elemento es una FilaProducto.
+        """
+        return self.cache.get_or_set(
+            ("catalogo", "productos"), self.repo.listar_catalogo, CATALOGO_CACHE_TTL
+        )
 
-    def buscar_activos(self, q: str) -> List[Producto]:
+    def buscar_activos(self, q: str) -> List[FilaProducto]:
         """
         Búsqueda simple mejorada:
         - Busca en nombre, detalle, categoría y presentación.
         """
-        q = (q or "").strip().lower()
-        if not q:
-            return self.repo.listar_activos()
+        return self.listar_activos().buscar(q)
+
+    # ==========================================================
+    #   PÁGINA DE PRODUCTOS (GRID)
+    # ==========================================================
+    COLUMNAS_GRID = [
+        "id",
+        "Nombre",
+        "Presentacion",
+        "Detalle",
+        "Compra",
+        "Unidad",
+        "Blister",
+        "Caja",
+        "UnidadesBlister",
+        "StockUnidades",
+        "Categoria",
+    ]
+
+    def get_pagina_df(
+        self,
+        q: str = "",
+        clase_abc: Optional[str] = None,
+        clases: Optional[Dict[int, str]] = None,
+        orden: str = "Nombre",
+        descendente: bool = False,
+        pagina: int = 1,
+        tamano: int = 100,
+    ) -> Tuple[pd.DataFrame, int, int]:
+        """
+        Devuelve (df_pagina, total_filtrado, pagina_efectiva).
 
-        productos = self.repo.listar_activos()
-        resultado: List[Producto] = []
+        Solo viaja a la UI la página pedida; búsqueda, filtro ABC y orden
+        se resuelven en la BD. Si la página pedida ya no existe (el filtro
+        dejó menos filas) se devuelve la última.
 
-        for p in productos:
-            texto = " ".join(
-                [
-                    p.nombre or "",
-                    p.detalle or "",
-                    p.categoria or "",
-                    getattr(p, "presentacion", "") or "",
-                ]
-            ).lower()
-            if q in texto:
-                resultado.append(p)
+        - clase_abc: 'A' | 'B' | 'C' | None
+        - clases: {id_producto: clase}; los que no aparecen cuentan como 'C'.
+        """
+        tamano = max(1, int(tamano))
+        pagina = max(1, int(pagina))
+        terminos = [t.strip() for t in (q or "").split() if t.strip()]
+
+        ids_incluir = ids_excluir = None
+        if clase_abc in ("A", "B"):
+            ids_incluir = [pid for pid, c in (clases or {}).items() if c == clase_abc]
+        elif clase_abc == "C":
+            ids_excluir = [pid for pid, c in (clases or {}).items() if c != "C"]
+
+        def consultar(p: int):
+            return self.repo.listar_activos_pagina(
+                terminos,
+                ids_incluir,
+                ids_excluir,
+                orden,
+                descendente,
+                (p - 1) * tamano,
+                tamano,
+            )
+
+        rows, total = consultar(pagina)
+        if not rows and pagina > 1:
+            _, total = consultar(1)
+            pagina = max(1, -(-total // tamano))
+            rows, total = consultar(pagina)
 
-        return resultado
+        df = pd.DataFrame(rows, columns=self.COLUMNAS_GRID)
+        if clases is not None:
+            df["ABC"] = df["id"].map(clases).fillna("C")
+        return df, total, pagina
 
     # ==========================================================
     #   OBTENER UNO
     # ==========================================================
-    def obtener_por_id(self, pid: int) -> Optional[Producto]:
-        productos = self.repo.listar_activos()
-        for p in productos:
-            if p.id == pid:
-                return p
-        return None
+    def obtener_por_id(self, pid: int) -> Optional[FilaProducto]:
+        return self.listar_activos().obtener(pid)
 
     # ==========================================================
     #   CREAR PRODUCTO (LÓGICA)
@@ -140,7 +213,7 @@ class ProductosService:
                 )
 
         # Delegar al repositorio
-        return self.repo.crear_producto(
+        pid = self.repo.crear_producto(
             nombre=nombre,
             detalle=detalle,
             presentacion=presentacion,
@@ -152,6 +225,8 @@ class ProductosService:
             unidades_por_blister=unidades_por_blister,
             precio_venta_caja=precio_venta_caja,
         )
+        self._invalidar_catalogo(abc=True)
+        return pid
 
     # ==========================================================
     #   ACTUALIZAR PRECIOS
@@ -198,6 +273,7 @@ class ProductosService:
             precio_blister,
             precio_caja,
         )
+        self._invalidar_catalogo()
 
     # ==========================================================
     #   AJUSTAR STOCK
@@ -216,6 +292,7 @@ class ProductosService:
         referencia = (referencia or "").strip() or None
 
         self.repo.update_stock(pid, delta, motivo, referencia)
+        self._invalidar_catalogo()
 
     # ==========================================================
     #   ACTUALIZAR PRODUCTO COMPLETO (sin stock)
@@ -293,6 +370,7 @@ class ProductosService:
             unidades_por_blister=unidades_por_blister,
             precio_venta_caja=precio_venta_caja,
         )
+        self._invalidar_catalogo(abc=True)
 
     # 👉 ALIAS compatible con page_carrito.py
     def update_producto_completo(
@@ -336,6 +414,7 @@ class ProductosService:
     def eliminar_producto(self, pid: int) -> None:
         """Soft delete: marca activo = FALSE."""
         self.repo.desactivar_producto(pid)
+        self._invalidar_catalogo(abc=True)
 
     # Alias para que funcione productos_service.desactivar_producto(...)
     def desactivar_producto(self, pid: int) -> None:
@@ -0,0 +1,133 @@
+# app/services/reposicion_service.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.profiler import perfilado
+from app.repos.reposicion_repo import ReposicionRepo
+
+
+@perfilado("service")
+class ReposicionService:
+    """
+    Motor de reposición:
+    - Calcula la velocidad de venta de TODO el catálogo a la vez
+      (matriz productos × días, ventanas móviles con NumPy).
+    - Estima días de cobertura y la cantidad sugerida a comprar.
+    - Guarda el resultado en public.sugerencias_reposicion para que
+      el dashboard lo lea sin recalcular.
+    """
+
+    # Peso de cada ventana (días) en la velocidad de venta
+    VENTANAS = {7: 0.5, 28: 0.3, 56: 0.2}
+
+    def __init__(self) -> None:
+        self.repo = ReposicionRepo()
+
+    # ==========================================================
+    #   CÁLCULO BATCH
+    # ==========================================================
+    def calcular_sugerencias(
+        self,
+        dias_objetivo: int = 30,
+        dias_entrega: int = 3,
+        hoy: Optional[date] = None,
+    ) -> int:
+        """
+        Recalcula y guarda las sugerencias de reposición.
+
+        - dias_objetivo: días de venta que debe cubrir el stock tras comprar.
+        - dias_entrega: días que tarda el proveedor en entregar.
+
+        Devuelve el número de productos procesados.
+        """
+        if dias_objetivo <= 0:
+            raise ValueError("Los días objetivo deben ser mayores que cero.")
+        if dias_entrega < 0:
+            raise ValueError("Los días de entrega no pueden ser negativos.")
+
+        hoy = hoy or date.today()
+        ventana = max(self.VENTANAS)
+        desde = hoy - timedelta(days=ventana - 1)
+
+        stock_rows = self.repo.listar_stock_activos()
+        if not stock_rows:
+            self.repo.guardar_sugerencias([])
+            return 0
+
+        ids = np.fromiter((r[0] for r in stock_rows), dtype=np.int64, count=len(stock_rows))
+        stock = np.fromiter((r[1] for r in stock_rows), dtype=np.float64, count=len(stock_rows))
+
+        # Matriz productos × días con las unidades vendidas/fiadas
+        matriz = np.zeros((len(ids), ventana), dtype=np.float64)
+        salidas = self.repo.listar_salidas_diarias(desde)
+        if salidas:
+            df = pd.DataFrame(salidas, columns=["id_producto", "dia", "unidades"])
+            fila = pd.Index(ids).get_indexer(df["id_producto"])
+            col = (pd.to_datetime(df["dia"]) - pd.Timestamp(desde)).dt.days.to_numpy()
+            ok = (fila >= 0) & (col >= 0) & (col < ventana)
+            np.add.at(
+                matriz,
+                (fila[ok], col[ok]),
+                df["unidades"].to_numpy(dtype=np.float64)[ok],
+            )
+
+        # Promedios móviles de las últimas N columnas (suma acumulada)
+        acumulado = np.cumsum(matriz[:, ::-1], axis=1)
+        medias = {n: acumulado[:, n - 1] / n for n in self.VENTANAS}
+        velocidad = sum(medias[n] * peso for n, peso in self.VENTANAS.items())
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cobertura = np.where(velocidad > 0, stock / velocidad, np.nan)
+
+        necesidad = velocidad * (dias_objetivo + dias_entrega) - stock
+        sugerido = np.ceil(np.clip(necesidad, 0, None)).astype(np.int64)
+
+        filas = [
+            (
+                int(pid),
+                int(st),
+                round(float(v7), 4),
+                round(float(v28), 4),
+                round(float(v), 4),
+                None if np.isnan(c) else round(float(c), 2),
+                int(s),
+            )
+            for pid, st, v7, v28, v, c, s in zip(
+                ids, stock, medias[7], medias[28], velocidad, cobertura, sugerido
+            )
+        ]
+        self.repo.guardar_sugerencias(filas)
+        return len(filas)
+
+    # ==========================================================
+    #   LECTURA PARA EL DASHBOARD
+    # ==========================================================
+    def get_sugerencias_df(self, max_dias_cobertura: float = 7.0) -> pd.DataFrame:
+        """
+        Devuelve los productos con compra sugerida o cobertura menor a
+        max_dias_cobertura, leídos de la tabla precalculada.
+        """
+        rows = self.repo.listar_sugerencias(max_dias_cobertura)
+        cols = [
+            "Id",
+            "Código",
+            "Producto",
+            "Stock (unidades)",
+            "Venta diaria",
+            "Días de cobertura",
+            "Sugerido comprar",
+            "Calculado",
+        ]
+
+        if not rows:
+            return pd.DataFrame(columns=cols)
+
+        df = pd.DataFrame(rows, columns=cols)
+        df["Venta diaria"] = df["Venta diaria"].astype(float).round(2)
+        df["Días de cobertura"] = df["Días de cobertura"].astype(float).round(1)
+        return df
@@ -1,13 +1,19 @@
 # app/services/ventas_service.py
-from typing import List, Dict
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional
 
 import pandas as pd
 
+from app.core.cache import SinCache
+from app.core.profiler import perfilado
+from app.models.pago import MetodoPago, PagoVenta
 from app.models.venta import CarritoItem
 from app.repos.productos_repo import ProductosRepo
 from app.repos.ventas_repo import VentasRepo
 
 
+@perfilado("service")
 class VentasService:
     """
     Capa de negocio para el flujo de:
@@ -15,53 +21,34 @@ class VentasService:
     - Registro de ventas
     """
 
-    def __init__(self) -> None:
+    # Los métodos de pago casi no cambian
+    METODOS_CACHE_TTL = 600
+
+    def __init__(self, cache=None) -> None:
         self.productos_repo = ProductosRepo()
         self.ventas_repo = VentasRepo()
+        self.cache = cache if cache is not None else SinCache()
 
     # =====================================================
     #   PRODUCTOS → DataFrame para la UI (ventas)
     # =====================================================
     def get_productos_activos_df(self) -> pd.DataFrame:
-        productos = self.productos_repo.listar_activos()
-        if not productos:
-            # IMPORTANTE: incluir también la columna Presentacion
-            return pd.DataFrame(
-                columns=[
-                    "id",
-                    "Nombre",
-                    "Presentacion",
-                    "Detalle",
-                    "Compra",
-                    "Unidad",
-                    "Blister",
-                    "Caja",
-                    "UnidadesBlister",
-                    "StockUnidades",
-                    "Categoria",
-                ]
-            )
-
-        rows = []
-        for p in productos:
-            rows.append(
-                {
-                    "id": p.id,
-                    "Nombre": p.nombre,
-                    # <- viene directo del repo / BD
-                    "Presentacion": getattr(p, "presentacion", None),
-                    "Detalle": getattr(p, "detalle", None),
-                    "Compra": p.precio_compra,
-                    "Unidad": p.precio_venta_unidad,
-                    "Blister": p.precio_venta_blister,
-                    "Caja": getattr(p, "precio_venta_caja", 0.0),
-                    "UnidadesBlister": p.unidades_por_blister,
-                    "StockUnidades": p.stock_unidades,
-                    "Categoria": getattr(p, "categoria", None),
-                }
-            )
+        """
+        Columnas: id, Nombre, Presentacion, Detalle, Compra, Unidad, Blister,
+        Caja, UnidadesBlister, StockUnidades, Categoria.
+        """
+        return self.productos_repo.listar_catalogo().df
 
-        return pd.DataFrame(rows)
+    # =====================================================
+    #   MÉTODOS DE PAGO
+    # =====================================================
+    def listar_metodos_pago(self) -> List[MetodoPago]:
+        """Métodos activos en el orden de la BD (efectivo primero)."""
+        return self.cache.get_or_set(
+            ("metodos_pago",),
+            lambda: MetodoPago.from_rows(self.ventas_repo.listar_metodos_pago()),
+            self.METODOS_CACHE_TTL,
+        )
 
     # =====================================================
     #   REGISTRO DE VENTAS (CARRITO COMPLETO)
@@ -70,32 +57,37 @@ class VentasService:
         self,
         carrito_raw: List[Dict],
         id_usuario: int,
+        pagos_raw: Optional[List[Dict]] = None,
     ) -> None:
         """
         Convierte los dicts del carrito (UI Streamlit)
         en CarritoItem y los envía al Repo.
 
+        pagos_raw: [{"metodo": "tarjeta", "monto": 50.0}, ...]. Sin pagos
+        se cobra todo en efectivo.
+
         Validaciones:
         - producto válido
         - cantidad > 0
         - tipo válido
         - stock suficiente
         - monto > 0
+        - pagos con método activo que suman el total del carrito
         """
 
-        # Obtener productos activos (para validaciones)
-        productos = {p.id: p for p in self.productos_repo.listar_activos()}
+        # Obtener productos activos (para validaciones). Va directo a la BD,
+        # sin caché: el stock tiene que ser el actual.
+        productos = self.productos_repo.listar_catalogo()
 
         items: List[CarritoItem] = []
 
         for it in carrito_raw:
 
             pid = int(it["producto_id"])
-            if pid not in productos:
+            prod = productos.obtener(pid)
+            if prod is None:
                 raise ValueError(f"Producto ID={pid} no existe o no está activo.")
 
-            prod = productos[pid]
-
             cantidad = int(it["cantidad"])
             if cantidad <= 0:
                 raise ValueError("La cantidad debe ser mayor que cero.")
@@ -141,7 +133,82 @@ class VentasService:
                 )
             )
 
+        # ===============================
+        #   PAGOS
+        # ===============================
+        pagos = None
+        if pagos_raw:
+            totales: Dict[date, float] = defaultdict(float)
+            for item in items:
+                totales[item.fecha] += item.monto
+            pagos = self._repartir_pagos(totales, self._validar_pagos(pagos_raw, totales))
+
         # ===============================
         #   Enviar al repo (transacción SQL)
         # ===============================
-        self.ventas_repo.registrar_ventas_desde_carrito(items, id_usuario)
+        self.ventas_repo.registrar_ventas_desde_carrito(items, id_usuario, pagos)
+
+        # La venta cambia stock, KPIs y clasificación ABC
+        for espacio in ("catalogo", "kpis", "abc"):
+            self.cache.invalidate(espacio)
+
+    def _validar_pagos(
+        self, pagos_raw: List[Dict], totales: Dict[date, float]
+    ) -> List[PagoVenta]:
+        """Pagos válidos (un renglón por método) que cubren exactamente el total."""
+        activos = {m.codigo for m in self.listar_metodos_pago()}
+
+        por_metodo: Dict[str, float] = {}
+        for p in pagos_raw:
+            metodo = str(p.get("metodo") or "").strip().lower()
+            if metodo not in activos:
+                raise ValueError(f"Método de pago no válido: {metodo or '(vacío)'}.")
+            try:
+                monto = round(float(p.get("monto")), 2)
+            except (TypeError, ValueError):
+                raise ValueError("El monto del pago no es válido.")
+            if monto <= 0:
+                continue
+            por_metodo[metodo] = round(por_metodo.get(metodo, 0.0) + monto, 2)
+
+        total = round(sum(totales.values()), 2)
+        pagado = round(sum(por_metodo.values()), 2)
+        if abs(pagado - total) >= 0.005:
+            raise ValueError(
+                f"Los pagos (Q {pagado:,.2f}) no cuadran con el total (Q {total:,.2f})."
+            )
+
+        return [PagoVenta(metodo, monto) for metodo, monto in por_metodo.items()]
+
+    @staticmethod
+    def _repartir_pagos(
+        totales: Dict[date, float], pagos: List[PagoVenta]
+    ) -> Dict[date, List[PagoVenta]]:
+        """
+        Reparte los pagos del carrito entre sus ventas (una por fecha), en
+        orden, en centavos. Con una sola fecha los pagos quedan tal cual.
+        """
+        pendientes = [[p.metodo, round(p.monto * 100)] for p in pagos]
+        resultado: Dict[date, List[PagoVenta]] = {}
+
+        for fecha in sorted(totales):
+            falta = round(totales[fecha] * 100)
+            asignados: List[PagoVenta] = []
+            for p in pendientes:
+                if falta <= 0:
+                    break
+                usar = min(p[1], falta)
+                if usar > 0:
+                    asignados.append(PagoVenta(p[0], usar / 100))
+                    p[1] -= usar
+                    falta -= usar
+            resultado[fecha] = asignados
+
+        # Centavos de redondeo que sobren van a la última venta
+        ultima = resultado[max(totales)]
+        for metodo, centavos in pendientes:
+            if centavos > 0:
+                ultima.append(PagoVenta(metodo, centavos / 100))
+
+        return resultado
+
@@ -0,0 +1,89 @@
+# app/ui/web/assets.py
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from app.core.profiler import span
+
+# Hojas de estilo de la app web (una por pantalla + sidebar)
+ASSETS_DIR = Path(__file__).resolve().parents[2] / "assets"
+
+_CLAVE_INYECTADOS = "_css_inyectado"
+
+
+# ==========================================================
+#   LECTURA (una vez por proceso)
+# ==========================================================
+@lru_cache(maxsize=None)
+def leer_css(nombre: str) -> str:
+    return (ASSETS_DIR / f"{nombre}.css").read_text(encoding="utf-8")
+
+
+def _modo() -> str:
+    """
+    CSS_MODO=sesion (por defecto): cada hoja se manda una vez por sesión y
+    queda en el <head> del navegador; los reruns siguientes no mandan nada.
+    CSS_MODO=inline: como antes, <style> en cada rerun.
+    """
+    return os.getenv("CSS_MODO", "sesion").lower()
+
+
+# ==========================================================
+#   INYECCIÓN
+# ==========================================================
+def bloque_inline(nombres) -> str:
+    return "<style>\n" + "\n".join(leer_css(n) for n in nombres) + "</style>"
+
+
+def bloque_sesion(nombres) -> str:
+    """
+    Script (en un iframe de components.html) que agrega cada hoja al <head>
+    de la app con id propio; si ya está (misma pestaña), no la duplica.
+    """
+    hojas = json.dumps({n: leer_css(n) for n in nombres}, ensure_ascii=False)
+    return (
+        "<script>\n"
+        "const doc = window.parent.document;\n"
+        f"const hojas = {hojas};\n"
+        "for (const [nombre, css] of Object.entries(hojas)) {\n"
+        "  const id = 'farmacia-css-' + nombre;\n"
+        "  if (doc.getElementById(id)) continue;\n"
+        "  const el = doc.createElement('style');\n"
+        "  el.id = id;\n"
+        "  el.textContent = css;\n"
+        "  doc.head.appendChild(el);\n"
+        "}\n"
+        "</script>"
+    )
+
+
+def inyectar_css(*nombres: str, por_sesion: bool = True) -> int:
+    """
+    Aplica las hojas app/assets/<nombre>.css. Devuelve los bytes enviados
+    al navegador en este rerun (0 si ya estaban en la sesión).
+
+    por_sesion=False fuerza <style> en cada rerun: es para hojas con reglas
+    globales que deben desaparecer al salir de la pantalla (login).
+    """
+    with span(f"css {'+'.join(nombres)}", "css") as s:
+        if not por_sesion or _modo() == "inline":
+            html = bloque_inline(nombres)
+            st.markdown(html, unsafe_allow_html=True)
+        else:
+            inyectados = st.session_state.setdefault(_CLAVE_INYECTADOS, set())
+            pendientes = [n for n in nombres if n not in inyectados]
+            if not pendientes:
+                html = ""
+            else:
+                html = bloque_sesion(pendientes)
+                components.html(html, height=0)
+                inyectados.update(pendientes)
+
+        enviados = len(html.encode("utf-8"))
+        if s is not None:
+            s["bytes"] = enviados
+        return enviados
@@ -0,0 +1,22 @@
+# app/ui/web/contexto.py
+import streamlit as st
+
+from app.services.contexto import ContextoApp
+
+
+@st.cache_resource(show_spinner=False)
+def _crear_contexto() -> ContextoApp:
+    return ContextoApp()
+
+
+def contexto() -> ContextoApp:
+    """
+    ContextoApp del proceso (uno para todas las sesiones). Las páginas lo
+    piden al ejecutarse en vez de crear services al importarse.
+    """
+    ctx = _crear_contexto()
+    if ctx.cerrado:
+        _crear_contexto.clear()
+        ctx = _crear_contexto()
+    return ctx
+
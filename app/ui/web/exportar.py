@@ -0,0 +1,69 @@
+# app/ui/web/exportar.py
+import os
+
+import streamlit as st
+
+from app.ui.web.contexto import contexto
+from app.ui.web.fragmentos import fragmento
+
+
+_MIME = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+_ETIQUETAS = {"csv": "CSV", "parquet": "Parquet", "xlsx": "Excel (XLSX)"}
+
+
+# ==========================================================
+#   EXPORTAR REPORTE DEL RANGO
+# ==========================================================
+@fragmento("exportar")
+def exportador(reporte: str, desde, hasta) -> None:
+    """
+    Selector de formato + "Generar archivo" + botón de descarga.
+
+    El archivo se genera en disco (ExportesService) solo al pulsar
+    "Generar"; cambiar el formato o el rango descarta el anterior. Al ser
+    un fragmento, nada de esto recarga el resto de la página.
+    """
+    clave = f"exp_{reporte}"
+
+    formato = st.selectbox(
+        "Formato",
+        list(_ETIQUETAS),
+        format_func=_ETIQUETAS.get,
+        key=f"{clave}_formato",
+    )
+
+    generado = st.session_state.get(f"{clave}_archivo")
+    if generado and generado[0] != (desde, hasta, formato):
+        generado = None
+
+    if st.button("📤 Generar archivo", key=f"{clave}_generar"):
+        try:
+            with st.spinner("Generando archivo..."):
+                ruta = contexto().exportes.exportar(reporte, desde, hasta, formato)
+        except Exception as e:
+            st.error(f"❌ Error al exportar: {e}")
+            return
+        generado = ((desde, hasta, formato), ruta)
+        st.session_state[f"{clave}_archivo"] = generado
+
+    if not generado:
+        return
+
+    ruta = generado[1]
+    if not os.path.exists(ruta):
+        st.info("El archivo ya no está disponible; vuelve a generarlo.")
+        return
+
+    st.caption(f"{os.path.getsize(ruta) / 2**20:,.1f} MB")
+    with open(ruta, "rb") as f:
+        st.download_button(
+            "⬇️ Descargar",
+            data=f,
+            file_name=os.path.basename(ruta),
+            mime=_MIME[formato],
+            key=f"{clave}_descargar",
+        )
@@ -0,0 +1,113 @@
+# app/ui/web/fragmentos.py
+import functools
+import os
+import time
+
+import streamlit as st
+
+from app.core.profiler import span
+
+
+# ==========================================================
+#   FRAGMENTOS CON MEDICIÓN DE TIEMPO
+# ==========================================================
+# Un fragmento (st.fragment) se vuelve a ejecutar solo cuando cambia uno de
+# sus propios widgets; el resto de la página no se toca. Al llamarlo desde
+# el script principal corre junto con la página, como cualquier función.
+#
+# Cada ejecución queda medida en st.session_state["tiempos_fragmentos"];
+# con DEBUG_TIEMPOS=1 además se imprime en consola.
+
+_CLAVE_TIEMPOS = "tiempos_fragmentos"
+
+
+def fragmento(nombre: str):
+    """
+    Decorador: convierte la función en un st.fragment y mide cada corrida.
+
+        @fragmento("inventario.tabla")
+        def _tabla(desde, hasta): ...
+    """
+
+    def decorador(fn):
+        @functools.wraps(fn)
+        def medido(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                with span(nombre, "fragmento"):
+                    return fn(*args, **kwargs)
+            finally:
+                _registrar(nombre, (time.perf_counter() - inicio) * 1000)
+
+        return st.fragment(medido)
+
+    return decorador
+
+
+def _registrar(nombre: str, ms: float) -> None:
+    tiempos = st.session_state.setdefault(_CLAVE_TIEMPOS, {})
+    t = tiempos.setdefault(nombre, {"ejecuciones": 0, "ultima_ms": 0.0, "total_ms": 0.0})
+    t["ejecuciones"] += 1
+    t["ultima_ms"] = ms
+    t["total_ms"] += ms
+
+    if os.getenv("DEBUG_TIEMPOS") == "1":
+        print(f"[FRAG] {nombre}: {ms:.1f} ms (#{t['ejecuciones']})")
+
+
+def tiempos_fragmentos():
+    """[(nombre, ejecuciones, última ms, promedio ms)] ordenado por nombre."""
+    tiempos = st.session_state.get(_CLAVE_TIEMPOS, {})
+    return [
+        (nombre, t["ejecuciones"], t["ultima_ms"], t["total_ms"] / t["ejecuciones"])
+        for nombre, t in sorted(tiempos.items())
+    ]
+
+
+def mostrar_tiempos(prefijo: str = "") -> None:
+    """Tabla compacta con el costo de cada fragmento (de la corrida completa)."""
+    filas = [f for f in tiempos_fragmentos() if f[0].startswith(prefijo)]
+    if not filas:
+        return
+
+    with st.expander("⏱️ Tiempos por fragmento"):
+        st.dataframe(
+            {
+                "Fragmento": [f[0] for f in filas],
+                "Ejecuciones": [f[1] for f in filas],
+                "Última (ms)": [round(f[2], 1) for f in filas],
+                "Promedio (ms)": [round(f[3], 1) for f in filas],
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+# ==========================================================
+#   DATOS COMPARTIDOS ENTRE FRAGMENTOS
+# ==========================================================
+def nueva_corrida(pagina: str) -> None:
+    """
+    Marca el inicio de una corrida completa de la página. Los datos
+    guardados con memo_corrida valen hasta la siguiente corrida completa,
+    así que las corridas de un solo fragmento no vuelven a la BD.
+    """
+    clave = f"_corrida_{pagina}"
+    st.session_state[clave] = st.session_state.get(clave, 0) + 1
+
+
+def memo_corrida(pagina: str, clave, calcular):
+    """
+    Devuelve calcular() una sola vez por corrida completa de la página y
+    por clave (p. ej. ("movimientos", desde, hasta)).
+    """
+    corrida = st.session_state.get(f"_corrida_{pagina}", 0)
+    memo = st.session_state.setdefault(f"_memo_{pagina}", {})
+
+    if memo.get("_corrida") != corrida:
+        memo.clear()
+        memo["_corrida"] = corrida
+
+    if clave not in memo:
+        memo[clave] = calcular()
+    return memo[clave]
@@ -2,6 +2,7 @@
 import pandas as pd
 import streamlit as st
 
+from app.models.pago import TIPO_PAGO_MIXTO
 from app.services.ventas_service import VentasService
 
 
@@ -112,22 +113,27 @@ def render_carrito_tab(
         total = sum(i["monto"] for i in carrito)
         st.write(f"**Total:** Q {total:,.2f}")
 
-        # Monto pagado y cálculo de cambio
-        monto_pagado = st.number_input(
-            "Monto pagado por el cliente (Q)",
-            min_value=0.0,
-            step=0.01,
-            key="monto_pagado",
-        )
+        # Método(s) de pago
+        pagos, a_cobrar_efectivo = _seleccionar_pagos(ventas_service, total)
+
+        # Monto pagado y cálculo de cambio (solo la parte en efectivo)
+        monto_pagado = 0.0
+        if a_cobrar_efectivo > 0:
+            monto_pagado = st.number_input(
+                "Monto pagado por el cliente (Q)",
+                min_value=0.0,
+                step=0.01,
+                key="monto_pagado",
+            )
 
         cambio = None
         if monto_pagado > 0:
-            if monto_pagado >= total:
-                cambio = monto_pagado - total
+            if monto_pagado >= a_cobrar_efectivo:
+                cambio = monto_pagado - a_cobrar_efectivo
                 st.success(f"💵 Cambio a entregar: **Q {cambio:,.2f}**")
             else:
                 st.warning(
-                    "El monto pagado es menor que el total. "
+                    "El monto pagado es menor que lo que se cobra en efectivo. "
                     "No se podrá registrar la venta hasta corregirlo."
                 )
 
@@ -163,15 +169,18 @@ def render_carrito_tab(
         # -------- Registrar venta(s) --------
         with col_b:
             if st.button("Registrar venta(s)", type="primary", use_container_width=True):
-                if monto_pagado < total:
+                if pagos is None:
+                    st.error("❌ Los montos de los pagos no cuadran con el total.")
+                elif monto_pagado < a_cobrar_efectivo:
                     st.error(
-                        "❌ El monto pagado no puede ser menor que el total de la venta."
+                        "❌ El monto pagado no puede ser menor que lo que se cobra en efectivo."
                     )
                 else:
                     try:
                         ventas_service.registrar_ventas_desde_carrito(
                             carrito,
                             id_usuario,
+                            pagos,
                         )
                     except Exception as e:
                         st.error(f"❌ Ocurrió un error al registrar la venta: {e}")
@@ -179,12 +188,13 @@ def render_carrito_tab(
                         st.session_state["carrito"] = []
 
                         if cambio is None:
-                            cambio = max(monto_pagado - total, 0.0)
+                            cambio = max(monto_pagado - a_cobrar_efectivo, 0.0)
 
                         st.success("✅ Venta(s) registrada(s) correctamente.")
                         st.info(
                             f"**Resumen de la venta:**  \n"
                             f"- Total: **Q {total:,.2f}**  \n"
+                            f"- Pago: **{_describir_pagos(pagos)}**  \n"
                             f"- Pagó: **Q {monto_pagado:,.2f}**  \n"
                             f"- Cambio entregado: **Q {cambio:,.2f}**"
                         )
@@ -193,3 +203,76 @@ def render_carrito_tab(
                             st.rerun()
     else:
         st.info("El carrito está vacío.")
+
+
+# =====================================================
+#   MÉTODOS DE PAGO
+# =====================================================
+
+def _seleccionar_pagos(ventas_service: VentasService, total: float):
+    """
+    Selector de método de pago. Con "Dividir pago" se indica cuánto va
+    con cada método que no es efectivo; el resto se cobra en efectivo.
+
+    Devuelve (pagos, a_cobrar_efectivo):
+    - pagos: [{"metodo", "monto"}, ...] o None si los montos no cuadran
+    - a_cobrar_efectivo: parte del total que se paga en efectivo
+    """
+    try:
+        metodos = ventas_service.listar_metodos_pago()
+    except Exception as e:
+        st.error(f"❌ No se pudieron cargar los métodos de pago: {e}")
+        metodos = []
+
+    if not metodos:
+        return [{"metodo": "efectivo", "monto": total}], total
+
+    nombres = {m.codigo: m.nombre for m in metodos}
+    efectivo = {m.codigo for m in metodos if m.es_efectivo}
+
+    opciones = list(nombres) + [TIPO_PAGO_MIXTO]
+    metodo = st.selectbox(
+        "Método de pago",
+        opciones,
+        format_func=lambda c: nombres.get(c, "Dividir pago"),
+        key="metodo_pago",
+    )
+
+    if metodo != TIPO_PAGO_MIXTO:
+        a_cobrar = total if metodo in efectivo else 0.0
+        return [{"metodo": metodo, "monto": total}], a_cobrar
+
+    # Pago dividido: un monto por cada método; el primero en efectivo
+    # (si hay) se queda con lo que falte
+    resto = next((m.codigo for m in metodos if m.es_efectivo), None)
+    pagos = []
+    for m in metodos:
+        if m.codigo == resto:
+            continue
+        monto = st.number_input(
+            f"Monto con {m.nombre} (Q)",
+            min_value=0.0,
+            step=0.01,
+            key=f"pago_{m.codigo}",
+        )
+        if monto > 0:
+            pagos.append({"metodo": m.codigo, "monto": round(monto, 2)})
+
+    falta = round(total - sum(p["monto"] for p in pagos), 2)
+    if resto is not None and falta > 0:
+        pagos.append({"metodo": resto, "monto": falta})
+        st.write(f"**{nombres[resto]}:** Q {falta:,.2f}")
+        falta = 0.0
+
+    if abs(falta) >= 0.005:
+        st.warning(
+            f"Los pagos suman Q {total - falta:,.2f} y el total es Q {total:,.2f}."
+        )
+        return None, 0.0
+
+    a_cobrar = sum(p["monto"] for p in pagos if p["metodo"] in efectivo)
+    return pagos, a_cobrar
+
+
+def _describir_pagos(pagos) -> str:
+    return " + ".join(f"{p['metodo'].capitalize()} Q {p['monto']:,.2f}" for p in pagos)
@@ -1,19 +1,12 @@
 # app/ui/web/page_fiados.py
 import datetime as dt
 from datetime import date, datetime
-import pandas as pd
 import streamlit as st
 
-from app.services.fiados_service import FiadosService
-
-# Colores (alineados con Gastos / Configuración)
-PRIMARY = "#2563EB"
-TEXT = "#E5E7EB"
-MUTED = "#64748B"
-CARD_BG = "#020617"
-BORDER = "#1f2937"
-
-service = FiadosService()
+from app.ui.web.assets import inyectar_css
+from app.ui.web.contexto import contexto
+from app.ui.web.exportar import exportador
+from app.ui.web.fragmentos import fragmento, memo_corrida, mostrar_tiempos, nueva_corrida
 
 
 def _fecha_a_str(valor) -> str:
@@ -29,42 +22,7 @@ def page_fiados():
     hoy = dt.date.today()
 
     # --------------------------- ESTILOS ---------------------------
-    st.markdown(
-        f"""
-        <style>
-        .fiados-title {{
-            font-size: 1.4rem;
-            font-weight: 700;
-            color: {TEXT};
-            margin-bottom: 0.1rem;
-        }}
-        .fiados-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0.7rem;
-        }}
-        .fiados-card {{
-            background-color: {CARD_BG};
-            padding: 1.1rem 1.3rem;
-            border-radius: 1rem;
-            border: 1px solid {BORDER};
-            margin-bottom: 0.8rem;
-        }}
-        .fiados-card-title {{
-            font-size: 1.05rem;
-            font-weight: 600;
-            color: {TEXT};
-            margin-bottom: 0.25rem;
-        }}
-        .fiados-card-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inyectar_css("fiados")
 
     # ---------------------- SESSION STATE --------------------------
     if "fiados_desde" not in st.session_state:
@@ -121,50 +79,13 @@ def page_fiados():
     st.write("")
 
     # ---------------------- CARGA DE DATOS --------------------------
+    nueva_corrida("fiados")
     try:
-        fiados = service.listar_rango(desde, hasta)
+        df = contexto().fiados.get_fiados_df(desde, hasta)
     except Exception as e:
         st.error(f"❌ Error al cargar fiados: {e}")
         return
 
-    columnas = [
-        "Id",
-        "Fecha",
-        "Cliente",
-        "Teléfono",
-        "Producto",
-        "Cantidad",
-        "Monto (Q)",
-        "Estado",
-    ]
-
-    if fiados:
-        df = pd.DataFrame(fiados)
-        df = df.rename(
-            columns={
-                "id": "Id",
-                "fecha": "Fecha",
-                "nombre_cliente": "Cliente",
-                "cliente": "Cliente",
-                "telefono": "Teléfono",
-                "producto": "Producto",
-                "cantidad": "Cantidad",
-                "monto": "Monto (Q)",
-                "estado": "Estado",
-            }
-        )
-
-        if "Fecha" in df.columns:
-            df["Fecha"] = df["Fecha"].apply(_fecha_a_str)
-
-        for col in columnas:
-            if col not in df.columns:
-                df[col] = None
-
-        df = df[columnas]
-    else:
-        df = pd.DataFrame(columns=columnas)
-
     # ---------------------- LAYOUT: TABLA + FORM --------------------------
     col_tabla, col_forms = st.columns([3, 2])
 
@@ -190,110 +111,220 @@ def page_fiados():
                 use_container_width=True,
             )
 
-            total_pend = df.loc[df["Estado"] != "Pagado", "Monto (Q)"].sum()
-            total_pag = df.loc[df["Estado"] == "Pagado", "Monto (Q)"].sum()
+            # Con abonos parciales lo pendiente es el saldo, no el monto
+            total_pend = df["Saldo (Q)"].sum()
+            total_pag = df["Monto (Q)"].sum() - total_pend
 
             st.write("---")
             m1, m2 = st.columns(2)
             m1.metric("Fiado pendiente", f"Q {total_pend:,.2f}")
-            m2.metric("Fiado pagado", f"Q {total_pag:,.2f}")
+            m2.metric("Fiado cobrado", f"Q {total_pag:,.2f}")
+
+        with st.expander("📤 Exportar fiados del rango"):
+            exportador("fiados", desde, hasta)
+
+        st.write("")
+        _fragmento_deudores()
 
     # ---------------------- FORMULARIOS -----------------------
     with col_forms:
 
-        # ------- CARD: NUEVO FIADO -------
-        st.markdown(
-            """
-            <div class="fiados-card">
-                <div class="fiados-card-title">➕ Agregar fiado</div>
-                <p class="fiados-card-sub">Registrar un nuevo fiado para un cliente.</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        # Cada formulario es un fragmento: escribir en él no recarga la tabla
+        _form_nuevo_fiado(hoy)
 
-        cli = st.text_input("Cliente", key="f_cli")
-        tel = st.text_input("Teléfono (opcional)", key="f_tel")
+        st.write("---")
 
-        try:
-            productos = service.listar_productos_activos()
-        except Exception as e:
-            st.error(f"Error al cargar productos: {e}")
-            productos = []
+        _form_pagar_fiado()
+
+    mostrar_tiempos("fiados.")
+
+
+# =====================================================
+#   FORMULARIOS
+# =====================================================
+
+@fragmento("fiados.form_nuevo")
+def _form_nuevo_fiado(hoy):
+    # ------- CARD: NUEVO FIADO -------
+    st.markdown(
+        """
+        <div class="fiados-card">
+            <div class="fiados-card-title">➕ Agregar fiado</div>
+            <p class="fiados-card-sub">Registrar un nuevo fiado para un cliente.</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
 
-        prod_sel = None
-        if productos:
-            opciones = [f"{p['id']} - {p['nombre']}" for p in productos]
-            prod_sel = st.selectbox("Producto", opciones, key="f_prod")
+    cli = st.text_input("Cliente", key="f_cli")
+    tel = st.text_input("Teléfono (opcional)", key="f_tel")
+
+    try:
+        # Escribir en el formulario no vuelve a pedir los productos a la BD
+        productos = memo_corrida(
+            "fiados", "productos", contexto().fiados.listar_productos_activos
+        )
+    except Exception as e:
+        st.error(f"Error al cargar productos: {e}")
+        productos = []
+
+    prod_sel = None
+    if productos:
+        opciones = [f"{p['id']} - {p['nombre']}" for p in productos]
+        prod_sel = st.selectbox("Producto", opciones, key="f_prod")
+    else:
+        st.warning("No hay productos activos. Registra productos primero.")
+
+    cant = st.number_input("Cantidad", min_value=1, value=1, key="f_cant")
+    monto = st.number_input("Monto (Q)", min_value=0.0, key="f_monto")
+    fecha = st.date_input("Fecha", hoy, key="f_fecha")
+
+    if st.button("Guardar fiado", key="btn_fiado_guardar"):
+        if not cli.strip():
+            st.warning("Ingresa el nombre del cliente.")
+        elif prod_sel is None:
+            st.warning("No hay productos disponibles para fiar.")
+        elif monto <= 0:
+            st.warning("Monto debe ser mayor a 0.")
         else:
-            st.warning("No hay productos activos. Registra productos primero.")
-
-        cant = st.number_input("Cantidad", min_value=1, value=1, key="f_cant")
-        monto = st.number_input("Monto (Q)", min_value=0.0, key="f_monto")
-        fecha = st.date_input("Fecha", hoy, key="f_fecha")
-
-        if st.button("Guardar fiado", key="btn_fiado_guardar"):
-            if not cli.strip():
-                st.warning("Ingresa el nombre del cliente.")
-            elif prod_sel is None:
-                st.warning("No hay productos disponibles para fiar.")
-            elif monto <= 0:
-                st.warning("Monto debe ser mayor a 0.")
+            try:
+                pid = int(prod_sel.split(" - ")[0])
+                contexto().fiados.crear_fiado(
+                    cliente=cli.strip(),
+                    telefono=tel.strip() or None,
+                    id_producto=pid,
+                    cantidad=int(cant),
+                    monto=float(monto),
+                    fecha=fecha,
+                )
+            except Exception as e:
+                st.error(f"Error al guardar fiado: {e}")
             else:
-                try:
-                    pid = int(prod_sel.split(" - ")[0])
-                    service.crear_fiado(
-                        nombre_cliente=cli.strip(),
-                        telefono=tel.strip() or None,
-                        id_producto=pid,
-                        cantidad=int(cant),
-                        monto=float(monto),
-                        fecha=fecha,
-                    )
-                    st.success("Fiado registrado.")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error al guardar fiado: {e}")
+                st.success("Fiado registrado.")
+                st.rerun()
 
-        st.write("---")
 
-        # ------- CARD: MARCAR PAGO -------
-        st.markdown(
-            """
-            <div class="fiados-card">
-                <div class="fiados-card-title">💰 Marcar fiado como pagado</div>
-                <p class="fiados-card-sub">Actualiza el estado del fiado seleccionado.</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
+@fragmento("fiados.form_pago")
+def _form_pagar_fiado():
+    # ------- CARD: PAGO / ABONO -------
+    st.markdown(
+        """
+        <div class="fiados-card">
+            <div class="fiados-card-title">💰 Pago o abono de un fiado</div>
+            <p class="fiados-card-sub">
+                Con el monto completo el fiado queda pagado; con menos queda
+                como abono y el resto sigue pendiente.
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    try:
+        pendientes = memo_corrida(
+            "fiados", "pendientes", contexto().fiados.listar_pendientes
         )
+    except Exception as e:
+        st.error(f"Error al cargar fiados pendientes: {e}")
+        pendientes = []
 
+    if not pendientes:
+        st.info("No hay fiados pendientes.")
+        return
+
+    saldos = {}
+    opciones_pend = []
+    for item in pendientes:
         try:
-            pendientes = service.listar_pendientes()
-        except Exception as e:
-            st.error(f"Error al cargar fiados pendientes: {e}")
-            pendientes = []
+            fid, cli_p, prod_p, saldo_p, fch = item
+        except Exception:
+            continue
+        saldos[int(fid)] = float(saldo_p or 0.0)
+        opciones_pend.append(
+            f"{fid} - {cli_p} - {prod_p} - debe Q{saldo_p:.2f} ({_fecha_a_str(fch)})"
+        )
+
+    sel = st.selectbox("Selecciona fiado", opciones_pend, key="f_pend")
+    fid = int(sel.split(" - ")[0])
 
-        if not pendientes:
-            st.info("No hay fiados pendientes.")
+    monto = st.number_input(
+        "Monto que paga (Q)",
+        min_value=0.0,
+        max_value=saldos[fid],
+        value=saldos[fid],
+        step=1.0,
+        key=f"f_abono_{fid}",
+    )
+
+    if st.button("Registrar pago", key="btn_fiado_pagar"):
+        try:
+            if monto >= saldos[fid]:
+                contexto().fiados.pagar_fiado(fid)
+            else:
+                contexto().fiados.abonar_fiado(fid, monto)
+        except Exception as e:
+            st.error(f"Error al registrar el pago: {e}")
         else:
-            opciones_pend = []
-            for item in pendientes:
-                try:
-                    fid, cli_p, prod_p, monto_p, fch = item
-                except Exception:
-                    continue
-                opciones_pend.append(
-                    f"{fid} - {cli_p} - {prod_p} - Q{monto_p:.2f} ({_fecha_a_str(fch)})"
-                )
+            st.rerun()
+
+
+# =====================================================
+#   QUIÉN DEBE CUÁNTO
+# =====================================================
+
+@fragmento("fiados.deudores")
+def _fragmento_deudores():
+    st.markdown(
+        """
+        <div class="fiados-card">
+            <div class="fiados-card-title">👥 Quién debe</div>
+            <p class="fiados-card-sub">
+                Saldo de cada cliente, sin importar la fecha de sus fiados.
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    fiados = contexto().fiados
+    try:
+        deudores = fiados.listar_deudores()
+    except Exception as e:
+        st.error(f"❌ Error al cargar deudores: {e}")
+        return
+
+    if not deudores:
+        st.info("Ningún cliente debe nada.")
+        return
+
+    st.metric("Total por cobrar", f"Q {fiados.total_pendiente():,.2f}")
+    st.dataframe(fiados.get_deudores_df(), hide_index=True, use_container_width=True)
 
-            sel = st.selectbox("Selecciona fiado", opciones_pend, key="f_pend")
+    # ------- Abono a la cuenta del cliente -------
+    por_id = {c.id: c for c in deudores}
+    id_cliente = st.selectbox(
+        "Abonar a la cuenta de",
+        list(por_id),
+        format_func=lambda i: f"{por_id[i].nombre} (debe Q {por_id[i].saldo:,.2f})",
+        key="f_deudor",
+    )
+    monto = st.number_input(
+        "Monto del abono (Q)",
+        min_value=0.0,
+        max_value=por_id[id_cliente].saldo,
+        step=1.0,
+        key=f"f_abono_cliente_{id_cliente}",
+    )
+    st.caption("Se aplica primero a sus fiados más antiguos.")
 
-            if st.button("Marcar como pagado", key="btn_fiado_pagar"):
-                try:
-                    fid = int(sel.split(" - ")[0])
-                    service.pagar_fiado(fid)
-                    st.success("Fiado pagado.")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error al pagar fiado: {e}")
+    if st.button("Registrar abono", key="btn_abono_cliente"):
+        if monto <= 0:
+            st.warning("El abono debe ser mayor que 0.")
+            return
+        try:
+            restante = fiados.abonar_cliente(id_cliente, monto)
+        except Exception as e:
+            st.error(f"❌ Error al registrar el abono: {e}")
+        else:
+            st.success(f"Abono registrado. Sigue debiendo Q {restante:,.2f}.")
+            st.rerun()
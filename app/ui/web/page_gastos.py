@@ -4,16 +4,9 @@ import datetime as dt
 import pandas as pd
 import streamlit as st
 
-from app.services.gastos_service import GastosService
-
-# Paleta (alineada con inventario / config)
-PRIMARY = "#2563EB"
-TEXT = "#E5E7EB"
-MUTED = "#64748B"
-CARD_BG = "#020617"
-BORDER = "#1f2937"
-
-service = GastosService()
+from app.ui.web.assets import inyectar_css
+from app.ui.web.contexto import contexto
+from app.ui.web.exportar import exportador
 
 
 def _fecha_a_str(valor) -> str:
@@ -31,44 +24,10 @@ def page_gastos():
     """Vista completa de gastos con rango de fechas + total del rango."""
 
     hoy = dt.date.today()
+    ctx = contexto()
 
     # --------- Estilos (igual estilo que inventario / config) ---------
-    st.markdown(
-        f"""
-        <style>
-        .gastos-title {{
-            font-size: 1.4rem;
-            font-weight: 700;
-            color: {TEXT};
-            margin-bottom: 0.1rem;
-        }}
-        .gastos-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0.7rem;
-        }}
-        .gastos-card {{
-            background-color: {CARD_BG};
-            padding: 1.1rem 1.3rem;
-            border-radius: 1rem;
-            border: 1px solid {BORDER};
-            margin-bottom: 0.8rem;
-        }}
-        .gastos-card-title {{
-            font-size: 1.05rem;
-            font-weight: 600;
-            color: {TEXT};
-            margin-bottom: 0.25rem;
-        }}
-        .gastos-card-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inyectar_css("gastos")
 
     # ===========================================================
     #   INICIALIZAR session_state SOLO SI NO EXISTEN
@@ -139,7 +98,7 @@ def page_gastos():
 
     # ---------- DATOS DESDE SERVICE ----------
     try:
-        df_gastos, total_rango = service.get_gastos_y_total(desde, hasta)
+        df_gastos, total_rango = ctx.gastos.get_gastos_y_total(desde, hasta)
     except Exception as e:
         st.error(f"❌ Error al cargar datos de gastos: {e}")
         return
@@ -184,6 +143,9 @@ def page_gastos():
         st.write("---")
         st.metric("Total de gastos (rango)", f"Q {total_rango:,.2f}")
 
+        with st.expander("📤 Exportar gastos del rango"):
+            exportador("gastos", desde, hasta)
+
     # ===========================================================
     #   FORMULARIO: NUEVO GASTO (lado derecho)
     # ===========================================================
@@ -220,7 +182,7 @@ def page_gastos():
                 st.warning("⚠ El monto debe ser mayor que cero.")
             else:
                 try:
-                    service.crear_gasto(
+                    ctx.gastos.crear_gasto(
                         descripcion=desc.strip(),
                         monto=float(monto),
                         fecha=fecha,
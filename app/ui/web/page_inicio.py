@@ -4,8 +4,8 @@ import datetime as dt
 import pandas as pd
 import streamlit as st
 
-from app.services.dashboard_service import DashboardService
-from app.services.gastos_service import GastosService
+from app.ui.web.assets import inyectar_css
+from app.ui.web.contexto import contexto
 
 # Paleta
 PRIMARY = "#2563EB"
@@ -14,120 +14,16 @@ BORDER = "#1f2937"
 TEXT = "#E5E7EB"
 MUTED = "#64748B"
 
-# Servicios
-service = DashboardService()
-gastos_service = GastosService()
-
 
 def page_inicio():
     """Dashboard inicial: resumen de productos, ventas, alertas y análisis de equilibrio."""
 
     hoy = dt.date.today()
     primer_dia_mes = hoy.replace(day=1)
+    ctx = contexto()
 
     # ====== Estilos propios del dashboard (tipo Admin / UI cookies) ======
-    st.markdown(
-        """
-        <style>
-        /* Contenedor principal del contenido (no sidebar) */
-        .main.block-container {
-            padding-top: 1.4rem;
-            padding-bottom: 2rem;
-        }
-
-        /* Título y subtítulo del panel */
-        .panel-header-title {
-            font-size: 1.4rem;
-            font-weight: 700;
-            text-align: center;
-            margin-bottom: 0.1rem;
-            color: #0f172a;
-        }
-
-        .panel-header-sub {
-            font-size: 0.88rem;
-            text-align: center;
-            color: #6b7280;
-            margin-bottom: 1.0rem;
-        }
-
-        /* Fila de KPIs principales */
-        .kpi-row {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(230px, 1fr));
-            gap: 1rem;
-            margin-bottom: 1.4rem;
-        }
-
-        .kpi-card {
-            border-radius: 1rem;
-            padding: 0.9rem 1rem;
-            background: #ffffff;
-            border: 1px solid #e5e7eb;
-            box-shadow: 0 14px 30px rgba(15,23,42,0.04);
-        }
-
-        .kpi-card.kpi-blue {
-            background: linear-gradient(135deg, #eff6ff 0%, #ffffff 55%);
-            border-color: #bfdbfe;
-        }
-        .kpi-card.kpi-emerald {
-            background: linear-gradient(135deg, #ecfdf5 0%, #ffffff 55%);
-            border-color: #bbf7d0;
-        }
-        .kpi-card.kpi-purple {
-            background: linear-gradient(135deg, #f5f3ff 0%, #ffffff 55%);
-            border-color: #ddd6fe;
-        }
-        .kpi-card.kpi-amber {
-            background: linear-gradient(135deg, #fffbeb 0%, #ffffff 55%);
-            border-color: #facc15;
-        }
-
-        .kpi-label {
-            font-size: 0.78rem;
-            text-transform: uppercase;
-            letter-spacing: 0.14em;
-            color: #6b7280;
-            margin-bottom: 0.25rem;
-        }
-
-        .kpi-value {
-            font-size: 1.4rem;
-            font-weight: 700;
-            color: #111827;
-            margin-bottom: 0.15rem;
-        }
-
-        .kpi-foot {
-            font-size: 0.78rem;
-            color: #6b7280;
-        }
-
-        /* Tarjeta oscura usada para análisis financiero / stock / top vendidos */
-        .dash-card {
-            background-color: #020617;
-            padding: 1.3rem 1.4rem;
-            border-radius: 1rem;
-            border: 1px solid #1f2937;
-            margin-bottom: 1.1rem;
-        }
-        .dash-title {
-            font-size: 1.05rem;
-            font-weight: 600;
-            color: #E5E7EB;
-            margin-bottom: 0.15rem;
-        }
-        .dash-sub {
-            font-size: 0.9rem;
-            color: #9ca3af;
-            margin-bottom: 0.7rem;
-        }
-
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inyectar_css("inicio")
 
     # ====== Inicializar filtros en session_state ======
     if "dash_desde" not in st.session_state:
@@ -178,9 +74,9 @@ def page_inicio():
 
     # ====== Consultar datos principales ======
     try:
-        resumen = service.get_resumen(desde, hasta)
-        df_bajos = service.get_productos_bajo_stock_df(threshold=1)
-        df_top = service.get_top_mas_vendidos_df(desde, hasta, top_n=5)
+        resumen = ctx.dashboard.get_resumen(desde, hasta)
+        df_bajos = ctx.dashboard.get_productos_bajo_stock_df(threshold=1)
+        df_top = ctx.dashboard.get_top_mas_vendidos_df(desde, hasta, top_n=5)
     except Exception as e:
         st.error(f"❌ Error al cargar datos del dashboard: {e}")
         return
@@ -189,7 +85,7 @@ def page_inicio():
     ganancia = float(resumen.get("ganancia", 0.0) or 0.0)
 
     try:
-        _df_gastos, total_gastos_rango = gastos_service.get_gastos_y_total(desde, hasta)
+        _df_gastos, total_gastos_rango = ctx.gastos.get_gastos_y_total(desde, hasta)
         total_gastos_rango = float(total_gastos_rango or 0.0)
     except Exception:
         total_gastos_rango = 0.0
@@ -289,6 +185,16 @@ def page_inicio():
             help="Cantidad adicional que podrías gastar en este rango sin caer en pérdidas.",
         )
 
+    try:
+        por_metodo = ctx.inventario.get_ventas_por_metodo(desde, hasta)
+    except Exception:
+        por_metodo = {}
+    if por_metodo:
+        st.caption(
+            "Cobrado por método de pago: "
+            + " · ".join(f"{m.capitalize()} Q {monto:,.2f}" for m, monto in por_metodo.items())
+        )
+
     # ====== Semáforo financiero ======
     if not datos_suficientes:
         st.info(
@@ -436,3 +342,33 @@ def page_inicio():
             st.dataframe(df_view, use_container_width=True, hide_index=True)
 
         st.markdown("</div>", unsafe_allow_html=True)
+
+    # =====================================================
+    #   TARJETA: Sugerencias de reposición (precalculadas)
+    # =====================================================
+    st.markdown(
+        """
+        <div class="dash-card">
+            <div class="dash-title">🛒 Sugerencias de reposición</div>
+            <div class="dash-sub">
+                Productos que se agotarán pronto según su velocidad de venta
+                (cálculo nocturno, 30 días de cobertura objetivo).
+            </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    try:
+        df_repo = ctx.reposicion.get_sugerencias_df(max_dias_cobertura=7)
+    except Exception as e:
+        st.warning(f"No se pudieron cargar las sugerencias de reposición: {e}")
+    else:
+        if df_repo.empty:
+            st.success("✔ No hay productos por reponer según el último cálculo.")
+        else:
+            calculado = df_repo["Calculado"].max()
+            df_view = df_repo.drop(columns=["Id", "Calculado"])
+            st.dataframe(df_view, use_container_width=True, hide_index=True)
+            st.caption(f"Último cálculo: {calculado:%Y-%m-%d %H:%M}")
+
+    st.markdown("</div>", unsafe_allow_html=True)
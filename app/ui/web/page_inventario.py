@@ -4,23 +4,11 @@ from datetime import date, datetime
 import pandas as pd
 import streamlit as st
 
-from app.services.inventario_service import InventarioService
-from app.services.fiados_service import FiadosService
-from app.services.gastos_service import GastosService
-
-# Paleta
-PRIMARY = "#2563EB"
-PRIMARY_HOVER = "#1D4ED8"
-SURFACE = "#0B1120"
-CARD = "#020617"
-BORDER = "#1f2937"
-TEXT = "#E5E7EB"
-MUTED = "#64748B"
-
-# Services
-inv_service = InventarioService()
-fiados_service = FiadosService()
-gastos_service = GastosService()
+from app.core.profiler import span
+from app.ui.web.assets import inyectar_css
+from app.ui.web.contexto import contexto
+from app.ui.web.exportar import exportador
+from app.ui.web.fragmentos import fragmento, memo_corrida, mostrar_tiempos, nueva_corrida
 
 
 def _fecha_a_str(valor) -> str:
@@ -34,42 +22,7 @@ def _fecha_a_str(valor) -> str:
 
 def page_inventario():
     # --------- Estilos ---------
-    st.markdown(
-        f"""
-        <style>
-        .inv-title {{
-            font-size: 1.4rem;
-            font-weight: 700;
-            color: {TEXT};
-            margin-bottom: 0.1rem;
-        }}
-        .inv-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0.7rem;
-        }}
-        .inv-card {{
-            background-color: {CARD};
-            padding: 1.1rem 1.3rem;
-            border-radius: 1rem;
-            border: 1px solid {BORDER};
-            margin-bottom: 0.8rem;
-        }}
-        .inv-card-title {{
-            font-size: 1.05rem;
-            font-weight: 600;
-            color: {TEXT};
-            margin-bottom: 0.25rem;
-        }}
-        .inv-card-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inyectar_css("inventario")
 
     hoy = dt.date.today()
 
@@ -139,13 +92,18 @@ def page_inventario():
     # ===========================================================
     #   MAIN LAYOUT: TABLA & TOTALS
     # ===========================================================
+    # Cada bloque es un fragmento: escribir en un formulario o filtrar la
+    # tabla solo vuelve a ejecutar ese bloque. Los cambios de rango y los
+    # "Guardar" (st.rerun) sí recorren la página completa.
+    nueva_corrida("inventario")
+
     col_tabla, col_totales = st.columns([3, 2])
 
     with col_tabla:
-        tabla_container = st.container()
+        _fragmento_tabla(desde, hasta)
 
     with col_totales:
-        metric_container = st.container()
+        _fragmento_metricas(desde, hasta)
         st.write("")
         # Encabezado tipo tarjeta para las acciones rápidas
         st.markdown(
@@ -168,83 +126,132 @@ def page_inventario():
         with st.expander("✅ Marcar fiado como pagado"):
             _form_marcar_fiado_pagado()
 
-    # ===========================================================
-    #   LÓGICA: OBTENER MOVIMIENTOS Y TOTALES (POR RANGO)
-    # ===========================================================
+        with st.expander("📤 Exportar libro del rango"):
+            exportador("libro", desde, hasta)
+
+        with st.expander("🔒 Corte de caja"):
+            _fragmento_cortes(desde, hasta)
+
+    mostrar_tiempos("inventario.")
+
+
+# =====================================================
+#   DATOS DEL RANGO (UNA CONSULTA POR CORRIDA)
+# =====================================================
+
+def _movimientos_y_totales(desde, hasta):
+    """Tabla y métricas comparten el mismo resultado de la BD."""
+    return memo_corrida(
+        "inventario",
+        ("movimientos", desde, hasta),
+        lambda: contexto().inventario.get_movimientos_y_totales(desde, hasta),
+    )
+
+
+# =====================================================
+#   TABLA
+# =====================================================
+
+@fragmento("inventario.tabla")
+def _fragmento_tabla(desde, hasta):
+    st.markdown(
+        """
+        <div class="inv-card">
+            <div class="inv-card-title">📑 Movimientos (Ventas / Fiados / Egresos)</div>
+            <p class="inv-card-sub">
+                Registros consolidados del rango de fechas seleccionado.
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
     try:
-        df_mov, totales = inv_service.get_movimientos_y_totales(
-            desde,
-            hasta,
-        )
+        df_mov, _ = _movimientos_y_totales(desde, hasta)
     except Exception as e:
         st.error(f"❌ Error al cargar datos del inventario: {e}")
         return
 
-    # ===========================================================
-    #   TABLA
-    # ===========================================================
-    with tabla_container:
-        st.markdown(
-            """
-            <div class="inv-card">
-                <div class="inv-card-title">📑 Movimientos (Ventas / Fiados / Egresos)</div>
-                <p class="inv-card-sub">
-                    Registros consolidados del rango de fechas seleccionado.
-                </p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+    if df_mov.empty:
+        st.info("No hay movimientos en este rango.")
+        return
 
-        if df_mov.empty:
-            st.info("No hay movimientos en este rango.")
-        else:
-            df_show = df_mov.copy()
+    # Filtro propio de la tabla: solo re-ejecuta este fragmento
+    tipos = st.multiselect(
+        "Tipo",
+        ["Venta", "Gasto", "Fiado"],
+        default=["Venta", "Gasto", "Fiado"],
+        key="inv_tabla_tipos",
+    )
 
-            # Normalizar fecha (quitar tz si existiera)
-            try:
-                df_show["fecha"] = (
-                    pd.to_datetime(df_show["fecha"], errors="coerce", utc=True)
-                    .dt.tz_convert(None)
-                )
-            except Exception as e:
-                st.error(f"Error procesando fecha: {e}")
+    df_show = df_mov[df_mov["tipo"].isin(tipos)]
 
-            df_show = df_show.sort_values("fecha").reset_index(drop=True)
+    # Normalizar fecha (quitar tz si existiera)
+    try:
+        df_show = df_show.assign(
+            fecha=pd.to_datetime(df_show["fecha"], errors="coerce", utc=True)
+            .dt.tz_convert(None)
+        )
+    except Exception as e:
+        st.error(f"Error procesando fecha: {e}")
 
-            st.dataframe(
-                df_show,
-                hide_index=True,
-                use_container_width=True,
-            )
+    df_show = df_show.sort_values("fecha").reset_index(drop=True)
 
-    # ===========================================================
-    #   MÉTRICAS
-    # ===========================================================
-    with metric_container:
-        st.markdown(
-            """
-            <div class="inv-card">
-                <div class="inv-card-title">📌 Totales</div>
-                <p class="inv-card-sub">
-                    Resumen financiero calculado con base en los movimientos del período.
-                </p>
-            </div>
-            """,
-            unsafe_allow_html=True,
+    with span("tabla movimientos", "render"):
+        st.dataframe(
+            df_show,
+            hide_index=True,
+            use_container_width=True,
         )
 
-        st.metric("Vendido", f"Q {totales.get('vendido', 0):,.2f}")
-        st.metric("Gastos", f"Q {totales.get('gastos', 0):,.2f}")
-        st.metric("Fiado pendiente", f"Q {totales.get('fiado_pendiente', 0):,.2f}")
-        st.metric("Balance", f"Q {totales.get('balance', 0):,.2f}")
-        st.metric("Caja (efectivo)", f"Q {totales.get('caja_efectivo', 0):,.2f}")
+
+# =====================================================
+#   MÉTRICAS
+# =====================================================
+
+@fragmento("inventario.metricas")
+def _fragmento_metricas(desde, hasta):
+    st.markdown(
+        """
+        <div class="inv-card">
+            <div class="inv-card-title">📌 Totales</div>
+            <p class="inv-card-sub">
+                Resumen financiero calculado con base en los movimientos del período.
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    try:
+        _, totales = _movimientos_y_totales(desde, hasta)
+    except Exception as e:
+        st.error(f"❌ Error al cargar totales: {e}")
+        return
+
+    st.metric("Vendido", f"Q {totales.get('vendido', 0):,.2f}")
+    st.metric("Gastos", f"Q {totales.get('gastos', 0):,.2f}")
+    st.metric("Fiado pendiente", f"Q {totales.get('fiado_pendiente', 0):,.2f}")
+    st.metric("Balance", f"Q {totales.get('balance', 0):,.2f}")
+    st.metric("Caja (efectivo)", f"Q {totales.get('caja_efectivo', 0):,.2f}")
+
+    try:
+        por_metodo = contexto().inventario.get_ventas_por_metodo(desde, hasta)
+    except Exception as e:
+        st.error(f"❌ Error al cargar ventas por método de pago: {e}")
+        return
+
+    if por_metodo:
+        st.markdown("**Cobrado por método de pago**")
+        for metodo, monto in por_metodo.items():
+            st.caption(f"{metodo.capitalize()}: Q {monto:,.2f}")
 
 
 # =====================================================
 #   FORMULARIOS
 # =====================================================
 
+@fragmento("inventario.form_gasto")
 def _form_agregar_gasto():
     desc = st.text_input("Descripción", key="gasto_desc")
     monto = st.number_input("Monto (Q)", min_value=0.0, step=1.0, key="gasto_monto")
@@ -260,7 +267,7 @@ def _form_agregar_gasto():
             return
 
         try:
-            gastos_service.crear_gasto(
+            contexto().gastos.crear_gasto(
                 desc.strip(),
                 float(monto),
                 fecha,
@@ -272,12 +279,16 @@ def _form_agregar_gasto():
             st.rerun()
 
 
+@fragmento("inventario.form_fiado")
 def _form_agregar_fiado():
     cli = st.text_input("Cliente", key="fiado_cliente")
     tel = st.text_input("Teléfono (opcional)", key="fiado_tel")
 
     try:
-        productos = fiados_service.listar_productos_para_combo()
+        # Escribir en el formulario no vuelve a pedir el combo a la BD
+        productos = memo_corrida(
+            "inventario", "productos_combo", contexto().fiados.listar_productos_para_combo
+        )
     except Exception as e:
         st.error(f"❌ Error al cargar productos: {e}")
         productos = []
@@ -314,7 +325,7 @@ def _form_agregar_fiado():
             return
 
         try:
-            fiados_service.crear_fiado(
+            contexto().fiados.crear_fiado(
                 id_producto=pid,
                 cliente=cli.strip(),
                 telefono=(tel.strip() or None),
@@ -328,9 +339,12 @@ def _form_agregar_fiado():
             st.rerun()
 
 
+@fragmento("inventario.form_pago")
 def _form_marcar_fiado_pagado():
     try:
-        fiados_pend = fiados_service.listar_pendientes()
+        fiados_pend = memo_corrida(
+            "inventario", "fiados_pendientes", contexto().fiados.listar_pendientes
+        )
     except Exception as e:
         st.error(f"❌ Error al cargar fiados pendientes: {e}")
         return
@@ -356,8 +370,56 @@ def _form_marcar_fiado_pagado():
             return
 
         try:
-            fiados_service.marcar_fiado_pagado(fid)
+            contexto().fiados.marcar_fiado_pagado(fid)
         except Exception as e:
             st.error(f"❌ Error al marcar fiado: {e}")
         else:
             st.rerun()
+
+
+# =====================================================
+#   CORTE DE CAJA
+# =====================================================
+
+@fragmento("inventario.cortes")
+def _fragmento_cortes(desde, hasta):
+    user = st.session_state.get("user") or {}
+
+    if user.get("rol") == "Administrador":
+        c1, c2 = st.columns([2, 1])
+        with c1:
+            dia = st.date_input(
+                "Día a cerrar",
+                value=dt.date.today(),
+                max_value=dt.date.today(),
+                key="corte_dia",
+            )
+        with c2:
+            st.write("")
+            cerrar = st.button("Cerrar día", key="btn_cerrar_dia")
+
+        if cerrar:
+            try:
+                corte = contexto().cortes.cerrar_dia(dia, user.get("id"))
+            except Exception as e:
+                st.error(f"❌ No se pudo cerrar el día: {e}")
+            else:
+                st.success(
+                    f"✅ Día {corte.fecha:%Y-%m-%d} cerrado. "
+                    f"Caja esperada: Q {corte.efectivo_esperado:,.2f}"
+                )
+                # Los totales del rango pasan a leer el corte
+                st.rerun()
+    else:
+        st.caption("Solo un administrador puede cerrar el día.")
+
+    try:
+        df_cortes = contexto().cortes.listar_df(desde, hasta)
+    except Exception as e:
+        st.error(f"❌ Error al cargar cortes: {e}")
+        return
+
+    if df_cortes.empty:
+        st.info("No hay días cerrados en el rango seleccionado.")
+    else:
+        st.dataframe(df_cortes, hide_index=True, use_container_width=True)
@@ -1,8 +1,11 @@
 # app/ui/web/page_productos.py
+from typing import Dict
+
 import pandas as pd
 import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
 
+from app.core.profiler import span
 from app.services.productos_service import ProductosService
 
 # Opciones de presentación
@@ -18,10 +21,30 @@ PRESENTACION_OPCIONES = [
 ]
 
 
-def render_listado_productos(df_prods: pd.DataFrame) -> None:
+# Tamaños de página del listado (solo la página viaja al navegador)
+TAMANOS_PAGINA = [50, 100, 250]
+
+# Columnas por las que se puede ordenar (las ordena la BD)
+ORDEN_OPCIONES = {
+    "Nombre": "Nombre",
+    "Stock": "StockUnidades",
+    "Precio unidad": "Unidad",
+    "Precio compra": "Compra",
+    "Presentación": "Presentacion",
+}
+
+
+def render_listado_productos(
+    productos_service: ProductosService,
+    clases_abc: Dict[int, str],
+) -> pd.DataFrame:
     """
     Renderiza el listado de productos en la columna izquierda (AgGrid)
     y deja en st.session_state["prod_selected_full"] el producto seleccionado.
+
+    La grilla recibe solo una página: búsqueda, clase ABC, orden y
+    paginación se resuelven en ProductosService / SQL.
+    Devuelve el DataFrame de la página mostrada.
     """
     st.markdown(
         """
@@ -35,53 +58,62 @@ def render_listado_productos(df_prods: pd.DataFrame) -> None:
         unsafe_allow_html=True,
     )
 
-    # Buscar + refrescar
-    col_buscar, col_refresh = st.columns([3, 1])
+    # Buscar + clase ABC + refrescar
+    col_buscar, col_abc, col_refresh = st.columns([3, 1, 1])
     with col_buscar:
         q = st.text_input("Buscar producto", "")
+    with col_abc:
+        clase_abc = st.selectbox(
+            "Clase ABC",
+            ["Todas", "A", "B", "C"],
+            help=(
+                "A: productos que suman el 80 % del ingreso, B: el siguiente 15 %, "
+                "C: el resto (últimos 90 días)."
+            ),
+        )
     with col_refresh:
         if st.button("🔄 Actualizar listado"):
             st.rerun()
 
-    df_view = df_prods.copy()
-
-    # ----- BÚSQUEDA: nombre + detalle + categoría + presentación -----
-    if q:
-        terms = [t.strip() for t in q.split() if t.strip()]
-        if terms:
-            mask = pd.Series(False, index=df_prods.index)
-
-            for term in terms:
-                term_mask = (
-                    df_prods["Nombre"]
-                    .astype(str)
-                    .str.contains(term, case=False, na=False)
-                    | df_prods.get(
-                        "Detalle", pd.Series("", index=df_prods.index)
-                    )
-                    .astype(str)
-                    .str.contains(term, case=False, na=False)
-                    | df_prods.get(
-                        "Categoria", pd.Series("", index=df_prods.index)
-                    )
-                    .astype(str)
-                    .str.contains(term, case=False, na=False)
-                    | df_prods.get(
-                        "Presentacion", pd.Series("", index=df_prods.index)
-                    )
-                    .astype(str)
-                    .str.contains(term, case=False, na=False)
-                )
-                mask = mask | term_mask
+    # Orden + tamaño de página
+    col_orden, col_sentido, col_tamano = st.columns([2, 1, 1])
+    with col_orden:
+        orden_label = st.selectbox("Ordenar por", list(ORDEN_OPCIONES))
+    with col_sentido:
+        descendente = st.selectbox("Sentido", ["Ascendente", "Descendente"]) == "Descendente"
+    with col_tamano:
+        tamano = st.selectbox("Filas por página", TAMANOS_PAGINA, index=1)
+
+    # Al cambiar filtros u orden se vuelve a la primera página
+    firma = (q, clase_abc, orden_label, descendente, tamano)
+    if st.session_state.get("prod_grid_firma") != firma:
+        st.session_state["prod_grid_firma"] = firma
+        st.session_state["prod_grid_pagina"] = 1
+
+    try:
+        df_view, total, pagina = productos_service.get_pagina_df(
+            q=q,
+            clase_abc=None if clase_abc == "Todas" else clase_abc,
+            clases=clases_abc,
+            orden=ORDEN_OPCIONES[orden_label],
+            descendente=descendente,
+            pagina=st.session_state.get("prod_grid_pagina", 1),
+            tamano=tamano,
+        )
+    except Exception as e:
+        st.error(f"❌ No se pudieron cargar los productos: {e}")
+        return pd.DataFrame(columns=ProductosService.COLUMNAS_GRID)
 
-            df_view = df_prods[mask]
-        else:
-            df_view = df_prods.copy()
+    st.session_state["prod_grid_pagina"] = pagina
+    paginas = max(1, -(-total // tamano))
 
     prod_sel_dict = None
 
     if not df_view.empty:
+        # El id viaja oculto en la grilla: la selección se resuelve por id,
+        # no por nombre (puede haber dos productos con el mismo nombre).
         columnas_grid = [
+            "id",
             "Nombre",
             "Presentacion",
             "Detalle",
@@ -91,35 +123,46 @@ def render_listado_productos(df_prods: pd.DataFrame) -> None:
             "Caja",
             "StockUnidades",
         ]
+        if "ABC" in df_view.columns:
+            columnas_grid.append("ABC")
 
         gb = GridOptionsBuilder.from_dataframe(df_view[columnas_grid])
+        gb.configure_column("id", hide=True)
         gb.configure_selection("single", use_checkbox=False)
+        # El orden lo hace la BD sobre todo el catálogo, no la grilla sobre la página
+        gb.configure_default_column(sortable=False)
         gb.configure_grid_options(domLayout="normal")
         grid_options = gb.build()
 
         # Aumentamos altura (más espacio hacia abajo)
-        grid_response = AgGrid(
-            df_view[columnas_grid],
-            gridOptions=grid_options,
-            height=600,  # antes 360
-            update_mode=GridUpdateMode.SELECTION_CHANGED,
-            allow_unsafe_jscode=True,
-            theme="alpine",
-        )
+        with span("AgGrid productos", "render"):
+            grid_response = AgGrid(
+                df_view[columnas_grid],
+                gridOptions=grid_options,
+                height=600,  # antes 360
+                update_mode=GridUpdateMode.SELECTION_CHANGED,
+                allow_unsafe_jscode=True,
+                theme="alpine",
+                key=f"grid_productos_{pagina}",
+            )
 
-        selected_rows = grid_response["selected_rows"]
+        # Paginación
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ Anterior", disabled=pagina <= 1):
+                st.session_state["prod_grid_pagina"] = pagina - 1
+                st.rerun()
+        with col_info:
+            st.caption(f"Página {pagina} de {paginas} · {total} productos")
+        with col_next:
+            if st.button("Siguiente ▶", disabled=pagina >= paginas):
+                st.session_state["prod_grid_pagina"] = pagina + 1
+                st.rerun()
 
-        if isinstance(selected_rows, list) and selected_rows:
-            selected_name = selected_rows[0].get("Nombre")
-            if selected_name:
-                matches = df_prods[df_prods["Nombre"] == selected_name]
-                if not matches.empty:
-                    prod_sel_dict = matches.iloc[0].to_dict()
-        elif isinstance(selected_rows, pd.DataFrame) and not selected_rows.empty:
-            selected_name = selected_rows.iloc[0].get("Nombre")
-            matches = df_prods[df_prods["Nombre"] == selected_name]
-            if not matches.empty:
-                prod_sel_dict = matches.iloc[0].to_dict()
+        prod_sel_dict = _resolver_seleccion(
+            grid_response["selected_rows"],
+            df_view.set_index("id", drop=False),
+        )
 
         if prod_sel_dict is not None:
             st.session_state["prod_selected_full"] = prod_sel_dict
@@ -130,6 +173,34 @@ def render_listado_productos(df_prods: pd.DataFrame) -> None:
         )
         st.session_state["prod_selected_full"] = None
 
+    return df_view
+
+
+def _resolver_seleccion(selected_rows, productos_por_id: pd.DataFrame):
+    """
+    Devuelve la fila (dict) del producto seleccionado en la grilla o None.
+
+    selected_rows puede venir como lista de dicts o como DataFrame según la
+    versión de st_aggrid; en ambos casos se toma el id oculto y se busca
+    en productos_por_id (DataFrame indexado por id).
+    """
+    if isinstance(selected_rows, pd.DataFrame):
+        if selected_rows.empty:
+            return None
+        pid = selected_rows.iloc[0].get("id")
+    elif isinstance(selected_rows, list) and selected_rows:
+        pid = selected_rows[0].get("id")
+    else:
+        return None
+
+    if pid is None or pd.isna(pid):
+        return None
+
+    try:
+        return productos_por_id.loc[int(pid)].to_dict()
+    except KeyError:
+        return None
+
 
 def render_registrar_producto_tab(productos_service: ProductosService) -> None:
     """
@@ -1,10 +1,9 @@
-from datetime import date
+from datetime import date, timedelta
 
-import pandas as pd
 import streamlit as st
 
-from app.services.ventas_service import VentasService
-from app.services.productos_service import ProductosService
+from app.ui.web.assets import inyectar_css
+from app.ui.web.contexto import contexto
 from app.ui.web.page_productos import (
     render_listado_productos,
     render_registrar_producto_tab,
@@ -12,58 +11,17 @@ from app.ui.web.page_productos import (
 )
 from app.ui.web.page_carrito import render_carrito_tab
 
-# Servicios (una sola instancia aquí)
-ventas_service = VentasService()
-productos_service = ProductosService()
-
-# Paleta coherente con el resto del sistema
-PRIMARY = "#2563EB"
-CARD_BG = "#020617"
-BORDER = "#1f2937"
-TEXT = "#E5E7EB"
-MUTED = "#64748B"
+# Ventana (en días) usada para la clasificación ABC del listado
+ABC_DIAS = 90
 
 
 def page_productos_carrito():
+    ctx = contexto()
+
     # =========================
     #   ESTILOS GENERALES
     # =========================
-    st.markdown(
-        f"""
-        <style>
-        .carrito-title {{
-            font-size: 1.4rem;
-            font-weight: 700;
-            color: {TEXT};
-            margin-bottom: 0.1rem;
-        }}
-        .carrito-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0.7rem;
-        }}
-        .carrito-card {{
-            background-color: {CARD_BG};
-            padding: 1.1rem 1.3rem;
-            border-radius: 1rem;
-            border: 1px solid {BORDER};
-            margin-bottom: 0.8rem;
-        }}
-        .carrito-card-title {{
-            font-size: 1.05rem;
-            font-weight: 600;
-            color: {TEXT};
-            margin-bottom: 0.25rem;
-        }}
-        .carrito-card-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inyectar_css("productos_carrito")
 
     # =========================
     #   TÍTULO
@@ -115,38 +73,16 @@ def page_productos_carrito():
     id_usuario = user.get("id", 1)
 
     # =========================
-    #   CARGA PRODUCTOS
+    #   CLASIFICACIÓN ABC
     # =========================
+    # Cacheada en el service; si falla, el listado sigue sin filtro ABC útil
     try:
-        df_prods = ventas_service.get_productos_activos_df()
-    except Exception as e:
-        st.error(f"❌ No se pudieron cargar los productos: {e}")
-        return
-
-    if df_prods.empty:
-        st.info("No hay productos activos en este momento.")
-        df_prods = pd.DataFrame(
-            columns=[
-                "id",
-                "Nombre",
-                "Presentacion",
-                "Detalle",
-                "Compra",
-                "Unidad",
-                "Blister",
-                "Caja",
-                "UnidadesBlister",
-                "StockUnidades",
-                "Categoria",
-            ]
+        hoy = date.today()
+        clases = ctx.dashboard.get_clase_abc_por_producto(
+            hoy - timedelta(days=ABC_DIAS), hoy
         )
-
-    # Aseguramos la columna Presentacion usando lo que venga de la BD
-    if "Presentacion" not in df_prods.columns:
-        if "presentacion" in df_prods.columns:
-            df_prods["Presentacion"] = df_prods["presentacion"]
-        else:
-            df_prods["Presentacion"] = ""
+    except Exception:
+        clases = {}
 
     # =========================
     #   LAYOUT PRINCIPAL
@@ -155,7 +91,8 @@ def page_productos_carrito():
 
     # -------- IZQUIERDA: TABLA DE PRODUCTOS --------
     with col_left:
-        render_listado_productos(df_prods)
+        # Solo la página visible del catálogo (búsqueda/orden en la BD)
+        df_prods = render_listado_productos(ctx.productos, clases)
 
     # -------- DERECHA: TABS (CARRITO + REGISTRO + EDICIÓN) --------
     with col_right:
@@ -177,12 +114,12 @@ def page_productos_carrito():
 
         # TAB 1: CARRITO
         with tab_carrito:
-            render_carrito_tab(ventas_service, id_usuario, date.today())
+            render_carrito_tab(ctx.ventas, id_usuario, date.today())
 
         # TAB 2: REGISTRAR PRODUCTO
         with tab_reg:
-            render_registrar_producto_tab(productos_service)
+            render_registrar_producto_tab(ctx.productos)
 
         # TAB 3: EDITAR / ELIMINAR
         with tab_edit:
-            render_editar_producto_tab(df_prods, productos_service)
+            render_editar_producto_tab(df_prods, ctx.productos)
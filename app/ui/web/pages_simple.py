@@ -4,41 +4,13 @@ import pandas as pd
 
 from app.core.database import conectar_bd
 from app.repos.users_repo import create_user
-
-PRIMARY = "#2563EB"
-CARD_BG = "#020617"
-BORDER = "#1f2937"
-TEXT = "#E5E7EB"
-MUTED = "#64748B"
+from app.ui.web.assets import inyectar_css
+from app.ui.web.perfilador import panel_perfilador
 
 
 def _card_styles():
     """Inyecta SOLO estilos CSS reutilizables (no abre divs)."""
-    st.markdown(
-        f"""
-        <style>
-        .config-card {{
-            background-color: {CARD_BG};
-            padding: 1.3rem 1.4rem;
-            border-radius: 1rem;
-            border: 1px solid {BORDER};
-            margin-bottom: 0.75rem;
-        }}
-        .config-title {{
-            font-size: 1.2rem;
-            font-weight: 600;
-            color: {TEXT};
-            margin-bottom: 0.3rem;
-        }}
-        .config-sub {{
-            font-size: 0.9rem;
-            color: {MUTED};
-            margin-bottom: 0.7rem;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    inyectar_css("config")
 
 
 # =========================
@@ -75,6 +47,14 @@ def page_config():
         "edición de roles, bloqueo, etc."
     )
 
+    # ====== PERFILADOR ======
+    with st.expander("⏱️ Perfilador de páginas"):
+        st.caption(
+            "Mide cada rerun: página, services, consultas SQL, fragmentos y "
+            "render. El resultado aparece al final de cada página."
+        )
+        panel_perfilador()
+
     # ====== CONEXIÓN BD ======
     cn = conectar_bd()
     if not cn:
@@ -0,0 +1,98 @@
+# app/ui/web/perfilador.py
+import pandas as pd
+import streamlit as st
+
+from app.core.profiler import directorio_perfiles, perfilar, span
+
+
+# Claves en session_state (no son keys de widgets: sobreviven al cambiar de página)
+_ACTIVO = "perfilador_activo"
+_GUARDAR = "perfilador_guardar"
+_CAPTURA = "perfilador_captura"      # None | "cprofile" | "pyinstrument" (una corrida)
+
+
+def ejecutar_pagina(nombre: str, pagina) -> None:
+    """
+    Ejecuta la función de la página. Con el perfilador activo registra la
+    línea de tiempo del rerun (página, services, SQL, fragmentos, render)
+    y la muestra al final; si se pidió, guarda el perfil en archivo.
+    """
+    if not st.session_state.get(_ACTIVO):
+        pagina()
+        return
+
+    # La captura de funciones es de un solo rerun
+    captura = st.session_state.pop(_CAPTURA, None)
+
+    with perfilar(nombre, captura) as perfil:
+        with span(nombre, "pagina"):
+            pagina()
+
+    ruta = perfil.guardar() if st.session_state.get(_GUARDAR) else None
+    _mostrar_perfil(perfil, ruta)
+
+
+def _mostrar_perfil(perfil, ruta=None) -> None:
+    with st.expander(f"⏱️ Perfil del rerun · {perfil.total_ms:,.1f} ms"):
+        if ruta:
+            st.caption(f"Guardado en {ruta}")
+
+        categorias = perfil.por_categoria()
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "Categoría": list(categorias),
+                    "Tiempo propio (ms)": [round(v, 1) for v in categorias.values()],
+                }
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "Span": ["· " * s["nivel"] + s["nombre"] for s in perfil.spans],
+                    "Categoría": [s["categoria"] for s in perfil.spans],
+                    "Inicio (ms)": [round(s["inicio_ms"], 1) for s in perfil.spans],
+                    "Duración (ms)": [round(s["dur_ms"], 1) for s in perfil.spans],
+                    "Propio (ms)": [round(s["propio_ms"], 1) for s in perfil.spans],
+                }
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        if perfil.perfil_texto:
+            st.code(perfil.perfil_texto, language="text")
+
+
+def panel_perfilador() -> None:
+    """Controles del perfilador para la página de Configuración."""
+    activo = st.toggle(
+        "Activar perfilador de páginas",
+        value=st.session_state.get(_ACTIVO, False),
+        key="cfg_perfilador_activo",
+    )
+    st.session_state[_ACTIVO] = activo
+
+    guardar = st.checkbox(
+        f"Guardar cada perfil en {directorio_perfiles()}/perfiles.jsonl",
+        value=st.session_state.get(_GUARDAR, False),
+        key="cfg_perfilador_guardar",
+        disabled=not activo,
+    )
+    st.session_state[_GUARDAR] = guardar
+
+    c1, c2 = st.columns(2)
+    with c1:
+        if st.button("Capturar cProfile (próximo rerun)", disabled=not activo):
+            st.session_state[_CAPTURA] = "cprofile"
+    with c2:
+        if st.button("Capturar pyinstrument (próximo rerun)", disabled=not activo):
+            st.session_state[_CAPTURA] = "pyinstrument"
+
+    if st.session_state.get(_CAPTURA):
+        st.caption(
+            f"Se capturará {st.session_state[_CAPTURA]} en la próxima página que abras."
+        )
@@ -0,0 +1,38 @@
+import argparse
+
+from app.services.archivo_service import ArchivoService
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Pasa los meses cerrados de ventas, detalle_ventas y "
+            "movimientos_inventario a archivos Parquet (ARCHIVO_DIR)."
+        )
+    )
+    parser.add_argument(
+        "--retener-meses",
+        type=int,
+        default=24,
+        help="Meses recientes que se quedan en la base de datos.",
+    )
+    args = parser.parse_args()
+
+    print("=== Archivo histórico ===")
+    try:
+        resultado = ArchivoService().archivar(retener_meses=args.retener_meses)
+    except Exception as e:
+        print(f"❌ Error al archivar: {e}")
+        return
+
+    if not resultado:
+        print("✅ No hay meses para archivar.")
+        return
+
+    for tabla, anio, mes, filas in resultado:
+        print(f"📦 {tabla} {anio}-{mes:02d}: {filas} filas archivadas.")
+    print("✅ Archivo completado.")
+
+
+if __name__ == "__main__":
+    main()
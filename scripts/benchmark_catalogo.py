@@ -0,0 +1,157 @@
+import argparse
+import gc
+import multiprocessing as mp
+import random
+import resource
+import statistics
+import time
+
+import pandas as pd
+
+from app.models.catalogo import CatalogoProductos
+from app.models.producto import Producto
+
+
+PRESENTACIONES = ["Tableta", "Jarabe", "Gotero", "Crema", "Cápsula", None]
+CATEGORIAS = ["Analgésico", "Antibiótico", "Vitaminas", "Dermatología", None]
+
+
+def _filas(n, semilla=7):
+    """Filas con la misma forma que devuelve el cursor de listar_catalogo()."""
+    rng = random.Random(semilla)
+    filas = []
+    for i in range(n):
+        compra = round(rng.uniform(0.5, 80), 2)
+        filas.append(
+            (
+                i + 1,
+                f"Producto {i:06d} {rng.choice(['forte', 'plus', 'kids', ''])}".strip(),
+                rng.choice([None, f"Lote {rng.randint(1, 999)}"]),
+                rng.choice(PRESENTACIONES),
+                compra,
+                round(compra * 1.3, 2),
+                rng.choice([None, round(compra * 9, 2)]),
+                rng.choice([1, 10, 12]),
+                rng.randint(0, 500),
+                rng.randint(0, 500),
+                round(compra * 25, 2),
+                rng.choice(CATEGORIAS),
+            )
+        )
+    return filas
+
+
+# ==========================================================
+#   VARIANTES
+# ==========================================================
+def _anterior(rows):
+    """Antes: Producto por fila → dict por fila → DataFrame (tres copias)."""
+    productos = [
+        Producto(
+            id=int(r[0]),
+            nombre=r[1],
+            precio_compra=float(r[4]),
+            precio_venta_unidad=float(r[5]),
+            precio_venta_blister=float(r[6]) if r[6] is not None else None,
+            unidades_por_blister=int(r[7] or 1),
+            stock_unidades=int(r[8] or 0),
+            stock_actual=int(r[9] or 0),
+            precio_venta_caja=float(r[10]),
+            detalle=r[2],
+            categoria=r[11],
+            presentacion=r[3],
+        )
+        for r in rows
+    ]
+    df = pd.DataFrame(
+        [
+            {
+                "id": p.id,
+                "Nombre": p.nombre,
+                "Presentacion": p.presentacion,
+                "Detalle": p.detalle,
+                "Compra": p.precio_compra,
+                "Unidad": p.precio_venta_unidad,
+                "Blister": p.precio_venta_blister,
+                "Caja": p.precio_venta_caja,
+                "UnidadesBlister": p.unidades_por_blister,
+                "StockUnidades": p.stock_unidades,
+                "Categoria": p.categoria,
+            }
+            for p in productos
+        ]
+    )
+    return productos, df
+
+
+def _columnar(rows):
+    catalogo = CatalogoProductos.desde_filas(rows)
+    return catalogo, catalogo.df
+
+
+VARIANTES = {"anterior": _anterior, "columnar": _columnar}
+
+
+def _rss_kb():
+    """RSS actual del proceso en KB (Linux); si no, el pico de getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _medir(variante, n, repeticiones, cola):
+    """Corre en un proceso aparte para que el RSS de una variante no ensucie la otra."""
+    rows = _filas(n)
+    construir = VARIANTES[variante]
+
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        t0 = time.perf_counter()
+        resultado = construir(rows)
+        tiempos.append((time.perf_counter() - t0) * 1000)
+        del resultado
+
+    gc.collect()
+    antes = _rss_kb()
+    resultado = construir(rows)
+    gc.collect()
+    retenido = _rss_kb() - antes
+
+    cola.put((variante, statistics.median(tiempos), min(tiempos), retenido))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compara armar el catálogo como lista de Producto + DataFrame "
+            "(antes) contra CatalogoProductos columnar: tiempo y RSS retenido."
+        )
+    )
+    parser.add_argument("--productos", type=int, default=50_000, help="Filas del catálogo.")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Construcciones medidas.")
+    args = parser.parse_args()
+
+    print(f"=== Catálogo · {args.productos:,} productos · {args.repeticiones} repeticiones ===")
+    print(f"{'Variante':<12}{'mediana ms':>12}{'mín ms':>10}{'RSS retenido':>15}")
+
+    ctx = mp.get_context("spawn")
+    resultados = {}
+    for variante in VARIANTES:
+        cola = ctx.Queue()
+        p = ctx.Process(target=_medir, args=(variante, args.productos, args.repeticiones, cola))
+        p.start()
+        nombre, mediana, minimo, retenido = cola.get()
+        p.join()
+        resultados[nombre] = (mediana, retenido)
+        print(f"{nombre:<12}{mediana:>12.1f}{minimo:>10.1f}{retenido / 1024:>12.1f} MB")
+
+    (t_a, m_a), (t_c, m_c) = resultados["anterior"], resultados["columnar"]
+    print(f"✅ Columnar: {t_a / t_c:.1f}x más rápido · "
+          f"{100 * (1 - m_c / m_a) if m_a else 0:.0f}% menos memoria retenida")
+
+
+if __name__ == "__main__":
+    main()
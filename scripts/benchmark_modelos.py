@@ -0,0 +1,105 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from app.models.producto import Producto
+
+
+@dataclass
+class ProductoAnterior:
+    """Producto tal como era antes: dataclass mutable con __dict__."""
+
+    id: int
+    nombre: str
+    precio_compra: float
+    precio_venta_unidad: float
+    precio_venta_blister: Optional[float]
+    unidades_por_blister: int
+    stock_unidades: int
+    stock_actual: int
+    precio_venta_caja: float
+    detalle: Optional[str] = None
+    categoria: Optional[str] = None
+    presentacion: Optional[str] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _filas(n):
+    """Filas en el orden de los campos de Producto (strings compartidos)."""
+    nombres = [f"Producto {i % 5000:05d}" for i in range(5000)]
+    return [
+        (i, nombres[i % 5000], 1.5, 2.0, None if i % 3 else 18.0, 10, i % 500, i % 500,
+         45.0, None, "Analgésico", "Tableta")
+        for i in range(n)
+    ]
+
+
+VARIANTES = {
+    "anterior __init__": lambda filas: [ProductoAnterior(*f) for f in filas],
+    "slots __init__": lambda filas: [Producto(*f) for f in filas],
+    "slots from_rows": Producto.from_rows,
+}
+
+
+def _tiempo(fn, *args):
+    gc.collect()
+    t0 = time.perf_counter()
+    resultado = fn(*args)
+    return (time.perf_counter() - t0) * 1000, resultado
+
+
+def _memoria(fn, filas):
+    """Bytes asignados que quedan vivos al construir la lista de entidades."""
+    gc.collect()
+    tracemalloc.start()
+    resultado = fn(filas)
+    actual, _pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return actual
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Micro-benchmark de los modelos: construir N entidades Producto y "
+            "pasarlas a dict, antes (dataclass con __dict__ + asdict) y ahora "
+            "(slots, to_dict plano, from_rows)."
+        )
+    )
+    parser.add_argument("--filas", type=int, default=1_000_000, help="Entidades a crear.")
+    parser.add_argument(
+        "--filas-dict",
+        type=int,
+        default=100_000,
+        help="Entidades convertidas con to_dict (asdict es lento).",
+    )
+    args = parser.parse_args()
+
+    filas = _filas(args.filas)
+    print(f"=== Modelos · {args.filas:,} filas ===")
+    print(f"{'Variante':<24}{'construir ms':>14}{'memoria MB':>12}{'B/entidad':>11}")
+
+    for nombre, fn in VARIANTES.items():
+        ms, resultado = _tiempo(fn, filas)
+        del resultado
+        mem = _memoria(fn, filas)
+        print(f"{nombre:<24}{ms:>14,.0f}{mem / 2**20:>12.1f}{mem / args.filas:>11.0f}")
+
+    muestra = filas[: args.filas_dict]
+    anteriores = [ProductoAnterior(*f) for f in muestra]
+    nuevos = [Producto.from_row(f) for f in muestra]
+    ms_a, _ = _tiempo(lambda: [p.to_dict() for p in anteriores])
+    ms_n, _ = _tiempo(lambda: [p.to_dict() for p in nuevos])
+    print(f"to_dict ×{len(muestra):,}: asdict {ms_a:,.0f} ms · plano {ms_n:,.0f} ms "
+          f"({ms_a / ms_n:.1f}x)")
+    print("✅ Benchmark terminado.")
+
+
+if __name__ == "__main__":
+    main()
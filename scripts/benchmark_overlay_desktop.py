@@ -0,0 +1,114 @@
+import argparse
+import statistics
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from app.interfaz.overlay_acciones import AccionesOverlay
+
+
+COLUMNAS = ("Nombre", "Precio Compra", "Precio Unidad", "Precio Blister", "Acciones")
+
+
+def _crear_treeview(root, filas):
+    tv = ttk.Treeview(root, columns=COLUMNAS, show="headings", height=18)
+    for c in COLUMNAS:
+        tv.heading(c, text=c)
+        tv.column(c, width=150)
+    for i in range(filas):
+        tv.insert("", "end", iid=str(i), values=(f"Producto {i:05d}", "1.00", "2.00", "0.00", ""))
+    vs = ttk.Scrollbar(root, orient="vertical", command=tv.yview)
+    tv.pack(side="left", fill="both", expand=True)
+    vs.pack(side="right", fill="y")
+    return tv, vs
+
+
+def _medir(root, tv, refrescar, frames):
+    """Desplaza el Treeview `frames` veces y mide refresco + dibujo (ms)."""
+    tiempos = []
+    for k in range(frames):
+        tv.yview_moveto(k / max(1, frames))
+        t0 = time.perf_counter()
+        refrescar()
+        root.update()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return tiempos
+
+
+def _overlay_por_fila(tv):
+    """Versión anterior: un Frame con dos botones por CADA fila."""
+    botones = {}
+
+    def refrescar():
+        for iid in tv.get_children():
+            bbox = tv.bbox(iid, column=4)
+            if not bbox:
+                if iid in botones:
+                    botones[iid].place_forget()
+                continue
+            x, y, w, h = bbox
+            if iid not in botones:
+                fr = tk.Frame(tv, bg="#FFFFFF")
+                ttk.Button(fr, text="Editar").pack(side="left", padx=(0, 6))
+                ttk.Button(fr, text="Añadir").pack(side="left")
+                botones[iid] = fr
+            botones[iid].place(x=x + 8, y=y + 2, width=w - 16, height=h - 4)
+
+    return refrescar
+
+
+def _resumen(nombre, tiempos):
+    ordenados = sorted(tiempos)
+    p95 = ordenados[int(len(ordenados) * 0.95) - 1]
+    print(
+        f"{nombre:<22} mediana {statistics.median(tiempos):8.2f} ms · "
+        f"p95 {p95:8.2f} ms · máx {max(tiempos):8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el tiempo por frame de la columna de acciones del Treeview."
+    )
+    parser.add_argument("--filas", type=int, default=10_000)
+    parser.add_argument("--frames", type=int, default=40)
+    parser.add_argument(
+        "--sin-anterior",
+        action="store_true",
+        help="No medir la versión con un Frame por fila (tarda mucho con 10k filas).",
+    )
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"❌ No hay pantalla disponible para Tk: {e}")
+        return
+    root.geometry("900x600")
+
+    print(f"=== Overlay de acciones · {args.filas} filas · {args.frames} frames ===")
+
+    tv, vs = _crear_treeview(root, args.filas)
+    overlay = AccionesOverlay(
+        tv,
+        "Acciones",
+        [("Editar", "TButton", lambda _iid: None), ("Añadir", "TButton", lambda _iid: None)],
+        yscroll=vs.set,
+    )
+    root.update()
+    _resumen("Virtualizado (pool)", _medir(root, tv, overlay.refrescar, args.frames))
+    print(f"   widgets en el pool: {len(overlay.pool)}")
+
+    if not args.sin_anterior:
+        tv.destroy()
+        vs.destroy()
+        tv, vs = _crear_treeview(root, args.filas)
+        tv.configure(yscrollcommand=vs.set)
+        root.update()
+        _resumen("Un Frame por fila", _medir(root, tv, _overlay_por_fila(tv), args.frames))
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+
+from app.services.reposicion_service import ReposicionService
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recalcula las sugerencias de reposición (tarea batch)."
+    )
+    parser.add_argument(
+        "--dias-objetivo",
+        type=int,
+        default=30,
+        help="Días de venta que debe cubrir el stock después de comprar.",
+    )
+    parser.add_argument(
+        "--dias-entrega",
+        type=int,
+        default=3,
+        help="Días que tarda el proveedor en entregar.",
+    )
+    args = parser.parse_args()
+
+    print("=== Cálculo de sugerencias de reposición ===")
+    try:
+        total = ReposicionService().calcular_sugerencias(
+            dias_objetivo=args.dias_objetivo,
+            dias_entrega=args.dias_entrega,
+        )
+        print(f"✅ Sugerencias calculadas para {total} productos.")
+    except Exception as e:
+        print(f"❌ Error al calcular sugerencias: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+from datetime import date, timedelta
+
+from app.services.cortes_caja_service import CortesCajaService
+
+
+def _fecha(valor: str) -> date:
+    return date.fromisoformat(valor)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Corte de caja: guarda los totales del día en public.cortes_caja. "
+            "Pensado para correr al final del día (cron)."
+        )
+    )
+    parser.add_argument(
+        "--fecha",
+        type=_fecha,
+        default=date.today(),
+        help="Día a cerrar, YYYY-MM-DD (por defecto hoy).",
+    )
+    parser.add_argument(
+        "--dias-atras",
+        type=int,
+        default=0,
+        help="Cerrar también los N días anteriores que aún no tengan corte.",
+    )
+    args = parser.parse_args()
+
+    desde = args.fecha - timedelta(days=args.dias_atras)
+    print(f"=== Corte de caja {desde:%Y-%m-%d} → {args.fecha:%Y-%m-%d} ===")
+    try:
+        cortes = CortesCajaService().cerrar_pendientes(desde, args.fecha)
+    except Exception as e:
+        print(f"❌ Error al cerrar caja: {e}")
+        return
+
+    if not cortes:
+        print("✅ No había días pendientes de cierre.")
+        return
+
+    for c in cortes:
+        print(
+            f"✅ {c.fecha:%Y-%m-%d}: {c.num_ventas} ventas · vendido Q {c.ventas_total:,.2f} · "
+            f"gastos Q {c.gastos:,.2f} · caja esperada Q {c.efectivo_esperado:,.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+
+from app.services.conciliacion_service import ConciliacionService
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Concilia productos.stock_unidades contra movimientos_inventario "
+            "(tarea nocturna)."
+        )
+    )
+    parser.add_argument(
+        "--reparar",
+        action="store_true",
+        help="Corrige el stock al valor del libro y registra el ajuste.",
+    )
+    parser.add_argument(
+        "--bloque",
+        type=int,
+        default=5000,
+        help="Cantidad de ids de producto por consulta.",
+    )
+    parser.add_argument(
+        "--hilos",
+        type=int,
+        default=4,
+        help="Bloques procesados en paralelo (una conexión por hilo).",
+    )
+    parser.add_argument("--desde-id", type=int, default=None, help="Primer id de producto.")
+    parser.add_argument("--hasta-id", type=int, default=None, help="Último id de producto.")
+    parser.add_argument(
+        "--salida",
+        default=None,
+        help="Ruta de un CSV donde guardar el detalle de los descuadres.",
+    )
+    args = parser.parse_args()
+
+    print("=== Conciliación de stock ===")
+    try:
+        df, reparados = ConciliacionService().conciliar(
+            reparar=args.reparar,
+            tamano_bloque=args.bloque,
+            hilos=args.hilos,
+            id_desde=args.desde_id,
+            id_hasta=args.hasta_id,
+        )
+    except Exception as e:
+        print(f"❌ Error al conciliar stock: {e}")
+        return
+
+    if df.empty:
+        print("✅ Sin descuadres: el stock coincide con el libro de movimientos.")
+        return
+
+    print(f"⚠️ Productos descuadrados: {len(df)}")
+    print(df.head(20).to_string(index=False))
+
+    if args.salida:
+        df.to_csv(args.salida, index=False)
+        print(f"📄 Detalle guardado en {args.salida}")
+
+    if args.reparar:
+        print(f"✅ Productos reparados: {reparados}")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,7 +43,7 @@ CREATE TABLE public.ventas (
     id BIGSERIAL PRIMARY KEY,
     fecha TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     total NUMERIC(10,2) NOT NULL,
-    tipo_pago TEXT,
+    tipo_pago TEXT NOT NULL DEFAULT 'efectivo',   -- metodos_pago.codigo o 'mixto'
     observacion TEXT,
     id_usuario BIGINT NOT NULL,
     estado TEXT NOT NULL DEFAULT 'Activa',
@@ -56,6 +56,7 @@ CREATE TABLE public.ventas (
 CREATE TABLE public.detalle_ventas (
     id BIGSERIAL PRIMARY KEY,
     id_venta BIGINT NOT NULL,
+    fecha TIMESTAMPTZ NOT NULL DEFAULT NOW(),   -- = ventas.fecha (clave de partición)
     id_producto BIGINT NOT NULL,
     tipo TEXT NOT NULL,
     cantidad INT NOT NULL,
@@ -67,25 +68,66 @@ CREATE TABLE public.detalle_ventas (
     FOREIGN KEY (id_producto) REFERENCES public.productos(id)
 );
 
+-- ========================================================
+-- 🧩 TABLA: CLIENTES (cuenta corriente de fiados)
+-- ========================================================
+-- saldo = lo que el cliente debe hoy. Lo mantienen crear_fiado y los
+-- abonos en la misma transacción que el fiado, así "quién debe cuánto"
+-- se lee de aquí sin sumar fiados.
+CREATE TABLE public.clientes (
+    id BIGSERIAL PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    -- mismo cliente aunque se escriba con otras mayúsculas o espacios
+    nombre_clave TEXT GENERATED ALWAYS AS (
+        lower(regexp_replace(btrim(nombre), '\s+', ' ', 'g'))
+    ) STORED UNIQUE,
+    telefono TEXT,
+    saldo NUMERIC(12,2) NOT NULL DEFAULT 0 CHECK (saldo >= 0),
+    fiados_pendientes INT NOT NULL DEFAULT 0 CHECK (fiados_pendientes >= 0),
+    ultimo_movimiento TIMESTAMPTZ,
+    creado_en TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Solo los clientes que deben: recorrerlo cuesta lo que haya deudores
+CREATE INDEX idx_clientes_deudores
+    ON public.clientes (saldo DESC)
+    INCLUDE (nombre, telefono, fiados_pendientes, ultimo_movimiento)
+    WHERE saldo > 0;
+
 -- ========================================================
 -- 🧩 TABLA: FIADOS
 -- ========================================================
 CREATE TABLE public.fiados (
     id BIGSERIAL PRIMARY KEY,
     id_producto BIGINT NOT NULL,
+    id_cliente BIGINT NOT NULL,
     nombre_cliente TEXT NOT NULL,
     telefono TEXT,
     producto TEXT,
     cantidad INT NOT NULL,
     monto NUMERIC(10,2) NOT NULL,
+    saldo NUMERIC(10,2) NOT NULL,                  -- lo que falta pagar
     fecha TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     estado TEXT NOT NULL DEFAULT 'Pendiente',
     fecha_pago TIMESTAMPTZ,
     id_venta BIGINT,
+    CHECK (saldo >= 0 AND saldo <= monto),
     FOREIGN KEY (id_producto) REFERENCES public.productos(id),
+    FOREIGN KEY (id_cliente) REFERENCES public.clientes(id),
     FOREIGN KEY (id_venta) REFERENCES public.ventas(id)
 );
 
+-- Fiados abiertos de cada cliente, del más viejo al más nuevo (abonos)
+CREATE INDEX idx_fiados_cliente_pendientes
+    ON public.fiados (id_cliente, fecha)
+    WHERE estado IS DISTINCT FROM 'Pagado';
+
+-- Listado de pendientes: solo entra lo que no está pagado
+CREATE INDEX idx_fiados_pendientes
+    ON public.fiados (fecha)
+    INCLUDE (nombre_cliente, producto, saldo)
+    WHERE estado IS DISTINCT FROM 'Pagado';
+
 -- ========================================================
 -- 🧩 TABLA: GASTOS
 -- ========================================================
@@ -112,4 +154,183 @@ CREATE TABLE public.movimientos_inventario (
     FOREIGN KEY (id_producto) REFERENCES public.productos(id)
 );
 
+-- ========================================================
+-- 🧩 ÍNDICES: REPORTES POR RANGO DE FECHAS
+-- ========================================================
+-- Clasificación ABC, top vendidos y resumen filtran ventas activas por fecha
+-- y luego unen el detalle por id_venta.
+CREATE INDEX IF NOT EXISTS idx_ventas_activas_fecha
+    ON public.ventas (fecha)
+    WHERE estado = 'Activa';
+
+CREATE INDEX IF NOT EXISTS idx_detalle_ventas_venta
+    ON public.detalle_ventas (id_venta);
+
+-- ========================================================
+-- 🧩 TABLA: SUGERENCIAS DE REPOSICIÓN (cálculo batch)
+-- ========================================================
+-- La llena ReposicionService.calcular_sugerencias (scripts/calcular_reposicion.py);
+-- el dashboard solo la lee.
+CREATE TABLE IF NOT EXISTS public.sugerencias_reposicion (
+    id_producto BIGINT PRIMARY KEY,
+    stock_unidades INT NOT NULL,
+    venta_diaria_7 NUMERIC(12,4) NOT NULL,
+    venta_diaria_28 NUMERIC(12,4) NOT NULL,
+    venta_diaria NUMERIC(12,4) NOT NULL,
+    dias_cobertura NUMERIC(12,2),          -- NULL = sin ventas recientes
+    cantidad_sugerida INT NOT NULL DEFAULT 0,
+    calculado_en TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    FOREIGN KEY (id_producto) REFERENCES public.productos(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_movimientos_tipo_fecha
+    ON public.movimientos_inventario (fecha, id_producto)
+    WHERE tipo IN ('venta', 'fiado');
+
+-- Conciliación de stock (scripts/conciliar_stock.py): reproduce el libro
+-- por producto en orden (fecha, id) y por rangos de id_producto.
+CREATE INDEX IF NOT EXISTS idx_movimientos_producto_fecha
+    ON public.movimientos_inventario (id_producto, fecha, id);
+
+-- Particiones mensuales de ventas, detalle_ventas y movimientos_inventario:
+-- ver scripts/particionar_tablas.sql (migración) y scripts/mantener_particiones.py.
+
+-- Listado paginado de productos (orden por nombre sobre los activos)
+CREATE INDEX IF NOT EXISTS idx_productos_activos_nombre
+    ON public.productos (nombre, id)
+    WHERE activo = TRUE;
+
+-- ========================================================
+-- 🧩 TABLA: CORTES DE CAJA (cierre diario)
+-- ========================================================
+-- Foto de los totales de cada día cerrado (CortesCajaService.cerrar_dia o
+-- scripts/cerrar_caja.py). Los reportes de rangos suman estas filas para
+-- los días cerrados y solo consultan ventas/gastos/fiados de los abiertos.
+CREATE TABLE IF NOT EXISTS public.cortes_caja (
+    fecha DATE PRIMARY KEY,
+    num_ventas INT NOT NULL,
+    ventas_total NUMERIC(12,2) NOT NULL,
+    ventas_efectivo NUMERIC(12,2) NOT NULL,
+    ventas_por_pago JSONB NOT NULL DEFAULT '{}',   -- {"efectivo": 120.50, ...}
+    ganancia NUMERIC(12,2) NOT NULL,
+    gastos NUMERIC(12,2) NOT NULL,
+    fiados_nuevos NUMERIC(12,2) NOT NULL,          -- fiado ese día
+    fiados_pendientes NUMERIC(12,2) NOT NULL,      -- de esos, sin abonar ese día
+    fiados_cobrados NUMERIC(12,2) NOT NULL,        -- abonos ese día a fiados anteriores
+    efectivo_esperado NUMERIC(12,2) NOT NULL,      -- efectivo + cobrados - gastos - pendientes
+    id_usuario BIGINT,
+    cerrado_en TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    FOREIGN KEY (id_usuario) REFERENCES public.usuarios(id)
+);
+
+-- Fiados del día y pagos del día (para el corte)
+CREATE INDEX IF NOT EXISTS idx_fiados_fecha
+    ON public.fiados (fecha);
+
+CREATE INDEX IF NOT EXISTS idx_fiados_fecha_pago
+    ON public.fiados (fecha_pago)
+    WHERE fecha_pago IS NOT NULL;
+
+-- Un día con corte no admite movimientos nuevos ni cambios en los que
+-- tiene. Borrar sí se permite: es lo que hace el archivo histórico.
+CREATE OR REPLACE FUNCTION public.bloquear_dia_cerrado()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM public.cortes_caja WHERE fecha = NEW.fecha::date)
+       OR (TG_OP = 'UPDATE'
+           AND EXISTS (SELECT 1 FROM public.cortes_caja WHERE fecha = OLD.fecha::date))
+    THEN
+        RAISE EXCEPTION 'El día % ya tiene corte de caja; no se puede modificar (%).',
+            CASE WHEN TG_OP = 'UPDATE' THEN OLD.fecha::date ELSE NEW.fecha::date END,
+            TG_TABLE_NAME
+            USING ERRCODE = 'check_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_ventas_dia_cerrado ON public.ventas;
+CREATE TRIGGER trg_ventas_dia_cerrado
+    BEFORE INSERT OR UPDATE ON public.ventas
+    FOR EACH ROW EXECUTE FUNCTION public.bloquear_dia_cerrado();
+
+DROP TRIGGER IF EXISTS trg_gastos_dia_cerrado ON public.gastos;
+CREATE TRIGGER trg_gastos_dia_cerrado
+    BEFORE INSERT OR UPDATE ON public.gastos
+    FOR EACH ROW EXECUTE FUNCTION public.bloquear_dia_cerrado();
+
+-- Pagar o abonar un fiado de un día cerrado sí se permite (estado,
+-- fecha_pago, saldo): el pago cuenta en el corte del día en que se cobra.
+DROP TRIGGER IF EXISTS trg_fiados_dia_cerrado ON public.fiados;
+CREATE TRIGGER trg_fiados_dia_cerrado
+    BEFORE INSERT OR UPDATE OF id_producto, nombre_cliente, producto, cantidad, monto, fecha
+    ON public.fiados
+    FOR EACH ROW EXECUTE FUNCTION public.bloquear_dia_cerrado();
+
+-- ========================================================
+-- 🧩 TABLAS: MÉTODOS DE PAGO + PAGOS POR VENTA
+-- ========================================================
+-- Cada venta tiene uno o más pagos (pago dividido). ventas.tipo_pago queda
+-- como etiqueta: el código del método, o 'mixto' si hubo varios. Los
+-- totales por método se suman sobre pagos_venta con el índice
+-- (fecha, metodo) INCLUDE (monto), sin tocar ventas.
+-- Bases existentes: scripts/migrar_pagos.sql.
+CREATE TABLE IF NOT EXISTS public.metodos_pago (
+    codigo TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    es_efectivo BOOLEAN NOT NULL DEFAULT FALSE,    -- entra a la caja
+    activo BOOLEAN NOT NULL DEFAULT TRUE,
+    orden SMALLINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO public.metodos_pago (codigo, nombre, es_efectivo, orden) VALUES
+    ('efectivo', 'Efectivo', TRUE, 1),
+    ('tarjeta', 'Tarjeta', FALSE, 2),
+    ('transferencia', 'Transferencia', FALSE, 3)
+ON CONFLICT (codigo) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS public.pagos_venta (
+    id BIGSERIAL PRIMARY KEY,
+    id_venta BIGINT NOT NULL,
+    fecha TIMESTAMPTZ NOT NULL,                    -- = ventas.fecha
+    metodo TEXT NOT NULL,
+    monto NUMERIC(10,2) NOT NULL CHECK (monto > 0),
+    FOREIGN KEY (id_venta) REFERENCES public.ventas(id),
+    FOREIGN KEY (metodo) REFERENCES public.metodos_pago(codigo)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pagos_venta_fecha_metodo
+    ON public.pagos_venta (fecha, metodo) INCLUDE (monto);
+
+CREATE INDEX IF NOT EXISTS idx_pagos_venta_venta
+    ON public.pagos_venta (id_venta);
+
+-- ========================================================
+-- 🧩 TABLA: ABONOS DE FIADOS (pagos parciales)
+-- ========================================================
+-- Cada pago a un fiado, completo o parcial. El fiado queda 'Pagado' cuando
+-- su saldo llega a cero. Bases existentes: scripts/migrar_clientes.sql.
+CREATE TABLE IF NOT EXISTS public.abonos_fiado (
+    id BIGSERIAL PRIMARY KEY,
+    id_fiado BIGINT NOT NULL,
+    id_cliente BIGINT NOT NULL,
+    fecha TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    monto NUMERIC(10,2) NOT NULL CHECK (monto > 0),
+    FOREIGN KEY (id_fiado) REFERENCES public.fiados(id),
+    FOREIGN KEY (id_cliente) REFERENCES public.clientes(id)
+);
+
+-- Cobrado por día (corte de caja)
+CREATE INDEX IF NOT EXISTS idx_abonos_fiado_fecha
+    ON public.abonos_fiado (fecha) INCLUDE (id_fiado, monto);
+
+CREATE INDEX IF NOT EXISTS idx_abonos_fiado_fiado
+    ON public.abonos_fiado (id_fiado);
 
+-- Un abono entra a la caja del día en que se cobra
+DROP TRIGGER IF EXISTS trg_abonos_fiado_dia_cerrado ON public.abonos_fiado;
+CREATE TRIGGER trg_abonos_fiado_dia_cerrado
+    BEFORE INSERT OR UPDATE ON public.abonos_fiado
+    FOR EACH ROW EXECUTE FUNCTION public.bloquear_dia_cerrado();
@@ -0,0 +1,52 @@
+import argparse
+
+from app.services.particiones_service import ParticionesService
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Mantiene las particiones mensuales de ventas, detalle_ventas "
+            "y movimientos_inventario (tarea mensual)."
+        )
+    )
+    parser.add_argument(
+        "--meses-adelante",
+        type=int,
+        default=3,
+        help="Meses futuros que deben tener partición creada.",
+    )
+    parser.add_argument(
+        "--retener-meses",
+        type=int,
+        default=None,
+        help=(
+            "Si se indica, desprende las particiones más viejas que estos meses "
+            "y las mueve al esquema 'archivo'."
+        ),
+    )
+    args = parser.parse_args()
+
+    service = ParticionesService()
+
+    print("=== Mantenimiento de particiones ===")
+    try:
+        creadas = service.asegurar_particiones(meses_adelante=args.meses_adelante)
+        for tabla, n in creadas.items():
+            print(f"✅ {tabla}: {n} particiones nuevas.")
+
+        if args.retener_meses is not None:
+            desprendidas = service.desprender_antiguas(args.retener_meses)
+            if desprendidas:
+                print(f"📦 Desprendidas al esquema archivo: {', '.join(desprendidas)}")
+            else:
+                print("✅ No hay particiones para desprender.")
+
+        for tabla in service.tablas_con_filas_en_default():
+            print(f"⚠️ {tabla}_default tiene filas: falta la partición de algún mes.")
+    except Exception as e:
+        print(f"❌ Error en el mantenimiento de particiones: {e}")
+
+
+if __name__ == "__main__":
+    main()
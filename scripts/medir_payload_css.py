@@ -0,0 +1,64 @@
+import argparse
+
+from app.ui.web.assets import bloque_inline, bloque_sesion
+
+
+# Hojas que manda cada pantalla (además de "sidebar" en todas las del panel)
+PANTALLAS = {
+    "Inicio": ["inicio"],
+    "Productos / Carrito": ["productos_carrito"],
+    "Inventario": ["inventario"],
+    "Gastos": ["gastos"],
+    "Fiados": ["fiados"],
+    "Configuración": ["config"],
+}
+
+
+def _bytes(texto: str) -> int:
+    return len(texto.encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Bytes de CSS que viajan al navegador por rerun: <style> inline en "
+            "cada rerun (antes) contra una sola vez por sesión (CSS_MODO=sesion)."
+        )
+    )
+    parser.add_argument(
+        "--reruns",
+        type=int,
+        default=20,
+        help="Reruns simulados por pantalla (clics, escritura en formularios...).",
+    )
+    args = parser.parse_args()
+
+    print(f"=== CSS por rerun · {args.reruns} reruns por pantalla ===")
+    print(f"{'Pantalla':<22}{'antes/rerun':>13}{'1er render':>13}{'después':>10}"
+          f"{'total antes':>14}{'total después':>15}")
+
+    ya_en_sesion = set()
+    total_antes = total_despues = 0
+    for pantalla, hojas in PANTALLAS.items():
+        nombres = ["sidebar"] + hojas
+
+        antes = _bytes(bloque_inline(nombres))
+        pendientes = [n for n in nombres if n not in ya_en_sesion]
+        primero = _bytes(bloque_sesion(pendientes)) if pendientes else 0
+        ya_en_sesion.update(pendientes)
+
+        t_antes = antes * args.reruns
+        t_despues = primero
+        total_antes += t_antes
+        total_despues += t_despues
+
+        print(f"{pantalla:<22}{antes:>13,}{primero:>13,}{0:>10}"
+              f"{t_antes:>14,}{t_despues:>15,}")
+
+    ahorro = 100 * (1 - total_despues / total_antes) if total_antes else 0.0
+    print(f"✅ Sesión completa: {total_antes:,} B antes · {total_despues:,} B después "
+          f"({ahorro:.1f}% menos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+-- ==============================================
+-- 🧱 FARMACIA 2.0 - CLIENTES Y ABONOS DE FIADOS
+-- ==============================================
+-- Para bases creadas antes de clientes / abonos_fiado:
+-- crea las tablas (mismas definiciones que crear_tablas.sql), arma un
+-- cliente por cada nombre distinto de fiados, liga cada fiado a su
+-- cliente, pasa los pagos ya hechos a abonos_fiado y calcula los saldos.
+--
+-- Ejecutar UNA vez (se puede repetir sin duplicar clientes ni abonos):
+--     psql "$DATABASE_URL" -f scripts/migrar_clientes.sql
+-- ==============================================
+
+BEGIN;
+
+-- Nadie registra ni paga fiados mientras se migra
+LOCK TABLE public.fiados IN SHARE ROW EXCLUSIVE MODE;
+
+-- ========================================================
+-- 🧩 CLIENTES
+-- ========================================================
+CREATE TABLE IF NOT EXISTS public.clientes (
+    id BIGSERIAL PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    nombre_clave TEXT GENERATED ALWAYS AS (
+        lower(regexp_replace(btrim(nombre), '\s+', ' ', 'g'))
+    ) STORED UNIQUE,
+    telefono TEXT,
+    saldo NUMERIC(12,2) NOT NULL DEFAULT 0 CHECK (saldo >= 0),
+    fiados_pendientes INT NOT NULL DEFAULT 0 CHECK (fiados_pendientes >= 0),
+    ultimo_movimiento TIMESTAMPTZ,
+    creado_en TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Un cliente por nombre normalizado: se queda con la forma y el teléfono
+-- del fiado más reciente
+INSERT INTO public.clientes (nombre, telefono)
+SELECT DISTINCT ON (lower(regexp_replace(btrim(f.nombre_cliente), '\s+', ' ', 'g')))
+    btrim(f.nombre_cliente),
+    f.telefono
+FROM public.fiados f
+ORDER BY lower(regexp_replace(btrim(f.nombre_cliente), '\s+', ' ', 'g')),
+         (f.telefono IS NULL),
+         f.fecha DESC
+ON CONFLICT (nombre_clave) DO NOTHING;
+
+-- ========================================================
+-- 🧩 FIADOS: CLIENTE + SALDO
+-- ========================================================
+-- Estas columnas no están en el trigger bloquear_dia_cerrado de fiados:
+-- se pueden llenar también en días con corte.
+ALTER TABLE public.fiados ADD COLUMN IF NOT EXISTS id_cliente BIGINT;
+ALTER TABLE public.fiados ADD COLUMN IF NOT EXISTS saldo NUMERIC(10,2);
+
+UPDATE public.fiados f
+SET id_cliente = c.id
+FROM public.clientes c
+WHERE f.id_cliente IS NULL
+  AND c.nombre_clave = lower(regexp_replace(btrim(f.nombre_cliente), '\s+', ' ', 'g'));
+
+UPDATE public.fiados
+SET saldo = CASE WHEN estado = 'Pagado' THEN 0 ELSE monto END
+WHERE saldo IS NULL;
+
+ALTER TABLE public.fiados ALTER COLUMN id_cliente SET NOT NULL;
+ALTER TABLE public.fiados ALTER COLUMN saldo SET NOT NULL;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fiados_id_cliente_fkey') THEN
+        ALTER TABLE public.fiados
+            ADD CONSTRAINT fiados_id_cliente_fkey
+            FOREIGN KEY (id_cliente) REFERENCES public.clientes(id);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fiados_saldo_check') THEN
+        ALTER TABLE public.fiados
+            ADD CONSTRAINT fiados_saldo_check CHECK (saldo >= 0 AND saldo <= monto);
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_fiados_cliente_pendientes
+    ON public.fiados (id_cliente, fecha)
+    WHERE estado IS DISTINCT FROM 'Pagado';
+
+CREATE INDEX IF NOT EXISTS idx_fiados_pendientes
+    ON public.fiados (fecha)
+    INCLUDE (nombre_cliente, producto, saldo)
+    WHERE estado IS DISTINCT FROM 'Pagado';
+
+-- ========================================================
+-- 🧩 ABONOS
+-- ========================================================
+CREATE TABLE IF NOT EXISTS public.abonos_fiado (
+    id BIGSERIAL PRIMARY KEY,
+    id_fiado BIGINT NOT NULL,
+    id_cliente BIGINT NOT NULL,
+    fecha TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    monto NUMERIC(10,2) NOT NULL CHECK (monto > 0),
+    FOREIGN KEY (id_fiado) REFERENCES public.fiados(id),
+    FOREIGN KEY (id_cliente) REFERENCES public.clientes(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_abonos_fiado_fecha
+    ON public.abonos_fiado (fecha) INCLUDE (id_fiado, monto);
+
+CREATE INDEX IF NOT EXISTS idx_abonos_fiado_fiado
+    ON public.abonos_fiado (id_fiado);
+
+-- Cada fiado pagado antes de la migración = un abono por el total, en su
+-- fecha de pago (los pagados sin fecha_pago no entran a ninguna caja).
+-- Los abonos históricos caen en días ya cerrados: sin trigger mientras tanto.
+DROP TRIGGER IF EXISTS trg_abonos_fiado_dia_cerrado ON public.abonos_fiado;
+
+INSERT INTO public.abonos_fiado (id_fiado, id_cliente, fecha, monto)
+SELECT f.id, f.id_cliente, f.fecha_pago, f.monto
+FROM public.fiados f
+WHERE f.estado = 'Pagado'
+  AND f.fecha_pago IS NOT NULL
+  AND f.monto > 0
+  AND NOT EXISTS (SELECT 1 FROM public.abonos_fiado a WHERE a.id_fiado = f.id);
+
+CREATE TRIGGER trg_abonos_fiado_dia_cerrado
+    BEFORE INSERT OR UPDATE ON public.abonos_fiado
+    FOR EACH ROW EXECUTE FUNCTION public.bloquear_dia_cerrado();
+
+-- ========================================================
+-- 🧩 SALDOS
+-- ========================================================
+UPDATE public.clientes c
+SET saldo = s.saldo,
+    fiados_pendientes = s.pendientes,
+    ultimo_movimiento = s.ultimo
+FROM (
+    SELECT
+        f.id_cliente,
+        COALESCE(SUM(f.saldo), 0) AS saldo,
+        COUNT(*) FILTER (WHERE f.estado IS DISTINCT FROM 'Pagado') AS pendientes,
+        MAX(GREATEST(f.fecha, f.fecha_pago)) AS ultimo
+    FROM public.fiados f
+    GROUP BY f.id_cliente
+) s
+WHERE s.id_cliente = c.id;
+
+CREATE INDEX IF NOT EXISTS idx_clientes_deudores
+    ON public.clientes (saldo DESC)
+    INCLUDE (nombre, telefono, fiados_pendientes, ultimo_movimiento)
+    WHERE saldo > 0;
+
+ANALYZE public.clientes;
+ANALYZE public.fiados;
+ANALYZE public.abonos_fiado;
+
+COMMIT;
@@ -0,0 +1,98 @@
+-- ==============================================
+-- 🧱 FARMACIA 2.0 - MÉTODOS DE PAGO
+-- ==============================================
+-- Para bases creadas antes de metodos_pago / pagos_venta:
+-- crea las tablas (mismas definiciones que crear_tablas.sql), normaliza
+-- ventas.tipo_pago y genera un pago por cada venta existente.
+--
+-- Ejecutar UNA vez (se puede repetir sin duplicar pagos):
+--     psql "$DATABASE_URL" -f scripts/migrar_pagos.sql
+-- ==============================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.metodos_pago (
+    codigo TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    es_efectivo BOOLEAN NOT NULL DEFAULT FALSE,
+    activo BOOLEAN NOT NULL DEFAULT TRUE,
+    orden SMALLINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO public.metodos_pago (codigo, nombre, es_efectivo, orden) VALUES
+    ('efectivo', 'Efectivo', TRUE, 1),
+    ('tarjeta', 'Tarjeta', FALSE, 2),
+    ('transferencia', 'Transferencia', FALSE, 3)
+ON CONFLICT (codigo) DO NOTHING;
+
+-- ========================================================
+-- 🧩 NORMALIZAR ventas.tipo_pago
+-- ========================================================
+-- Antes se guardaba texto libre (NULL = efectivo). Días con corte de caja:
+-- el trigger no deja tocarlos, así que se desactiva solo para este UPDATE.
+ALTER TABLE public.ventas DISABLE TRIGGER USER;
+
+UPDATE public.ventas
+SET tipo_pago = lower(COALESCE(NULLIF(trim(tipo_pago), ''), 'efectivo'))
+WHERE tipo_pago IS DISTINCT FROM lower(COALESCE(NULLIF(trim(tipo_pago), ''), 'efectivo'));
+
+ALTER TABLE public.ventas ENABLE TRIGGER USER;
+
+ALTER TABLE public.ventas ALTER COLUMN tipo_pago SET DEFAULT 'efectivo';
+ALTER TABLE public.ventas ALTER COLUMN tipo_pago SET NOT NULL;
+
+-- Valores viejos que no son de la lista quedan como métodos inactivos
+INSERT INTO public.metodos_pago (codigo, nombre, activo, orden)
+SELECT DISTINCT v.tipo_pago, initcap(v.tipo_pago), FALSE, 99
+FROM public.ventas v
+WHERE v.tipo_pago <> 'mixto'
+ON CONFLICT (codigo) DO NOTHING;
+
+-- ========================================================
+-- 🧩 PAGOS POR VENTA
+-- ========================================================
+CREATE TABLE IF NOT EXISTS public.pagos_venta (
+    id BIGSERIAL PRIMARY KEY,
+    id_venta BIGINT NOT NULL,
+    fecha TIMESTAMPTZ NOT NULL,
+    metodo TEXT NOT NULL,
+    monto NUMERIC(10,2) NOT NULL CHECK (monto > 0),
+    FOREIGN KEY (metodo) REFERENCES public.metodos_pago(codigo)
+);
+
+-- FK hacia ventas: con ventas particionada (particionar_tablas.sql) debe
+-- incluir la fecha
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'pagos_venta_id_venta_fkey'
+    ) THEN
+        IF (SELECT relkind FROM pg_class WHERE oid = 'public.ventas'::regclass) = 'p' THEN
+            ALTER TABLE public.pagos_venta
+                ADD CONSTRAINT pagos_venta_id_venta_fkey
+                FOREIGN KEY (id_venta, fecha) REFERENCES public.ventas(id, fecha);
+        ELSE
+            ALTER TABLE public.pagos_venta
+                ADD CONSTRAINT pagos_venta_id_venta_fkey
+                FOREIGN KEY (id_venta) REFERENCES public.ventas(id);
+        END IF;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_pagos_venta_fecha_metodo
+    ON public.pagos_venta (fecha, metodo) INCLUDE (monto);
+
+CREATE INDEX IF NOT EXISTS idx_pagos_venta_venta
+    ON public.pagos_venta (id_venta);
+
+INSERT INTO public.pagos_venta (id_venta, fecha, metodo, monto)
+SELECT v.id, v.fecha, v.tipo_pago, v.total
+FROM public.ventas v
+WHERE v.total > 0
+  AND v.tipo_pago <> 'mixto'
+  AND NOT EXISTS (SELECT 1 FROM public.pagos_venta p WHERE p.id_venta = v.id);
+
+ANALYZE public.pagos_venta;
+
+COMMIT;
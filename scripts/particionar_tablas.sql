@@ -0,0 +1,241 @@
+-- ==============================================
+-- 🧱 FARMACIA 2.0 - PARTICIONES MENSUALES
+-- ==============================================
+-- Convierte ventas, detalle_ventas y movimientos_inventario en tablas
+-- particionadas por mes (RANGE sobre fecha) y migra los datos existentes.
+--
+-- Ejecutar UNA vez, después de crear_tablas.sql y en una ventana sin ventas:
+--     psql "$DATABASE_URL" -f scripts/particionar_tablas.sql
+--
+-- Las tablas originales quedan como *_sin_particion para verificación;
+-- borrarlas a mano cuando se confirme la migración.
+--
+-- Mantenimiento posterior (crear meses futuros, desprender meses viejos):
+--     python -m scripts.mantener_particiones
+-- ==============================================
+
+BEGIN;
+
+-- ========================================================
+-- 🧩 FUNCIÓN: CREAR PARTICIONES MENSUALES
+-- ========================================================
+-- Crea <tabla>_pYYYYMM para cada mes en [desde, desde + meses).
+-- Si ya existe, no hace nada. Devuelve cuántas particiones creó.
+CREATE OR REPLACE FUNCTION public.crear_particiones_mensuales(
+    p_tabla TEXT,
+    p_desde DATE,
+    p_meses INT
+) RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_inicio DATE := date_trunc('month', p_desde)::date;
+    v_fin    DATE;
+    v_nombre TEXT;
+    v_creadas INT := 0;
+BEGIN
+    FOR i IN 0 .. GREATEST(p_meses, 1) - 1 LOOP
+        v_fin := (v_inicio + INTERVAL '1 month')::date;
+        v_nombre := format('%s_p%s', p_tabla, to_char(v_inicio, 'YYYYMM'));
+
+        IF to_regclass(format('public.%I', v_nombre)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE public.%I PARTITION OF public.%I
+                     FOR VALUES FROM (%L) TO (%L);',
+                v_nombre, p_tabla, v_inicio, v_fin
+            );
+            v_creadas := v_creadas + 1;
+        END IF;
+
+        v_inicio := v_fin;
+    END LOOP;
+
+    RETURN v_creadas;
+END;
+$$;
+
+-- ========================================================
+-- 🧩 RETIRAR TABLAS SIN PARTICIÓN
+-- ========================================================
+-- fiados.id_venta no puede seguir siendo FK: una FK hacia una tabla
+-- particionada debe incluir la columna de partición (fecha).
+ALTER TABLE public.fiados DROP CONSTRAINT IF EXISTS fiados_id_venta_fkey;
+
+-- pagos_venta sí guarda la fecha de su venta: la FK se vuelve a crear
+-- sobre (id_venta, fecha) al final
+ALTER TABLE public.pagos_venta DROP CONSTRAINT IF EXISTS pagos_venta_id_venta_fkey;
+
+-- detalle_ventas guarda la fecha de su venta (clave de partición y de la FK)
+ALTER TABLE public.detalle_ventas
+    ADD COLUMN IF NOT EXISTS fecha TIMESTAMPTZ;
+
+UPDATE public.detalle_ventas d
+SET fecha = v.fecha
+FROM public.ventas v
+WHERE v.id = d.id_venta
+  AND d.fecha IS DISTINCT FROM v.fecha;
+
+DROP INDEX IF EXISTS public.idx_ventas_activas_fecha;
+DROP INDEX IF EXISTS public.idx_detalle_ventas_venta;
+DROP INDEX IF EXISTS public.idx_movimientos_tipo_fecha;
+DROP INDEX IF EXISTS public.idx_movimientos_producto_fecha;
+
+ALTER TABLE public.movimientos_inventario RENAME TO movimientos_inventario_sin_particion;
+ALTER TABLE public.movimientos_inventario_sin_particion
+    RENAME CONSTRAINT movimientos_inventario_pkey TO movimientos_inventario_sin_particion_pkey;
+
+ALTER TABLE public.detalle_ventas RENAME TO detalle_ventas_sin_particion;
+ALTER TABLE public.detalle_ventas_sin_particion
+    RENAME CONSTRAINT detalle_ventas_pkey TO detalle_ventas_sin_particion_pkey;
+
+ALTER TABLE public.ventas RENAME TO ventas_sin_particion;
+ALTER TABLE public.ventas_sin_particion
+    RENAME CONSTRAINT ventas_pkey TO ventas_sin_particion_pkey;
+
+-- ========================================================
+-- 🧩 TABLA: VENTAS (PARTICIONADA)
+-- ========================================================
+CREATE TABLE public.ventas (
+    id BIGINT NOT NULL DEFAULT nextval('public.ventas_id_seq'),
+    fecha TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    total NUMERIC(10,2) NOT NULL,
+    tipo_pago TEXT NOT NULL DEFAULT 'efectivo',   -- metodos_pago.codigo o 'mixto'
+    observacion TEXT,
+    id_usuario BIGINT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'Activa',
+    PRIMARY KEY (id, fecha),
+    FOREIGN KEY (id_usuario) REFERENCES public.usuarios(id)
+) PARTITION BY RANGE (fecha);
+
+-- ========================================================
+-- 🧩 TABLA: DETALLE_VENTAS (PARTICIONADA)
+-- ========================================================
+CREATE TABLE public.detalle_ventas (
+    id BIGINT NOT NULL DEFAULT nextval('public.detalle_ventas_id_seq'),
+    id_venta BIGINT NOT NULL,
+    fecha TIMESTAMPTZ NOT NULL,            -- = ventas.fecha
+    id_producto BIGINT NOT NULL,
+    tipo TEXT NOT NULL,
+    cantidad INT NOT NULL,
+    precio_unitario NUMERIC(10,2) NOT NULL,
+    unidades_descuento INT NOT NULL,
+    costo_unitario_compra NUMERIC(10,2) NOT NULL,
+    subtotal NUMERIC GENERATED ALWAYS AS (cantidad * precio_unitario) STORED,
+    PRIMARY KEY (id, fecha),
+    FOREIGN KEY (id_venta, fecha) REFERENCES public.ventas(id, fecha),
+    FOREIGN KEY (id_producto) REFERENCES public.productos(id)
+) PARTITION BY RANGE (fecha);
+
+-- ========================================================
+-- 🧩 TABLA: MOV INVENTARIO (PARTICIONADA)
+-- ========================================================
+CREATE TABLE public.movimientos_inventario (
+    id BIGINT NOT NULL DEFAULT nextval('public.movimientos_inventario_id_seq'),
+    id_producto BIGINT NOT NULL,
+    tipo TEXT NOT NULL,
+    cantidad INT NOT NULL,
+    referencia TEXT,
+    motivo TEXT,
+    fecha TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    stock_resultante INT NOT NULL,
+    PRIMARY KEY (id, fecha),
+    FOREIGN KEY (id_producto) REFERENCES public.productos(id)
+) PARTITION BY RANGE (fecha);
+
+-- Las secuencias pasan a las tablas nuevas (si no, se borrarían junto
+-- con las tablas *_sin_particion).
+ALTER SEQUENCE public.ventas_id_seq OWNED BY public.ventas.id;
+ALTER SEQUENCE public.detalle_ventas_id_seq OWNED BY public.detalle_ventas.id;
+ALTER SEQUENCE public.movimientos_inventario_id_seq OWNED BY public.movimientos_inventario.id;
+
+-- Fechas fuera de toda partición mensual caen aquí en vez de fallar;
+-- mantener_particiones avisa si tiene filas.
+CREATE TABLE public.ventas_default
+    PARTITION OF public.ventas DEFAULT;
+CREATE TABLE public.detalle_ventas_default
+    PARTITION OF public.detalle_ventas DEFAULT;
+CREATE TABLE public.movimientos_inventario_default
+    PARTITION OF public.movimientos_inventario DEFAULT;
+
+-- ========================================================
+-- 🧩 ÍNDICES (se propagan a cada partición)
+-- ========================================================
+CREATE INDEX idx_ventas_activas_fecha
+    ON public.ventas (fecha)
+    WHERE estado = 'Activa';
+
+CREATE INDEX idx_detalle_ventas_venta
+    ON public.detalle_ventas (id_venta);
+
+CREATE INDEX idx_movimientos_tipo_fecha
+    ON public.movimientos_inventario (fecha, id_producto)
+    WHERE tipo IN ('venta', 'fiado');
+
+CREATE INDEX idx_movimientos_producto_fecha
+    ON public.movimientos_inventario (id_producto, fecha, id);
+
+-- ========================================================
+-- 🧩 PARTICIONES PARA LOS DATOS EXISTENTES + 3 MESES
+-- ========================================================
+DO $$
+DECLARE
+    v_tabla TEXT;
+    v_desde DATE;
+    v_meses INT;
+BEGIN
+    FOREACH v_tabla IN ARRAY ARRAY['ventas', 'detalle_ventas', 'movimientos_inventario'] LOOP
+        EXECUTE format(
+            'SELECT COALESCE(MIN(fecha), NOW())::date FROM public.%I',
+            v_tabla || '_sin_particion'
+        ) INTO v_desde;
+
+        v_meses := (
+            (EXTRACT(YEAR FROM age(date_trunc('month', NOW()), date_trunc('month', v_desde))) * 12)
+            + EXTRACT(MONTH FROM age(date_trunc('month', NOW()), date_trunc('month', v_desde)))
+        )::int + 4;
+
+        PERFORM public.crear_particiones_mensuales(v_tabla, v_desde, v_meses);
+    END LOOP;
+END;
+$$;
+
+-- ========================================================
+-- 🧩 MIGRAR DATOS
+-- ========================================================
+INSERT INTO public.ventas (
+    id, fecha, total, tipo_pago, observacion, id_usuario, estado
+)
+SELECT id, fecha, total, COALESCE(tipo_pago, 'efectivo'), observacion, id_usuario, estado
+FROM public.ventas_sin_particion;
+
+INSERT INTO public.detalle_ventas (
+    id, id_venta, fecha, id_producto, tipo, cantidad,
+    precio_unitario, unidades_descuento, costo_unitario_compra
+)
+SELECT
+    id, id_venta, fecha, id_producto, tipo, cantidad,
+    precio_unitario, unidades_descuento, costo_unitario_compra
+FROM public.detalle_ventas_sin_particion;
+
+INSERT INTO public.movimientos_inventario (
+    id, id_producto, tipo, cantidad, referencia, motivo, fecha, stock_resultante
+)
+SELECT id, id_producto, tipo, cantidad, referencia, motivo, fecha, stock_resultante
+FROM public.movimientos_inventario_sin_particion;
+
+-- Días con corte de caja (crear_tablas.sql): el trigger queda en la tabla
+-- particionada y se aplica a todas sus particiones. Se crea después de
+-- copiar los datos: las ventas de días ya cerrados no deben rechazarse.
+CREATE TRIGGER trg_ventas_dia_cerrado
+    BEFORE INSERT OR UPDATE ON public.ventas
+    FOR EACH ROW EXECUTE FUNCTION public.bloquear_dia_cerrado();
+
+ALTER TABLE public.pagos_venta
+    ADD CONSTRAINT pagos_venta_id_venta_fkey
+    FOREIGN KEY (id_venta, fecha) REFERENCES public.ventas(id, fecha);
+
+ANALYZE public.ventas;
+ANALYZE public.detalle_ventas;
+ANALYZE public.movimientos_inventario;
+
+COMMIT;
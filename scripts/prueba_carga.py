@@ -0,0 +1,383 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+
+from app.core.database import conectar_bd, estado_pool
+from app.services.contexto import ContextoApp
+
+
+# ==========================================================
+#   GUIONES DE LOS CAJEROS VIRTUALES
+# ==========================================================
+# Cada cajero repite operaciones elegidas al azar según estos pesos, con
+# una pausa entre una y otra (el tiempo que tarda una persona en caja).
+# Todos comparten un mismo ContextoApp, como las sesiones de un proceso
+# de Streamlit.
+PESOS = {
+    "buscar_producto": 35,
+    "venta_carrito": 20,
+    "ver_dashboard": 15,
+    "ver_pendientes": 10,
+    "ver_inventario": 10,
+    "crear_fiado": 5,
+    "ver_gastos": 5,
+}
+
+# Operaciones que escriben en la BD (se omiten con --solo-lectura)
+ESCRITURAS = {"venta_carrito", "crear_fiado"}
+
+TERMINOS = ["para", "amox", "ibup", "vita", "jarabe", "tab", "crema", "sol", "a", "lo"]
+
+# Páginas que recorre un cajero en modo --streamlit
+PAGINAS = [
+    "🏠 Inicio",
+    "📦 Productos / Carrito",
+    "📈 Inventario",
+    "📘 Fiados",
+    "🧾 Gastos",
+]
+
+
+class Metricas:
+    """Latencias y errores por operación, compartidas por todos los hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+        self.ejemplos_error = {}
+
+    def registrar(self, operacion, ms, error=None):
+        with self._lock:
+            if error is None:
+                self.latencias[operacion].append(ms)
+            else:
+                self.errores[operacion] += 1
+                self.ejemplos_error.setdefault(operacion, str(error)[:200])
+
+
+class Cajero:
+    """Un cajero virtual que usa directamente la capa de services."""
+
+    def __init__(self, ctx, id_usuario, rng, solo_lectura):
+        self.ctx = ctx
+        self.id_usuario = id_usuario
+        self.rng = rng
+        ops = [o for o in PESOS if not (solo_lectura and o in ESCRITURAS)]
+        self.operaciones = ops
+        self.pesos = [PESOS[o] for o in ops]
+
+    def siguiente(self):
+        return self.rng.choices(self.operaciones, weights=self.pesos)[0]
+
+    def ejecutar(self, operacion):
+        getattr(self, operacion)()
+
+    # ---------- Guiones ----------
+    def buscar_producto(self):
+        self.ctx.productos.buscar_activos(self.rng.choice(TERMINOS))
+
+    def _producto_con_stock(self):
+        disponibles = [p for p in self.ctx.productos.listar_activos() if p.stock_unidades > 0]
+        if not disponibles:
+            raise RuntimeError("No hay productos con stock para la prueba.")
+        return self.rng.choice(disponibles)
+
+    def venta_carrito(self):
+        # Buscar, agregar 1-3 productos al carrito y cobrar
+        self.ctx.productos.buscar_activos(self.rng.choice(TERMINOS))
+        carrito = []
+        for _ in range(self.rng.randint(1, 3)):
+            p = self._producto_con_stock()
+            precio = float(p.precio_venta_unidad or 0) or 1.0
+            carrito.append(
+                {
+                    "producto_id": p.id,
+                    "nombre": p.nombre,
+                    "tipo": "unidad",
+                    "cantidad": 1,
+                    "monto": precio,
+                    "fecha": date.today().isoformat(),
+                }
+            )
+        self.ctx.ventas.registrar_ventas_desde_carrito(carrito, self.id_usuario)
+
+    def ver_dashboard(self):
+        hoy = date.today()
+        desde = hoy.replace(day=1)
+        self.ctx.dashboard.get_resumen(desde, hoy)
+        self.ctx.dashboard.get_productos_bajo_stock_df(threshold=1)
+        self.ctx.dashboard.get_top_mas_vendidos_df(desde, hoy, top_n=5)
+
+    def ver_pendientes(self):
+        self.ctx.fiados.listar_pendientes()
+
+    def ver_inventario(self):
+        hoy = date.today()
+        self.ctx.inventario.get_libro(hoy.replace(day=1), hoy)
+
+    def ver_gastos(self):
+        hoy = date.today()
+        self.ctx.gastos.get_gastos_y_total(hoy.replace(day=1), hoy)
+
+    def crear_fiado(self):
+        p = self._producto_con_stock()
+        self.ctx.fiados.crear_fiado(
+            id_producto=p.id,
+            cliente=f"Carga {self.rng.randint(1, 50)}",
+            telefono=None,
+            cantidad=1,
+            monto=float(p.precio_venta_unidad or 0) or 1.0,
+            fecha=date.today(),
+        )
+
+
+class CajeroStreamlit:
+    """
+    Cajero virtual que recorre las páginas de la app web con el cliente de
+    pruebas de Streamlit (AppTest): cada operación es un rerun completo.
+    """
+
+    def __init__(self, id_usuario, rng, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = rng
+        self.timeout = timeout
+        self.app = AppTest.from_file("main.py", default_timeout=timeout)
+        self.app.session_state["user"] = {
+            "id": id_usuario,
+            "username": f"carga_{id_usuario}",
+        }
+        self.app.run()
+
+    def siguiente(self):
+        return self.rng.choice(PAGINAS)
+
+    def ejecutar(self, pagina):
+        self.app.sidebar.radio[0].set_value(pagina).run(timeout=self.timeout)
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].message)
+        # Las páginas muestran los fallos de BD con st.error
+        if self.app.error:
+            raise RuntimeError(self.app.error[0].value)
+
+
+# ==========================================================
+#   EJECUCIÓN
+# ==========================================================
+def _cajero(n, crear, metricas, fin, pausa_ms, rampa, args):
+    # Arranque escalonado para no abrir todas las sesiones a la vez
+    time.sleep(rampa * n / max(1, args.usuarios))
+    rng = random.Random(args.semilla + n)
+    try:
+        cajero = crear(rng)
+    except Exception as e:
+        metricas.registrar("inicio_sesion", 0.0, e)
+        return
+
+    while time.monotonic() < fin:
+        operacion = cajero.siguiente()
+        inicio = time.perf_counter()
+        try:
+            cajero.ejecutar(operacion)
+        except Exception as e:
+            metricas.registrar(operacion, 0.0, e)
+        else:
+            metricas.registrar(operacion, (time.perf_counter() - inicio) * 1000)
+
+        if pausa_ms:
+            time.sleep(rng.uniform(0.5, 1.5) * pausa_ms / 1000)
+
+
+def _conexiones_servidor():
+    """Conexiones abiertas contra esta base (pg_stat_activity)."""
+    cn = conectar_bd()
+    if not cn:
+        raise RuntimeError("No se pudo conectar a la BD.")
+    try:
+        with cn.cursor() as cur:
+            cur.execute(
+                "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database();"
+            )
+            return int(cur.fetchone()[0])
+    finally:
+        cn.close()
+
+
+def _muestrear(muestras, fin, intervalo):
+    while time.monotonic() < fin:
+        muestra = dict(estado_pool())
+        try:
+            muestra["servidor"] = _conexiones_servidor()
+        except Exception:
+            muestra["servidor"] = None
+        muestras.append(muestra)
+        time.sleep(intervalo)
+
+
+def _resumen(metricas, duracion):
+    filas = []
+    for op in sorted(set(metricas.latencias) | set(metricas.errores)):
+        lat = np.asarray(metricas.latencias.get(op, []), dtype=float)
+        ok = len(lat)
+        err = metricas.errores.get(op, 0)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if ok else (0.0, 0.0, 0.0)
+        filas.append(
+            {
+                "operacion": op,
+                "ok": ok,
+                "errores": err,
+                "tasa_error": err / (ok + err) if ok + err else 0.0,
+                "por_seg": ok / duracion if duracion else 0.0,
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(lat.max()) if ok else 0.0,
+            }
+        )
+    return filas
+
+
+def _imprimir(filas, muestras, duracion, metricas):
+    print(f"{'Operación':<22}{'ok':>7}{'err':>6}{'%err':>7}{'op/s':>8}"
+          f"{'p50':>9}{'p95':>9}{'p99':>9}{'máx':>9}")
+    for f in filas:
+        print(f"{f['operacion']:<22}{f['ok']:>7}{f['errores']:>6}"
+              f"{100 * f['tasa_error']:>6.1f}%{f['por_seg']:>8.2f}"
+              f"{f['p50_ms']:>9.1f}{f['p95_ms']:>9.1f}{f['p99_ms']:>9.1f}{f['max_ms']:>9.1f}")
+
+    total_ok = sum(f["ok"] for f in filas)
+    total_err = sum(f["errores"] for f in filas)
+    print(f"Throughput: {total_ok / duracion:.2f} op/s · errores: {total_err} "
+          f"({100 * total_err / max(1, total_ok + total_err):.1f}%)")
+
+    if muestras:
+        en_uso = [m["en_uso"] for m in muestras]
+        servidor = [m["servidor"] for m in muestras if m["servidor"] is not None]
+        print(f"Pool: en uso máx {max(en_uso)} / {muestras[-1]['maximo']} "
+              f"(prom {sum(en_uso) / len(en_uso):.1f}) · "
+              f"conexiones directas por pool agotado: {muestras[-1]['directas']}")
+        if servidor:
+            print(f"Servidor: conexiones máx {max(servidor)} "
+                  f"(prom {sum(servidor) / len(servidor):.1f})")
+
+    for op, msg in metricas.ejemplos_error.items():
+        print(f"❌ {op}: {msg}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Prueba de carga: N cajeros virtuales concurrentes (buscar, vender, "
+            "dashboard, fiados...) contra la BD configurada en DB_HOST. "
+            "Las ventas y fiados se registran de verdad: usar una BD local de pruebas."
+        )
+    )
+    parser.add_argument("--usuarios", type=int, default=10, help="Cajeros simultáneos.")
+    parser.add_argument("--duracion", type=float, default=60.0, help="Segundos de prueba.")
+    parser.add_argument(
+        "--rampa", type=float, default=5.0, help="Segundos para que arranquen todos."
+    )
+    parser.add_argument(
+        "--pausa-ms",
+        type=float,
+        default=500.0,
+        help="Pausa media entre operaciones de un cajero (0 = sin pausa).",
+    )
+    parser.add_argument(
+        "--id-usuario", type=int, default=1, help="Usuario con el que se registran las ventas."
+    )
+    parser.add_argument(
+        "--solo-lectura", action="store_true", help="No registra ventas ni fiados."
+    )
+    parser.add_argument(
+        "--streamlit",
+        action="store_true",
+        help="Recorre las páginas de la app web con AppTest en vez de llamar a los services.",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Timeout por rerun en modo --streamlit."
+    )
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla de los guiones.")
+    parser.add_argument(
+        "--permitir-remoto",
+        action="store_true",
+        help="Permite correr contra un DB_HOST que no es local.",
+    )
+    parser.add_argument("--salida", default=None, help="Ruta de un JSON con el resultado.")
+    args = parser.parse_args()
+
+    host = os.getenv("DB_HOST", "")
+    if host not in ("localhost", "127.0.0.1", "::1") and not args.permitir_remoto:
+        print(f"❌ DB_HOST={host or '(vacío)'} no es local. "
+              "Usa una BD de pruebas o pasa --permitir-remoto.")
+        return
+
+    modo = "streamlit" if args.streamlit else "services"
+    print(f"=== Prueba de carga · {args.usuarios} cajeros · {args.duracion:.0f} s · "
+          f"modo {modo}{' · solo lectura' if args.solo_lectura else ''} ===")
+
+    if args.streamlit:
+        def crear(rng):
+            return CajeroStreamlit(args.id_usuario, rng, args.timeout)
+        ctx = None
+    else:
+        ctx = ContextoApp()
+
+        def crear(rng):
+            return Cajero(ctx, args.id_usuario, rng, args.solo_lectura)
+
+    metricas = Metricas()
+    muestras = []
+    inicio = time.monotonic()
+    fin = inicio + args.rampa + args.duracion
+
+    hilos = [
+        threading.Thread(
+            target=_cajero,
+            args=(n, crear, metricas, fin, args.pausa_ms, args.rampa, args),
+            daemon=True,
+        )
+        for n in range(args.usuarios)
+    ]
+    hilos.append(threading.Thread(target=_muestrear, args=(muestras, fin, 1.0), daemon=True))
+
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    duracion = time.monotonic() - inicio
+    filas = _resumen(metricas, duracion)
+    _imprimir(filas, muestras, duracion, metricas)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "usuarios": args.usuarios,
+                    "duracion_s": duracion,
+                    "modo": modo,
+                    "operaciones": filas,
+                    "muestras_conexiones": muestras,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"📄 Resultado guardado en {args.salida}")
+
+    if ctx is not None:
+        ctx.cerrar()
+    print("✅ Prueba terminada.")
+
+
+if __name__ == "__main__":
+    main()
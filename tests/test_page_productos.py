@@ -0,0 +1,38 @@
+# tests/test_page_productos.py
+import pandas as pd
+import pytest
+
+from app.ui.web.page_productos import _resolver_seleccion
+
+
+@pytest.fixture
+def productos_por_id():
+    # Dos productos con el mismo nombre: solo el id los distingue
+    return pd.DataFrame(
+        {
+            "id": [10, 20],
+            "Nombre": ["Paracetamol", "Paracetamol"],
+            "Unidad": [1.50, 2.75],
+        }
+    ).set_index("id", drop=False)
+
+
+@pytest.mark.parametrize("pid", [10, 20])
+def test_lista_resuelve_su_id(productos_por_id, pid):
+    fila = _resolver_seleccion([{"id": pid, "Nombre": "Paracetamol"}], productos_por_id)
+    assert fila["id"] == pid
+
+
+@pytest.mark.parametrize("pid", [10, 20])
+def test_dataframe_resuelve_su_id(productos_por_id, pid):
+    seleccion = pd.DataFrame([{"id": pid, "Nombre": "Paracetamol"}])
+    fila = _resolver_seleccion(seleccion, productos_por_id)
+    assert fila["id"] == pid
+
+
+@pytest.mark.parametrize(
+    "seleccion",
+    [None, [], pd.DataFrame(), [{"id": 99}], pd.DataFrame([{"id": 99}]), [{"id": None}]],
+)
+def test_sin_seleccion_o_id_desconocido(productos_por_id, seleccion):
+    assert _resolver_seleccion(seleccion, productos_por_id) is None
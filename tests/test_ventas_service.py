@@ -0,0 +1,108 @@
+# tests/test_ventas_service.py
+from datetime import date
+
+import pytest
+
+from app.models.pago import MetodoPago, PagoVenta
+from app.services.ventas_service import VentasService
+
+HOY = date(2026, 3, 10)
+AYER = date(2026, 3, 9)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Métodos activos fijos: no hace falta BD
+    service = VentasService()
+    metodos = [MetodoPago("efectivo", "Efectivo", True), MetodoPago("tarjeta", "Tarjeta")]
+    monkeypatch.setattr(service, "listar_metodos_pago", lambda: metodos)
+    return service
+
+
+def _centavos(pagos):
+    return sum(round(p.monto * 100) for p in pagos)
+
+
+# =========================================================
+#   _validar_pagos
+# =========================================================
+def test_validar_junta_metodos_repetidos(service):
+    pagos = service._validar_pagos(
+        [
+            {"metodo": "Efectivo", "monto": 10},
+            {"metodo": " tarjeta ", "monto": "5.50"},
+            {"metodo": "efectivo", "monto": 4.5},
+        ],
+        {HOY: 20.0},
+    )
+    assert pagos == [PagoVenta("efectivo", 14.5), PagoVenta("tarjeta", 5.5)]
+
+
+def test_validar_ignora_renglon_en_cero(service):
+    pagos = service._validar_pagos(
+        [{"metodo": "efectivo", "monto": 12.25}, {"metodo": "tarjeta", "monto": 0}],
+        {HOY: 12.25},
+    )
+    assert pagos == [PagoVenta("efectivo", 12.25)]
+
+
+@pytest.mark.parametrize("metodo", ["cheque", "", None])
+def test_validar_rechaza_metodo_inactivo(service, metodo):
+    with pytest.raises(ValueError, match="Método de pago no válido"):
+        service._validar_pagos([{"metodo": metodo, "monto": 10}], {HOY: 10.0})
+
+
+def test_validar_rechaza_monto_no_numerico(service):
+    with pytest.raises(ValueError, match="monto del pago no es válido"):
+        service._validar_pagos([{"metodo": "efectivo", "monto": "diez"}], {HOY: 10.0})
+
+
+@pytest.mark.parametrize("monto", [9.99, 10.01, 0])
+def test_validar_rechaza_pagos_que_no_cuadran(service, monto):
+    with pytest.raises(ValueError, match="no cuadran con el total"):
+        service._validar_pagos([{"metodo": "efectivo", "monto": monto}], {HOY: 10.0})
+
+
+def test_validar_cuadra_con_varias_fechas(service):
+    pagos = service._validar_pagos(
+        [{"metodo": "efectivo", "monto": 0.3}], {AYER: 0.1, HOY: 0.2}
+    )
+    assert pagos == [PagoVenta("efectivo", 0.3)]
+
+
+# =========================================================
+#   _repartir_pagos
+# =========================================================
+def test_repartir_una_fecha_deja_los_pagos_igual():
+    pagos = [PagoVenta("efectivo", 7.5), PagoVenta("tarjeta", 2.5)]
+    assert VentasService._repartir_pagos({HOY: 10.0}, pagos) == {HOY: pagos}
+
+
+def test_repartir_varias_fechas_en_orden():
+    pagos = [PagoVenta("efectivo", 8.0), PagoVenta("tarjeta", 7.0)]
+    # Las fechas se recorren en orden aunque el dict venga al revés
+    resultado = VentasService._repartir_pagos({HOY: 5.0, AYER: 10.0}, pagos)
+
+    assert list(resultado) == [AYER, HOY]
+    assert resultado[AYER] == [PagoVenta("efectivo", 8.0), PagoVenta("tarjeta", 2.0)]
+    assert resultado[HOY] == [PagoVenta("tarjeta", 5.0)]
+
+
+def test_repartir_centavos_impares():
+    totales = {AYER: 3.33, HOY: 6.67}
+    pagos = [PagoVenta("efectivo", 5.01), PagoVenta("tarjeta", 4.99)]
+    resultado = VentasService._repartir_pagos(totales, pagos)
+
+    assert resultado[AYER] == [PagoVenta("efectivo", 3.33)]
+    assert resultado[HOY] == [PagoVenta("efectivo", 1.68), PagoVenta("tarjeta", 4.99)]
+    for fecha, total in totales.items():
+        assert _centavos(resultado[fecha]) == round(total * 100)
+
+
+def test_repartir_sobrante_de_redondeo_va_a_la_ultima():
+    # Totales que por redondeo suman un centavo menos que los pagos
+    pagos = [PagoVenta("efectivo", 10.01)]
+    resultado = VentasService._repartir_pagos({AYER: 5.0, HOY: 5.0}, pagos)
+
+    assert resultado[AYER] == [PagoVenta("efectivo", 5.0)]
+    assert resultado[HOY] == [PagoVenta("efectivo", 5.0), PagoVenta("efectivo", 0.01)]